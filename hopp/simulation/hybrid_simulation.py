@@ -1,5 +1,7 @@
-from typing import Dict, Iterable, Optional, Sequence, Union
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Sequence, Union
 import csv
+import importlib
 from pathlib import Path
 
 import json
@@ -7,34 +9,119 @@ import numpy as np
 import PySAM.Singleowner as Singleowner
 from attrs import field, define
 
-from hopp.tools.analysis import create_cost_calculator
 from hopp.simulation.technologies.sites.site_info import SiteInfo
-from hopp.simulation.technologies.pv.pv_plant import PVPlant, PVConfig
-from hopp.simulation.technologies.pv.detailed_pv_plant import DetailedPVPlant, DetailedPVConfig
-from hopp.simulation.technologies.wind.wind_plant import WindPlant, WindConfig
-from hopp.simulation.technologies.csp.tower_plant import TowerConfig, TowerPlant
-from hopp.simulation.technologies.csp.trough_plant import TroughConfig, TroughPlant
-from hopp.simulation.technologies.wave.mhk_wave_plant import MHKWavePlant, MHKConfig
-from hopp.simulation.technologies.battery import Battery, BatteryConfig, BatteryStateless, BatteryStatelessConfig
-from hopp.simulation.technologies.grid import Grid, GridConfig
-from hopp.simulation.technologies.reopt import REopt
 from hopp.simulation.technologies.layout.hybrid_layout import HybridLayout
 from hopp.simulation.technologies.dispatch.hybrid_dispatch_builder_solver import HybridDispatchBuilderSolver
 from hopp.utilities.log import hybrid_logger as logger
+from hopp.utilities.utilities import RepeatedYearArray
 from hopp.simulation.base import BaseClass
 
+if TYPE_CHECKING:
+    from hopp.simulation.technologies.pv.pv_plant import PVPlant, PVConfig
+    from hopp.simulation.technologies.pv.detailed_pv_plant import DetailedPVPlant, DetailedPVConfig
+    from hopp.simulation.technologies.wind.wind_plant import WindPlant, WindConfig
+    from hopp.simulation.technologies.csp.tower_plant import TowerConfig, TowerPlant
+    from hopp.simulation.technologies.csp.trough_plant import TroughConfig, TroughPlant
+    from hopp.simulation.technologies.wave.mhk_wave_plant import MHKWavePlant, MHKConfig
+    from hopp.simulation.technologies.battery import Battery, BatteryConfig, BatteryStateless, BatteryStatelessConfig
+    from hopp.simulation.technologies.grid import Grid, GridConfig
+
+    PowerSourceTypes = Union[
+        PVPlant,
+        DetailedPVPlant,
+        WindPlant,
+        MHKWavePlant,
+        TowerPlant,
+        TroughPlant,
+        Battery,
+        BatteryStateless,
+        Grid
+    ]
+
+# Technology registry: the module and plant class of each technology configuration class. Modules are imported on
+# first use, so that only the configured technologies load their models and dependencies.
+TECHNOLOGY_REGISTRY = {
+    "PVConfig": ("hopp.simulation.technologies.pv.pv_plant", "PVPlant"),
+    "DetailedPVConfig": ("hopp.simulation.technologies.pv.detailed_pv_plant", "DetailedPVPlant"),
+    "WindConfig": ("hopp.simulation.technologies.wind.wind_plant", "WindPlant"),
+    "MHKConfig": ("hopp.simulation.technologies.wave.mhk_wave_plant", "MHKWavePlant"),
+    "TowerConfig": ("hopp.simulation.technologies.csp.tower_plant", "TowerPlant"),
+    "TroughConfig": ("hopp.simulation.technologies.csp.trough_plant", "TroughPlant"),
+    "BatteryConfig": ("hopp.simulation.technologies.battery.battery", "Battery"),
+    "BatteryStatelessConfig": ("hopp.simulation.technologies.battery.battery_stateless", "BatteryStateless"),
+    "GridConfig": ("hopp.simulation.technologies.grid", "Grid"),
+}
+
+
+def get_technology_config(config_name: str) -> type:
+    """
+    Technology configuration class of `TECHNOLOGY_REGISTRY`, importing its module on first use
+
+    :param config_name: name of the configuration class
+    """
+    module_name, _ = TECHNOLOGY_REGISTRY[config_name]
+    return getattr(importlib.import_module(module_name), config_name)
+
+
+def create_technology(site: SiteInfo, config) -> PowerSourceTypes:
+    """
+    Creates the technology plant of a configuration, using the plant class registered in `TECHNOLOGY_REGISTRY` for
+    the configuration's class or its closest registered base class
+
+    :param site: site information
+    :param config: technology configuration
+    :return: technology plant
+    """
+    for config_class in type(config).__mro__:
+        if config_class.__name__ in TECHNOLOGY_REGISTRY:
+            module_name, plant_name = TECHNOLOGY_REGISTRY[config_class.__name__]
+            plant_class = getattr(importlib.import_module(module_name), plant_name)
+            return plant_class(site, config=config)
+    raise ValueError(f"{type(config).__name__} is not a registered technology configuration")
+
+# technology outputs of `HybridSimulation.simulation_results`: scalars, cash flows by year and time series
+RESULT_SCALARS = ("system_capacity_kw", "interconnect_kw", "annual_energy_kwh", "capacity_factor",
+                  "capacity_factor_at_interconnect", "curtailment_percent", "capacity_credit_percent",
+                  "cost_installed", "total_installed_cost", "net_present_value", "internal_rate_of_return",
+                  "levelized_cost_of_energy_real", "levelized_cost_of_energy_nominal", "benefit_cost_ratio")
+RESULT_CASH_FLOWS = ("total_revenue", "capacity_payment", "energy_purchases", "energy_sales", "energy_value",
+                     "federal_depreciation_total", "federal_taxes", "tax_incentives", "debt_payment",
+                     "insurance_expense", "om_total_expense")
+RESULT_TIME_SERIES = ("generation_profile",)
+# outputs that do not require a financial simulation
+_PERFORMANCE_RESULTS = ("system_capacity_kw", "interconnect_kw", "annual_energy_kwh", "capacity_factor",
+                        "capacity_factor_at_interconnect", "curtailment_percent", "generation_profile")
+
+
+def _add_generation(total_gen: np.ndarray, gen: np.ndarray, project_life: int) -> np.ndarray:
+    """
+    Adds a generation profile of one or more years to a total generation of shape (years, timesteps), in place unless
+    the total is expanded from a single year to the project life
+
+    :param total_gen: total generation of a single year or of the project life [kW]
+    :param gen: generation profile, whose number of years divides the project life [kW]
+    :param project_life: number of years in the analysis period [years]
+    :return: total generation
+    """
+    gen = gen.reshape(-1, total_gen.shape[1])
+    if len(gen) > 1 and len(total_gen) == 1:
+        total_gen = np.repeat(total_gen, project_life, axis=0)
+    if len(gen) == 1 or len(gen) == len(total_gen):
+        total_gen += gen
+    else:
+        total_gen_by_cycle = total_gen.reshape(-1, *gen.shape)
+        total_gen_by_cycle += gen
+    return total_gen
+
+
+def _lifetime_generation(total_gen: np.ndarray, project_life: int) -> Union[RepeatedYearArray, np.ndarray]:
+    """
+    Generation over the project life of a total generation of shape (years, timesteps), see `_add_generation`
+    """
+    if len(total_gen) == 1:
+        return RepeatedYearArray(total_gen[0], project_life)
+    return total_gen.ravel()
 
-PowerSourceTypes = Union[
-    PVPlant,
-    DetailedPVPlant,
-    WindPlant,
-    MHKWavePlant,
-    TowerPlant,
-    TroughPlant,
-    Battery,
-    BatteryStateless,
-    Grid
-]
 
 class HybridSimulationOutput:
     """Class for creating :class:`HybridSimulation` output structure"""
@@ -124,30 +211,30 @@ class TechnologiesConfig(BaseClass):
         
         if "pv" in data:
             if "use_pvwatts" in data["pv"] and not data["pv"]["use_pvwatts"]:
-                config["pv"] = DetailedPVConfig.from_dict(data["pv"])
+                config["pv"] = get_technology_config("DetailedPVConfig").from_dict(data["pv"])
             else:
-                config["pv"] = PVConfig.from_dict(data["pv"])
+                config["pv"] = get_technology_config("PVConfig").from_dict(data["pv"])
         
         if "wind" in data:
-            config["wind"] = WindConfig.from_dict(data["wind"])
+            config["wind"] = get_technology_config("WindConfig").from_dict(data["wind"])
 
         if "wave" in data:
-            config["wave"] = MHKConfig.from_dict(data["wave"])
+            config["wave"] = get_technology_config("MHKConfig").from_dict(data["wave"])
 
         if "tower" in data:
-            config["tower"] = TowerConfig.from_dict(data["tower"])
+            config["tower"] = get_technology_config("TowerConfig").from_dict(data["tower"])
 
         if "trough" in data:
-            config["trough"] = TroughConfig.from_dict(data["trough"])
+            config["trough"] = get_technology_config("TroughConfig").from_dict(data["trough"])
 
         if "battery" in data:
             if "tracking" in data["battery"] and not data["battery"]["tracking"]:
-                config["battery"] = BatteryStatelessConfig.from_dict(data["battery"])
+                config["battery"] = get_technology_config("BatteryStatelessConfig").from_dict(data["battery"])
             else:
-                config["battery"] = BatteryConfig.from_dict(data["battery"])
+                config["battery"] = get_technology_config("BatteryConfig").from_dict(data["battery"])
 
         if "grid" in data:
-            config["grid"] = GridConfig.from_dict(data["grid"])
+            config["grid"] = get_technology_config("GridConfig").from_dict(data["grid"])
 
         return super().from_dict(config)
 
@@ -192,28 +279,26 @@ class HybridSimulation(BaseClass):
 
     dispatch_builder: HybridDispatchBuilderSolver = field(init=False)
     _fileout: Path = field(init=False)
+    _lifetime_sim: bool = field(init=False, default=False)
 
     def __attrs_post_init__(self):
         self.technologies = {} # store technologies after they've been initialized
         self._fileout = Path.cwd() / "results"
         self.sim_options = self.simulation_options or {}
+        self.check_resource_resolution()
 
         pv_config = self.tech_config.pv
 
         if pv_config is not None:
-            if isinstance(pv_config, DetailedPVConfig):
-                self.pv = DetailedPVPlant(self.site, config=pv_config)       # PVSAMv1 plant
-                self.technologies["pv"] = self.pv
-            else:
-                self.pv = PVPlant(self.site, config=pv_config)               # PVWatts plant
-                self.technologies["pv"] = self.pv
+            self.pv = create_technology(self.site, pv_config)    # PVWatts or PVSAMv1 plant
+            self.technologies["pv"] = self.pv
 
             logger.info("Created HybridSystem.pv with system size {} mW".format(pv_config.system_capacity_kw))
 
         wind_config = self.tech_config.wind
 
         if wind_config is not None:
-            self.wind = WindPlant(self.site, config=wind_config)
+            self.wind = create_technology(self.site, wind_config)
             self.technologies["wind"] = self.wind
 
             logger.info("Created HybridSystem.wind with system size {} mW".format(wind_config))
@@ -221,7 +306,7 @@ class HybridSimulation(BaseClass):
         wave_config = self.tech_config.wave
 
         if wave_config is not None:
-            self.wave = MHKWavePlant(self.site, config=wave_config)
+            self.wave = create_technology(self.site, wave_config)
             self.technologies["wave"] = self.wave
 
             logger.info("Created HybridSystem.wave with system size {} mW".format(wave_config))
@@ -229,7 +314,7 @@ class HybridSimulation(BaseClass):
         tower_config = self.tech_config.tower
 
         if tower_config is not None:
-            self.tower = TowerPlant(self.site, config=tower_config)
+            self.tower = create_technology(self.site, tower_config)
             self.technologies["tower"] = self.tower
 
             logger.info("Created HybridSystem.tower with cycle size {} MW, a solar multiple of {}, {} hours of storage".format(
@@ -238,7 +323,7 @@ class HybridSimulation(BaseClass):
         trough_config = self.tech_config.trough
 
         if trough_config is not None:
-            self.trough = TroughPlant(self.site, config=trough_config)
+            self.trough = create_technology(self.site, trough_config)
             self.technologies["trough"] = self.trough
 
             logger.info("Created HybridSystem.trough with cycle size {} MW, a solar multiple of {}, {} hours of storage".format(
@@ -247,12 +332,8 @@ class HybridSimulation(BaseClass):
         battery_config = self.tech_config.battery
 
         if battery_config is not None:
-            if isinstance(battery_config, BatteryStatelessConfig):
-                self.battery = BatteryStateless(self.site, config=battery_config)
-                self.technologies["battery"] = self.battery
-            else:
-                self.battery = Battery(self.site, config=battery_config)
-                self.technologies["battery"] = self.battery
+            self.battery = create_technology(self.site, battery_config)
+            self.technologies["battery"] = self.battery
 
             if self.battery is not None:
                 logger.info("Created HybridSystem.battery with system capacity {} MWh and rating of {} MW".format(
@@ -264,7 +345,7 @@ class HybridSimulation(BaseClass):
         grid_config = self.tech_config.grid
 
         if grid_config is not None:
-            self.grid = Grid(self.site, config=grid_config)
+            self.grid = create_technology(self.site, grid_config)
             self.technologies["grid"] = self.grid
 
             self.interconnect_kw = self.grid.interconnect_kw
@@ -281,6 +362,7 @@ class HybridSimulation(BaseClass):
                                                             dispatch_options=self.dispatch_options or {})
 
         # Default cost calculator, can be overwritten
+        from hopp.tools.analysis import create_cost_calculator
         self.cost_model = create_cost_calculator(self.interconnect_kw, **self.cost_info or {})
 
         self.outputs_factory = HybridSimulationOutput(self.technologies)
@@ -295,6 +377,25 @@ class HybridSimulation(BaseClass):
         if grid_config.ppa_price:
             self.ppa_price = grid_config.ppa_price
 
+    def check_resource_resolution(self):
+        """
+        Checks that the technologies and dispatch options support the resolution of the site's resource.
+
+        Support for sub-hourly and multi-year resources is partial: the PV, wind, battery and grid models and the
+        dispatch use the resource's time steps, and only the year selected by `SiteInfo.set_resource_year` is
+        simulated. The CSP models and dispatch clustering read the resource files themselves and only support a
+        single year of hourly data, so they are rejected for other resources.
+        """
+        if self.site.n_years == 1 and self.site.steps_per_hour == 1:
+            return
+        hourly_only = [tech for tech in ('tower', 'trough') if getattr(self.tech_config, tech) is not None]
+        if (self.dispatch_options or {}).get('use_clustering'):
+            hourly_only.append('dispatch clustering')
+        if hourly_only:
+            raise ValueError(f"{', '.join(hourly_only)} only support a single year of hourly resource data, "
+                             f"but the site has {self.site.n_years} years with {self.site.steps_per_hour} "
+                             f"steps per hour")
+
     def check_consistent_financial_models(self):
         fin_models = {}
         for tech, model in self.technologies.items():
@@ -347,6 +448,7 @@ class HybridSimulation(BaseClass):
         # TODO: remove or move?? This doesn't seem to be used. "system_capacity_closest_fit"  is not even available
         if not self.site.urdb_label:
             raise ValueError("REopt run requires urdb_label")
+        from hopp.simulation.technologies.reopt import REopt
         reopt = REopt(lat=self.site.lat,
                       lon=self.site.lon,
                       interconnection_limit_kw=self.interconnect_kw,
@@ -623,6 +725,7 @@ class HybridSimulation(BaseClass):
         :return:
         """
         self.setup_performance_models()
+        self._lifetime_sim = lifetime_sim
         # simulate non-dispatchable systems
         non_dispatchable_systems = ['pv', 'wind','wave']
         for system in non_dispatchable_systems:
@@ -636,8 +739,9 @@ class HybridSimulation(BaseClass):
         # Put the hybrid together for grid simulation
         hybrid_size_kw = 0
         hybrid_nominal_capacity = 0
-        total_gen = np.zeros(self.site.n_timesteps * project_life)
-        total_gen_before_battery = np.zeros(self.site.n_timesteps * project_life)
+        # generation is totaled over a single year as long as all profiles are, and over the project life otherwise
+        total_gen = np.zeros((1, self.site.n_timesteps))
+        total_gen_before_battery = np.zeros((1, self.site.n_timesteps))
         total_gen_max_feasible_year1 = np.zeros(self.site.n_timesteps)
 
         for system in self.technologies.keys():
@@ -646,20 +750,23 @@ class HybridSimulation(BaseClass):
                 if model:
                     hybrid_size_kw += model.system_capacity_kw
                     hybrid_nominal_capacity += model.calc_nominal_capacity(self.interconnect_kw)
-                    project_life_gen = np.tile(model.generation_profile, int(project_life / (len(model.generation_profile) // self.site.n_timesteps)))
-                    if len(project_life_gen) != len(total_gen):
+                    gen = np.asarray(model.generation_profile, dtype=float)
+                    gen_years = len(gen) // self.site.n_timesteps
+                    if gen_years == 0 or len(gen) != gen_years * self.site.n_timesteps or project_life % gen_years:
                         raise ValueError("Generation profile, `gen`, from system {} should have length that divides"
                                         " n_timesteps {} * project_life {}".format(system, self.site.n_timesteps,
                                                                                     project_life))
                     if system in non_dispatchable_systems:
-                        total_gen_before_battery += project_life_gen
-                    total_gen += project_life_gen
+                        total_gen_before_battery = _add_generation(total_gen_before_battery, gen, project_life)
+                    total_gen = _add_generation(total_gen, gen, project_life)
                     model.gen_max_feasible = model.calc_gen_max_feasible_kwh(self.interconnect_kw)
                     total_gen_max_feasible_year1 += model.gen_max_feasible
 
+        total_gen = _lifetime_generation(total_gen, project_life)
+
         # Consolidate grid generation by copying over power and storage generation information
         if self.battery:
-            self.grid.generation_profile_wo_battery = total_gen_before_battery
+            self.grid.generation_profile_wo_battery = _lifetime_generation(total_gen_before_battery, project_life)
         self.grid.simulate_grid_connection(hybrid_size_kw, total_gen, project_life, lifetime_sim, total_gen_max_feasible_year1)
         self.grid.hybrid_nominal_capacity = hybrid_nominal_capacity
         self.grid.total_gen_max_feasible_year1 = total_gen_max_feasible_year1
@@ -727,6 +834,16 @@ class HybridSimulation(BaseClass):
         self.calculate_financials()
         self.simulate_financials(project_life)
 
+    def clear_simulation_cache(self):
+        """
+        Forces the next simulation to execute the system models of all technologies, including those whose inputs
+        are unchanged since their last simulation
+        """
+        for system in self.technologies.keys():
+            model = getattr(self, system)
+            if model:
+                model.clear_simulation_cache()
+
     @property
     def interconnect_kw(self) -> float:
         """Interconnection limit [kW]"""
@@ -803,7 +920,7 @@ class HybridSimulation(BaseClass):
                 continue
             if hasattr(self, v):
                 setattr(aep, v, getattr(getattr(self, v), "annual_energy_kwh"))
-        aep.hybrid = sum(self.grid.generation_profile[0:self.site.n_timesteps])
+        aep.hybrid = sum(self.grid.generation_profile[0:self.site.n_timesteps]) * self.site.interval / 60
         return aep
 
     @property
@@ -844,7 +961,7 @@ class HybridSimulation(BaseClass):
             hybrid_generation += self.trough.annual_energy_kwh
             hybrid_capacity += self.trough.system_capacity_kw
         if self.battery:
-            hybrid_generation += sum(self.battery.outputs.gen)
+            hybrid_generation += sum(self.battery.outputs.gen) * self.site.interval / 60
             hybrid_capacity += self.battery.system_capacity_kw
         try:
             cf.grid = self.grid.capacity_factor_after_curtailment
@@ -1032,9 +1149,9 @@ class HybridSimulation(BaseClass):
             # outputs['Grid Capacity Factor After Curtailment (%)'] = self.grid.capacity_factor_after_curtailment
             outputs['Grid Capacity Factor at Interconnect (%)'] = self.grid.capacity_factor_at_interconnect
             if self.site.follow_desired_schedule:
-                outputs['Missed Load year 1 (MWh)'] = sum(self.grid.missed_load[0:8760])/1.e3
+                outputs['Missed Load year 1 (MWh)'] = sum(self.grid.missed_load[0:self.site.n_timesteps]) * self.site.interval / 60 / 1.e3
                 outputs['Missed Scheduled Load (%)'] = self.grid.missed_load_percentage * 100
-                outputs['Schedule Curtailment year 1 (MWh)'] = sum(self.grid.schedule_curtailed[0:8760])/1.e3
+                outputs['Schedule Curtailment year 1 (MWh)'] = sum(self.grid.schedule_curtailed[0:self.site.n_timesteps]) * self.site.interval / 60 / 1.e3
                 outputs['Schedule Curtailment (%)'] = self.grid.schedule_curtailed_percentage * 100
 
         attr_map = {'annual_energies': {'name': 'AEP (GWh)', 'scale': 1/1e6},
@@ -1133,6 +1250,41 @@ class HybridSimulation(BaseClass):
 
         return outputs
 
+    def simulation_results(self) -> Dict[str, np.ndarray]:
+        """
+        Columnar results of the last simulation, to be appended to a dataset by
+        :class:`hopp.tools.results_store.ResultsWriter`
+
+        Columns are named ``<technology>.<output>``, the grid's outputs being named ``hybrid``, for the outputs of
+        `RESULT_SCALARS`, `RESULT_CASH_FLOWS` by year of the analysis period and `RESULT_TIME_SERIES`, which cover the
+        project life for lifetime simulations and the first year otherwise, as the other years repeat it. Outputs that
+        a technology does not have are left out, as are the cash flows of technologies without capacity and the
+        financial outputs of technologies skipping their financial simulation.
+
+        :returns: values of each column
+        """
+        results = {}
+        n_timesteps = None if self._lifetime_sim else self.site.n_timesteps
+        for tech, model in self.technologies.items():
+            prefix = "hybrid" if tech == "grid" else tech
+            skip_financial = self.sim_options.get(tech, {}).get('skip_financial', False)
+            has_capacity = model.system_capacity_kw > 0
+            for name in RESULT_SCALARS + RESULT_CASH_FLOWS + RESULT_TIME_SERIES:
+                if skip_financial and name not in _PERFORMANCE_RESULTS:
+                    continue
+                if not has_capacity and name in RESULT_CASH_FLOWS:
+                    continue
+                try:
+                    value = getattr(model, name)
+                except (AttributeError, UnicodeDecodeError):
+                    # not an output of this technology, or not one of its PySAM models, for which PySAM may fail to
+                    # decode the message of its AttributeError
+                    continue
+                if name in RESULT_TIME_SERIES:
+                    value = value[:n_timesteps]
+                results[f"{prefix}.{name}"] = np.asarray(np.nan if value is None else value, dtype=float)
+        return results
+
     def assign(self, input_dict: dict):
         """
         Assign values from a nested dictionary of values which can be for all technologies in the hybrid plant
@@ -1,12 +1,21 @@
-from hopp.simulation.technologies.battery import BatteryOutputs, Battery
-from hopp.simulation.technologies.clustering import Clustering, AffinityPropagation
-from hopp.simulation.technologies.csp.csp_plant import CspPlant
-from hopp.simulation.technologies.pv.detailed_pv_plant import DetailedPVPlant
-from hopp.simulation.technologies.grid import Grid
-from hopp.simulation.technologies.power_source import PowerSource
-from hopp.simulation.technologies.pv.pv_plant import PVPlant
-from hopp.simulation.technologies.reopt import REopt
-from hopp.simulation.technologies.csp.tower_plant import TowerPlant
-from hopp.simulation.technologies.csp.trough_plant import TroughPlant
-from hopp.simulation.technologies.utility_rate import UtilityRate
-from hopp.simulation.technologies.wind.wind_plant import WindPlant
+from hopp.utilities.utilities import lazy_exports
+
+# technology models are imported on first use, so that only the configured technologies load their dependencies
+_exports = {
+    "BatteryOutputs": ".battery",
+    "Battery": ".battery",
+    "Clustering": ".clustering",
+    "AffinityPropagation": ".clustering",
+    "CspPlant": ".csp.csp_plant",
+    "DetailedPVPlant": ".pv.detailed_pv_plant",
+    "Grid": ".grid",
+    "PowerSource": ".power_source",
+    "PVPlant": ".pv.pv_plant",
+    "REopt": ".reopt",
+    "TowerPlant": ".csp.tower_plant",
+    "TroughPlant": ".csp.trough_plant",
+    "UtilityRate": ".utility_rate",
+    "WindPlant": ".wind.wind_plant",
+}
+__all__ = list(_exports)
+__getattr__ = lazy_exports(__name__, _exports)
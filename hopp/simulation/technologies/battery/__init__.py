@@ -1,2 +1,11 @@
-from .battery import Battery, BatteryConfig, BatteryOutputs
-from .battery_stateless import BatteryStateless, BatteryStatelessConfig
\ No newline at end of file
+from hopp.utilities.utilities import lazy_exports
+
+_exports = {
+    "Battery": ".battery",
+    "BatteryConfig": ".battery",
+    "BatteryOutputs": ".battery",
+    "BatteryStateless": ".battery_stateless",
+    "BatteryStatelessConfig": ".battery_stateless",
+}
+__all__ = list(_exports)
+__getattr__ = lazy_exports(__name__, _exports)
@@ -14,6 +14,7 @@ from hopp.simulation.technologies.power_source import PowerSource
 from hopp.simulation.technologies.sites.site_info import SiteInfo
 
 from hopp.utilities.log import hybrid_logger as logger
+from hopp.utilities.utilities import RepeatedYearArray
 from hopp.utilities.validators import contains, gt_zero, range_val
 
 
@@ -156,7 +157,7 @@ class Battery(PowerSource):
         # Minimum set of parameters to set to get statefulBattery to work
         self._system_model.value("control_mode", 0.0)
         self._system_model.value("input_current", 0.0)
-        self._system_model.value("dt_hr", 1.0)
+        self._system_model.value("dt_hr", self.site.interval / 60)
         self._system_model.value("minimum_SOC", self.config.minimum_SOC)
         self._system_model.value("maximum_SOC", self.config.maximum_SOC)
         self._system_model.value("initial_SOC", self.config.initial_SOC)
@@ -252,8 +253,8 @@ class Battery(PowerSource):
         Step through dispatch solution for battery and simulate battery
 
         Args:
-            n_periods: Number of hours to simulate [hrs]
-            sim_start_time: Start hour of simulation horizon
+            n_periods: Number of time steps to simulate
+            sim_start_time: Start time step of simulation horizon
 
         """
         if self.dispatch is None:
@@ -385,9 +386,10 @@ class Battery(PowerSource):
 
         if len(self.outputs.gen) == self.site.n_timesteps:
             single_year_gen = self.outputs.gen
-            self._financial_model.value('gen', list(single_year_gen) * project_life)
+            gen = RepeatedYearArray(single_year_gen, project_life)
+            self._financial_model.value('gen', gen)
 
-            self._financial_model.value('system_pre_curtailment_kwac', list(single_year_gen) * project_life)
+            self._financial_model.value('system_pre_curtailment_kwac', gen)
             self._financial_model.value('annual_energy_pre_curtailment_ac', sum(single_year_gen))
             self._financial_model.value('batt_annual_discharge_energy', [sum(i for i in single_year_gen if i > 0)] * project_life)
             self._financial_model.value('batt_annual_charge_energy', [sum(i for i in single_year_gen if i < 0)] * project_life)
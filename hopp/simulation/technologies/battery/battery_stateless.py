@@ -1,21 +1,23 @@
 from typing import Sequence, List, Optional, Union
 from dataclasses import dataclass, asdict
 
+import numpy as np
 from attrs import define, field
 
 from hopp.simulation.technologies.financial.custom_financial_model import CustomFinancialModel
 from hopp.simulation.technologies.sites import SiteInfo
 from hopp.simulation.technologies.power_source import PowerSource
 from hopp.utilities.log import hybrid_logger as logger
+from hopp.utilities.utilities import RepeatedYearArray
 from hopp.utilities.validators import gt_zero, range_val
 from hopp.simulation.base import BaseClass
 
 
 @dataclass
 class BatteryStatelessOutputs:
-    I: List[float]
-    P: List[float]
-    SOC: List[float]
+    I: np.ndarray
+    P: np.ndarray
+    SOC: np.ndarray
     lifecycles_per_day: List[Optional[int]]
     """
     The following outputs are from the HOPP dispatch model, an entry per timestep:
@@ -28,9 +30,9 @@ class BatteryStatelessOutputs:
     """
     def __init__(self, n_timesteps, n_periods_per_day):
         """Class for storing battery.outputs."""
-        self.I = [0.0] * n_timesteps
-        self.P = [0.0] * n_timesteps
-        self.SOC = [0.0] * n_timesteps
+        self.I = np.zeros(n_timesteps)
+        self.P = np.zeros(n_timesteps)
+        self.SOC = np.zeros(n_timesteps)
         self.lifecycles_per_day = [None] * int(n_timesteps / n_periods_per_day)
 
     def export(self):
@@ -124,20 +126,21 @@ class BatteryStateless(PowerSource):
         Step through dispatch solution for battery to collect outputs
 
         Args:
-            n_periods: Number of hours to simulate [hrs]
-            sim_start_time: Start hour of simulation horizon
+            n_periods: Number of time steps to simulate
+            sim_start_time: Start time step of simulation horizon
         """
         # Store Dispatch model values, converting to kW from mW
         if sim_start_time is not None:
             time_slice = slice(sim_start_time, sim_start_time + n_periods)
-            self.outputs.SOC[time_slice] = [i for i in self.dispatch.soc[0:n_periods]]
-            self.outputs.P[time_slice] = [i * 1e3 for i in self.dispatch.power[0:n_periods]]
-            self.outputs.I[time_slice] = [i * 1e3 for i in self.dispatch.current[0:n_periods]]
+            self.outputs.SOC[time_slice] = self.dispatch.soc[0:n_periods]
+            self.outputs.P[time_slice] = np.multiply(self.dispatch.power[0:n_periods], 1e3)
+            self.outputs.I[time_slice] = np.multiply(self.dispatch.current[0:n_periods], 1e3)
             if self.dispatch.options.include_lifecycle_count:
+                # lifecycles are read from the dispatch model once for all days of the horizon
                 days_in_period = n_periods // (self.site.n_periods_per_day)
                 start_day = sim_start_time // self.site.n_periods_per_day
-                for d in range(days_in_period):
-                    self.outputs.lifecycles_per_day[start_day + d] = self.dispatch.lifecycles[d]
+                self.outputs.lifecycles_per_day[start_day:start_day + days_in_period] = \
+                    self.dispatch.lifecycles[0:days_in_period]
 
         # logger.info("battery.outputs at start time {}".format(sim_start_time, self.outputs))
 
@@ -191,13 +194,17 @@ class BatteryStateless(PowerSource):
         self.financial_model.value('analysis_period', project_life)
 
         if len(self.outputs.P) == self.site.n_timesteps:
+            # annual values are computed once for the simulated year, then repeated for each year of the project
             single_year_gen = self.outputs.P
-            self.financial_model.value('gen', list(single_year_gen) * project_life)
-
-            self.financial_model.value('system_pre_curtailment_kwac', list(single_year_gen) * project_life)
-            self.financial_model.value('annual_energy_pre_curtailment_ac', sum(single_year_gen))
-            self.financial_model.value('batt_annual_discharge_energy', [sum(i for i in single_year_gen if i > 0)] * project_life)
-            self.financial_model.value('batt_annual_charge_energy', [sum(i for i in single_year_gen if i < 0)] * project_life)
+            gen = RepeatedYearArray(single_year_gen, project_life)
+            self.financial_model.value('gen', gen)
+
+            self.financial_model.value('system_pre_curtailment_kwac', gen)
+            self.financial_model.value('annual_energy_pre_curtailment_ac', float(single_year_gen.sum()))
+            self.financial_model.value('batt_annual_discharge_energy',
+                                       [float(single_year_gen[single_year_gen > 0].sum())] * project_life)
+            self.financial_model.value('batt_annual_charge_energy',
+                                       [float(single_year_gen[single_year_gen < 0].sum())] * project_life)
             self.financial_model.value('batt_annual_charge_from_system', (0,))
         else:
             raise RuntimeError
@@ -250,7 +257,7 @@ class BatteryStateless(PowerSource):
     @property
     def annual_energy_kwh(self) -> float:
         if self.system_capacity_kw > 0:
-            return sum(self.outputs.P)
+            return float(self.outputs.P.sum())
         else:
             return 0
         
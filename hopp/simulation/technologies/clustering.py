@@ -49,6 +49,7 @@ class Clustering:
         self.index_first = -1      # Cluster index that best represents incomplete first group
         self.index_last = -1       # Cluster index that best represents incomplete last group
         self.daily_resource = {}     # Daily DNI, GHI, and wind resource (used only for CSP initial charge state heuristic)
+        self._day_cluster_map = None  # Cached map of each day onto exemplar days (calculated in get_day_cluster_map())
 
 
 
@@ -163,6 +164,11 @@ class Clustering:
 
         header = np.genfromtxt(self.solar_resource_file, dtype=str, delimiter=',', max_rows=1, skip_header=2)
         data = np.genfromtxt(self.solar_resource_file, dtype=float, delimiter=',', skip_header=3)
+        if 'Month' in header and 'Day' in header:
+            # Leap days are dropped, as in the simulation
+            month = data[:, header.tolist().index('Month')]
+            day = data[:, header.tolist().index('Day')]
+            data = data[(month != 2) | (day != 29)]
         for k in labels.keys():
             found = False
             for j in labels[k]:
@@ -706,114 +712,118 @@ class Clustering:
         return initial_soc
 
 
-    def compute_annual_array_from_cluster_exemplar_data(self, exemplardata, dtype=float):
+    def get_day_cluster_map(self, n_days: int):
         """
-        # Create full year hourly array from hourly array containing only data at exemplar points (Note, data can exist outside of exemplar points, but will not be used)
-        exemplardata = full-year hourly array with data existing only at days within exemplar groupings
-        adjust_wt = adjust calculations with first/last days allocated to a Cluster
+        Map of each day of the year onto the exemplar days it is reconstructed from, computed once per clustering
+        n_days = number of days in the annual array
+        returns (source_days, weights), arrays of shape (n_days, n): day d of the annual array is the sum over j of
+        weights[d, j] x day source_days[d, j] of the exemplar data.  Unused entries have zero weight.
         """
-        npts = len(exemplardata)  # Total number of points in a year
-        fulldata = np.zeros((npts))
-        ngroup, ncluster = self.clusters['partition_matrix'].shape
-        nptshr = int(npts / 8760)
-        nptsday = nptshr * 24
-
-        data = np.zeros((nptsday * self.ndays, ncluster))  # Hourly data for each Cluster exemplar
-        for k in range(ncluster):
-            d = self.sim_start_days[k]   # Starting days for each exemplar grouping
-            data[:, k] = exemplardata[d * nptsday:(d + self.ndays) * nptsday]
+        partition_matrix = self.clusters['partition_matrix']
+        key = (n_days, self.ndays, tuple(self.sim_start_days), self.index_first, self.index_last, partition_matrix.tobytes())
+        if self._day_cluster_map is not None and self._day_cluster_map[0] == key:
+            return self._day_cluster_map[1]
 
+        ngroup, ncluster = partition_matrix.shape
+        rows = [[] for d in range(n_days)]  # (source day, weight) pairs for each day
         for g in range(ngroup):
-            d = g * self.ndays + 1  # Starting day for data group g
-            fulldata[d * nptsday:(d + self.ndays) * nptsday] = (self.clusters['partition_matrix'][g, :] * data).sum(1)  # Sum of partition matrix x exemplar data points for each hour
+            clusters = np.nonzero(partition_matrix[g, :])[0]
+            for i in range(self.ndays):
+                d = g * self.ndays + 1 + i  # Day i of data group g
+                if d < n_days:
+                    rows[d] = [(self.sim_start_days[k] + i, partition_matrix[g, k]) for k in clusters]
 
-        # Fill in first/last days 
+        # Fill in first/last days
         k1 = self.index_first
         k2 = self.index_last
         if k1 >= 0 and k2 >= 0:
-            d = self.sim_start_days[k1]    # Starting day for group to which day 0 is assigned
-            fulldata[0:nptsday] = fulldata[d * nptsday:(d + 1) * nptsday]
-            d = self.sim_start_days[k2]  # Starting day for group to which incomplete last group is assigned
-            dstart = ngroup*self.ndays+1 # Starting day for incomplete last group
-            fulldata[dstart * nptsday:(dstart + self.ndays) * nptsday] = fulldata[d * nptsday:(d + self.ndays) * nptsday]
-        else:  # TODO: Is this needed anymore?  Calculations should be generalized to >2-day clusters, so probably can remove?  
+            rows[0] = rows[self.sim_start_days[k1]]  # Day 0 uses the first day of the group to which it is assigned
+            dstart = ngroup * self.ndays + 1  # Starting day for incomplete last group
+            for i in range(min(self.ndays, n_days - dstart)):
+                rows[dstart + i] = rows[self.sim_start_days[k2] + i]
+        else:  # TODO: Is this needed anymore?  Calculations should be generalized to >2-day clusters, so probably can remove?
             navg = 5
-            if max(fulldata[0:24]) == 0:  # No data for first day of year
-                print(
-                    'First day of the year was not assigned to a Cluster and will be assigned average generation profile from the next ' + str(
-                        navg) + ' days.')
-                hourly_avg = np.zeros((nptsday))
-                for d in range(1, navg + 1):
-                    for h in range(24 * nptshr):
-                        hourly_avg[h] += fulldata[d * nptsday + h] / navg
-                fulldata[0:nptsday] = hourly_avg
-
-            nexclude = 364 - ngroup * self.ndays # Number of excluded days at the end of the year
+            print('First day of the year was not assigned to a Cluster and will be assigned average generation profile from the next ' + str(navg) + ' days.')
+            rows[0] = [(s, w / navg) for d in range(1, navg + 1) for s, w in rows[d]]
+
+            nexclude = n_days - 1 - ngroup * self.ndays  # Number of excluded days at the end of the year
             if nexclude > 0:
-                h1 = 8760 * nptshr - nexclude * nptsday  # First excluded hour at the end of the year
-                if max(fulldata[h1: h1 + nexclude * nptsday]) == 0:
-                    print('Last ' + str(
-                        nexclude) + ' days were not assigned to a Cluster and will be assigned average generation profile from prior ' + str(
-                        navg) + ' days.')
-                    hourly_avg = np.zeros((nexclude * nptsday))
-                    d1 = 365 - nexclude - navg  # First day to include in average
-                    for d in range(d1, d1 + navg):
-                        for h in range(nptsday):
-                            hourly_avg[h] += fulldata[d * nptsday + h] / navg
-                    fulldata[h1: h1 + nexclude * nptsday] = hourly_avg
+                print('Last ' + str(nexclude) + ' days were not assigned to a Cluster and will be assigned average generation profile from prior ' + str(navg) + ' days.')
+                d1 = n_days - nexclude - navg  # First day to include in average
+                avg = [(s, w / navg) for d in range(d1, d1 + navg) for s, w in rows[d]]
+                for d in range(n_days - nexclude, n_days):
+                    rows[d] = avg
+
+        width = max(1, max(len(r) for r in rows))
+        source_days = np.zeros((n_days, width), int)
+        weights = np.zeros((n_days, width))
+        for d, r in enumerate(rows):
+            if len(r):
+                source_days[d, :len(r)], weights[d, :len(r)] = zip(*r)
+
+        self._day_cluster_map = (key, (source_days, weights))
+        return source_days, weights
+
+    def compute_annual_array_from_cluster_exemplar_data(self, exemplardata, dtype=float, periods_per_day=None):
+        """
+        # Create full year array from array containing only data at exemplar points (Note, data can exist outside of exemplar points, but will not be used)
+        exemplardata = full-year array with data existing only at days within exemplar groupings, or 2D array with one column per signal
+        periods_per_day = number of time steps per day, defaults to the time steps per day of a year of exemplardata
+        returns numpy array with the same shape as exemplardata
+        """
+        exemplardata = np.asarray(exemplardata, dtype=float)
+        nptsday = periods_per_day or int(len(exemplardata) / 8760) * 24
+        n_days = len(exemplardata) // nptsday
+        days = exemplardata[:n_days * nptsday].reshape((n_days, nptsday) + exemplardata.shape[1:])
+
+        # Sum of partition matrix x exemplar data points for each day
+        source_days, weights = self.get_day_cluster_map(n_days)
+        fulldata = np.zeros_like(exemplardata)
+        fulldata[:n_days * nptsday] = np.einsum('dj,dj...->d...', weights, days[source_days]).reshape((n_days * nptsday,) + exemplardata.shape[1:])
 
         if dtype is bool:
-            fulldata = np.array(fulldata, dtype=bool)
+            fulldata = fulldata.astype(bool)
 
-        return fulldata.tolist()
+        return fulldata
 
-    def compute_cluster_avg_from_timeseries(self, hourly):
+    def compute_cluster_avg_from_timeseries(self, hourly, periods_per_day=None):
         """
-        # Compute Cluster-average hourly values from full-year hourly array and partition matrix
-        hourly = full annual array of data 
-        ouput = list of Cluster-average hourly arrays for the (Nprev+Ndays+Nnext) days simulated within the Cluster
+        # Compute Cluster-average values from full-year array and partition matrix
+        hourly = full annual array of data, or 2D array with one column per signal
+        periods_per_day = number of time steps per day, defaults to the time steps per day of a year of hourly
+        ouput = numpy array of Cluster-average arrays for the (Nprev+Ndays+Nnext) days simulated within the Cluster, of shape (Ncluster, Npts) or (Ncluster, Npts, Nsignals)
         """
         Nprev = 1
         Nnext = 1
         Ngroup, Ncluster = self.clusters['partition_matrix'].shape
         Ndaystot = self.ndays + Nprev + Nnext  # Number of days that will be included in the simulation (including previous / next days)
-        Nptshr = int(len(hourly) / 8760)
-
-        avg = np.zeros((Ncluster, Ndaystot * 24 * Nptshr))
-        for g in range(Ngroup):
-            d = g * self.ndays + 1  # First day to be counted in simulation group g
-            d1 = max(0, d - Nprev)  # First day to be included in simulation group g (Nprev days before day d if possible)
-            Nprev_actual = d - d1   # Actual number of previous days that can be included
-            Ndaystot_actual = self.ndays + Nprev_actual + Nnext
-            h = d1 * 24 * Nptshr  # First time point included in simulation group g
-            if Nprev == Nprev_actual:
-                vals = np.array(hourly[h:h + Ndaystot * 24 * Nptshr])  # Hourly values for only the days included in the simulation for group g
-            else:  # Number of previous days was reduced (only occurs at beginning of the year)
-                Nvoid = Nprev - Nprev_actual  # Number of previous days which don't exist in the data file (only occurs when Nprev >1)
-                vals = []
-                for v in range(Nvoid):  # Days for which data doesn't exist
-                    vals = np.append(vals, hourly[0:24 * Nptshr])  # Use data from first day
-                vals = np.append(vals, hourly[h:h + Ndaystot_actual * 24 * Nptshr])
-
-            for k in range(Ncluster):
-                avg[k, :] += vals * self.clusters['partition_matrix'][g, k]  # Sum of hourly array * partition_matrix value for Cluster k over all points (g)
-
-        for k in range(Ncluster):
-            avg[k, :] = avg[k, :] / self.clusters['partition_matrix'].sum(0)[k]  # Divide by sum of partition matrix over all groups to normalize
+        hourly = np.asarray(hourly, dtype=float)
+        Nptsday = periods_per_day or int(len(hourly) / 8760) * 24
+        Ndays_year = len(hourly) // Nptsday
+        days = hourly[:Ndays_year * Nptsday].reshape((Ndays_year, Nptsday) + hourly.shape[1:])
+
+        # Days included in the simulation for each group g, starting Nprev days before the first counted day g * ndays + 1
+        # Previous days which don't exist in the data (only at the beginning of the year) use data from the first day
+        group_days = (np.arange(Ngroup) * self.ndays + 1)[:, None] + np.arange(-Nprev, self.ndays + Nnext)[None, :]
+        group_days = np.clip(group_days, 0, Ndays_year - 1)
+
+        # Sum of values * partition_matrix value for Cluster k over all groups, divided by sum of partition matrix over all groups to normalize
+        partition_sum = self.clusters['partition_matrix'].sum(0)
+        avg = np.tensordot(self.clusters['partition_matrix'].T, days[group_days], axes=1)
+        avg /= partition_sum.reshape((Ncluster,) + (1,) * (avg.ndim - 1))
 
         if self.ndays == 2:  # Adjust averages to include first/last days of the year (Not currently defined/tested except for 2-day clusters)
             k1 = self.index_first
             k2 = self.index_last
 
-            avgnew = avg[k1, Nprev * 24 * Nptshr:(Nprev + 1) * 24 * Nptshr] * self.clusters['partition_matrix'].sum(0)[k1]  # Revert back to non-normalized values for first simulation day in which results will be counted
-            avgnew += hourly[0:24 * Nptshr]  # Update values to include first day
-            avg[k1, Nprev * 24 * Nptshr:(Nprev + 1) * 24 * Nptshr] = avgnew / (self.clusters['partition_matrix'].sum(0)[k1] + 1)  # Normalize values for first day and insert back into average array
+            # Revert back to non-normalized values for first simulation day in which results will be counted, update values to include first day and normalize
+            avg[k1, Nprev] = (avg[k1, Nprev] * partition_sum[k1] + days[0]) / (partition_sum[k1] + 1)
 
-            avgnew = avg[k2, 0:(self.ndays + Nprev) * 24 * Nptshr] * self.clusters['partition_matrix'].sum(0)[k2]  # Revert back to non-normalized values for the previous day and two simulated days
-            avgnew += hourly[(363 - Nprev) * 24 * Nptshr:365 * 24 * Nptshr]  # Update values to include the last days of the year
-            avg[k2, 0:(self.ndays + Nprev) * 24 * Nptshr] = avgnew / (self.clusters['partition_matrix'].sum(0)[k2] + 1)  # Normalize values and insert back into average array
+            # Same for the previous day and two simulated days, updated to include the last days of the year
+            n = self.ndays + Nprev
+            avg[k2, 0:n] = (avg[k2, 0:n] * partition_sum[k2] + days[Ndays_year - n:Ndays_year]) / (partition_sum[k2] + 1)
 
-        return avg.tolist()
+        return avg.reshape((Ncluster, Ndaystot * Nptsday) + hourly.shape[1:])
 
 class AffinityPropagation:
     # Affinity propagation algorithm
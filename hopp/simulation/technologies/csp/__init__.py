@@ -1,2 +1,10 @@
-from .tower_plant import TowerPlant, TowerConfig
-from .trough_plant import TroughPlant, TroughConfig
\ No newline at end of file
+from hopp.utilities.utilities import lazy_exports
+
+_exports = {
+    "TowerPlant": ".tower_plant",
+    "TowerConfig": ".tower_plant",
+    "TroughPlant": ".trough_plant",
+    "TroughConfig": ".trough_plant",
+}
+__all__ = list(_exports)
+__getattr__ = lazy_exports(__name__, _exports)
@@ -10,6 +10,7 @@ import numpy as np
 import PySAM.Singleowner as Singleowner
 
 from hopp.simulation.technologies.csp.pySSC_daotk.ssc_wrap import PysamWrap, PysscWrap, ssc_wrap
+from hopp.simulation.technologies.csp.forecast_cache import CspForecastCache, get_forecast_cache
 from hopp.simulation.base import BaseClass
 from hopp.simulation.technologies.dispatch.power_sources.csp_dispatch import CspDispatch
 from hopp.simulation.technologies.power_source import PowerSource
@@ -17,10 +18,15 @@ from hopp.simulation.technologies.sites import SiteInfo
 from hopp.simulation.technologies.financial import FinancialModelType, CustomFinancialModel
 from hopp.utilities.validators import contains, gt_zero
 from hopp.utilities.log import hybrid_logger as logger
+from hopp.utilities.utilities import RepeatedYearArray
 
 
 class CspOutputs:
-    """Object for storing CSP outputs from SSC (SAM's Simulation Core) and dispatch optimization."""
+    """
+    Object for storing CSP outputs from SSC (SAM's Simulation Core) and dispatch optimization.
+
+    SSC time series are stored in annual NumPy arrays, into which each simulated horizon is written.
+    """
     def __init__(self):
         self.ssc_time_series = {}
         self.dispatch = {}
@@ -49,11 +55,11 @@ class CspOutputs:
 
         if is_empty:
             for name, val in ssc_outputs.items():
-                if isinstance(val, list) and len(val) == ntot:  
-                    self.ssc_time_series[name] = [0.0]*ntot
+                if isinstance(val, (list, np.ndarray)) and len(val) == ntot:
+                    self.ssc_time_series[name] = np.zeros(ntot)
         
-        for name in self.ssc_time_series.keys():
-            self.ssc_time_series[name][i:i+n] = ssc_outputs[name][s1:s1+n]
+        for name, annual_values in self.ssc_time_series.items():
+            annual_values[i:i+n] = ssc_outputs[name][s1:s1+n]
 
     def store_dispatch_outputs(self, dispatch: CspDispatch, n_periods: int, sim_start_time: int):
         """
@@ -90,6 +96,10 @@ class CspConfig(BaseClass):
         tes_hours: Full load hours of thermal energy storage [hrs]
         fin_model: Financial model for the specific technology
         name: Configured name for this plant
+        forecast_cache_dir: (optional) Directory of a `CspForecastCache` shared with other plants and processes,
+            so the annual thermal-potential forecast is only simulated once per solar field and weather
+        persistent_ssc: (optional) If True (default), keep one ssc data container between simulations, so the weather
+            and other unchanged inputs are only passed to ssc once. If False, each simulation uses a new container
     """
     tech_name: str = field(validator=contains(["tcsmolten_salt", "trough_physical"]))
     cycle_capacity_kw: float = field(validator=gt_zero)
@@ -97,6 +107,8 @@ class CspConfig(BaseClass):
     tes_hours: float = field(validator=gt_zero)
     fin_model: Optional[Union[dict, FinancialModelType]] = field(default=None)
     name: str = field(default="TowerPlant")
+    forecast_cache_dir: Optional[str] = field(default=None)
+    persistent_ssc: bool = field(default=True)
 
 
 @define
@@ -116,6 +128,7 @@ class CspPlant(PowerSource):
     cycle_efficiency_tables: dict = field(init=False)
     plant_state: dict = field(init=False)
     outputs: CspOutputs = field(init=False)
+    forecast_cache: Optional[CspForecastCache] = field(init=False, default=None)
 
     # Initialize in subclass
     param_files: Dict[str, str] = field(init=False)
@@ -133,11 +146,14 @@ class CspPlant(PowerSource):
 
         # TODO: Should 'SSC' object be a protected attr
         # Initialize ssc and get weather data
+        # With `persistent_ssc`, the ssc data container persists between simulations, so the weather is only passed
+        # to ssc once
         self.ssc = ssc_wrap(
             wrapper='pyssc',  # ['pyssc' | 'pysam']
             tech_name=self.config.tech_name,  # ['tcsmolten_salt' | 'trough_physical]
             financial_name=None,
-            defaults_name=None)  # ['MSPTSingleOwner' | 'PhysicalTroughSingleOwner']  NOTE: not used for pyssc
+            defaults_name=None,  # ['MSPTSingleOwner' | 'PhysicalTroughSingleOwner']  NOTE: not used for pyssc
+            persistent=self.config.persistent_ssc)
         self.initialize_params()
 
         self.year_weather_df = self.tmy3_to_df()  # read entire weather file
@@ -159,6 +175,9 @@ class CspPlant(PowerSource):
 
         self.outputs = CspOutputs()
 
+        if self.config.forecast_cache_dir is not None:
+            self.forecast_cache = get_forecast_cache(self.config.forecast_cache_dir)
+
     def param_file_paths(self, relative_path: str):
         """
         Converts relative paths to absolute for files containing SSC default parameters.
@@ -460,9 +479,24 @@ class CspPlant(PowerSource):
     def setup_performance_model(self):
         """
         Runs a year long forecasting simulation of csp thermal generation, then sets power cycle efficiency tables and
-        solar thermal resource for the dispatch model.
+        solar thermal resource for the dispatch model. If the plant has a forecast cache, a forecast of identical
+        inputs is reused instead of simulated.
+
+        .. note::
+            A reused forecast sets the same SSC inputs as a simulated one, but SSC's outputs are not those of the
+            forecast simulation. Simulations overwrite these outputs and the plant state is not set by the forecast,
+            so the following simulations are unaffected.
         """
-        ssc_outputs = self.run_year_for_max_thermal_gen()
+        if self.forecast_cache is None:
+            ssc_outputs = self.run_year_for_max_thermal_gen()
+        else:
+            key = self.forecast_cache.get_key(self.ssc.export_params())
+            ssc_outputs = self.forecast_cache.load(key)
+            if ssc_outputs is None:
+                ssc_outputs = self.run_year_for_max_thermal_gen()
+                self.forecast_cache.save(key, ssc_outputs)
+            else:
+                self.set_forecast_simulation_times()
         self.set_cycle_efficiency_tables(ssc_outputs)
         self.set_solar_thermal_resource(ssc_outputs)
 
@@ -477,10 +511,7 @@ class CspPlant(PowerSource):
         Returns:
             ssc_outputs: SSC's output dictionary containing the previous simulation results
         """
-        self.value('is_dispatch_targets',  0)
-        # Setting simulation times and simulate the horizon
-        self.value('time_start', 0)
-        self.value('time_stop', 8760*60*60)
+        self.set_forecast_simulation_times()
 
         # Inflate TES capacity, set near-zero startup requirements, and run ssc estimates
         original_values = {k: self.ssc.get(k) for k in ['tshours', 'rec_su_delay', 'rec_qf_delay']}
@@ -491,6 +522,15 @@ class CspPlant(PowerSource):
 
         return ssc_outputs
 
+    def set_forecast_simulation_times(self):
+        """
+        Sets SSC to simulate the whole year without dispatch targets, as for the thermal generation forecast
+        """
+        self.value('is_dispatch_targets',  0)
+        # Setting simulation times and simulate the horizon
+        self.value('time_start', 0)
+        self.value('time_stop', 8760*60*60)
+
     def set_cycle_efficiency_tables(self, ssc_outputs: dict):
         """
         Sets cycle off-design performance tables from PySSC outputs.
@@ -591,28 +631,30 @@ class CspPlant(PowerSource):
         """
         # Set targets
         dis = self.dispatch
+        is_field_on = np.array(dis.is_field_generating[0:n_periods]) + np.array(dis.is_field_starting[0:n_periods])
+        is_cycle_starting = np.array(dis.is_cycle_starting[0:n_periods])
+        is_cycle_on = np.array(dis.is_cycle_generating[0:n_periods]) + is_cycle_starting
+        cycle_thermal_power = np.array(dis.cycle_thermal_power[0:n_periods])
+        no_standby = np.zeros(n_periods, dtype=int)
 
         dispatch_targets = {'is_dispatch_targets': 1,
                             # Receiver on, startup, (or standby - NOT in dispatch currently)
-                            'is_rec_su_allowed_in': [1 if (dis.is_field_generating[t] + dis.is_field_starting[t]) > 0.01
-                                                     else 0 for t in range(n_periods)],
+                            'is_rec_su_allowed_in': (is_field_on > 0.01).astype(int),
                             # Receiver standby - NOT in dispatch currently
-                            'is_rec_sb_allowed_in': [0 for t in range(n_periods)],
+                            'is_rec_sb_allowed_in': no_standby,
                             # Cycle on or startup
-                            'is_pc_su_allowed_in': [1 if (dis.is_cycle_generating[t] + dis.is_cycle_starting[t]) > 0.01
-                                                    else 0 for t in range(n_periods)],
+                            'is_pc_su_allowed_in': (is_cycle_on > 0.01).astype(int),
                             # Cycle standby - NOT in dispatch currently
-                            'is_pc_sb_allowed_in': [0 for t in range(n_periods)],
+                            'is_pc_sb_allowed_in': no_standby,
                             # Cycle start up thermal power
-                            'q_pc_target_su_in': [dis.allowable_cycle_startup_power if dis.is_cycle_starting[t] > 0.01
-                                                  else 0.0 for t in range(n_periods)],
+                            'q_pc_target_su_in': np.where(is_cycle_starting > 0.01,
+                                                          dis.allowable_cycle_startup_power, 0.0),
                             # Cycle thermal power
-                            'q_pc_target_on_in': dis.cycle_thermal_power[0:n_periods]}
+                            'q_pc_target_on_in': cycle_thermal_power}
 
         # Cycle max thermal power allowed
-        pc_max = [min(ctp + su, dis.maximum_cycle_thermal_power) for ctp, su in
-                  zip(dis.cycle_thermal_power[0:n_periods], dispatch_targets['q_pc_target_su_in'])]
-        dispatch_targets['q_pc_max_in'] = pc_max
+        dispatch_targets['q_pc_max_in'] = np.minimum(cycle_thermal_power + dispatch_targets['q_pc_target_su_in'],
+                                                     dis.maximum_cycle_thermal_power)
 
         self.ssc.set(dispatch_targets)
 
@@ -730,9 +772,10 @@ class CspPlant(PowerSource):
 
         if len(self.generation_profile) == self.site.n_timesteps:
             single_year_gen = self.generation_profile
-            self._financial_model.value('gen', list(single_year_gen) * project_life)
+            gen = RepeatedYearArray(single_year_gen, project_life)
+            self._financial_model.value('gen', gen)
 
-            self._financial_model.value('system_pre_curtailment_kwac', list(single_year_gen) * project_life)
+            self._financial_model.value('system_pre_curtailment_kwac', gen)
             self._financial_model.value('annual_energy_pre_curtailment_ac', sum(single_year_gen))
 
         self._financial_model.execute(0)
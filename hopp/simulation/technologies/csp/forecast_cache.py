@@ -0,0 +1,104 @@
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import rapidjson                # NOTE: install 'python-rapidjson' NOT 'rapidjson'
+
+from attrs import define, field
+import numpy as np
+
+from hopp.simulation.base import BaseClass
+from hopp.utilities.log import hybrid_logger as logger
+from hopp.utilities.utilities import update_digest
+
+# SSC outputs of the annual forecast used to set up the dispatch model
+FORECAST_OUTPUTS = ('Q_thermal', 'qsf_expected', 'cycle_eff_load_table', 'cycle_eff_Tdb_table',
+                    'cycle_wcond_Tdb_table', 'pc_config', 'ud_ind_od')
+
+# SSC inputs that are overridden for the forecast, or only size storage, set dispatch targets or price the output
+FORECAST_IGNORED_INPUTS = ('tshours', 'rec_su_delay', 'rec_qf_delay', 'time_start', 'time_stop',
+                           'is_dispatch_targets', 'is_rec_su_allowed_in', 'is_rec_sb_allowed_in',
+                           'is_pc_su_allowed_in', 'is_pc_sb_allowed_in', 'q_pc_target_su_in', 'q_pc_target_on_in',
+                           'q_pc_max_in', 'h_tank', 'cold_tank_max_heat', 'hot_tank_max_heat',
+                           'ppa_multiplier_model', 'dispatch_factors_ts', 'financial_model')
+
+
+@define
+class CspForecastCache(BaseClass):
+    """
+    On-disk cache of the annual thermal-potential forecast run by `CspPlant.setup_performance_model`.
+
+    Forecasts are stored as one JSON file per digest of the SSC inputs, so the cache can be shared by any process
+    using the same directory. Inputs in `FORECAST_IGNORED_INPUTS` are left out of the digest, so plants that differ
+    only in storage hours or prices reuse each other's forecast.
+
+    Args:
+        cache_dir: directory of the cached forecasts, created if needed
+    """
+    cache_dir: Path = field(converter=Path)
+
+    n_hits: int = field(init=False, default=0)
+    n_misses: int = field(init=False, default=0)
+
+    def __attrs_post_init__(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def get_key(ssc_params: dict, ignored_inputs: Iterable[str] = FORECAST_IGNORED_INPUTS) -> str:
+        """
+        Digest of the SSC inputs that determine the forecast
+
+        :param ssc_params: SSC inputs, see `SscWrap.export_params`
+        :param ignored_inputs: names of inputs left out of the digest
+        :return: hex digest
+        """
+        ignored_inputs = set(ignored_inputs)
+        digest = hashlib.sha1()
+        update_digest(digest, {k: v for k, v in ssc_params.items() if k not in ignored_inputs})
+        return digest.hexdigest()
+
+    def load(self, key: str) -> Optional[dict]:
+        """
+        Cached forecast outputs, or None if there are none for `key`
+
+        :param key: digest of the SSC inputs, see `get_key`
+        """
+        filepath = self.cache_dir / f"{key}.json"
+        try:
+            with open(filepath, 'r') as f:
+                ssc_outputs = rapidjson.load(f)
+        except (FileNotFoundError, ValueError):
+            self.n_misses += 1
+            return None
+        self.n_hits += 1
+        logger.info(f"CspForecastCache loaded forecast {key} ({self.n_hits} hits, {self.n_misses} misses)")
+        return ssc_outputs
+
+    def save(self, key: str, ssc_outputs: dict):
+        """
+        Stores the forecast outputs listed in `FORECAST_OUTPUTS`
+
+        :param key: digest of the SSC inputs, see `get_key`
+        :param ssc_outputs: SSC's output dictionary of the forecast simulation
+        """
+        outputs = {k: np.asarray(ssc_outputs[k]).tolist() for k in FORECAST_OUTPUTS if k in ssc_outputs}
+        # write to a temporary file first so other processes never read a partial forecast
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            rapidjson.dump(outputs, f)
+        os.replace(tmp_path, self.cache_dir / f"{key}.json")
+
+
+@lru_cache(maxsize=None)
+def _forecast_cache_from_dir(cache_dir: Path) -> CspForecastCache:
+    return CspForecastCache(cache_dir)
+
+
+def get_forecast_cache(cache_dir: Union[str, Path]) -> CspForecastCache:
+    """
+    Returns the forecast cache of `cache_dir`, shared by all plants of this process using the same directory
+    """
+    return _forecast_cache_from_dir(Path(cache_dir).resolve())
@@ -5,6 +5,7 @@ c_number = c_double  # must be c_double or c_float depending on how defined in s
 import abc
 import importlib
 import copy
+import numpy as np
 
 PYSAM_MODULE_NAME = 'PySAM_DAOTk'
 # PYSAM_MODULE_NAME = 'PySAM'
@@ -14,16 +15,18 @@ SSCDLL_PATH = os.path.join(os.path.abspath(os.path.dirname(__file__)), "libs", "
 # SSCDLL_PATH = os.path.join(os.environ.get('SAMNTDIR'), 'deploy/x64/ssc.dll')             # release
 # SSCDLL_PATH = os.path.join(os.environ.get('SAMNTDIR'),'deploy/x64/sscd.dll')            # debug
 
-def ssc_wrap(wrapper, tech_name, financial_name, defaults_name=None, defaults=None):
+def ssc_wrap(wrapper, tech_name, financial_name, defaults_name=None, defaults=None, persistent=False):
     """Factory method for ssc wrappers
     Returns an SscWrap object for an ssc interface via either PySSC or PySAM
+
+    persistent: (pyssc only) keep one ssc data container across executions, see PysscWrap
     """
     #TODO:  Flatten the dictionaries returned by PysamWrap::execute and PysamWrap::export_params
     #TODO:  Add a function to replace the defaults parameter. If there's a defaults_name specified and
     #       wrapper is pyssc, create a PysamWrap first and run export_params.
 
     if wrapper == 'pyssc':
-        return PysscWrap(tech_name, financial_name, defaults)
+        return PysscWrap(tech_name, financial_name, defaults, persistent)
     elif wrapper == 'pysam':
         return PysamWrap(tech_name, financial_name, defaults_name)
 
@@ -50,7 +53,15 @@ class SscWrap(metaclass=abc.ABCMeta):
 
 
 class PysscWrap(SscWrap):
-    def __init__(self, tech_name, financial_name, defaults=None):
+    """
+    PySSC wrapper
+
+    A persistent wrapper keeps one ssc data container for all executions, and only passes the parameters set since
+    the previous execution (plus any the compute modules may overwrite) to ssc, so large inputs like the weather
+    table are converted once. Its results hold array outputs as numpy arrays, and inputs as the values that were set.
+    Values returned by `get` must not be modified in place without calling `set`.
+    """
+    def __init__(self, tech_name, financial_name, defaults=None, persistent=False):
         self.ssc = PySSC()
         self.wrapper = 'pyssc'
         self.tech_name = tech_name
@@ -63,18 +74,94 @@ class PysscWrap(SscWrap):
             self.params = {}
         self.params['tech_model'] = self.tech_name
         self.params['financial_model'] = self.financial_name
-	
+
+        self.persistent = persistent
+        self._data = None           # persistent ssc data container
+        self._modified = set()      # parameters set since the data container was last updated
+        self._module_vars = {}
+
+    def __del__(self):
+        if getattr(self, '_data', None) is not None:
+            self.ssc.data_free(self._data)
+
     def set(self, param_dict):
         if 'is_elec_heat_dur_off' in param_dict and type(param_dict['is_elec_heat_dur_off']) == list:
             param_dict['is_elec_heat_dur_off'] = param_dict['is_elec_heat_dur_off'][0]
 
         self.params.update(param_dict)
+        self._modified.update(param_dict.keys())
 
     def get(self, name):
         return self.params[name]
 
     def execute(self):
-        results = ssc_sim_from_dict(self.ssc, self.params)
+        if not self.persistent:
+            return ssc_sim_from_dict(self.ssc, self.params)
+
+        if self._data is None:
+            self._data = self.ssc.data_create()
+            self._modified = set(self.params.keys())
+        model_names = [name for name in (self.tech_name, self.financial_name) if name not in [None, "none"]]
+        for model_name in model_names:
+            for name, data_type, var_type in self.get_module_vars(model_name):
+                # INOUT variables are always reset, as the compute module may have overwritten them
+                if not (var_type == 3 or (var_type == 1 and name in self._modified)):
+                    continue
+                value = self.params.get(name)
+                if value is None or (data_type > 2 and len(value) == 0):
+                    self.ssc.data_unassign(self._data, name.encode("ascii"))
+                else:
+                    set_ssc_var(data_type, self.ssc, self._data, name, value)
+        self._modified.clear()
+
+        results = {"tech_model": self.tech_name, "financial_model": self.financial_name}
+        for model_name in model_names:
+            success = ssc_cmod_exec(self.ssc, self._data, model_name)
+            results.update(self.get_results(model_name))
+            if not success:
+                results["cmod_success"] = 0
+                return results
+        results["cmod_success"] = 1
+        return results
+
+    def get_module_vars(self, model_name):
+        """Name, data type and variable type of each variable of an ssc compute module"""
+        if model_name not in self._module_vars:
+            cmod = self.ssc.module_create(model_name.encode("utf-8"))
+            module_vars = []
+            i = 0
+            while True:
+                p_ssc_entry = self.ssc.module_var_info(cmod, i)
+                data_type = self.ssc.info_data_type(p_ssc_entry)
+                if data_type <= 0 or data_type > 5:
+                    break
+                module_vars.append((self.ssc.info_name(p_ssc_entry).decode("ascii"), data_type,
+                                    self.ssc.info_var_type(p_ssc_entry)))
+                i += 1
+            self.ssc.module_free(cmod)
+            self._module_vars[model_name] = module_vars
+        return self._module_vars[model_name]
+
+    def get_results(self, model_name):
+        """Values of the variables of an ssc compute module in the persistent data container"""
+        results = {}
+        for name, data_type, var_type in self.get_module_vars(model_name):
+            if var_type == 1 and name in self.params:
+                results[name] = self.params[name]
+                continue
+            name_ascii = name.encode("ascii")
+            if self.ssc.data_query(self._data, name_ascii) <= 0:
+                continue
+            if data_type == 1:
+                results[name] = self.ssc.data_get_string(self._data, name_ascii).decode("ascii")
+            elif data_type == 2:
+                results[name] = self.ssc.data_get_number(self._data, name_ascii)
+            elif data_type == 3:
+                results[name] = self.ssc.data_get_array_numpy(self._data, name_ascii)
+            elif data_type == 4:
+                results[name] = self.ssc.data_get_matrix(self._data, name_ascii)
+            elif data_type == 5:
+                results[name] = self.ssc.data_get_table(self._data, name_ascii)
         return results
 
     def export_params(self):
@@ -93,7 +180,11 @@ class PysscWrap(SscWrap):
         for key, value in self.params.items():
             if key == 'tech_model' or key == 'financial_model':
                 continue
-            elif any([type(value) is scalar_type for scalar_type in [int, float, str]]):
+            if isinstance(value, np.ndarray):
+                value = value.tolist()
+            elif isinstance(value, np.generic):
+                value = value.item()
+            if any([type(value) is scalar_type for scalar_type in [int, float, str]]):
                 file.write("var( '" + key + "', " + str(value) + " );\n")
             elif type(value) is bool:
                 if value:
@@ -283,13 +374,7 @@ def ssc_cmod(ssc, dat, name):
     # Run compute module
     # Check for simulation errors
     if ssc.module_exec(cmod, dat) == 0:
-        print(name + ' simulation error')
-        idx = 1
-        msg = ssc.module_log(cmod, 0)
-        while msg is not None:
-            print(' : ' + msg.decode("utf - 8"))
-            msg = ssc.module_log(cmod, idx)
-            idx = idx + 1
+        print_ssc_module_log(ssc, cmod, name)
         cmod_err_dict = ssc_table_to_dict(ssc, cmod, dat)
         return [False, cmod_err_dict]
 
@@ -297,6 +382,27 @@ def ssc_cmod(ssc, dat, name):
     return [True, ssc_table_to_dict(ssc, cmod, dat)]
 
 
+def ssc_cmod_exec(ssc, dat, name):
+    """Runs a compute module on a data container, leaving the container allocated. Returns True if successful."""
+    cmod = ssc.module_create(name.encode("utf-8"))
+    ssc.module_exec_set_print(0)
+    success = ssc.module_exec(cmod, dat) != 0
+    if not success:
+        print_ssc_module_log(ssc, cmod, name)
+    ssc.module_free(cmod)
+    return success
+
+
+def print_ssc_module_log(ssc, cmod, name):
+    print(name + ' simulation error')
+    idx = 1
+    msg = ssc.module_log(cmod, 0)
+    while msg is not None:
+        print(' : ' + msg.decode("utf - 8"))
+        msg = ssc.module_log(cmod, idx)
+        idx = idx + 1
+
+
 def dict_to_ssc_table(ssc, py_dict, cmod_name):
     # ssc = PySSC()
     dat = ssc.data_create()
@@ -484,10 +590,9 @@ class PySSC:
         self.pdll.ssc_data_set_number(c_void_p(p_data), c_char_p(name), c_number(value))
 
     def data_set_array(self, p_data, name, parr):
-        count = len(parr)
-        arr = (c_number * count)()
-        arr[:] = parr  # set all at once instead of looping
-        return self.pdll.ssc_data_set_array(c_void_p(p_data), c_char_p(name), pointer(arr), c_int(count))
+        arr = np.ascontiguousarray(parr, dtype=c_number)  # ssc copies the values
+        return self.pdll.ssc_data_set_array(c_void_p(p_data), c_char_p(name), arr.ctypes.data_as(POINTER(c_number)),
+                                            c_int(len(arr)))
 
     def data_set_array_from_csv(self, p_data, name, fn):
         f = open(fn, 'rb')
@@ -537,6 +642,14 @@ class PySSC:
         arr = parr[0:count.value]  # extract all at once
         return arr
 
+    def data_get_array_numpy(self, p_data, name):
+        count = c_int()
+        self.pdll.ssc_data_get_array.restype = POINTER(c_number)
+        parr = self.pdll.ssc_data_get_array(c_void_p(p_data), c_char_p(name), byref(count))
+        if count.value == 0:
+            return np.zeros(0)
+        return np.ctypeslib.as_array(parr, shape=(count.value,)).copy()
+
     def data_get_matrix(self, p_data, name):
         nrows = c_int()
         ncols = c_int()
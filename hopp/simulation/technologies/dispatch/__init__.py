@@ -1,12 +1,18 @@
-from hopp.simulation.technologies.dispatch.power_sources.pv_dispatch import PvDispatch
-from hopp.simulation.technologies.dispatch.power_sources.wind_dispatch import WindDispatch
-from hopp.simulation.technologies.dispatch.power_sources.csp_dispatch import CspDispatch
-from hopp.simulation.technologies.dispatch.power_sources.trough_dispatch import TroughDispatch
-from hopp.simulation.technologies.dispatch.power_sources.tower_dispatch import TowerDispatch
-from hopp.simulation.technologies.dispatch.power_sources.wave_dispatch import WaveDispatch
+from hopp.utilities.utilities import lazy_exports
 
-from hopp.simulation.technologies.dispatch.grid_dispatch import GridDispatch
-from hopp.simulation.technologies.dispatch.hybrid_dispatch_options import HybridDispatchOptions
-from hopp.simulation.technologies.dispatch.hybrid_dispatch import HybridDispatch
-from hopp.simulation.technologies.dispatch.dispatch_problem_state import DispatchProblemState
-from hopp.simulation.technologies.dispatch.power_storage.simple_battery_dispatch import SimpleBatteryDispatch
+# dispatch models are imported on first use, so that Pyomo is only loaded when dispatch is needed
+_exports = {
+    "PvDispatch": ".power_sources.pv_dispatch",
+    "WindDispatch": ".power_sources.wind_dispatch",
+    "CspDispatch": ".power_sources.csp_dispatch",
+    "TroughDispatch": ".power_sources.trough_dispatch",
+    "TowerDispatch": ".power_sources.tower_dispatch",
+    "WaveDispatch": ".power_sources.wave_dispatch",
+    "GridDispatch": ".grid_dispatch",
+    "HybridDispatchOptions": ".hybrid_dispatch_options",
+    "HybridDispatch": ".hybrid_dispatch",
+    "DispatchProblemState": ".dispatch_problem_state",
+    "SimpleBatteryDispatch": ".power_storage.simple_battery_dispatch",
+}
+__all__ = list(_exports)
+__getattr__ = lazy_exports(__name__, _exports)
@@ -152,6 +152,20 @@ class GridDispatch(Dispatch):
         self.electricity_sell_price = [norm_price * ppa_price * 1e3 for norm_price in prices]
         self.electricity_purchase_price = [norm_price * ppa_price * 1e3 for norm_price in prices]
 
+    @property
+    def time_duration(self) -> list:
+        """Dispatch horizon time steps [hour]"""
+        return [self.blocks[t].time_duration.value for t in self.blocks.index_set()]
+
+    @time_duration.setter
+    def time_duration(self, time_duration: list):
+        """Dispatch horizon time steps [hour]"""
+        if len(time_duration) == len(self.blocks):
+            for t, delta in zip(self.blocks, time_duration):
+                self.blocks[t].time_duration = round(delta, self.round_digits)
+        else:
+            raise ValueError(self.time_duration.__name__ + " list must be the same length as time horizon")
+
     @property
     def electricity_sell_price(self) -> list:
         return [self.blocks[t].electricity_sell_price.value for t in self.blocks.index_set()]
@@ -1,5 +1,5 @@
 import pyomo.environ as pyomo
-from pyomo.network import Port, Arc
+from pyomo.core.expr.numeric_expr import LinearExpression
 from pyomo.environ import units as u
 
 from hopp.simulation.technologies.dispatch.dispatch import Dispatch
@@ -10,6 +10,23 @@ class HybridDispatch(Dispatch):
     """
 
     """
+    # hybrid variables linked to the port members of each technology's dispatch blocks
+    port_members = {
+        'pv': {'generation': 'pv_generation'},
+        'wind': {'generation': 'wind_generation'},
+        'wave': {'generation': 'wave_generation'},
+        'tower': {'cycle_generation': 'tower_generation',
+                  'system_load': 'tower_load'},
+        'trough': {'cycle_generation': 'trough_generation',
+                   'system_load': 'trough_load'},
+        'battery': {'charge_power': 'battery_charge',
+                    'discharge_power': 'battery_discharge'},
+        'grid': {'system_generation': 'system_generation',
+                 'system_load': 'system_load',
+                 'electricity_sold': 'electricity_sold',
+                 'electricity_purchased': 'electricity_purchased'},
+    }
+
     def __init__(self,
                  pyomo_model: pyomo.ConcreteModel,
                  index_set: pyomo.Set,
@@ -29,8 +46,6 @@ class HybridDispatch(Dispatch):
         self.options = dispatch_options
         self.power_source_gen_vars = {key: [] for key in index_set}
         self.load_vars = {key: [] for key in index_set}
-        self.ports = {key: [] for key in index_set}
-        self.arcs = []
 
         super().__init__(pyomo_model,
                          index_set,
@@ -44,12 +59,11 @@ class HybridDispatch(Dispatch):
         ##################################
         self._create_parameters(hybrid)
         ##################################
-        # Variables / Ports              #
+        # Variables                      #
         ##################################
         for tech in self.power_sources.keys():
             try:
                 getattr(self, "_create_" + tech + "_variables")(hybrid, t)
-                getattr(self, "_create_" + tech + "_port")(hybrid, t)
             except AttributeError:
                 raise ValueError("'{}' is not supported in the hybrid dispatch model.".format(tech))
             except Exception as e:
@@ -81,10 +95,6 @@ class HybridDispatch(Dispatch):
             initialize=0.0)
         self.power_source_gen_vars[t].append(hybrid.pv_generation)
 
-    def _create_pv_port(self, hybrid, t):
-        hybrid.pv_port = Port(initialize={'generation': hybrid.pv_generation})
-        self.ports[t].append(hybrid.pv_port)
-
     def _create_wind_variables(self, hybrid, t):
         hybrid.wind_generation = pyomo.Var(
             doc="Power generation of wind turbines [MW]",
@@ -93,10 +103,6 @@ class HybridDispatch(Dispatch):
             initialize=0.0)
         self.power_source_gen_vars[t].append(hybrid.wind_generation)
 
-    def _create_wind_port(self, hybrid, t):
-        hybrid.wind_port = Port(initialize={'generation': hybrid.wind_generation})
-        self.ports[t].append(hybrid.wind_port)
-
     def _create_wave_variables(self, hybrid, t):
         hybrid.wave_generation = pyomo.Var(
             doc="Power generation of wave devices [MW]",
@@ -105,10 +111,6 @@ class HybridDispatch(Dispatch):
             initialize=0.0)
         self.power_source_gen_vars[t].append(hybrid.wave_generation)
 
-    def _create_wave_port(self, hybrid, t):
-        hybrid.wave_port = Port(initialize={'generation': hybrid.wave_generation})
-        self.ports[t].append(hybrid.wave_port)
-
     def _create_tower_variables(self, hybrid, t):
         hybrid.tower_generation = pyomo.Var(
             doc="Power generation of CSP tower [MW]",
@@ -123,11 +125,6 @@ class HybridDispatch(Dispatch):
         self.power_source_gen_vars[t].append(hybrid.tower_generation)
         self.load_vars[t].append(hybrid.tower_load)
 
-    def _create_tower_port(self, hybrid, t):
-        hybrid.tower_port = Port(initialize={'cycle_generation': hybrid.tower_generation,
-                                             'system_load': hybrid.tower_load})
-        self.ports[t].append(hybrid.tower_port)
-
     def _create_trough_variables(self, hybrid, t):
         hybrid.trough_generation = pyomo.Var(
             doc="Power generation of CSP trough [MW]",
@@ -142,11 +139,6 @@ class HybridDispatch(Dispatch):
         self.power_source_gen_vars[t].append(hybrid.trough_generation)
         self.load_vars[t].append(hybrid.trough_load)
 
-    def _create_trough_port(self, hybrid, t):
-        hybrid.trough_port = Port(initialize={'cycle_generation': hybrid.trough_generation,
-                                              'system_load': hybrid.trough_load})
-        self.ports[t].append(hybrid.trough_port)
-
     def _create_battery_variables(self, hybrid, t):
         hybrid.battery_charge = pyomo.Var(
             doc="Power charging the electric battery [MW]",
@@ -161,11 +153,6 @@ class HybridDispatch(Dispatch):
         self.power_source_gen_vars[t].append(hybrid.battery_discharge)
         self.load_vars[t].append(hybrid.battery_charge)
 
-    def _create_battery_port(self, hybrid, t):
-        hybrid.battery_port = Port(initialize={'charge_power': hybrid.battery_charge,
-                                               'discharge_power': hybrid.battery_discharge})
-        self.ports[t].append(hybrid.battery_port)
-
     @staticmethod
     def _create_grid_variables(hybrid, _):
         hybrid.system_generation = pyomo.Var(
@@ -185,13 +172,6 @@ class HybridDispatch(Dispatch):
             domain=pyomo.NonNegativeReals,
             units=u.MW)
 
-    def _create_grid_port(self, hybrid, t):
-        hybrid.grid_port = Port(initialize={'system_generation': hybrid.system_generation,
-                                            'system_load': hybrid.system_load,
-                                            'electricity_sold': hybrid.electricity_sold,
-                                            'electricity_purchased': hybrid.electricity_purchased})
-        self.ports[t].append(hybrid.grid_port)
-
     def _create_grid_constraints(self, hybrid, t):
         hybrid.generation_total = pyomo.Constraint(
             doc="hybrid system generation total",
@@ -213,167 +193,164 @@ class HybridDispatch(Dispatch):
             doc="Battery storage can only charge from pv",
             expr=hybrid.pv_generation >= hybrid.battery_charge)
 
-    def create_arcs(self):
-        ##################################
-        # Arcs                           #
-        ##################################
+    def create_port_balance_constraints(self):
+        """
+        Links each technology's dispatch port to the hybrid variables of the same period, as expanding an `Arc`
+        between them would, without the network transformation.
+        """
         for tech in self.power_sources.keys():
-            def arc_rule(m, t):
-                source_port = self.power_sources[tech].dispatch.blocks[t].port
-                destination_port = getattr(self.blocks[t], tech + "_port")
-                return {'source': source_port, 'destination': destination_port}
+            source_blocks = self.power_sources[tech].dispatch.blocks
+            members = self.port_members[tech]
 
-            setattr(self.model, tech + "_hybrid_arc", Arc(self.blocks.index_set(), rule=arc_rule))
-            self.arcs.append(getattr(self.model, tech + "_hybrid_arc"))
+            def port_balance_rule(m, t, name):
+                return source_blocks[t].port.vars[name] == getattr(self.blocks[t], members[name])
 
-        pyomo.TransformationFactory("network.expand_arcs").apply_to(self.model)
+            setattr(self.model, tech + "_port_balance", pyomo.Constraint(
+                self.blocks.index_set(),
+                list(members),
+                doc=tech + " port balance with the hybrid system",
+                rule=port_balance_rule))
 
     def initialize_parameters(self):
         self.time_weighting_factor = self.options.time_weighting_factor     # Discount factor
         for tech in self.power_sources.values():
             tech.dispatch.initialize_parameters()
+            tech.dispatch.time_duration = [self.options.time_step_hours] * len(tech.dispatch.blocks)
 
     def update_time_series_parameters(self, start_time: int):
         for tech in self.power_sources.values():
             tech.dispatch.update_time_series_parameters(start_time)
 
-    def _delete_objective(self):
+    def _linear_sum(self, terms, constant=0.0):
+        """
+        Linear expression `constant + sum(coefficient * variable)` built directly from its terms
+
+        :param terms: functions of the time period returning (coefficient, variable) pairs, summed over the horizon
+        """
+        coefficients = []
+        variables = []
+        for t in self.blocks.index_set():
+            for term in terms:
+                coefficient, variable = term(t)
+                coefficients.append(coefficient)
+                variables.append(variable)
+        return LinearExpression(constant=constant, linear_coefs=coefficients, linear_vars=variables)
+
+    def _set_objective(self, expression: pyomo.Expression, sense):
+        # the objective component is created once, then swapped between the expressions built for it
         if hasattr(self.model, "objective"):
-            self.model.del_component(self.model.objective)
+            self.model.objective.set_value(expression)
+            self.model.objective.set_sense(sense)
+        else:
+            self.model.objective = pyomo.Objective(expr=expression, sense=sense)
 
     def create_max_gross_profit_objective(self):
-        self._delete_objective()
+        if not hasattr(self.model, "gross_profit"):
+            self._create_gross_profit_expressions()
+        self._set_objective(self.model.gross_profit, pyomo.maximize)
+
+    def _create_gross_profit_expressions(self):
+        hb = self.blocks
 
         if 'grid' in self.power_sources.keys():
             tb = self.power_sources['grid'].dispatch.blocks
-            self.model.grid_obj = pyomo.Expression(expr=
-                sum(self.blocks[t].time_weighting_factor * tb[t].time_duration
-                * tb[t].electricity_sell_price * self.blocks[t].electricity_sold
-                - (1/self.blocks[t].time_weighting_factor) * tb[t].time_duration
-                * tb[t].electricity_purchase_price * self.blocks[t].electricity_purchased
-                - tb[t].epsilon * tb[t].is_generating
-                for t in self.blocks.index_set()))
-            
-        if 'pv' in self.power_sources.keys():
-            tb = self.power_sources['pv'].dispatch.blocks
-            self.model.pv_obj = pyomo.Expression(expr=
-                sum(- (1/self.blocks[t].time_weighting_factor)
-                * tb[t].time_duration * tb[t].cost_per_generation * self.blocks[t].pv_generation
-                for t in self.blocks.index_set()))
-
-        if 'wind' in self.power_sources.keys():
-            tb = self.power_sources['wind'].dispatch.blocks
-            self.model.wind_obj = pyomo.Expression(expr=
-                sum(- (1/self.blocks[t].time_weighting_factor)
-                * tb[t].time_duration * tb[t].cost_per_generation * self.blocks[t].wind_generation
-                for t in self.blocks.index_set()))
-
-        if 'wave' in self.power_sources.keys():
-            tb = self.power_sources['wave'].dispatch.blocks
-            self.model.wave_obj = pyomo.Expression(expr=
-                sum(- (1/self.blocks[t].time_weighting_factor)
-                * tb[t].time_duration * tb[t].cost_per_generation * self.blocks[t].wave_generation
-                for t in self.blocks.index_set()))
-
-        csp_techs = [i for i in ['tower', 'trough'] if i in self.power_sources.keys()]
-        for tech in csp_techs:
+            self.model.grid_obj = pyomo.Expression(expr=self._linear_sum((
+                lambda t: (hb[t].time_weighting_factor * tb[t].time_duration * tb[t].electricity_sell_price,
+                           hb[t].electricity_sold),
+                lambda t: (- (1/hb[t].time_weighting_factor) * tb[t].time_duration
+                           * tb[t].electricity_purchase_price,
+                           hb[t].electricity_purchased),
+                lambda t: (- tb[t].epsilon, tb[t].is_generating))))
+
+        for tech in [i for i in ['pv', 'wind', 'wave'] if i in self.power_sources.keys()]:
             tb = self.power_sources[tech].dispatch.blocks
-            objective = pyomo.Expression(expr=
-                sum(- (1/self.blocks[t].time_weighting_factor)
-                * ((tb[t].cost_per_field_generation
-                    * tb[t].receiver_thermal_power
-                    * tb[t].time_duration)
-                + tb[t].cost_per_field_start * tb[t].incur_field_start
-                + (tb[t].cost_per_cycle_generation
-                    * tb[t].cycle_generation
-                    * tb[t].time_duration)
-                + tb[t].cost_per_cycle_start * tb[t].incur_cycle_start
-                + tb[t].cost_per_change_thermal_input * tb[t].cycle_thermal_ramp)
-                for t in self.blocks.index_set()))
+            objective = pyomo.Expression(expr=self._linear_sum((
+                lambda t: (- (1/hb[t].time_weighting_factor) * tb[t].time_duration * tb[t].cost_per_generation,
+                           getattr(hb[t], tech + "_generation")),)))
             setattr(self.model, tech + "_obj", objective)
-            
-        if 'battery' in self.power_sources.keys():
-            def battery_profit_objective_rule(m):
-                objective = 0
-                tb = self.power_sources['battery'].dispatch.blocks
-                objective += sum(- (1/self.blocks[t].time_weighting_factor) * tb[t].time_duration
-                                    * (tb[t].cost_per_charge * self.blocks[t].battery_charge
-                                    + tb[t].cost_per_discharge * self.blocks[t].battery_discharge)
-                                    for t in self.blocks.index_set())
-                tb = self.power_sources['battery'].dispatch
-                if tb.options.include_lifecycle_count:
-                    objective -= tb.model.lifecycle_cost * sum(tb.model.lifecycles)
-                return objective
-            self.model.battery_obj = pyomo.Expression(rule=battery_profit_objective_rule)
 
-        def gross_profit_objective_rule(m):
-            obj = 0
-            for tech in self.power_sources.keys():
-                obj += getattr(m, tech + "_obj")
-            return obj
+        for tech in [i for i in ['tower', 'trough'] if i in self.power_sources.keys()]:
+            tb = self.power_sources[tech].dispatch.blocks
+            objective = pyomo.Expression(expr=self._linear_sum((
+                lambda t: (- (1/hb[t].time_weighting_factor) * tb[t].cost_per_field_generation * tb[t].time_duration,
+                           tb[t].receiver_thermal_power),
+                lambda t: (- (1/hb[t].time_weighting_factor) * tb[t].cost_per_field_start,
+                           tb[t].incur_field_start),
+                lambda t: (- (1/hb[t].time_weighting_factor) * tb[t].cost_per_cycle_generation * tb[t].time_duration,
+                           tb[t].cycle_generation),
+                lambda t: (- (1/hb[t].time_weighting_factor) * tb[t].cost_per_cycle_start,
+                           tb[t].incur_cycle_start),
+                lambda t: (- (1/hb[t].time_weighting_factor) * tb[t].cost_per_change_thermal_input,
+                           tb[t].cycle_thermal_ramp))))
+            setattr(self.model, tech + "_obj", objective)
 
-        self.model.objective = pyomo.Objective(
-            expr=gross_profit_objective_rule,
-            sense=pyomo.maximize)
+        if 'battery' in self.power_sources.keys():
+            tb = self.power_sources['battery'].dispatch.blocks
+            objective = self._linear_sum((
+                lambda t: (- (1/hb[t].time_weighting_factor) * tb[t].time_duration * tb[t].cost_per_charge,
+                           hb[t].battery_charge),
+                lambda t: (- (1/hb[t].time_weighting_factor) * tb[t].time_duration * tb[t].cost_per_discharge,
+                           hb[t].battery_discharge)))
+            tb = self.power_sources['battery'].dispatch
+            if tb.options.include_lifecycle_count:
+                objective -= tb.model.lifecycle_cost * pyomo.quicksum(tb.model.lifecycles.values())
+            self.model.battery_obj = pyomo.Expression(expr=objective)
+
+        self.model.gross_profit = pyomo.Expression(
+            doc="Gross profit of the hybrid system over the horizon [$]",
+            expr=pyomo.quicksum(getattr(self.model, tech + "_obj") for tech in self.power_sources.keys()))
 
     def create_min_operating_cost_objective(self):
-        self._delete_objective()
-
-        def operating_cost_objective_rule(m):
-            objective = 0.0
-            for tech in self.power_sources.keys():
-                if tech == 'grid':
-                    tb = self.power_sources[tech].dispatch.blocks
-                    objective += sum(self.blocks[t].time_weighting_factor * tb[t].time_duration
-                                     * tb[t].electricity_sell_price * (tb[t].generation_transmission_limit
-                                                                       - self.blocks[t].electricity_sold)
-                                     + self.blocks[t].time_weighting_factor * tb[t].time_duration
-                                     * tb[t].electricity_purchase_price * self.blocks[t].electricity_purchased
-                                     + tb[t].epsilon * tb[t].is_generating
-                                     for t in self.blocks.index_set())
-                elif tech == 'pv':
-                    tb = self.power_sources[tech].dispatch.blocks
-                    objective += sum(self.blocks[t].time_weighting_factor * tb[t].time_duration
-                                     * tb[t].cost_per_generation * self.blocks[t].pv_generation
-                                     for t in self.blocks.index_set())
-                elif tech == 'wind':
-                    tb = self.power_sources[tech].dispatch.blocks
-                    objective += sum(self.blocks[t].time_weighting_factor * tb[t].time_duration
-                                     * tb[t].cost_per_generation * self.blocks[t].wind_generation
-                                     for t in self.blocks.index_set())
-                elif tech == 'wave':
-                    tb = self.power_sources[tech].dispatch.blocks
-                    objective += sum(self.blocks[t].time_weighting_factor * tb[t].time_duration
-                                     * tb[t].cost_per_generation * self.blocks[t].wave_generation
-                                     for t in self.blocks.index_set())
-                elif tech == 'tower' or tech == 'trough':
-                    tb = self.power_sources[tech].dispatch.blocks
-                    objective += sum(self.blocks[t].time_weighting_factor
-                                     * (tb[t].cost_per_field_start * tb[t].incur_field_start
-                                        - (tb[t].cost_per_field_generation
-                                           * tb[t].receiver_thermal_power
-                                           * tb[t].time_duration)   # Trying to incentivize TES generation
-                                        + (tb[t].cost_per_cycle_generation
-                                           * tb[t].cycle_generation
-                                           * tb[t].time_duration)
-                                        + tb[t].cost_per_cycle_start * tb[t].incur_cycle_start
-                                        + tb[t].cost_per_change_thermal_input * tb[t].cycle_thermal_ramp)
-                                     for t in self.blocks.index_set())
-                elif tech == 'battery':
-                    tb = self.power_sources[tech].dispatch.blocks
-                    objective += sum(self.blocks[t].time_weighting_factor * tb[t].time_duration
-                                     * (tb[t].cost_per_discharge * self.blocks[t].battery_discharge
-                                        - tb[t].cost_per_charge * self.blocks[t].battery_charge)
-                                     # Try to incentivize battery charging
-                                     for t in self.blocks.index_set())
-                    tb = self.power_sources['battery'].dispatch
-                    if tb.options.include_lifecycle_count:
-                        objective += tb.model.lifecycle_cost * tb.model.lifecycles
-            return objective
-
-        self.model.objective = pyomo.Objective(
-            rule=operating_cost_objective_rule,
-            sense=pyomo.minimize)
+        if not hasattr(self.model, "operating_cost"):
+            self._create_operating_cost_expression()
+        self._set_objective(self.model.operating_cost, pyomo.minimize)
+
+    def _create_operating_cost_expression(self):
+        hb = self.blocks
+        objective = 0.0
+        for tech in self.power_sources.keys():
+            tb = self.power_sources[tech].dispatch.blocks
+            if tech == 'grid':
+                objective += self._linear_sum((
+                    lambda t: (- hb[t].time_weighting_factor * tb[t].time_duration * tb[t].electricity_sell_price,
+                               hb[t].electricity_sold),
+                    lambda t: (hb[t].time_weighting_factor * tb[t].time_duration * tb[t].electricity_purchase_price,
+                               hb[t].electricity_purchased),
+                    lambda t: (tb[t].epsilon, tb[t].is_generating)),
+                    constant=pyomo.quicksum(hb[t].time_weighting_factor * tb[t].time_duration
+                                            * tb[t].electricity_sell_price * tb[t].generation_transmission_limit
+                                            for t in hb.index_set()))
+            elif tech in ['pv', 'wind', 'wave']:
+                objective += self._linear_sum((
+                    lambda t: (hb[t].time_weighting_factor * tb[t].time_duration * tb[t].cost_per_generation,
+                               getattr(hb[t], tech + "_generation")),))
+            elif tech == 'tower' or tech == 'trough':
+                objective += self._linear_sum((
+                    lambda t: (hb[t].time_weighting_factor * tb[t].cost_per_field_start,
+                               tb[t].incur_field_start),
+                    # Trying to incentivize TES generation
+                    lambda t: (- hb[t].time_weighting_factor * tb[t].cost_per_field_generation * tb[t].time_duration,
+                               tb[t].receiver_thermal_power),
+                    lambda t: (hb[t].time_weighting_factor * tb[t].cost_per_cycle_generation * tb[t].time_duration,
+                               tb[t].cycle_generation),
+                    lambda t: (hb[t].time_weighting_factor * tb[t].cost_per_cycle_start,
+                               tb[t].incur_cycle_start),
+                    lambda t: (hb[t].time_weighting_factor * tb[t].cost_per_change_thermal_input,
+                               tb[t].cycle_thermal_ramp)))
+            elif tech == 'battery':
+                objective += self._linear_sum((
+                    lambda t: (hb[t].time_weighting_factor * tb[t].time_duration * tb[t].cost_per_discharge,
+                               hb[t].battery_discharge),
+                    # Try to incentivize battery charging
+                    lambda t: (- hb[t].time_weighting_factor * tb[t].time_duration * tb[t].cost_per_charge,
+                               hb[t].battery_charge)))
+                tb = self.power_sources['battery'].dispatch
+                if tb.options.include_lifecycle_count:
+                    objective += tb.model.lifecycle_cost * pyomo.quicksum(tb.model.lifecycles.values())
+
+        self.model.operating_cost = pyomo.Expression(
+            doc="Operating cost of the hybrid system over the horizon [$]",
+            expr=objective)
 
     @property
     def time_weighting_factor(self) -> float:
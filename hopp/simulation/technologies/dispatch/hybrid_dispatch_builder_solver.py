@@ -1,15 +1,21 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
 import sys, os
 from pathlib import Path
 import time
-
-import pyomo.environ as pyomo
-from pyomo.opt import TerminationCondition
-from pyomo.util.check_units import assert_units_consistent
+import logging
+import numpy as np
 
 from hopp.simulation.technologies.sites.site_info import SiteInfo
-from hopp.simulation.technologies.dispatch import HybridDispatch, HybridDispatchOptions, DispatchProblemState
-from hopp.simulation.technologies.clustering import Clustering
-from hopp.utilities.log import hybrid_logger as logger
+from hopp.simulation.technologies.dispatch.hybrid_dispatch_options import HybridDispatchOptions
+from hopp.utilities.log import hybrid_logger as logger, get_solver_logger
+from hopp.utilities.utilities import lazy_import
+
+if TYPE_CHECKING:
+    from hopp.simulation.technologies.dispatch.hybrid_dispatch import HybridDispatch
+
+# Pyomo is only loaded once a dispatch model is built
+pyomo = lazy_import("pyomo.environ")
 
 
 class HybridDispatchBuilderSolver:
@@ -32,26 +38,35 @@ class HybridDispatchBuilderSolver:
         self.site: SiteInfo = site
         self.power_sources = power_sources
         self.options = HybridDispatchOptions(dispatch_options)
+        self.options.steps_per_hour = self.site.steps_per_hour
 
-        # deletes previous log file under same name
-        if os.path.isfile(self.options.log_name):
-            os.remove(self.options.log_name)
+        # solver output goes to a log file shared by the builders with the same log name
+        self.solver_logger = get_solver_logger(self.options.log_name)
 
         self.needs_dispatch = any(item in ['battery', 'tower', 'trough'] for item in self.power_sources.keys())
 
         if self.needs_dispatch:
+            from pyomo.util.check_units import assert_units_consistent
+            from hopp.simulation.technologies.dispatch.dispatch_problem_state import DispatchProblemState
+
+            if self.options.solver == 'highs' and not pyomo.SolverFactory('appsi_highs').available(exception_flag=False):
+                logger.warning("HiGHS is not available, install 'highspy' to solve dispatch in-process. "
+                               "Falling back to 'cbc'.")
+                self.options.solver = 'cbc'
             self._pyomo_model = self._create_dispatch_optimization_model()
             if self.site.follow_desired_schedule:
                 self.dispatch.create_min_operating_cost_objective()
             else:
                 self.dispatch.create_max_gross_profit_objective()
-            self.dispatch.create_arcs()
+            self.dispatch.create_port_balance_constraints()
             assert_units_consistent(self.pyomo_model)
             self.problem_state = DispatchProblemState()
         
         # Clustering (optional)
         self.clustering = None
         if self.options.use_clustering:
+            from hopp.simulation.technologies.clustering import Clustering
+
             #TODO: Add resource data for wind
             self.clustering = Clustering(power_sources.keys(), self.site.solar_resource.filename, wind_resource_data = None, price_data = self.site.elec_prices.data)
             self.clustering.n_cluster = self.options.n_clusters
@@ -70,12 +85,14 @@ class HybridDispatchBuilderSolver:
         """
         Creates monolith dispatch model
         """
+        from hopp.simulation.technologies.dispatch.hybrid_dispatch import HybridDispatch
+
         model = pyomo.ConcreteModel(name='hybrid_dispatch')
         #################################
         # Sets                          #
         #################################
         model.forecast_horizon = pyomo.Set(doc="Set of time periods in time horizon",
-                                           initialize=range(self.options.n_look_ahead_periods))
+                                           initialize=range(self.options.n_look_ahead_steps))
         #################################
         # Blocks (technologies)         #
         #################################
@@ -108,25 +125,30 @@ class HybridDispatchBuilderSolver:
             self.options)
         return model
 
+    @property
+    def solvers(self) -> dict:
+        """Solve methods of the supported solvers, by name"""
+        return {'glpk': self.glpk_solve,
+                'cbc': self.cbc_solve,
+                'highs': self.highs_solve,
+                'xpress': self.xpress_solve,
+                'xpress_persistent': self.xpress_persistent_solve,
+                'gurobi_ampl': self.gurobi_ampl_solve,
+                'gurobi': self.gurobi_solve}
+
     def solve_dispatch_model(self, start_time: int, n_days: int):
         # Solve dispatch model
-        if self.options.solver == 'glpk':
-            solver_results = self.glpk_solve()
-        elif self.options.solver == 'cbc':
-            solver_results = self.cbc_solve()
-        elif self.options.solver == 'xpress':
-            solver_results = self.xpress_solve()
-        elif self.options.solver == 'xpress_persistent':
-            solver_results = self.xpress_persistent_solve()
-        elif self.options.solver == 'gurobi_ampl':
-            solver_results = self.gurobi_ampl_solve()
-        elif self.options.solver == 'gurobi':
-            solver_results = self.gurobi_solve()
-        else:
+        try:
+            solve = self.solvers[self.options.solver]
+        except KeyError:
             raise ValueError("{} is not a supported solver".format(self.options.solver))
+        solver_results = solve()
 
-        self.problem_state.store_problem_metrics(solver_results, start_time, n_days,
-                                                 self.dispatch.objective_value)
+        objective_value = self.dispatch.objective_value
+        self.problem_state.store_problem_metrics(solver_results, start_time, n_days, objective_value)
+        self.solver_logger.info("dispatch solved: start_time=%d n_days=%d solver=%s termination=%s objective=%s",
+                                start_time, n_days, self.options.solver,
+                                solver_results.solver.termination_condition, objective_value)
 
     @staticmethod
     def glpk_solve_call(pyomo_model: pyomo.ConcreteModel,
@@ -233,6 +255,32 @@ class HybridDispatchBuilderSolver:
                                                           self.options.log_name,
                                                           self.options.solver_options)
 
+    @staticmethod
+    def highs_solve_call(opt: pyomo.SolverFactory,
+                         pyomo_model: pyomo.ConcreteModel,
+                         user_solver_options: dict = None):
+        # Solves in-process: the model stays loaded in `opt`, which only updates the parameters changed since the
+        # previous solve. The solver output goes to the dispatch solver log.
+        # Ref. on solver options: https://ergo-code.github.io/HiGHS/stable/options/definitions/
+        highs_solver_options = {'time_limit': 60.}
+        solver_options = SolverOptions(highs_solver_options, "", user_solver_options)
+
+        results = opt.solve(pyomo_model, load_solutions=False, options=solver_options.constructed)
+        if len(results.solution) > 0:
+            pyomo_model.solutions.load_from(results)
+        HybridDispatchBuilderSolver.check_solve_condition(results.solver.termination_condition, pyomo_model)
+        return results
+
+    def highs_solve(self):
+        if self.opt is None:
+            self.opt = pyomo.SolverFactory('appsi_highs')
+            self.opt.config.solver_output_logger = self.solver_logger
+            self.opt.config.log_level = logging.INFO
+
+        return HybridDispatchBuilderSolver.highs_solve_call(self.opt,
+                                                            self.pyomo_model,
+                                                            self.options.solver_options)
+
     @staticmethod
     def xpress_solve_call(pyomo_model: pyomo.ConcreteModel,
                           log_name: str = "",
@@ -302,23 +350,17 @@ class HybridDispatchBuilderSolver:
 
     @staticmethod
     def check_solve_condition(solver_termination_condition, pyomo_model):
-        if solver_termination_condition == TerminationCondition.infeasible:
+        if solver_termination_condition == pyomo.TerminationCondition.infeasible:
             HybridDispatchBuilderSolver.print_infeasible_problem(pyomo_model)
-        elif not solver_termination_condition == TerminationCondition.optimal:
+        elif not solver_termination_condition == pyomo.TerminationCondition.optimal:
             logger.warning("Warning: Dispatch problem termination condition was '"
                   + str(solver_termination_condition) + "'")
 
     @staticmethod
     def append_solve_to_log(log_name: str, solve_log: str):
-        # Appends single problem instance log to annual log file
-        fin = open(solve_log, 'r')
-        data = fin.read()
-        fin.close()
-
-        ann_log = open(log_name, 'a+')
-        ann_log.write("=" * 50 + "\n")
-        ann_log.write(data)
-        ann_log.close()
+        # Passes single problem instance log to the rotating dispatch solver log, see `get_solver_logger`
+        with open(solve_log, 'r') as fin:
+            get_solver_logger(log_name).info(fin.read())
 
     @staticmethod
     def print_infeasible_problem(model: pyomo.ConcreteModel):
@@ -363,7 +405,7 @@ class HybridDispatchBuilderSolver:
         else:
             logger.info("Dispatch optimization not required...")
             return
-        ti = list(range(0, self.site.n_timesteps, self.options.n_roll_periods))
+        ti = list(range(0, self.site.n_timesteps, self.options.n_roll_steps))
         self.dispatch.initialize_parameters()
 
         if self.clustering is None:
@@ -415,18 +457,26 @@ class HybridDispatchBuilderSolver:
                                 initial_states[tech]['soc'].append(self.power_sources[tech].get_tes_soc(day*24))
                                 initial_states[tech]['load'].append(self.power_sources[tech].get_cycle_load(day*24))
                             elif tech in ['battery']:
-                                step = day*24 * int(self.site.n_timesteps/8760)
+                                step = day * self.site.n_periods_per_day
                                 initial_states[tech]['soc'].append(self.power_sources[tech].Outputs.SOC[step])
 
             # After exemplar simulations, update to full annual generation array for dispatchable technologies
+            n_periods_per_day = self.site.n_periods_per_day
             for tech in self.power_sources.keys():
                 if tech in ['battery']:
-                    for key in ['gen', 'P', 'SOC']:
-                        val = getattr(self.power_sources[tech].Outputs, key)
-                        setattr(self.power_sources[tech].Outputs, key, list(self.clustering.compute_annual_array_from_cluster_exemplar_data(val)))
+                    keys = ['gen', 'P', 'SOC']
+                    outputs = self.power_sources[tech].Outputs
+                    annual = self.clustering.compute_annual_array_from_cluster_exemplar_data(
+                        np.column_stack([getattr(outputs, key) for key in keys]), periods_per_day=n_periods_per_day)
+                    for i, key in enumerate(keys):
+                        setattr(outputs, key, annual[:, i].tolist())
                 elif tech in ['trough', 'tower']:
-                    for key in ['gen', 'P_out_net', 'P_cycle', 'q_dot_pc_startup', 'q_pc_startup', 'e_ch_tes', 'eta', 'q_pb']:  # Data quantities used in capacity value calculations
-                        self.power_sources[tech].outputs.ssc_time_series[key] = list(self.clustering.compute_annual_array_from_cluster_exemplar_data(self.power_sources[tech].outputs.ssc_time_series[key])) 
+                    keys = ['gen', 'P_out_net', 'P_cycle', 'q_dot_pc_startup', 'q_pc_startup', 'e_ch_tes', 'eta', 'q_pb']  # Data quantities used in capacity value calculations
+                    ssc_time_series = self.power_sources[tech].outputs.ssc_time_series
+                    annual = self.clustering.compute_annual_array_from_cluster_exemplar_data(
+                        np.column_stack([ssc_time_series[key] for key in keys]), periods_per_day=n_periods_per_day)
+                    for i, key in enumerate(keys):
+                        ssc_time_series[key] = annual[:, i].copy()
 
     def simulate_with_dispatch(self,
                                start_time: int,
@@ -436,7 +486,7 @@ class HybridDispatchBuilderSolver:
         # this is needed for clustering effort
         update_dispatch_times = list(range(start_time,
                                            start_time + n_days * self.site.n_periods_per_day,
-                                           self.options.n_roll_periods))
+                                           self.options.n_roll_steps))
 
         for i, sim_start_time in enumerate(update_dispatch_times):
             # Update battery initial state of charge
@@ -481,20 +531,20 @@ class HybridDispatchBuilderSolver:
 
             # simulate using dispatch solution
             if 'battery' in self.power_sources.keys():
-                self.power_sources['battery'].simulate_with_dispatch(self.options.n_roll_periods,
+                self.power_sources['battery'].simulate_with_dispatch(self.options.n_roll_steps,
                                                                      sim_start_time=battery_sim_start_time)
 
             if 'trough' in self.power_sources.keys():
-                self.power_sources['trough'].simulate_with_dispatch(self.options.n_roll_periods,
+                self.power_sources['trough'].simulate_with_dispatch(self.options.n_roll_steps,
                                                                     sim_start_time=sim_start_time,
                                                                     store_outputs=store_outputs)
             if 'tower' in self.power_sources.keys():
-                self.power_sources['tower'].simulate_with_dispatch(self.options.n_roll_periods,
+                self.power_sources['tower'].simulate_with_dispatch(self.options.n_roll_steps,
                                                                    sim_start_time=sim_start_time,
                                                                    store_outputs=store_outputs)
 
     def battery_heuristic(self):
-        tot_gen = [0.0]*self.options.n_look_ahead_periods
+        tot_gen = [0.0]*self.options.n_look_ahead_steps
         if 'pv' in self.power_sources.keys():
             pv_gen = self.power_sources['pv'].dispatch.available_generation
             tot_gen = [pv + gen for pv, gen in zip(pv_gen, tot_gen)]
@@ -1,12 +1,6 @@
 import numpy as np
 
-from hopp.simulation.technologies.dispatch.power_storage import (
-    OneCycleBatteryDispatchHeuristic,
-    SimpleBatteryDispatchHeuristic,
-    SimpleBatteryDispatch,
-    NonConvexLinearVoltageBatteryDispatch,
-    ConvexLinearVoltageBatteryDispatch
-)
+from hopp.simulation.technologies.dispatch import power_storage
 
 
 class HybridDispatchOptions:
@@ -16,7 +10,7 @@ class HybridDispatchOptions:
     Args:
         dispatch_options (dict): Contains attribute key-value pairs to change default options. 
 
-            - **solver** (str, default='cbc'): MILP solver used for dispatch optimization problem. Options are `('glpk', 'cbc', 'xpress', 'xpress_persistent', 'gurobi_ampl', 'gurobi')`.
+            - **solver** (str, default='cbc'): MILP solver used for dispatch optimization problem. Options are `('glpk', 'cbc', 'highs', 'xpress', 'xpress_persistent', 'gurobi_ampl', 'gurobi')`. 'highs' solves in-process through Pyomo's appsi interface, keeping the model loaded between dispatch windows, and requires `highspy`; without it, 'cbc' is used instead.
 
             - **solver_options** (dict): Dispatch solver options.
 
@@ -32,13 +26,13 @@ class HybridDispatchOptions:
 
             - **max_lifecycle_per_day** (int, default=None): If include_lifecycle_count, how many cycles allowed per day.
 
-            - **n_look_ahead_periods** (int, default=48): Number of time periods dispatch looks ahead.
+            - **n_look_ahead_periods** (int, default=48): Number of hours dispatch looks ahead.
 
-            - **n_roll_periods** (int, default=24): Number of time periods simulation rolls forward after each dispatch.
+            - **n_roll_periods** (int, default=24): Number of hours simulation rolls forward after each dispatch.
 
             - **time_weighting_factor** (float, default=0.995): Discount factor for the time periods in the look ahead period.
 
-            - **log_name** (str, default=''): Dispatch log file name, empty str will result in no log (for development).
+            - **log_name** (str, default=''): Dispatch solver log file name, rotated once it reaches 10 MB, empty str will result in no log (for development).
 
             - **is_test_start_year** (bool, default=False): If True, simulation solves for first 5 days of the year.
 
@@ -52,6 +46,8 @@ class HybridDispatchOptions:
 
             - **clustering_divisions** (dict, default={}): Custom number of averaging periods for classification metrics for data clustering. If empty, default values will be used.
 
+            - **steps_per_hour** (int, default=1): Number of dispatch time periods per hour. Set by `HybridDispatchBuilderSolver` from the site's resource.
+
     """
     def __init__(self, dispatch_options: dict = None):
         self.solver: str = 'cbc'
@@ -74,6 +70,8 @@ class HybridDispatchOptions:
         self.clustering_weights: dict = {}
         self.clustering_divisions: dict = {}
 
+        self.steps_per_hour: int = 1
+
         if dispatch_options is not None:
             for key, value in dispatch_options.items():
                 if hasattr(self, key):
@@ -98,20 +96,39 @@ class HybridDispatchOptions:
         if self.pv_charging_only and self.grid_charging:
             raise ValueError("Battery cannot be restricted to charge from PV only if grid_charging is enabled")
 
+        # battery dispatch classes by name, imported once used so that Pyomo is only loaded for dispatch
         self._battery_dispatch_model_options = {
-            'one_cycle_heuristic': OneCycleBatteryDispatchHeuristic,
-            'heuristic': SimpleBatteryDispatchHeuristic,
-            'simple': SimpleBatteryDispatch,
-            'non_convex_LV': NonConvexLinearVoltageBatteryDispatch,
-            'convex_LV': ConvexLinearVoltageBatteryDispatch}
+            'one_cycle_heuristic': 'OneCycleBatteryDispatchHeuristic',
+            'heuristic': 'SimpleBatteryDispatchHeuristic',
+            'simple': 'SimpleBatteryDispatch',
+            'non_convex_LV': 'NonConvexLinearVoltageBatteryDispatch',
+            'convex_LV': 'ConvexLinearVoltageBatteryDispatch'}
         if self.battery_dispatch in self._battery_dispatch_model_options:
-            self.battery_dispatch_class = self._battery_dispatch_model_options[self.battery_dispatch]
             if 'heuristic' in self.battery_dispatch:
-                # FIXME: This should be set to the number of time steps within a day.
-                #  Dispatch time duration is not set as of now...
+                # heuristics dispatch one day at a time
                 self.n_roll_periods = 24
                 self.n_look_ahead_periods = self.n_roll_periods
                 # dispatch cycle counting is not available in heuristics
                 self.include_lifecycle_count = False
         else:
             raise ValueError("'{}' is not currently a battery dispatch class.".format(self.battery_dispatch))
+
+    @property
+    def battery_dispatch_class(self) -> type:
+        """Battery dispatch class of `battery_dispatch`"""
+        return getattr(power_storage, self._battery_dispatch_model_options[self.battery_dispatch])
+
+    @property
+    def time_step_hours(self) -> float:
+        """Duration of a dispatch time period [hr]"""
+        return 1. / self.steps_per_hour
+
+    @property
+    def n_look_ahead_steps(self) -> int:
+        """Number of time periods dispatch looks ahead"""
+        return int(self.n_look_ahead_periods * self.steps_per_hour)
+
+    @property
+    def n_roll_steps(self) -> int:
+        """Number of time periods simulation rolls forward after each dispatch"""
+        return int(self.n_roll_periods * self.steps_per_hour)
@@ -1,4 +1,10 @@
-from hopp.simulation.technologies.dispatch.power_sources.power_source_dispatch import PowerSourceDispatch
-from hopp.simulation.technologies.dispatch.power_sources.pv_dispatch import PvDispatch
-from hopp.simulation.technologies.dispatch.power_sources.wind_dispatch import WindDispatch
-from hopp.simulation.technologies.dispatch.power_sources.wave_dispatch import WaveDispatch
+from hopp.utilities.utilities import lazy_exports
+
+_exports = {
+    "PowerSourceDispatch": ".power_source_dispatch",
+    "PvDispatch": ".pv_dispatch",
+    "WindDispatch": ".wind_dispatch",
+    "WaveDispatch": ".wave_dispatch",
+}
+__all__ = list(_exports)
+__getattr__ = lazy_exports(__name__, _exports)
@@ -23,6 +23,10 @@ class CspDispatch(Dispatch):
         super().__init__(pyomo_model, index_set, system_model, financial_model, block_set_name=block_set_name)
         self._create_linking_constraints()
 
+        # annual weather-derived time series, sliced into each dispatch horizon
+        self._annual_time_series = None
+        self._horizon_params = {}
+
         self.objective_cost_terms = {'cost_per_field_generation': 0.5,
                                      'cost_per_field_start_rel': 1.5,
                                      'cost_per_cycle_generation': 2.0,
@@ -656,34 +660,67 @@ class CspDispatch(Dispatch):
         self.maximum_cycle_thermal_power = csp.value('cycle_max_frac') * cycle_rated_thermal
         self.set_part_load_cycle_parameters()
 
+        self.initialize_annual_time_series()
+
+    def initialize_annual_time_series(self):
+        """
+        Precomputes the annual forecast and ambient temperature dependent parameters sliced into each dispatch
+        horizon by `update_time_series_parameters`. Must be called again if the forecast or cycle tables change.
+        """
+        self.min_receiver_start_time = self._system_model.value('rec_su_delay')
+
+        field_gen = np.asarray(self._system_model.solar_thermal_resource, dtype=float)
+        temperature = np.asarray(self._system_model.year_weather_df.Temperature.values, dtype=float)
+        efficiency_correction, condenser_losses = self.get_ambient_temperature_cycle_corrections(temperature)
+        self._annual_time_series = {
+            'available_thermal_generation': field_gen,
+            'cycle_ambient_efficiency_correction': efficiency_correction,
+            'condenser_losses': condenser_losses,
+            'receiver_startup_fraction': self.get_receiver_startup_fraction(field_gen, 1.0)
+        }
+
     def update_time_series_parameters(self, start_time: int):
         """
         Sets up SSC simulation to get time series performance parameters after simulation.
         : param start_time: hour of the year starting dispatch horizon
         """
-        n_horizon = len(self.blocks.index_set())
-        self.time_duration = [1.0] * n_horizon  # assume hourly for now
+        if self._annual_time_series is None:
+            self.initialize_annual_time_series()
 
-        # Set available thermal energy based on forecast
-        thermal_resource = self._system_model.solar_thermal_resource
-        temperature = list(self._system_model.year_weather_df.Temperature.values)
-        if start_time + n_horizon > len(thermal_resource):
-            field_gen = list(thermal_resource[start_time:])
-            field_gen.extend(list(thermal_resource[0:n_horizon - len(field_gen)]))
-
-            dry_bulb_temperature = list(temperature[start_time:])
-            dry_bulb_temperature.extend(list(temperature[0:n_horizon - len(dry_bulb_temperature)]))
-        else:
-            field_gen = thermal_resource[start_time:start_time + n_horizon]
-            dry_bulb_temperature = temperature[start_time:start_time + n_horizon]
+        n_horizon = len(self.blocks)
+        self.time_duration = [1.0] * n_horizon  # assume hourly for now
 
-        self.available_thermal_generation = field_gen
-        # Set cycle performance parameters that depend on ambient temperature
-        self.set_ambient_temperature_cycle_parameters(dry_bulb_temperature)
-        self.set_receiver_require_startup_time_fraction(field_gen)
+        # Horizons extending past the end of the year wrap around to its start
+        horizon = np.arange(start_time, start_time + n_horizon)
+        for name, annual_values in self._annual_time_series.items():
+            self._set_horizon_values(name, annual_values.take(horizon, mode='wrap'))
 
         self.update_initial_conditions()  # other dispatch models do not have this method
 
+    def _set_horizon_values(self, name: str, values):
+        """Sets the value of parameter `name` in each block of the dispatch horizon"""
+        if len(values) != len(self.blocks):
+            raise ValueError(name + " list must be the same length as time horizon")
+        values = np.round(np.asarray(values, dtype=float), self.round_digits)
+
+        params = self._horizon_params.get(name)
+        if params is None:
+            # the first values are set through Pyomo, which also adds each parameter's data
+            params = [getattr(block, name) for block in self.blocks.values()]
+            for param, value in zip(params, values.tolist()):
+                param.set_value(value)
+            self._horizon_params[name] = params
+            return
+
+        # Pyomo validates each value set, which dominates the cost of a horizon update, so later windows are checked
+        # against the parameter domain once and stored without per-value checks, as Param.store_values(check=False)
+        lower, upper = params[0].domain.bounds()
+        if (not np.isfinite(values).all() or (lower is not None and values.min() < lower)
+                or (upper is not None and values.max() > upper)):
+            raise ValueError(f"{name} values must be within the parameter domain {params[0].domain.name}")
+        for param, value in zip(params, values.tolist()):
+            param._value = value
+
     def set_part_load_cycle_parameters(self):
         """Set parameters in dispatch model for off-design cycle performance."""
         # --- Cycle part-load efficiency
@@ -728,6 +765,17 @@ class CspDispatch(Dispatch):
 
     def set_ambient_temperature_cycle_parameters(self, dry_bulb_temperature):
         """Set ambient temperature dependent cycle performance parameters."""
+        efficiency_correction, condenser_losses = self.get_ambient_temperature_cycle_corrections(dry_bulb_temperature)
+        self.cycle_ambient_efficiency_correction = efficiency_correction
+        self.condenser_losses = condenser_losses
+
+    def get_ambient_temperature_cycle_corrections(self, dry_bulb_temperature) -> tuple:
+        """
+        Ambient temperature dependent cycle performance parameters.
+
+        :param dry_bulb_temperature: ambient temperature of each time step [C]
+        :return: cycle ambient efficiency correction and condenser losses arrays
+        """
         # --- Cycle ambient-temperature efficiency corrections
         tables = self._system_model.cycle_efficiency_tables
         if 'cycle_eff_Tdb_table' in tables:
@@ -735,7 +783,7 @@ class CspDispatch(Dispatch):
             Tpts = [tables['cycle_eff_Tdb_table'][i][0] for i in range(nT)]
             efficiency_pts = [tables['cycle_eff_Tdb_table'][i][1] * self._system_model.cycle_nominal_efficiency for i in range(nT)]  # Efficiency
             wcondfpts = [tables['cycle_wcond_Tdb_table'][i][1] for i in range(nT)]  # Fraction of cycle design gross output consumed by cooling
-            self.set_cycle_ambient_corrections(dry_bulb_temperature, Tpts, efficiency_pts, wcondfpts)
+            return self.get_cycle_ambient_corrections(dry_bulb_temperature, Tpts, efficiency_pts, wcondfpts)
         elif 'ud_ind_od' in tables:
             # Tables not returned from ssc, but can be taken from user-defined cycle inputs
             D = self.interpret_user_defined_cycle_data(tables['ud_ind_od'])
@@ -746,28 +794,29 @@ class CspDispatch(Dispatch):
                               for j in range(k, k + npts)]  # Efficiency
             wcondfpts = [(self._system_model.value('ud_f_W_dot_cool_des') / 100.) * tables['ud_ind_od'][j][5] for j in
                          range(k, k + npts)]  # Fraction of cycle design gross output consumed by cooling
-            self.set_cycle_ambient_corrections(dry_bulb_temperature, D['Tambpts'], efficiency_pts, wcondfpts)
+            return self.get_cycle_ambient_corrections(dry_bulb_temperature, D['Tambpts'], efficiency_pts, wcondfpts)
         else:
             print('WARNING: Dispatch optimization cycle ambient temperature corrections are not set up.')
             n = len(dry_bulb_temperature)
-            self.cycle_ambient_efficiency_correction = [self._system_model.cycle_nominal_efficiency] * n
-            self.condenser_losses = [0.0] * n
-        return
+            return np.full(n, self._system_model.cycle_nominal_efficiency), np.zeros(n)
 
     def set_cycle_ambient_corrections(self, Tdb, Tpts, etapts, wcondfpts):
-        n = len(Tdb)            # Tdb = set of ambient temperature points for each dispatch time step
-        npts = len(Tpts)        # Tpts = ambient temperature points with tabulated values
-        cycle_ambient_efficiency_correction = [1.0]*n
-        condenser_losses = [0.0]*n
-        Tstep = Tpts[1] - Tpts[0]
-        for j in range(n):
-            i = max(0, min( int((Tdb[j] - Tpts[0]) / Tstep), npts-2) )
-            r = (Tdb[j] - Tpts[i]) / Tstep
-            cycle_ambient_efficiency_correction[j] = etapts[i] + (etapts[i + 1] - etapts[i]) * r
-            condenser_losses[j] = wcondfpts[i] + (wcondfpts[i + 1] - wcondfpts[i]) * r
-        self.cycle_ambient_efficiency_correction = cycle_ambient_efficiency_correction
+        efficiency_correction, condenser_losses = self.get_cycle_ambient_corrections(Tdb, Tpts, etapts, wcondfpts)
+        self.cycle_ambient_efficiency_correction = efficiency_correction
         self.condenser_losses = condenser_losses
-        return
+
+    @staticmethod
+    def get_cycle_ambient_corrections(Tdb, Tpts, etapts, wcondfpts) -> tuple:
+        Tdb = np.asarray(Tdb, dtype=float)          # Tdb = set of ambient temperature points for each dispatch time step
+        Tpts = np.asarray(Tpts, dtype=float)        # Tpts = ambient temperature points with tabulated values
+        etapts = np.asarray(etapts, dtype=float)
+        wcondfpts = np.asarray(wcondfpts, dtype=float)
+        Tstep = Tpts[1] - Tpts[0]
+        i = np.clip(((Tdb - Tpts[0]) / Tstep).astype(int), 0, len(Tpts) - 2)
+        r = (Tdb - Tpts[i]) / Tstep
+        cycle_ambient_efficiency_correction = etapts[i] + (etapts[i + 1] - etapts[i]) * r
+        condenser_losses = wcondfpts[i] + (wcondfpts[i + 1] - wcondfpts[i]) * r
+        return cycle_ambient_efficiency_correction, condenser_losses
 
     @staticmethod
     def interpret_user_defined_cycle_data(ud_ind_od):
@@ -794,20 +843,19 @@ class CspDispatch(Dispatch):
     def set_receiver_require_startup_time_fraction(self, field_gen: list):
         """Estimates the fraction of time period required for receiver start-up."""
         self.min_receiver_start_time = self._system_model.value('rec_su_delay')
+        self.receiver_startup_fraction = self.get_receiver_startup_fraction(field_gen, np.array(self.time_duration))
 
-        su_fraction = [1.0] * len(field_gen)
-        epsilon = 1e-6
-        time_duration = self.time_duration
-
-        for i in range(len(field_gen)):
-            su_fraction[i] = min(1.0,
-                                 max(self.min_receiver_start_time / time_duration[i],
-                                     self.receiver_required_startup_energy / max(1e-6,
-                                                                                 field_gen[i] * time_duration[i])
-                                     )
-                                 )
+    def get_receiver_startup_fraction(self, field_gen, time_duration) -> np.ndarray:
+        """
+        Estimated fraction of each time period required for receiver start-up.
 
-        self.receiver_startup_fraction = su_fraction
+        :param field_gen: available solar thermal generation of each time period [MWt]
+        :param time_duration: duration of the time periods [hour]
+        """
+        field_gen = np.asarray(field_gen, dtype=float)
+        return np.minimum(1.0, np.maximum(self.min_receiver_start_time / time_duration,
+                                          self.receiver_required_startup_energy
+                                          / np.maximum(1e-6, field_gen * time_duration)))
 
     def update_initial_conditions(self):
         csp = self._system_model
@@ -884,11 +932,7 @@ class CspDispatch(Dispatch):
     @time_duration.setter
     def time_duration(self, time_duration: list):
         """Dispatch horizon time steps [hour]"""
-        if len(time_duration) == len(self.blocks):
-            for t, delta in zip(self.blocks, time_duration):
-                self.blocks[t].time_duration = round(delta, self.round_digits)
-        else:
-            raise ValueError(self.time_duration.__name__ + " list must be the same length as time horizon")
+        self._set_horizon_values('time_duration', time_duration)
 
     @property
     def available_thermal_generation(self) -> list:
@@ -898,11 +942,7 @@ class CspDispatch(Dispatch):
     @available_thermal_generation.setter
     def available_thermal_generation(self, available_thermal_generation: list):
         """Available solar thermal generation from the csp field [MWt]"""
-        if len(available_thermal_generation) == len(self.blocks):
-            for t, value in zip(self.blocks, available_thermal_generation):
-                self.blocks[t].available_thermal_generation = round(value, self.round_digits)
-        else:
-            raise ValueError(self.available_thermal_generation.__name__ + " list must be the same length as time horizon")
+        self._set_horizon_values('available_thermal_generation', available_thermal_generation)
 
     @property
     def cycle_ambient_efficiency_correction(self) -> list:
@@ -912,11 +952,7 @@ class CspDispatch(Dispatch):
     @cycle_ambient_efficiency_correction.setter
     def cycle_ambient_efficiency_correction(self, cycle_ambient_efficiency_correction: list):
         """Cycle efficiency ambient temperature adjustment factor [-]"""
-        if len(cycle_ambient_efficiency_correction) == len(self.blocks):
-            for t, value in zip(self.blocks, cycle_ambient_efficiency_correction):
-                self.blocks[t].cycle_ambient_efficiency_correction = round(value, self.round_digits)
-        else:
-            raise ValueError(self.cycle_ambient_efficiency_correction.__name__ + " list must be the same length as time horizon")
+        self._set_horizon_values('cycle_ambient_efficiency_correction', cycle_ambient_efficiency_correction)
 
     @property
     def condenser_losses(self) -> list:
@@ -926,11 +962,7 @@ class CspDispatch(Dispatch):
     @condenser_losses.setter
     def condenser_losses(self, condenser_losses: list):
         """Normalized condenser parasitic losses [-]"""
-        if len(condenser_losses) == len(self.blocks):
-            for t, value in zip(self.blocks, condenser_losses):
-                self.blocks[t].condenser_losses = round(value, self.round_digits)
-        else:
-            raise ValueError(self.condenser_losses.__name__ + " list must be the same length as time horizon")
+        self._set_horizon_values('condenser_losses', condenser_losses)
 
     @property
     def receiver_startup_fraction(self) -> list:
@@ -940,11 +972,7 @@ class CspDispatch(Dispatch):
     @receiver_startup_fraction.setter
     def receiver_startup_fraction(self, receiver_startup_fraction: list):
         """Estimated fraction of time period required for receiver start-up [-]"""
-        if len(receiver_startup_fraction) == len(self.blocks):
-            for t, value in zip(self.blocks, receiver_startup_fraction):
-                self.blocks[t].receiver_startup_fraction = round(value, self.round_digits)
-        else:
-            raise ValueError(self.receiver_startup_fraction.__name__ + " list must be the same length as time horizon")
+        self._set_horizon_values('receiver_startup_fraction', receiver_startup_fraction)
 
     @property
     def min_receiver_start_time(self) -> float:
@@ -79,6 +79,20 @@ class PowerSourceDispatch(Dispatch):
                                f"length but has only {len(generation)}")
         self.available_generation = [gen_kw / 1e3 for gen_kw in horizon_gen]
 
+    @property
+    def time_duration(self) -> list:
+        """Dispatch horizon time steps [hour]"""
+        return [self.blocks[t].time_duration.value for t in self.blocks.index_set()]
+
+    @time_duration.setter
+    def time_duration(self, time_duration: list):
+        """Dispatch horizon time steps [hour]"""
+        if len(time_duration) == len(self.blocks):
+            for t, delta in zip(self.blocks, time_duration):
+                self.blocks[t].time_duration = round(delta, self.round_digits)
+        else:
+            raise ValueError(self.time_duration.__name__ + " list must be the same length as time horizon")
+
     @property
     def cost_per_generation(self) -> float:
         for t in self.blocks.index_set():
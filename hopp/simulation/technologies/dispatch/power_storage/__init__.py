@@ -1,6 +1,15 @@
-from hopp.simulation.technologies.dispatch.power_storage.linear_voltage_convex_battery_dispatch import ConvexLinearVoltageBatteryDispatch
-from hopp.simulation.technologies.dispatch.power_storage.linear_voltage_nonconvex_battery_dispatch import NonConvexLinearVoltageBatteryDispatch
-from hopp.simulation.technologies.dispatch.power_storage.one_cycle_battery_dispatch_heuristic import OneCycleBatteryDispatchHeuristic
-from hopp.simulation.technologies.dispatch.power_storage.power_storage_dispatch import PowerStorageDispatch
-from hopp.simulation.technologies.dispatch.power_storage.simple_battery_dispatch import SimpleBatteryDispatch
-from hopp.simulation.technologies.dispatch.power_storage.simple_battery_dispatch_heuristic import SimpleBatteryDispatchHeuristic
+from hopp.utilities.utilities import lazy_exports
+
+_exports = {
+    "ConvexLinearVoltageBatteryDispatch": ".linear_voltage_convex_battery_dispatch",
+    "NonConvexLinearVoltageBatteryDispatch": ".linear_voltage_nonconvex_battery_dispatch",
+    "OneCycleBatteryDispatchHeuristic": ".one_cycle_battery_dispatch_heuristic",
+    "one_cycle_heuristic_dispatch": ".one_cycle_battery_dispatch_heuristic",
+    "PowerStorageDispatch": ".power_storage_dispatch",
+    "SimpleBatteryDispatch": ".simple_battery_dispatch",
+    "BatteryHeuristicParameters": ".simple_battery_dispatch_heuristic",
+    "SimpleBatteryDispatchHeuristic": ".simple_battery_dispatch_heuristic",
+    "simple_heuristic_dispatch": ".simple_battery_dispatch_heuristic",
+}
+__all__ = list(_exports)
+__getattr__ = lazy_exports(__name__, _exports)
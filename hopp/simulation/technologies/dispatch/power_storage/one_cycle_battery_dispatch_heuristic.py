@@ -1,11 +1,215 @@
-from typing import Tuple
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
 import pyomo.environ as pyomo
 from pyomo.environ import units as u
 
 import PySAM.BatteryStateful as BatteryModel
 import PySAM.Singleowner as Singleowner
 
-from hopp.simulation.technologies.dispatch.power_storage.simple_battery_dispatch_heuristic import SimpleBatteryDispatchHeuristic
+from hopp.simulation.technologies.dispatch.power_storage.simple_battery_dispatch_heuristic import (
+    BatteryHeuristicParameters,
+    SimpleBatteryDispatchHeuristic,
+    power_fraction_limits,
+    soc_trajectory,
+)
+
+
+def full_cycle_duration(battery: BatteryHeuristicParameters) -> Tuple[float, float]:
+    """ Calculates discharge and charge hours required to fully cycle the battery."""
+    true_capacity = (battery.maximum_soc - battery.minimum_soc) * battery.capacity / 100.0
+
+    n_discharge = true_capacity / (1/(battery.discharge_efficiency/100.) * battery.maximum_power)
+    n_charge = true_capacity / (battery.charge_efficiency / 100. * battery.maximum_power)
+    return n_discharge, n_charge
+
+
+def first_soc_infeasibility(fixed_dispatch: np.ndarray,
+                            initial_soc: float,
+                            battery: BatteryHeuristicParameters) -> Optional[int]:
+    """Index of the first time step of a normalized dispatch at which the state-of-charge leaves its limits, or None
+    if the dispatch is feasible.
+
+    :param initial_soc: state-of-charge [-] before the first time step
+    """
+    return _first_infeasibility(soc_trajectory(fixed_dispatch, initial_soc, battery), battery)
+
+
+def _dispatch_in_order(remaining: float,
+                       next_idx: int,
+                       order: np.ndarray,
+                       limits: np.ndarray,
+                       time_duration: float,
+                       fixed_dispatch: np.ndarray,
+                       sign: float) -> int:
+    """Dispatches `remaining` hours of full power over the periods of `order` from `next_idx` on, each up to its power
+    fraction limit, until none remains.
+
+    Periods are set to their limit as long as the remaining operation exceeds it, which is a cumulative sum over the
+    ordered periods. The first period that the remaining operation doesn't exceed is set to what remains.
+
+    :param sign: -1 to charge and 1 to discharge
+    :return: index in `order` of the next period to be tried
+    """
+    while remaining > 0 and next_idx < len(order):
+        idx = order[next_idx:]
+        limit = limits[idx]
+        # remaining operation before each period, if all the previous ones are at their limit
+        remaining_before = np.cumsum(np.concatenate(([remaining], - limit * time_duration)))
+        at_limit = limit < remaining_before[:-1]
+        n_at_limit = len(idx) if at_limit.all() else int(np.argmin(at_limit))
+
+        fixed_dispatch[idx[:n_at_limit]] = sign * limit[:n_at_limit]
+        remaining = remaining_before[n_at_limit]
+        next_idx += n_at_limit
+        if n_at_limit < len(idx) and remaining > 0:
+            fixed_dispatch[idx[n_at_limit]] = sign * remaining
+            remaining -= remaining * time_duration
+            next_idx += 1
+    return next_idx
+
+
+def _dispatch_days_in_order(remaining: float,
+                            order: np.ndarray,
+                            limits: np.ndarray,
+                            time_duration: float,
+                            fixed_dispatch: np.ndarray,
+                            sign: float) -> np.ndarray:
+    """`_dispatch_in_order` from the first period of each day, at once for arrays of shape (days, periods)
+
+    :return: index in `order` of the next period to be tried on each day
+    """
+    n_days, n_periods = order.shape
+    days = np.arange(n_days)[:, None]
+    limit = limits[days, order]
+    remaining_before = np.cumsum(np.hstack((np.full((n_days, 1), remaining), - limit * time_duration)), axis=1)
+    at_limit = limit < remaining_before[:, :-1]
+    n_at_limit = np.where(at_limit.all(axis=1), n_periods, np.argmin(at_limit, axis=1))
+
+    is_at_limit = np.arange(n_periods) < n_at_limit[:, None]
+    fixed_dispatch[days, order] = np.where(is_at_limit, sign * limit, fixed_dispatch[days, order])
+    remaining = remaining_before[days[:, 0], n_at_limit]
+    next_idx = n_at_limit
+
+    # what remains goes to the next period, the rest of the day being dispatched on its own if some still remains
+    for d in np.flatnonzero((n_at_limit < n_periods) & (remaining > 0)):
+        fixed_dispatch[d, order[d, n_at_limit[d]]] = sign * remaining[d]
+        next_idx[d] = _dispatch_in_order(remaining[d] - remaining[d] * time_duration, n_at_limit[d] + 1,
+                                         order[d], limits[d], time_duration, fixed_dispatch[d], sign)
+    return next_idx
+
+
+def _one_cycle_days(prices: np.ndarray,
+                    gen: np.ndarray,
+                    max_charge_fraction: np.ndarray,
+                    max_discharge_fraction: np.ndarray,
+                    initial_soc: float,
+                    battery: BatteryHeuristicParameters) -> Tuple[np.ndarray, np.ndarray]:
+    """One cycle heuristic dispatch and state-of-charge of consecutive days, arrays being of shape (days, periods)"""
+    n_periods = prices.shape[1]
+    time_duration = battery.time_duration
+    # lowest prices first, then highest generation, then time step
+    order = np.lexsort((-gen, prices), axis=1)
+    reverse_order = order[:, ::-1]
+
+    # Set initial fixed dispatch of all days
+    discharge_time, charge_time = full_cycle_duration(battery)
+    fixed_dispatch = np.zeros(prices.shape)
+    next_charge_idx = _dispatch_days_in_order(charge_time, order, max_charge_fraction, time_duration,
+                                              fixed_dispatch, -1.0)
+    next_discharge_idx = _dispatch_days_in_order(discharge_time, reverse_order, max_discharge_fraction,
+                                                 time_duration, fixed_dispatch, 1.0)
+
+    # test feasibility of each day from the SOC at the end of the previous one, and shift the operation at the first
+    # infeasibility to the next sorted price periods until feasible
+    soc = np.zeros(prices.shape)
+    soc0 = initial_soc
+    for d, day_dispatch in enumerate(fixed_dispatch):
+        soc[d] = soc_trajectory(day_dispatch, soc0, battery)
+        idx_infeasible = _first_infeasibility(soc[d], battery)
+        while idx_infeasible is not None:
+            infeasible_value = day_dispatch[idx_infeasible]
+            if infeasible_value > 0:  # Discharging
+                day_dispatch[idx_infeasible] = 0
+                if next_discharge_idx[d] < n_periods / 2:
+                    next_discharge_idx[d] = _dispatch_in_order(infeasible_value * time_duration,
+                                                               next_discharge_idx[d], reverse_order[d],
+                                                               max_discharge_fraction[d], time_duration,
+                                                               day_dispatch, 1.0)
+            elif infeasible_value < 0:  # Charging
+                day_dispatch[idx_infeasible] = 0
+                if next_charge_idx[d] < n_periods / 2:  # TODO: maybe too restrictive
+                    next_charge_idx[d] = _dispatch_in_order(-infeasible_value * time_duration,
+                                                            next_charge_idx[d], order[d],
+                                                            max_charge_fraction[d], time_duration,
+                                                            day_dispatch, -1.0)
+            else:
+                # the initial state-of-charge is out of limits, which no operation can fix
+                break
+            soc[d] = soc_trajectory(day_dispatch, soc0, battery)
+            idx_infeasible = _first_infeasibility(soc[d], battery)
+        soc0 = soc[d, -1]
+    return fixed_dispatch, soc
+
+
+def _first_infeasibility(soc: np.ndarray, battery: BatteryHeuristicParameters) -> Optional[int]:
+    soc = np.round(soc, 6) * 100.
+    infeasible = np.flatnonzero((soc < battery.minimum_soc) | (soc > battery.maximum_soc))
+    return int(infeasible[0]) if len(infeasible) else None
+
+
+def one_cycle_dispatch(prices: Sequence,
+                       gen: Sequence,
+                       max_charge_fraction: np.ndarray,
+                       max_discharge_fraction: np.ndarray,
+                       initial_soc: float,
+                       battery: BatteryHeuristicParameters) -> np.ndarray:
+    """Normalized battery dispatch [-1, 1] (Charging (-), Discharging (+)) of one cycle over the time steps, see
+    `OneCycleBatteryDispatchHeuristic._heuristic_method`.
+
+    :param prices: electricity prices, of which the lowest are used to charge and the highest to discharge
+    :param gen: available generation [MW], whose highest values are used first at equal prices
+    :param max_charge_fraction: charge power fraction limits
+    :param max_discharge_fraction: discharge power fraction limits
+    :param initial_soc: state-of-charge [-] before the first time step
+    """
+    days = [np.asarray(x, dtype=float)[None, :] for x in (prices, gen, max_charge_fraction, max_discharge_fraction)]
+    return _one_cycle_days(*days, initial_soc, battery)[0][0]
+
+
+def one_cycle_heuristic_dispatch(prices: Sequence,
+                                 gen: Sequence,
+                                 grid_limit: Sequence,
+                                 initial_soc: float,
+                                 battery: BatteryHeuristicParameters,
+                                 n_periods_per_day: int = 24) -> Tuple[np.ndarray, np.ndarray]:
+    """One cycle per day heuristic battery dispatch over many days, e.g. a whole year, without a Pyomo model.
+
+    Each day starts from the state-of-charge at the end of the previous one.
+
+    :param prices: electricity prices
+    :param gen: available generation [MW]
+    :param grid_limit: grid transmission limit [MW]
+    :param initial_soc: state-of-charge [-] before the first time step
+    :param n_periods_per_day: number of time steps per day, the last day being shorter if they don't divide the
+        time steps
+    :return: normalized dispatch [-1, 1] (Charging (-), Discharging (+)), and state-of-charge [-]
+    """
+    prices = np.asarray(prices, dtype=float)
+    gen = np.asarray(gen, dtype=float)
+    max_charge_fraction, max_discharge_fraction = power_fraction_limits(gen, grid_limit, battery.maximum_power)
+
+    n_full = len(prices) - len(prices) % n_periods_per_day
+    inputs = (prices, gen, max_charge_fraction, max_discharge_fraction)
+    fixed_dispatch, soc = _one_cycle_days(*(x[:n_full].reshape(-1, n_periods_per_day) for x in inputs),
+                                          initial_soc, battery)
+    fixed_dispatch, soc = fixed_dispatch.ravel(), soc.ravel()
+    if n_full < len(prices):
+        last_dispatch, last_soc = _one_cycle_days(*(x[None, n_full:] for x in inputs),
+                                                  soc[-1] if n_full else initial_soc, battery)
+        fixed_dispatch = np.concatenate((fixed_dispatch, last_dispatch[0]))
+        soc = np.concatenate((soc, last_soc[0]))
+    return fixed_dispatch, soc
 
 
 class OneCycleBatteryDispatchHeuristic(SimpleBatteryDispatchHeuristic):
@@ -45,107 +249,24 @@ class OneCycleBatteryDispatchHeuristic(SimpleBatteryDispatchHeuristic):
         if sum(self.prices) == 0.0 and max(self.prices) == 0.0:
             raise ValueError("prices must be set before calling heuristic method.")
 
-        discharge_time, charge_time = self._get_duration_battery_full_cycle()
-        fixed_dispatch = [0.0] * len(self.prices)
-        price_and_gen = zip(range(0, len(self.prices)), self.prices, gen)
-        sorted_prices = sorted(price_and_gen, key=lambda i: i[2], reverse=True)
-        sorted_prices = sorted(sorted_prices, key=lambda i: i[1])
-
-        # Set initial fixed dispatch
-        fixed_dispatch, next_charge_idx = self._charge_battery(charge_time, 0,
-                                                               sorted_prices,
-                                                               fixed_dispatch)
-
-        fixed_dispatch, next_discharge_idx = self._discharge_battery(discharge_time, 0,
-                                                                     sorted_prices,
-                                                                     fixed_dispatch)
-
-        # test feasibility and find infeasibility
-        feasible = self.test_soc_feasibility(fixed_dispatch)
-        while not feasible[0]:
-            # TODO: Improve algorithm
-            idx_infeasible = feasible[1]
-            infeasible_value = fixed_dispatch[idx_infeasible]
-            if infeasible_value > 0:  # Discharging
-                discharge_remaining = fixed_dispatch[idx_infeasible] * self.time_duration[idx_infeasible]
-                fixed_dispatch[idx_infeasible] = 0
-                if next_discharge_idx < len(sorted_prices)/2:
-                    fixed_dispatch, next_discharge_idx = self._discharge_battery(discharge_remaining,
-                                                                                 next_discharge_idx,
-                                                                                 sorted_prices,
-                                                                                 fixed_dispatch)
-            elif infeasible_value < 0:    # Charging
-                charge_remaining = -fixed_dispatch[idx_infeasible] * self.time_duration[idx_infeasible]
-                fixed_dispatch[idx_infeasible] = 0
-                if next_charge_idx < len(sorted_prices)/2:  # TODO: maybe too restrictive
-                    fixed_dispatch, next_charge_idx = self._charge_battery(charge_remaining,
-                                                                           next_charge_idx,
-                                                                           sorted_prices,
-                                                                           fixed_dispatch)
-            feasible = self.test_soc_feasibility(fixed_dispatch)
-
-        self._fixed_dispatch = fixed_dispatch
-
-    def _discharge_battery(self, discharge_remaining, next_discharge_idx, sorted_prices, fixed_dispatch):
-        """Discharge battery using the remaining discharge and the next best discharge period.
-
-        Returns adjusted fixed_dispatch and next discharge index to be tried."""
-        period_count = next_discharge_idx
-        while discharge_remaining > 0:
-            if period_count < len(sorted_prices):
-                idx = sorted_prices[-(period_count + 1)][0]
-                if self.max_discharge_fraction[idx] < discharge_remaining:
-                    fixed_dispatch[idx] = self.max_discharge_fraction[idx]
-                else:
-                    fixed_dispatch[idx] = discharge_remaining
-                # update count and remaining discharge
-                discharge_remaining -= fixed_dispatch[idx] * self.time_duration[idx]
-                period_count += 1
-            else:
-                break
-        next_discharge_idx = period_count
-        return fixed_dispatch, next_discharge_idx
-
-    def _charge_battery(self, charge_remaining, next_charge_idx, sorted_prices, fixed_dispatch):
-        """Charge battery using the remaining charge and the next best charge period.
-
-        Returns adjusted fixed_dispatch and next charge index to be tried."""
-        period_count = next_charge_idx
-        while charge_remaining > 0:
-            if period_count < len(sorted_prices):
-                idx = sorted_prices[period_count][0]
-                if self.max_charge_fraction[idx] < charge_remaining:
-                    fixed_dispatch[idx] = - self.max_charge_fraction[idx]
-                else:
-                    fixed_dispatch[idx] = - charge_remaining
-                # update count and remaining discharge
-                charge_remaining += fixed_dispatch[idx] * self.time_duration[idx]
-                period_count += 1
-            else:
-                break
-        next_charge_idx = period_count
-        return fixed_dispatch, next_charge_idx
+        self._fixed_dispatch = one_cycle_dispatch(self.prices, gen,
+                                                  self.max_charge_fraction,
+                                                  self.max_discharge_fraction,
+                                                  self.model.initial_soc.value,
+                                                  BatteryHeuristicParameters.from_dispatch(self)).tolist()
 
     def _get_duration_battery_full_cycle(self) -> Tuple[float, float]:
         """ Calculates discharge and charge hours required to fully cycle the battery."""
-        true_capacity = (self.maximum_soc - self.minimum_soc) * self.capacity / 100.0
-
-        n_discharge = true_capacity / (1/(self.discharge_efficiency/100.) * self.maximum_power)
-        n_charge = true_capacity / (self.charge_efficiency / 100. * self.maximum_power)
-        return n_discharge, n_charge
+        return full_cycle_duration(BatteryHeuristicParameters.from_dispatch(self))
 
     def test_soc_feasibility(self, fixed_dispatch) -> Tuple[bool, int]:
-        """Steps through fixed_dispatch and test SOC feasibility.
+        """Tests SOC feasibility of fixed_dispatch.
 
         If fixed_dispatch is infeasible, return index of first infeasibility operation.
         """
-        soc0 = self.model.initial_soc.value
-        for idx, fd in enumerate(fixed_dispatch):
-            soc = self.update_soc(fd, soc0)
-            if round(soc, 6)*100. < self.minimum_soc or round(soc, 6)*100. > self.maximum_soc:
-                return False, idx
-            soc0 = soc
-        return True, None
+        idx_infeasible = first_soc_infeasibility(fixed_dispatch, self.model.initial_soc.value,
+                                                 BatteryHeuristicParameters.from_dispatch(self))
+        return idx_infeasible is None, idx_infeasible
 
     @property
     def prices(self) -> list:
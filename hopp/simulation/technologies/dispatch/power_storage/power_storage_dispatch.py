@@ -220,7 +220,7 @@ class PowerStorageDispatch(Dispatch):
         ##################################
         # Parameters                     #
         ##################################
-        self.timesteps_per_day = 24 / pyomo.value(self.blocks[0].time_duration)
+        self.timesteps_per_day = 24 * self.options.steps_per_hour
         self.model.days = pyomo.RangeSet(0, int(len(self.blocks)) / self.timesteps_per_day - 1)
         self.model.lifecycle_cost = pyomo.Param(
             doc="Lifecycle cost of " + self.block_set_name + " [$/lifecycle]",
@@ -1,3 +1,7 @@
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
 import pyomo.environ as pyomo
 from pyomo.environ import units as u
 
@@ -7,6 +11,116 @@ import PySAM.Singleowner as Singleowner
 from hopp.simulation.technologies.dispatch.power_storage.simple_battery_dispatch import SimpleBatteryDispatch
 
 
+@dataclass
+class BatteryHeuristicParameters:
+    """Battery parameters of the heuristic dispatch, which runs on arrays without a Pyomo model.
+
+    :param maximum_power: maximum charge and discharge power [MW]
+    :param capacity: energy capacity [MWh]
+    :param minimum_soc: minimum state-of-charge [%]
+    :param maximum_soc: maximum state-of-charge [%]
+    :param charge_efficiency: charge efficiency [%]
+    :param discharge_efficiency: discharge efficiency [%]
+    :param time_duration: time step [hour]
+    """
+    maximum_power: float
+    capacity: float
+    minimum_soc: float
+    maximum_soc: float
+    charge_efficiency: float
+    discharge_efficiency: float
+    time_duration: float = 1.0
+
+    @classmethod
+    def from_dispatch(cls, dispatch: SimpleBatteryDispatch) -> "BatteryHeuristicParameters":
+        """Parameters of a battery dispatch model, whose SOC update uses the duration of its first time step"""
+        return cls(maximum_power=dispatch.maximum_power,
+                   capacity=dispatch.capacity,
+                   minimum_soc=dispatch.minimum_soc,
+                   maximum_soc=dispatch.maximum_soc,
+                   charge_efficiency=dispatch.charge_efficiency,
+                   discharge_efficiency=dispatch.discharge_efficiency,
+                   time_duration=dispatch.time_duration[0])
+
+
+def power_fraction_limits(gen: Sequence, grid_limit: Sequence, maximum_power: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Battery charge and discharge power fraction limits based on available generation and grid capacity,
+    respectively, bounded to (0, 1).
+
+    NOTE: This assumes that battery cannot be charged by the grid.
+
+    :return: maximum charge and discharge fractions
+    """
+    gen = np.asarray(gen, dtype=float)
+    max_charge_fraction = np.clip(gen / maximum_power, 0.0, 1.0)
+    max_discharge_fraction = np.clip((np.asarray(grid_limit, dtype=float) - gen) / maximum_power, 0.0, 1.0)
+    return max_charge_fraction, max_discharge_fraction
+
+
+def enforce_power_fraction_limits(fixed_dispatch: Sequence,
+                                  max_charge_fraction: np.ndarray,
+                                  max_discharge_fraction: np.ndarray) -> np.ndarray:
+    """Limits normalized dispatch [-1, 1] (Charging (-), Discharging (+)) to the charge and discharge fractions"""
+    return np.clip(np.asarray(fixed_dispatch, dtype=float), -max_charge_fraction, max_discharge_fraction)
+
+
+def soc_changes(fixed_dispatch: np.ndarray, battery: BatteryHeuristicParameters) -> np.ndarray:
+    """Change of state-of-charge [-] over each time step of a normalized dispatch [-1, 1] (Charging (-),
+    Discharging (+))"""
+    fixed_dispatch = np.asarray(fixed_dispatch, dtype=float)
+    power = np.abs(fixed_dispatch) * battery.maximum_power
+    discharge = battery.time_duration * (1 / (battery.discharge_efficiency / 100.) * power) / battery.capacity
+    charge = battery.time_duration * (battery.charge_efficiency / 100. * power) / battery.capacity
+    return np.where(fixed_dispatch > 0.0, -discharge, np.where(fixed_dispatch < 0.0, charge, 0.0))
+
+
+def soc_trajectory(fixed_dispatch: np.ndarray, initial_soc: float, battery: BatteryHeuristicParameters) -> np.ndarray:
+    """State-of-charge [-] at the end of each time step of a normalized dispatch, bounded to (0, 1) at every step.
+
+    The SOC is the cumulative sum of its changes, accumulated over windows of doubling length. It is re-accumulated
+    from each step at which it leaves (0, 1), once bounded.
+
+    :param fixed_dispatch: normalized dispatch [-1, 1] (Charging (-), Discharging (+))
+    :param initial_soc: state-of-charge [-] before the first time step
+    """
+    delta = soc_changes(fixed_dispatch, battery)
+    soc = np.empty(len(delta))
+    start, soc0, window = 0, initial_soc, 32
+    while start < len(soc):
+        end = min(len(soc), start + window)
+        segment = np.cumsum(np.concatenate(([soc0], delta[start:end])))[1:]
+        out_of_bounds = np.flatnonzero((segment < 0.0) | (segment > 1.0))
+        if len(out_of_bounds) == 0:
+            soc[start:end] = segment
+            start, soc0, window = end, segment[-1], 2 * window
+            continue
+        n_within = out_of_bounds[0]
+        soc[start:start + n_within] = segment[:n_within]
+        soc0 = min(1.0, max(0.0, segment[n_within]))
+        soc[start + n_within] = soc0
+        start, window = start + n_within + 1, 32
+    return soc
+
+
+def simple_heuristic_dispatch(fixed_dispatch: Sequence,
+                              gen: Sequence,
+                              grid_limit: Sequence,
+                              initial_soc: float,
+                              battery: BatteryHeuristicParameters) -> Tuple[np.ndarray, np.ndarray]:
+    """Heuristic battery dispatch of `SimpleBatteryDispatchHeuristic` over any number of time steps, e.g. a whole
+    year, without a Pyomo model.
+
+    :param fixed_dispatch: user normalized dispatch [-1, 1] (Charging (-), Discharging (+))
+    :param gen: available generation [MW]
+    :param grid_limit: grid transmission limit [MW]
+    :param initial_soc: state-of-charge [-] before the first time step
+    :return: normalized dispatch limited by available generation and grid limits, and state-of-charge [-]
+    """
+    max_charge_fraction, max_discharge_fraction = power_fraction_limits(gen, grid_limit, battery.maximum_power)
+    dispatch = enforce_power_fraction_limits(fixed_dispatch, max_charge_fraction, max_discharge_fraction)
+    return dispatch, soc_trajectory(dispatch, initial_soc, battery)
+
+
 class SimpleBatteryDispatchHeuristic(SimpleBatteryDispatch):
     """Fixes battery dispatch operations based on user input.
 
@@ -65,10 +179,8 @@ class SimpleBatteryDispatchHeuristic(SimpleBatteryDispatch):
 
         NOTE: This method assumes that battery cannot be charged by the grid.
         """
-        for t in self.blocks.index_set():
-            self.max_charge_fraction[t] = self.enforce_power_fraction_simple_bounds(gen[t] / self.maximum_power)
-            self.max_discharge_fraction[t] = self.enforce_power_fraction_simple_bounds((grid_limit[t] - gen[t])
-                                                                                       / self.maximum_power)
+        self.max_charge_fraction, self.max_discharge_fraction = power_fraction_limits(gen, grid_limit,
+                                                                                      self.maximum_power)
 
     @staticmethod
     def enforce_power_fraction_simple_bounds(power_fraction) -> float:
@@ -80,16 +192,7 @@ class SimpleBatteryDispatchHeuristic(SimpleBatteryDispatch):
         return power_fraction
 
     def update_soc(self, power_fraction, soc0) -> float:
-        if power_fraction > 0.0:
-            discharge_power = power_fraction * self.maximum_power
-            soc = soc0 - self.time_duration[0] * (1/(self.discharge_efficiency/100.) * discharge_power) / self.capacity
-        elif power_fraction < 0.0:
-            charge_power = - power_fraction * self.maximum_power
-            soc = soc0 + self.time_duration[0] * (self.charge_efficiency / 100. * charge_power) / self.capacity
-        else:
-            soc = soc0
-        soc = max(0, min(1, soc))
-        return soc
+        return float(soc_trajectory([power_fraction], soc0, BatteryHeuristicParameters.from_dispatch(self))[0])
 
     def _heuristic_method(self, _):
         """ Does specific heuristic method to fix battery dispatch."""
@@ -97,35 +200,21 @@ class SimpleBatteryDispatchHeuristic(SimpleBatteryDispatch):
 
     def _enforce_power_fraction_limits(self):
         """ Enforces battery power fraction limits and sets _fixed_dispatch attribute"""
-        for t in self.blocks.index_set():
-            fd = self.user_fixed_dispatch[t]
-            if fd > 0.0:    # Discharging
-                if fd > self.max_discharge_fraction[t]:
-                    fd = self.max_discharge_fraction[t]
-            elif fd < 0.0:  # Charging
-                if - fd > self.max_charge_fraction[t]:
-                    fd = - self.max_charge_fraction[t]
-            self._fixed_dispatch[t] = fd
+        self._fixed_dispatch = enforce_power_fraction_limits(self.user_fixed_dispatch,
+                                                             self.max_charge_fraction,
+                                                             self.max_discharge_fraction).tolist()
 
     def _fix_dispatch_model_variables(self):
-        soc0 = self.model.initial_soc.value
-        for t in self.blocks.index_set():
-            dispatch_factor = self._fixed_dispatch[t]
-            self.blocks[t].soc.fix(self.update_soc(dispatch_factor, soc0))
-            soc0 = self.blocks[t].soc.value
-
-            if dispatch_factor == 0.0:
-                # Do nothing
-                self.blocks[t].charge_power.fix(0.0)
-                self.blocks[t].discharge_power.fix(0.0)
-            elif dispatch_factor > 0.0:
-                # Discharging
-                self.blocks[t].charge_power.fix(0.0)
-                self.blocks[t].discharge_power.fix(dispatch_factor * self.maximum_power)
-            elif dispatch_factor < 0.0:
-                # Charging
-                self.blocks[t].discharge_power.fix(0.0)
-                self.blocks[t].charge_power.fix(- dispatch_factor * self.maximum_power)
+        battery = BatteryHeuristicParameters.from_dispatch(self)
+        dispatch_factor = np.asarray(self._fixed_dispatch, dtype=float)
+        soc = soc_trajectory(dispatch_factor, self.model.initial_soc.value, battery)
+        charge_power = np.where(dispatch_factor < 0.0, - dispatch_factor * battery.maximum_power, 0.0)
+        discharge_power = np.where(dispatch_factor > 0.0, dispatch_factor * battery.maximum_power, 0.0)
+        for t, block_soc, charge, discharge in zip(self.blocks.index_set(), soc.tolist(), charge_power.tolist(),
+                                                   discharge_power.tolist()):
+            self.blocks[t].soc.fix(block_soc)
+            self.blocks[t].charge_power.fix(charge)
+            self.blocks[t].discharge_power.fix(discharge)
 
     @property
     def fixed_dispatch(self) -> list:
@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING, Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional, Sequence
+import numpy as np
 import PySAM.MhkCosts as MhkCost
 
 from attrs import define, field
@@ -10,6 +11,9 @@ from hopp.utilities.validators import gt_zero, range_val
 if TYPE_CHECKING:
     from hopp.simulation.technologies.wave.mhk_wave_plant import MHKConfig
 
+# outputs of the PySAM cost module by its inputs, shared by all cost models of this process
+_cost_outputs_cache: Dict[tuple, dict] = {}
+
 @define
 class MHKCostModelInputs(BaseClass):
     """
@@ -63,6 +67,7 @@ class MHKCosts(BaseClass):
     _device_spacing: float = field(init=False)
     _row_spacing: float = field(init=False)
     _cable_sys_overbuild: float = field(init=False)
+    _cost_outputs: Optional[dict] = field(init=False, default=None)
 
     def __attrs_post_init__(self):
         self._cost_model = MhkCost.new()
@@ -110,30 +115,41 @@ class MHKCosts(BaseClass):
     
         self.initialize()
 
+    def _layout_inputs(self, number_devices: int) -> dict:
+        """
+        Inputs of the PySAM cost module that depend on the number of devices
+        """
+        if number_devices < self._number_rows:
+            raise Exception("number_of_rows exceeds number_devices")
+        if not (number_devices / self._number_rows).is_integer():
+            raise Exception("Layout must be square or rectangular. Modify 'number_rows' or 'num_devices'.")
+        devices_per_row = number_devices / self._number_rows
+        return {
+            'system_capacity': self._device_rated_power * number_devices,
+            'devices_per_row': devices_per_row,
+            # Inter-array cable length, m
+            # The total length of cable used within the array of devices
+            'inter_array_cable_length': (devices_per_row - 1) * (self._device_spacing * self._number_rows)
+                                        + self._row_spacing * (self._number_rows - 1),
+            # Riser cable length, m
+            # The length of cable from the seabed to the water surfacethat
+            # connects the floating device to the seabed cabling.
+            # Applies only to floating array
+            'riser_cable_length': 1.5 * self._water_depth * number_devices * (1 + self._cable_sys_overbuild / 100),
+        }
+
     def initialize(self):
         self._cost_model.value("device_rated_power", self._device_rated_power)
-        self._cost_model.value("system_capacity", self._cost_model.value("device_rated_power") * self._number_devices) 
         
         if self._row_spacing is None:
             raise AttributeError("row_spacing must be provided")
 
-        if self._number_devices < self._number_rows:
-            raise Exception("number_of_rows exceeds number_devices")
-        else:
-            if (self._number_devices/self._number_rows).is_integer():
-                self._cost_model.value("devices_per_row", \
-                    self._number_devices / self._number_rows)
-            else:
-                raise Exception("Layout must be square or rectangular. Modify 'number_rows' or 'num_devices'.")
+        layout_inputs = self._layout_inputs(self._number_devices)
+        self._cost_model.MHKCosts.assign(layout_inputs)
         self._cost_model.value("lib_wave_device", self._ref_model_num)
         self._cost_model.value("marine_energy_tech", 0)
         self._cost_model.value("library_or_input_wec", 0)
-        # Inter-array cable length, m
-        # The total length of cable used within the array of devices
-        self._array_cable_length = (self._cost_model.value("devices_per_row") -1) * \
-            (self._device_spacing * self._number_rows) \
-            + self._row_spacing * (self._number_rows-1)
-        self._cost_model.value("inter_array_cable_length", self._array_cable_length)
+        self._array_cable_length = layout_inputs['inter_array_cable_length']
 
         # Export cable length, m
         # The length of cable between the array and onshore grid connection point
@@ -141,13 +157,7 @@ class MHKCosts(BaseClass):
             (1 + self._cable_sys_overbuild/100)
         self._cost_model.value("export_cable_length", self._export_cable_length)
 
-        #Riser cable length, m
-        # The length of cable from the seabed to the water surfacethat 
-        # connects the floating device to the seabed cabling.
-        # Applies only to floating array
-        self.riser_cable_length = 1.5 * self._water_depth * self._number_devices * \
-            (1 + self._cable_sys_overbuild/100)
-        self._cost_model.value("riser_cable_length", self.riser_cable_length)
+        self.riser_cable_length = layout_inputs['riser_cable_length']
 
     def system_capacity_by_num_devices(self, wave_size_kw):
         """
@@ -158,9 +168,39 @@ class MHKCosts(BaseClass):
             self._number_devices = new_num_devices
             self.initialize()
 
+    @staticmethod
+    def _run_cost_model(cost_model: MhkCost.MhkCosts) -> dict:
+        # runs the PySAM cost module once per distinct set of inputs
+        key = tuple(sorted(cost_model.MHKCosts.export().items()))
+        if key not in _cost_outputs_cache:
+            # TODO: what is the correct int_verbosity?
+            cost_model.execute(1)
+            _cost_outputs_cache[key] = cost_model.Outputs.export()
+        return _cost_outputs_cache[key]
+
     def simulate_costs(self):
-        # TODO: what is the correct int_verbosity?
-        self._cost_model.execute(1)
+        self._cost_outputs = self._run_cost_model(self._cost_model)
+
+    def cost_curve(self, number_devices: Sequence[int]) -> Dict[str, np.ndarray]:
+        """
+        Cost outputs for each number of devices, the other inputs being those of this cost model.
+
+        Each point is computed once per reference model, device rating, layout and cost inputs in this process, so
+        that sizing sweeps reuse the curve rather than re-running the cost module for every size.
+
+        Args:
+            number_devices: numbers of devices, each fitting the layout's `number_rows`
+
+        Returns:
+            dictionary of the cost outputs, with one value per number of devices
+        """
+        cost_model = MhkCost.new()
+        cost_model.MHKCosts.assign(self._cost_model.MHKCosts.export())
+        points = []
+        for n in number_devices:
+            cost_model.MHKCosts.assign(self._layout_inputs(n))
+            points.append(self._run_cost_model(cost_model))
+        return {k: np.array([point[k] for point in points]) for k in points[0]} if points else {}
 
     @property
     def device_rated_power(self):
@@ -219,4 +259,6 @@ class MHKCosts(BaseClass):
     ### Output dictionary of costs
     @property
     def cost_outputs(self) -> dict:
-        return self._cost_model.Outputs.export()
\ No newline at end of file
+        if self._cost_outputs is None:
+            return self._cost_model.Outputs.export()
+        return dict(self._cost_outputs)
\ No newline at end of file
@@ -10,6 +10,7 @@ from hopp.simulation.technologies.power_source import PowerSource
 from hopp.simulation.base import BaseClass
 from hopp.simulation.technologies.financial import FinancialModelType, CustomFinancialModel
 from hopp.type_dec import NDArrayFloat
+from hopp.utilities.utilities import RepeatedYearArray
 from hopp.utilities.validators import gt_zero
 
 
@@ -41,12 +42,15 @@ class Grid(PowerSource):
     config: GridConfig
 
     # TODO: figure out if this is the best place for these
-    missed_load: NDArrayFloat = field(init=False)
+    missed_load: Union[NDArrayFloat, RepeatedYearArray] = field(init=False)
     missed_load_percentage: float = field(init=False, default=0.)
-    schedule_curtailed: NDArrayFloat = field(init=False)
+    schedule_curtailed: Union[NDArrayFloat, RepeatedYearArray] = field(init=False)
     schedule_curtailed_percentage: float = field(init=False, default=0.)
     total_gen_max_feasible_year1: NDArrayFloat = field(init=False)
 
+    # the grid model executes faster than its inputs are compared
+    cache_simulations = False
+
     def __attrs_post_init__(self):
         """
         Class that houses the hybrid system performance and financials. Enforces interconnection and curtailment
@@ -88,7 +92,7 @@ class Grid(PowerSource):
         # TODO: update args to use numpy types, once PowerSource is refactored
         self,
         hybrid_size_kw: float, 
-        total_gen: Union[List[float], NDArrayFloat], 
+        total_gen: Union[List[float], NDArrayFloat, RepeatedYearArray], 
         project_life: int, 
         lifetime_sim: bool, 
         total_gen_max_feasible_year1: Union[List[float], NDArrayFloat]
@@ -100,7 +104,8 @@ class Grid(PowerSource):
 
         Args:
             hybrid_size_kw: Hybrid system capacity [kW]
-            total_gen: Hybrid system generation profile [kWh]
+            total_gen: Hybrid system generation profile [kWh], which may repeat a single year
+                as a `RepeatedYearArray`
             project_life: Number of year in the analysis period (expected project
                 lifetime) [years]
             lifetime_sim: For simulation modules which support simulating each year of
@@ -112,19 +117,32 @@ class Grid(PowerSource):
         """
         if self.site.follow_desired_schedule:
             # Desired schedule sets the upper bound of the system output, any over generation is curtailed
-            lifetime_schedule: NDArrayFloat = np.tile([
-                x * 1e3 for x in self.site.desired_schedule],
-                int(project_life / (len(self.site.desired_schedule) // self.site.n_timesteps))
-            )
-            self.generation_profile = list(np.minimum(total_gen, lifetime_schedule)) # TODO: remove list() cast once parent class uses numpy 
-
-            self.missed_load = np.array([schedule - gen if gen > 0 else schedule for (schedule, gen) in
-                                     zip(lifetime_schedule, self.generation_profile)])
-            self.missed_load_percentage = sum(self.missed_load)/sum(lifetime_schedule)
-
-            self.schedule_curtailed = np.array([gen - schedule if gen > schedule else 0. for (gen, schedule) in
-                                            zip(total_gen, lifetime_schedule)])
-            self.schedule_curtailed_percentage = sum(self.schedule_curtailed)/sum(lifetime_schedule)
+            desired_schedule = np.asarray(self.site.desired_schedule) * 1e3
+            if isinstance(total_gen, RepeatedYearArray) and len(desired_schedule) == self.site.n_timesteps:
+                # the generation and schedule repeat a single year, so the schedule is only followed over that year
+                generation_profile, missed_load, schedule_curtailed = self.apply_desired_schedule(
+                    total_gen.year, desired_schedule
+                )
+                self.generation_profile = RepeatedYearArray(generation_profile, project_life)
+                self.missed_load = RepeatedYearArray(missed_load, project_life)
+                self.schedule_curtailed = RepeatedYearArray(schedule_curtailed, project_life)
+                schedule_total = desired_schedule.sum()
+                self.missed_load_percentage = self.missed_load.year.sum() / schedule_total
+                self.schedule_curtailed_percentage = self.schedule_curtailed.year.sum() / schedule_total
+            else:
+                lifetime_schedule: NDArrayFloat = np.tile(
+                    desired_schedule,
+                    int(project_life / (len(desired_schedule) // self.site.n_timesteps))
+                )
+                generation_profile, self.missed_load, self.schedule_curtailed = self.apply_desired_schedule(
+                    np.asarray(total_gen), lifetime_schedule
+                )
+                self.generation_profile = list(generation_profile) # TODO: remove list() cast once parent class uses numpy 
+                self.missed_load_percentage = sum(self.missed_load)/sum(lifetime_schedule)
+                self.schedule_curtailed_percentage = sum(self.schedule_curtailed)/sum(lifetime_schedule)
+        elif isinstance(total_gen, RepeatedYearArray):
+            # PySAM is set from the elements of the single year, which the repeated years share
+            self.generation_profile = total_gen
         else:
             self.generation_profile = list(total_gen)
 
@@ -139,6 +157,23 @@ class Grid(PowerSource):
         # FIXME: updating capacity credit for reporting only.
         self.capacity_credit_percent = [i * (self.system_capacity_kw / self.interconnect_kw) for i in self.capacity_credit_percent]
 
+    @staticmethod
+    def apply_desired_schedule(total_gen: NDArrayFloat, schedule: NDArrayFloat):
+        """
+        Limits the generation to the desired schedule
+
+        Args:
+            total_gen: Hybrid system generation profile [kWh]
+            schedule: Desired schedule of the same length [kWh]
+
+        Returns:
+            generation profile, missed load and curtailment of the schedule [kWh]
+        """
+        generation_profile = np.minimum(total_gen, schedule)
+        missed_load = np.where(generation_profile > 0, schedule - generation_profile, schedule)
+        schedule_curtailed = np.maximum(total_gen - schedule, 0.)
+        return generation_profile, missed_load, schedule_curtailed
+
     def calc_gen_max_feasible_kwh(self, interconnect_kw: float) -> list:
         """
         Calculates the maximum feasible generation profile that could have occurred (year 1)
@@ -25,9 +25,10 @@ import sys
 import pandas as pd
 from matplotlib import pyplot as plt
 import scipy
-import rainflow
 from scipy import interpolate
 
+from hopp.simulation.technologies.hydrogen.electrolysis.rainflow_counter import RainflowCounter, cumulative_rainflow_damage
+
 np.set_printoptions(threshold=sys.maxsize)
 
 # def calc_current(P_T,p1,p2,p3,p4,p5,p6): #calculates i-v curve coefficients given the stack power and stack temp
@@ -40,6 +41,9 @@ def calc_current(P_T,p1,p2,p3,p4,p5,p6): #calculates i-v curve coefficients give
     i_stack=p1*(pwr**3) + p2*(pwr**2) +  (p3*pwr) + (p4*pwr**(1/2)) + p5
     return i_stack 
 
+#I-V curve coefficients fit for each stack design, see PEM_H2_Clusters.iv_curve
+_iv_curve_coeff_cache = {}
+
 class PEM_H2_Clusters:
     """
     Create an instance of a low-temperature PEM Electrolyzer System. Each
@@ -412,8 +416,9 @@ class PEM_H2_Clusters:
     def approx_fatigue_degradation(self,voltage_signal,dt_fatigue_calc_hrs=168):
         #should not use voltage values when voltage_signal = 0
         #aka - should only be counted when electrolyzer is on
+        #cycles are counted in a single pass and carried across the dt_fatigue_calc_hrs windows,
+        #so the fatigue at the end of each window is that of the signal up to that point
         
-        t_calc=np.arange(0,len(voltage_signal)+dt_fatigue_calc_hrs ,dt_fatigue_calc_hrs ) 
         v_max=np.max(voltage_signal)
         v_min=np.min(voltage_signal)
         if v_max==v_min:
@@ -423,31 +428,15 @@ class PEM_H2_Clusters:
 
         else:
 
-            rf_cycles = rainflow.count_cycles(voltage_signal, nbins=10)
-            rf_sum = np.sum([pair[0] * pair[1] for pair in rf_cycles])
+            rf_counter = RainflowCounter((v_max-v_min)/10, nbins=10)
+            rf_counter.update(voltage_signal)
+            rf_sum = rf_counter.total_damage
             lifetime_fatigue_deg=rf_sum*self.rate_fatigue
             self.output_dict['Approx Total Fatigue Degradation [V]'] = lifetime_fatigue_deg
-            rf_track=0
-            V_fatigue_ts=np.zeros(len(voltage_signal))
-            for i in range(len(t_calc)-1):
-                voltage_signal_temp = voltage_signal[np.nonzero(voltage_signal[t_calc[i]:t_calc[i+1]])]
-                if np.size(voltage_signal_temp)==0:
-                    rf_sum = 0
-                else:
-                    v_max=np.max(voltage_signal_temp)
-                    v_min=np.min(voltage_signal_temp)
-
-                    if v_max == v_min:
-                        rf_sum=0
-                    else:
-                        
-                        rf_cycles=rainflow.count_cycles(voltage_signal_temp, nbins=10)
-                    # rf_cycles=rainflow.count_cycles(voltage_signal[t_calc[i]:t_calc[i+1]], nbins=10)
-                        rf_sum=np.sum([pair[0] * pair[1] for pair in rf_cycles])
-                rf_track+=rf_sum
-                V_fatigue_ts[t_calc[i]:t_calc[i+1]]=rf_track*self.rate_fatigue
-                #already cumulative!
-            self.output_dict['Sim End RF Track'] = rf_track #TODO: remove
+            rf_track = cumulative_rainflow_damage(voltage_signal,dt_fatigue_calc_hrs,nbins=10)
+            V_fatigue_ts=np.repeat(rf_track,dt_fatigue_calc_hrs)[:len(voltage_signal)]*self.rate_fatigue
+            #already cumulative!
+            self.output_dict['Sim End RF Track'] = rf_track[-1] #TODO: remove
             self.output_dict['Total Actual Fatigue Degradation [V]'] = V_fatigue_ts[-1] #TODO: remove
 
         return V_fatigue_ts #already cumulative!
@@ -577,27 +566,23 @@ class PEM_H2_Clusters:
 
         temperature range is 40 degC : rated_temp+5 -> temperatures for PEM are usually within 60-80degC
 
-        calls cell_design() which calculates the cell voltage
+        calls cell_design() which calculates the cell voltage. The fit is computed once
+        per stack design and reused by every cluster with that design
         """
         # current_range = np.arange(0,self.max_cell_current+10,10) 
         current_range = np.arange(self.stack_input_current_lower_bound,self.max_cell_current+10,10) 
         temp_range = np.arange(40,self.T_C+5,5)
-        idx = 0
-        powers = np.zeros(len(current_range)*len(temp_range))
-        currents = np.zeros(len(current_range)*len(temp_range))
-        temps_C = np.zeros(len(current_range)*len(temp_range))
-        for i in range(len(current_range)):
-            
-            for t in range(len(temp_range)):
-                powers[idx] = current_range[i]*self.cell_design(temp_range[t],current_range[i])*self.N_cells*(1e-3) #stack power
-                currents[idx] = current_range[i]
-                temps_C[idx] = temp_range[t]
-                idx = idx+1
-        df=pd.DataFrame({'Power':powers,'Current':currents,'Temp':temps_C}) #added
-        temp_oi_idx = df.index[df['Temp']==self.T_C]      #added  
-        # curve_coeff, curve_cov = scipy.optimize.curve_fit(calc_current, (powers,temps_C), currents, p0=(1.0,1.0,1.0,1.0,1.0,1.0)) #updates IV curve coeff
-        curve_coeff, curve_cov = scipy.optimize.curve_fit(calc_current, (df['Power'][temp_oi_idx].values,df['Temp'][temp_oi_idx].values), df['Current'][temp_oi_idx].values, p0=(1.0,1.0,1.0,1.0,1.0,1.0))
-        return curve_coeff
+        #the fit only depends on the stack design, so it is shared by all clusters with the same design
+        design = (self.stack_input_current_lower_bound,self.max_cell_current,self.T_C,self.N_cells,self.cell_active_area,
+                  self.membrane_thickness,self.R,self.F,self.mmHg_2_atm)
+        if design not in _iv_curve_coeff_cache:
+            currents,temps_C = [a.ravel() for a in np.meshgrid(current_range,temp_range,indexing='ij')]
+            powers = currents*self.cell_design(temps_C,currents)*self.N_cells*(1e-3) #stack power
+            temp_oi_idx = temps_C==self.T_C
+            # curve_coeff, curve_cov = scipy.optimize.curve_fit(calc_current, (powers,temps_C), currents, p0=(1.0,1.0,1.0,1.0,1.0,1.0)) #updates IV curve coeff
+            curve_coeff, curve_cov = scipy.optimize.curve_fit(calc_current, (powers[temp_oi_idx],temps_C[temp_oi_idx]), currents[temp_oi_idx], p0=(1.0,1.0,1.0,1.0,1.0,1.0))
+            _iv_curve_coeff_cache[design] = tuple(curve_coeff)
+        return np.array(_iv_curve_coeff_cache[design])
 
     def system_design(self,input_power_kw,cluster_size_mw):
         """
@@ -1,66 +1,48 @@
 from pyomo.environ import *
-import random
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
 import time
-import os
+from pathlib import Path
 
+from hopp.utilities.log import hybrid_logger as logger
 
-def optimize(
-    P_wind_t,
-    T=50,
-    n_stacks=3,
-    c_wp=0,
-    c_sw=12,
-    rated_power=500,
-    dt=1,
-    P_init=None,
-    I_init=None,
-    T_init=None,
-    AC_init=0,
-    F_tot_init=0,
-):
+# Things to solve:
+C_INV = 1.47e6
+LT = 90000
+
+
+def build_power_split_model(T, n_stacks, c_wp=0, c_sw=12, rated_power=500, dt=1):
+    """
+    Builds the Pyomo model splitting the available power between `n_stacks` electrolyzer clusters over `T` time steps.
+
+    The available power is the mutable parameter `P_wind`, so the model can be re-solved in place for any window of
+    length `T`.
+    """
     model = ConcreteModel()
-    # Things to solve:
-    C_INV = 1.47e6
-    LT = 90000
-
-    # Initializations
-    if P_init is None:
-        P_init = [0 for i in range(n_stacks * T)]
-    else:
-        P_init = P_init.flatten()
-    if I_init is None:
-        I_init = [0 for i in range(n_stacks * T)]
-    else:
-        I_init = I_init.flatten()
-    if T_init is None:
-        T_init = [0 for i in range(n_stacks * T)]
-    else:
-        T_init = T_init.flatten()
 
     model.p = Var(
         [i for i in range(n_stacks * T)],
         bounds=(-1e-2, rated_power),
-        initialize=P_init,
+        initialize=0,
     )
     model.I = Var(
         [i for i in range(n_stacks * T)],
         within=Binary,
-        initialize=I_init,  # .astype(int),
+        initialize=0,
     )
     model.T = Var(
         [i for i in range(n_stacks * T)],
         within=Binary,
-        initialize=T_init,  # .astype(int),
+        initialize=0,
     )
     model.AC = Var(
-        [0], bounds=(1e-3, 1.2 * rated_power * n_stacks * T), initialize=float(AC_init)
+        [0], bounds=(1e-3, 1.2 * rated_power * n_stacks * T), initialize=0.
     )
     model.F_tot = Var(
-        [0], bounds=(1e-3, 8 * rated_power * n_stacks * T), initialize=float(F_tot_init)
+        [0], bounds=(1e-3, 8 * rated_power * n_stacks * T), initialize=0.
     )
     model.eps = Param(initialize=1, mutable=True)
+    model.P_wind = Param(range(T), initialize=0, mutable=True)
 
     C_WP = c_wp * np.ones(
         T,
@@ -106,7 +88,7 @@ def optimize(
         power_full_stack = 0
         for stack in range(n_stacks):
             power_full_stack = power_full_stack + model.p[t * n_stacks + stack]
-        return power_full_stack <= P_wind_t[t]
+        return power_full_stack <= model.P_wind[t]
 
     def safety_bounds_lower(model, t, stack):
         """Make sure input powers don't exceed safety bounds."""
@@ -145,40 +127,192 @@ def optimize(
     model.physical_constraints.add(physical_constraint_F_tot(model))
     model.physical_constraints.add(physical_constraint_AC(model))
     model.objective = Objective(expr=obj(model), sense=minimize)
-    eps = 10
-    cbc_path = os.path.abspath('')+'\\hybrid\\PEM_Model_2Push\\cbc.exe'
-    solver = SolverFactory('cbc', executable=cbc_path) # Use this if you have a Windows machine; also make sure that cbc.exe is in the same folder as this script
-    #solver = SolverFactory("cbc") # Use this if you don't have a windows machine
-    j = 1
-    while eps > 1e-3:
-        start = time.process_time()
-        results = solver.solve(model)
-        print("time to solve", time.process_time() - start)
-
-        model.eps = value(model.AC[0] / model.F_tot[0])  # optimal value
-        eps = model.AC[0].value - model.eps.value * model.F_tot[0].value
-        j = j + 1
-
-    I = np.array([model.I[i].value for i in range(n_stacks * T)])
-    I_ = np.reshape(I, (T, n_stacks))
-    P = np.array([model.p[i].value for i in range(n_stacks * T)])
-    P_ = np.reshape(P, (T, n_stacks))
-    Tr = np.array([model.T[i].value for i in range(n_stacks * T)]).reshape(
-        (T, n_stacks)
-    )
-    P_tot_opt = np.sum(P_, axis=1)
-    H2f = np.zeros((T, n_stacks))
-    for stack in range(n_stacks):
-        H2f[:, stack] = (
-            0.0145 * P_[:, stack] + 0.3874 * I_[:, stack] * rated_power / 500
-        ) * dt
-    return (
-        P_tot_opt,
-        P_,
-        H2f,
-        I_,
-        Tr,
+    return model
+
+
+def get_solver(solver="cbc"):
+    """
+    Pyomo solver for the power split model. Persistent solvers, e.g. 'gurobi_persistent', keep each model loaded
+    between windows.
+    """
+    if solver == "cbc" and (sys.platform == 'win32' or sys.platform == 'cygwin'):
+        cbc_path = Path(__file__).parents[2] / "dispatch" / "cbc_solver" / "cbc-win64" / "cbc"
+        return SolverFactory('cbc', executable=cbc_path)
+    return SolverFactory(solver)
+
+
+class PowerSplitOptimizer:
+    """
+    Optimizes the power split between electrolyzer clusters window by window.
+
+    The Pyomo model is built once per window length. Each window only updates the available power and the initial
+    values of the previous window's solution, which warm-start solvers capable of it, before re-solving.
+
+    Args:
+        n_stacks: number of clusters
+        c_wp: cost of power [$/kW]
+        c_sw: switching cost [$]
+        rated_power: rated power of a cluster [kW]
+        dt: time step [hr]
+        solver: name of the Pyomo solver, see `get_solver`
+    """
+
+    def __init__(self, n_stacks, c_wp=0, c_sw=12, rated_power=500, dt=1, solver="cbc"):
+        self.n_stacks = n_stacks
+        self.c_wp = c_wp
+        self.c_sw = c_sw
+        self.rated_power = rated_power
+        self.dt = dt
+        self.solver = get_solver(solver)
+        self.is_persistent = hasattr(self.solver, 'set_instance')
+        self._models = {}
+        self._instance = None  # model loaded in the persistent solver
+
+    def get_model(self, T):
+        """Power split model for windows of `T` time steps, built on first use"""
+        if T not in self._models:
+            self._models[T] = build_power_split_model(T, self.n_stacks, self.c_wp, self.c_sw, self.rated_power, self.dt)
+        return self._models[T]
+
+    def _update_instance(self, model):
+        # persistent solvers don't track changes of mutable parameters, so the power constraints are reloaded
+        if self._instance is not model:
+            self.solver.set_instance(model)
+            self._instance = model
+            return
+        for constraint in model.pwr_constraints.values():
+            self.solver.remove_constraint(constraint)
+            self.solver.add_constraint(constraint)
+
+    def _solve(self, model):
+        warmstart = self.solver.warm_start_capable()
+        if self.is_persistent:
+            self.solver.set_objective(model.objective)
+            return self.solver.solve(save_results=False, warmstart=warmstart)
+        if warmstart:
+            return self.solver.solve(model, warmstart=True)
+        return self.solver.solve(model)
+
+    def optimize(
+        self,
         P_wind_t,
-        model.AC[0].value,
-        model.F_tot[0].value,
-    )
+        P_init=None,
+        I_init=None,
+        T_init=None,
+        AC_init=0,
+        F_tot_init=0,
+    ):
+        """
+        Solves the power split over one window
+
+        :param P_wind_t: available power for each time step of the window [kW]
+        :param P_init: initial cluster powers, of shape (time steps, clusters)
+        :param I_init: initial cluster on/off status, of shape (time steps, clusters)
+        :param T_init: initial cluster switching, of shape (time steps, clusters)
+        :param AC_init: initial total cost
+        :param F_tot_init: initial total hydrogen production
+        :return: total power, cluster powers, cluster hydrogen production, cluster status, cluster switching,
+                 available power, total cost and total hydrogen production
+        """
+        T = len(P_wind_t)
+        n_stacks = self.n_stacks
+        rated_power = self.rated_power
+        dt = self.dt
+        model = self.get_model(T)
+
+        # Update the window in place
+        for t in range(T):
+            model.P_wind[t] = float(P_wind_t[t])
+        initial_values = ((model.p, P_init), (model.I, I_init), (model.T, T_init))
+        for var, init in initial_values:
+            init = np.zeros(n_stacks * T) if init is None else np.asarray(init).flatten()
+            for i in range(n_stacks * T):
+                var[i].set_value(float(init[i]), skip_validation=True)
+        model.AC[0].set_value(float(AC_init), skip_validation=True)
+        model.F_tot[0].set_value(float(F_tot_init), skip_validation=True)
+        model.eps = 1
+        if self.is_persistent:
+            self._update_instance(model)
+
+        eps = 10
+        j = 1
+        while eps > 1e-3:
+            start = time.process_time()
+            self._solve(model)
+            logger.debug(f"PowerSplitOptimizer solved {T} steps x {n_stacks} stacks in {time.process_time() - start:.3f} s")
+
+            model.eps = value(model.AC[0] / model.F_tot[0])  # optimal value
+            eps = model.AC[0].value - model.eps.value * model.F_tot[0].value
+            j = j + 1
+
+        I = np.array([model.I[i].value for i in range(n_stacks * T)])
+        I_ = np.reshape(I, (T, n_stacks))
+        P = np.array([model.p[i].value for i in range(n_stacks * T)])
+        P_ = np.reshape(P, (T, n_stacks))
+        Tr = np.array([model.T[i].value for i in range(n_stacks * T)]).reshape(
+            (T, n_stacks)
+        )
+        P_tot_opt = np.sum(P_, axis=1)
+        H2f = (0.0145 * P_ + 0.3874 * I_ * rated_power / 500) * dt
+        return (
+            P_tot_opt,
+            P_,
+            H2f,
+            I_,
+            Tr,
+            P_wind_t,
+            model.AC[0].value,
+            model.F_tot[0].value,
+        )
+
+
+def optimize(
+    P_wind_t,
+    T=50,
+    n_stacks=3,
+    c_wp=0,
+    c_sw=12,
+    rated_power=500,
+    dt=1,
+    P_init=None,
+    I_init=None,
+    T_init=None,
+    AC_init=0,
+    F_tot_init=0,
+):
+    optimizer = PowerSplitOptimizer(n_stacks, c_wp, c_sw, rated_power, dt)
+    return optimizer.optimize(P_wind_t[:T], P_init, I_init, T_init, AC_init, F_tot_init)
+
+
+def optimize_power_split_windows(P_wind, window, n_stacks, c_wp=0, c_sw=12, rated_power=500, dt=1, solver="cbc"):
+    """
+    Optimizes the power split over consecutive windows, warm-starting each window from the previous one
+
+    :param P_wind: available power for each time step [kW]
+    :param window: number of time steps per window
+    :return: cluster powers, of shape (time steps, clusters)
+    """
+    optimizer = PowerSplitOptimizer(n_stacks, c_wp, c_sw, rated_power, dt, solver)
+    P_ = None
+    I_ = None
+    Tr_ = None
+    AC = 1
+    F_tot = 1
+    P_full = []
+    for start_time in range(0, len(P_wind), window):
+        P_wind_t = P_wind[start_time:start_time + window]
+        logger.info(f"Optimizing {n_stacks} stacks starting {start_time}hr/{len(P_wind)}hr")
+        if P_ is not None:
+            P_ = P_[: len(P_wind_t), :]
+            I_ = I_[: len(P_wind_t), :]
+            Tr_ = Tr_[: len(P_wind_t), :]
+        P_tot_opt, P_, H2f, I_, Tr_, P_wind_t, AC, F_tot = optimizer.optimize(
+            P_wind_t,
+            P_init=P_,
+            I_init=I_,
+            T_init=Tr_,
+            AC_init=AC,
+            F_tot_init=F_tot,
+        )
+        P_full.append(P_)
+    return np.vstack(P_full)
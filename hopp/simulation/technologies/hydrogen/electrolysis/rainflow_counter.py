@@ -0,0 +1,156 @@
+"""
+Incremental rainflow cycle counting for fatigue degradation of electrolyzer stacks
+"""
+import math
+from typing import Optional
+
+import numpy as np
+
+
+class RainflowCounter:
+    """
+    Incremental rainflow cycle counter following ASTM E1049-85 section 5.4.4, as implemented in the `rainflow` package.
+
+    Samples can be added in any number of chunks. Cycles are counted as soon as they close, while the residual reversals
+    are kept across chunks, so the cycles counted over consecutive chunks are those of the whole series. At any point,
+    `total_damage` equals the result of `rainflow.count_cycles` on all samples added so far.
+
+    Cycle ranges are rounded up to the right edge of bins of width `binsize`, as in `rainflow.count_cycles`, and summed
+    weighted by their count (1 for full cycles and 0.5 for half cycles).
+
+    Args:
+        binsize: width of the cycle-counting bins
+        nbins: number of bins, used to move ranges just above the last bin edge back into the last bin
+    """
+
+    def __init__(self, binsize: float, nbins: Optional[int] = None):
+        self.binsize = binsize
+        self.nbins = nbins
+        self.closed_damage = 0.0  # binned range x count of the cycles closed so far
+        self.n_samples = 0
+        self._reversals = []  # residual reversals, oldest first
+        self._last = None  # last distinct sample, a provisional reversal
+        self._direction = 0.0  # difference between the last two distinct samples
+
+    def binned_range(self, rng):
+        """
+        Ranges rounded up to the right edge of their bin
+        """
+        if self.binsize <= 0:
+            return np.zeros_like(rng, dtype=float)
+        n = np.ceil(np.asarray(rng, dtype=float) / self.binsize)
+        if self.nbins:
+            n = np.minimum(n, self.nbins)
+        return n * self.binsize
+
+    @staticmethod
+    def _close_cycles(reversals: list, x: float, ranges: list, counts: list):
+        # adds reversal x, moving the cycles it closes from `reversals` to `ranges` and `counts`
+        reversals.append(x)
+        while len(reversals) >= 3:
+            X = abs(x - reversals[-2])
+            Y = abs(reversals[-2] - reversals[-3])
+            if X < Y:
+                break
+            ranges.append(Y)
+            if len(reversals) == 3:
+                # Y contains the starting point: count it as one-half cycle and discard the first point
+                counts.append(0.5)
+                del reversals[0]
+            else:
+                # count Y as one cycle and discard its peak and valley
+                counts.append(1.0)
+                del reversals[-3:-1]
+
+    def _damage(self, ranges: list, counts: list) -> float:
+        if not ranges:
+            return 0.0
+        return float(np.dot(self.binned_range(ranges), counts))
+
+    def update(self, samples: np.ndarray):
+        """
+        Counts the cycles closed by `samples`, which continue the series added so far
+        """
+        samples = np.asarray(samples, dtype=float).ravel()
+        if len(samples) == 0:
+            return
+        self.n_samples += len(samples)
+        if self._last is None:
+            self._reversals.append(float(samples[0]))  # the first point is always a reversal
+        else:
+            samples = np.concatenate(([self._last], samples))
+
+        # reversals are the distinct points at which the series changes direction
+        distinct = samples[np.concatenate(([True], samples[1:] != samples[:-1]))]
+        self._last = float(distinct[-1])
+        diff = np.diff(distinct)
+        if len(diff) == 0:
+            return
+        is_reversal = np.concatenate(([self._direction], diff[:-1])) * diff < 0
+        self._direction = float(diff[-1])
+
+        reversals = self._reversals
+        close_cycles = self._close_cycles
+        ranges, counts = [], []
+        for x in distinct[:-1][is_reversal].tolist():
+            close_cycles(reversals, x, ranges, counts)
+        self.closed_damage += self._damage(ranges, counts)
+
+    def residual_damage(self) -> float:
+        """
+        Damage of the residual half-cycles if the series ended with the samples added so far
+        """
+        reversals = list(self._reversals)
+        ranges, counts = [], []
+        # as in the `rainflow` package, the last point only counts once the series has 3 or more samples
+        if self.n_samples >= 3:
+            self._close_cycles(reversals, self._last, ranges, counts)
+        ranges += [abs(x2 - x1) for x1, x2 in zip(reversals[:-1], reversals[1:])]
+        counts += [0.5] * (len(reversals) - 1)
+        return self._damage(ranges, counts)
+
+    @property
+    def total_damage(self) -> float:
+        """
+        Binned range x count of all cycles of the samples added so far, counting the residual as half-cycles
+        """
+        return self.closed_damage + self.residual_damage()
+
+
+def cumulative_rainflow_damage(signals: np.ndarray,
+                               window: int,
+                               nbins: int = 10,
+                               skip_zeros: bool = True
+                               ) -> np.ndarray:
+    """
+    Cumulative rainflow damage at the end of each window of one or more signals, counted in a single pass
+
+    Cycles spanning window boundaries are counted once they close, so the damage at the end of a window is the
+    rainflow damage of the signal up to that point, and the last value is that of the whole signal.
+
+    :param signals: 1-D signal, or 2-D array with one signal per row
+    :param window: number of time steps per window
+    :param nbins: number of cycle-counting bins, spanning the range of each signal
+    :param skip_zeros: exclude zero samples, e.g. when a stack is off, from the count
+    :return: cumulative damage with the shape of `signals`, but with one value per window along the last axis
+    """
+    signals = np.asarray(signals, dtype=float)
+    rows = np.atleast_2d(signals)
+    n_steps = rows.shape[1]
+    window_ends = np.minimum(np.arange(window, n_steps + window, window), n_steps)
+
+    damage = np.zeros((rows.shape[0], len(window_ends)))
+    for r, signal in enumerate(rows):
+        counted = signal != 0 if skip_zeros else np.ones(n_steps, dtype=bool)
+        samples = signal[counted]
+        if len(samples) == 0:
+            continue
+        counter = RainflowCounter((samples.max() - samples.min()) / nbins, nbins)
+        if counter.binsize == 0:
+            continue
+        # split the counted samples at the window ends
+        chunk_ends = np.cumsum(counted)[window_ends - 1]
+        for i, chunk in enumerate(np.split(samples, chunk_ends[:-1])):
+            counter.update(chunk)
+            damage[r, i] = counter.total_damage
+    return damage.reshape(signals.shape[:-1] + (len(window_ends),))
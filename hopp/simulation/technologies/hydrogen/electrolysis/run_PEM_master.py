@@ -1,5 +1,6 @@
 import os
 import sys
+from multiprocessing import Pool
 
 sys.path.append("")
 # from dotenv import load_dotenv
@@ -26,7 +27,8 @@ import matplotlib.pyplot as plt
 import pandas as pd
 
 
-from hopp.simulation.technologies.hydrogen.electrolysis.optimization_utils_linear import optimize
+from hopp.simulation.technologies.hydrogen.electrolysis.optimization_utils_linear import optimize_power_split_windows
+from hopp.utilities.log import hybrid_logger as logger
 import time
 
 # from PyOMO import ipOpt !! FOR SANJANA!!
@@ -53,6 +55,10 @@ class run_PEM_clusters:
     Nomenclature:
     `cluster`: cluster is built up of 1MW stacks
     `stack`: must be 1MW (because of current PEM model)
+    `n_procs`: number of processes used to run the clusters, which are independent once the power is split, and
+    the optimized power split, whose windows are divided into as many contiguous chunks
+    `solver`: Pyomo solver of the optimized power split, e.g. 'cbc', 'glpk' or a persistent solver such as
+    'gurobi_persistent'
     """
 
     def __init__(
@@ -65,6 +71,8 @@ class run_PEM_clusters:
         user_defined_electrolyzer_params,
         degradation_penalty,
         turndown_ratio,
+        n_procs=1,
+        solver="cbc",
     ):
         # nomen
         self.cluster_cap_mw = np.round(system_size_mw / num_clusters)
@@ -79,6 +87,8 @@ class run_PEM_clusters:
         self.plant_life_yrs = useful_life
         self.use_deg_penalty = degradation_penalty
         self.turndown_ratio = turndown_ratio
+        self.n_procs = n_procs
+        self.solver = solver
         # Do not modify stack_rating_kw or stack_min_power_kw
         # these represent the hard-coded and unmodifiable
         # PEM model basecode
@@ -121,39 +131,27 @@ class run_PEM_clusters:
             power_to_clusters = self.optimize_power_split()  # run Sanjana's code
         else:
             power_to_clusters = self.even_split_power()
-        h2_df_ts = pd.DataFrame()
-        h2_df_tot = pd.DataFrame()
-
-        col_names = []
         start = time.perf_counter()
-        for ci, cluster in enumerate(clusters):
-            cl_name = "Cluster #{}".format(ci)
-            col_names.append(cl_name)
-            h2_ts, h2_tot = clusters[ci].run(power_to_clusters[ci])
-            # h2_dict_ts['Cluster #{}'.format(ci)] = h2_ts
-
-            h2_ts_temp = pd.Series(h2_ts, name=cl_name)
-            h2_tot_temp = pd.Series(h2_tot, name=cl_name)
-            if len(h2_df_tot) == 0:
-                # h2_df_ts=pd.concat([h2_df_ts,h2_ts_temp],axis=0,ignore_index=False)
-                h2_df_tot = pd.concat(
-                    [h2_df_tot, h2_tot_temp], axis=0, ignore_index=False
-                )
-                h2_df_tot.columns = col_names
-
-                h2_df_ts = pd.concat([h2_df_ts, h2_ts_temp], axis=0, ignore_index=False)
-                h2_df_ts.columns = col_names
-            else:
-                # h2_df_ts = h2_df_ts.join(h2_ts_temp)
-                h2_df_tot = h2_df_tot.join(h2_tot_temp)
-                h2_df_tot.columns = col_names
+        cluster_inputs = list(zip(clusters, power_to_clusters))
+        if self.n_procs > 1 and len(clusters) > 1:
+            with Pool(processes=min(self.n_procs, len(clusters))) as pool:
+                cluster_results = pool.map(run_cluster, cluster_inputs)
+        else:
+            cluster_results = [run_cluster(cluster_input) for cluster_input in cluster_inputs]
 
-                h2_df_ts = h2_df_ts.join(h2_ts_temp)
-                h2_df_ts.columns = col_names
+        # clusters run in another process come back as copies holding their results
+        clusters = [cluster for cluster, _, _ in cluster_results]
+        col_names = ["Cluster #{}".format(ci) for ci in range(len(clusters))]
+        h2_df_ts = pd.concat(
+            [pd.Series(h2_ts, name=cl_name) for cl_name, (_, h2_ts, _) in zip(col_names, cluster_results)], axis=1
+        )
+        h2_df_tot = pd.concat(
+            [pd.Series(h2_tot, name=cl_name) for cl_name, (_, _, h2_tot) in zip(col_names, cluster_results)], axis=1
+        )
 
         end = time.perf_counter()
         self.clusters = clusters
-        print("Took {} sec to run the RUN function".format(round(end - start, 3)))
+        logger.info("Took {} sec to run the RUN function".format(round(end - start, 3)))
         return h2_df_ts, h2_df_tot
         # return h2_dict_ts, h2_df_tot
 
@@ -163,66 +161,28 @@ class run_PEM_clusters:
         tf = 96
         n_times_to_run = int(np.ceil(self.T / tf))
         df = pd.DataFrame({"Wind + PV Generation": self.input_power_kw})
-        P_ = None
-        I_ = None
-        Tr_ = None
-        AC = 1
-        F_tot = 1
-        diff = 0
-
-        for start_time in range(n_times_to_run):
-            print(
-                f"Optimizing {number_of_stacks} stacks tarting {start_time*tf}hr/{self.T}hr"
-            )
-            if start_time == 0:
-
-                df["Wind + PV Generation"].replace(0, np.NaN, inplace=True)
-                df = df.interpolate()
-
-            P_wind_t = df["Wind + PV Generation"][
-                (start_time * tf) : ((start_time * tf) + tf)
-            ].values
-            start = time.time()
-            if P_ is not None:
-                P_ = P_[: len(P_wind_t), :]
-                I_ = I_[: len(P_wind_t), :]
-                Tr_ = Tr_[: len(P_wind_t), :]
-            P_tot_opt, P_, H2f, I_, Tr_, P_wind_t, AC, F_tot = optimize(
-                P_wind_t,
-                T=(len(P_wind_t)),
-                n_stacks=(number_of_stacks),
-                c_wp=0,
-                c_sw=self.switching_cost,
-                rated_power=rated_power,
-                P_init=P_,
-                I_init=I_,
-                T_init=Tr_,
-                AC_init=AC,
-                F_tot_init=F_tot,
-            )
+        df["Wind + PV Generation"] = df["Wind + PV Generation"].replace(0, np.nan)
+        df = df.interpolate()
+        P_wind = df["Wind + PV Generation"].values
 
-            diff += time.time() - start
-            if type(AC).__module__ != "numpy":
-                AC = np.array(AC)
-                F_tot = np.array(F_tot)
-            if start_time == 0:
-                P_tot_opt_full = P_tot_opt
-                P_full = P_
-                P_wind_t_full = P_wind_t
-                H2f_full = H2f
-                I_full = I_
-                Tr_full = np.sum(Tr_, axis=0)
-                AC_full = AC
-                F_tot_full = F_tot
-
-            else:
-
-                P_full = np.vstack((P_full, P_))
-                H2f_full = np.vstack((H2f_full, H2f))
-                I_full = np.vstack((I_full, I_))
-                Tr_full = np.vstack((Tr_full, np.sum(Tr_, axis=0)))
-                AC_full = np.vstack((AC_full, (AC)))
-                F_tot_full = np.vstack((F_tot_full, (F_tot)))
+        start = time.perf_counter()
+        # windows are chained by warm starts, so each process optimizes a contiguous chunk of them
+        n_chunks = max(1, min(self.n_procs, n_times_to_run))
+        chunk_starts = [int(i) * tf for i in np.linspace(0, n_times_to_run, n_chunks + 1)]
+        chunk_args = [
+            (P_wind[t0:t1], tf, number_of_stacks, 0, self.switching_cost, rated_power, 1, self.solver)
+            for t0, t1 in zip(chunk_starts[:-1], chunk_starts[1:])
+        ]
+        if n_chunks > 1:
+            with Pool(processes=n_chunks) as pool:
+                P_chunks = pool.starmap(optimize_power_split_windows, chunk_args)
+        else:
+            P_chunks = [optimize_power_split_windows(*args) for args in chunk_args]
+        P_full = np.vstack(P_chunks)
+        end = time.perf_counter()
+        logger.info(
+            "Took {} sec to optimize the power split over {} windows".format(round(end - start, 3), n_times_to_run)
+        )
 
         return np.transpose(P_full)
 
@@ -253,7 +213,7 @@ class run_PEM_clusters:
 
         # power_to_clusters = np.repeat([power_per_cluster],self.num_clusters,axis=0)
         end = time.perf_counter()
-        print(
+        logger.info(
             "Took {} sec to run even_split_power function".format(
                 round(end - start, 3)
             )
@@ -287,10 +247,17 @@ class run_PEM_clusters:
                 )
             )
         end = time.perf_counter()
-        print("Took {} sec to run the create clusters".format(round(end - start, 3)))
+        logger.info("Took {} sec to run the create clusters".format(round(end - start, 3)))
         return stacks
 
 
+def run_cluster(cluster_input):
+    """Runs a single PEM cluster on its power signal, returning the cluster and its results"""
+    cluster, power_to_cluster = cluster_input
+    h2_ts, h2_tot = cluster.run(power_to_cluster)
+    return cluster, h2_ts, h2_tot
+
+
 if __name__ == "__main__":
 
     system_size_mw = 1000
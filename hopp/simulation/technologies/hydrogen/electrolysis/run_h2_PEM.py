@@ -41,11 +41,12 @@ def run_h2_PEM(electrical_generation_timeseries, electrolyzer_size,
                 pem_control_type,electrolyzer_direct_cost_kw, user_defined_pem_param_dictionary,
                 use_degradation_penalty, grid_connection_scenario,
                 hydrogen_production_capacity_required_kgphr,debug_mode = False,turndown_ratio = 0.1,
+                n_procs = 1,
                 ):
    #last modified by Elenya Grant on 9/21/2023
    from hopp.simulation.technologies.hydrogen.electrolysis.run_PEM_master import run_PEM_clusters
    
-   pem=run_PEM_clusters(electrical_generation_timeseries,electrolyzer_size,n_pem_clusters,electrolyzer_direct_cost_kw,useful_life,user_defined_pem_param_dictionary,use_degradation_penalty,turndown_ratio)
+   pem=run_PEM_clusters(electrical_generation_timeseries,electrolyzer_size,n_pem_clusters,electrolyzer_direct_cost_kw,useful_life,user_defined_pem_param_dictionary,use_degradation_penalty,turndown_ratio,n_procs)
 
    if grid_connection_scenario!='off-grid':
       h2_ts,h2_tot=pem.run_grid_connected_pem(electrolyzer_size,hydrogen_production_capacity_required_kgphr)
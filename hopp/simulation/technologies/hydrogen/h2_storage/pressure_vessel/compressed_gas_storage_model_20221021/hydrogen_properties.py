@@ -0,0 +1,98 @@
+"""
+Tabulated real-gas properties of hydrogen for the compressed gas storage model
+"""
+from functools import lru_cache
+
+import numpy as np
+from CoolProp.CoolProp import PropsSI
+from scipy.interpolate import RectBivariateSpline
+
+# CoolProp outputs available from the table
+PROPERTIES = ('D', 'H', 'ISENTROPIC_EXPANSION_COEFFICIENT')
+
+
+class HydrogenPropertyTable:
+    """
+    Bicubic spline tables of hydrogen properties from CoolProp's `PropsSI`, as functions of pressure and temperature.
+
+    Density is tabulated as P/(D*T), which is nearly constant over the envelope, so that it stays accurate down to
+    near-vacuum pressures. Nodes are spaced more closely near the edges of the envelope, where the splines are least
+    constrained. The table is validated against `PropsSI` at the center of every cell, which bounds the interpolation
+    error, and lookups outside of the envelope raise an error rather than extrapolate.
+
+    Args:
+        p_max: maximum pressure [Pa], the minimum being 1 Pa
+        t_min: minimum temperature [K]
+        t_max: maximum temperature [K]
+        n_pressures: number of pressure nodes
+        n_temperatures: number of temperature nodes
+        rtol: maximum relative error of the interpolated properties
+    """
+
+    def __init__(self,
+                 p_max: float = 1000e5,
+                 t_min: float = 250.,
+                 t_max: float = 400.,
+                 n_pressures: int = 81,
+                 n_temperatures: int = 61,
+                 rtol: float = 1e-7):
+        self.p_min = 1.
+        self.p_max = p_max
+        self.t_min = t_min
+        self.t_max = t_max
+        self.pressures = self.p_min + (p_max - self.p_min) * (1 - np.cos(np.linspace(0, np.pi, n_pressures))) / 2
+        self.temperatures = t_min + (t_max - t_min) * (1 - np.cos(np.linspace(0, np.pi, n_temperatures))) / 2
+
+        P, T = np.meshgrid(self.pressures, self.temperatures, indexing='ij')
+        self._splines = {}
+        for output in PROPERTIES:
+            values = PropsSI(output, 'P', P.ravel(), 'T', T.ravel(), 'Hydrogen').reshape(P.shape)
+            self._splines[output] = RectBivariateSpline(self.pressures, self.temperatures,
+                                                        self._transform(output, values, P, T), kx=3, ky=3)
+
+        self.max_error = self.validate()
+        if max(self.max_error.values()) > rtol:
+            raise ValueError(f"HydrogenPropertyTable interpolation error {self.max_error} exceeds {rtol}, "
+                             f"increase n_pressures or n_temperatures")
+
+    @staticmethod
+    def _transform(output, values, P, T):
+        # maps densities to the tabulated P/(D*T) and back, the transform being its own inverse
+        return P / (values * T) if output == 'D' else values
+
+    def validate(self) -> dict:
+        """
+        Maximum relative error of each property against `PropsSI` at the centers of the table's cells
+        """
+        pressures = (self.pressures[1:] + self.pressures[:-1]) / 2
+        temperatures = (self.temperatures[1:] + self.temperatures[:-1]) / 2
+        P, T = np.meshgrid(pressures, temperatures, indexing='ij')
+        max_error = {}
+        for output in PROPERTIES:
+            reference = PropsSI(output, 'P', P.ravel(), 'T', T.ravel(), 'Hydrogen')
+            max_error[output] = float(np.max(np.abs(self.props(output, P.ravel(), T.ravel()) / reference - 1)))
+        return max_error
+
+    def props(self, output: str, pressure, temperature):
+        """
+        Property of hydrogen, as `PropsSI(output, "P", pressure, "T", temperature, "Hydrogen")`
+
+        :param output: one of `PROPERTIES`
+        :param pressure: pressure [Pa], scalar or array
+        :param temperature: temperature [K], scalar or array
+        :return: property in SI units, of the broadcast shape of `pressure` and `temperature`
+        """
+        P, T = np.broadcast_arrays(np.asarray(pressure, dtype=float), np.asarray(temperature, dtype=float))
+        if np.any((P < self.p_min) | (P > self.p_max) | (T < self.t_min) | (T > self.t_max)):
+            raise ValueError(f"HydrogenPropertyTable is limited to {self.p_min}-{self.p_max} Pa and "
+                             f"{self.t_min}-{self.t_max} K")
+        values = self._transform(output, self._splines[output].ev(P, T), P, T)
+        return values if values.ndim else float(values)
+
+
+@lru_cache(maxsize=None)
+def get_hydrogen_property_table(**kwargs) -> HydrogenPropertyTable:
+    """
+    Hydrogen property table shared by all storage models of this process, built on first use
+    """
+    return HydrogenPropertyTable(**kwargs)
@@ -4,18 +4,57 @@ Added to HOPP by: Jared Thomas
 Note: ANL costs are in 2018 dollars
 """
 
+from functools import lru_cache
+
 import pandas as pd
 import numpy as np
-from scipy.optimize import fsolve
 import os
 
 bar2MPa = 0.1
 mm2in = 0.0393701
 
-def run_pipe_analysis(L,m_dot,p_inlet,p_outlet,depth, risers=1, data_location=os.path.abspath(os.path.dirname(__file__)+"/data_tables")):
+DATA_LOCATION = os.path.abspath(os.path.dirname(__file__)+"/data_tables")
+
+@lru_cache(maxsize=None)
+def load_pipe_tables(data_location=DATA_LOCATION):
+    '''
+        Loads the steel grades and pipe dimensions once per data location, as NumPy arrays.
+        Grades A, B, and A25 are removed since they have no costing data.
+
+        Returns a dict of grades, SMYS [MPa], SMTS [MPa] and price [$/kg] per grade, DN, outer diameter [mm] per
+        diameter, schedules, and thickness [mm] per diameter and schedule (nan if the schedule doesn't exist)
+    '''
+    yield_strengths = pd.read_csv(os.path.join(data_location, 'steel_mechanical_props.csv'),index_col = None,header = 0)
+    yield_strengths = yield_strengths.loc[~yield_strengths['Grade'].isin(['A','B','A25'])].reset_index()
+    schedules_all = pd.read_csv(os.path.join(data_location, 'pipe_dimensions_metric.csv'),index_col = None,header = 0)
+    steel_costs_kg = pd.read_csv(os.path.join(data_location, 'steel_costs_per_kg.csv'),index_col = None,header = 0)
+
+    schds = schedules_all.columns[~schedules_all.columns.isin(['DN','Outer diameter [mm]'])]
+    prices = steel_costs_kg.drop_duplicates('Grade').set_index('Grade')['Price [$/kg]']
+    tables = {
+        'grades': yield_strengths['Grade'].values,
+        'SMYS': yield_strengths['SMYS [Mpa]'].values.astype(float),
+        'SMTS': yield_strengths['SMTS [Mpa]'].values.astype(float),
+        'price': prices.loc[yield_strengths['Grade']].values.astype(float),
+        'DN': schedules_all['DN'].values.astype(float),
+        'outer_diameter': schedules_all['Outer diameter [mm]'].values.astype(float),
+        'schedules': schds.values,
+        'thickness': schedules_all[schds].values.astype(float),
+    }
+    for table in tables.values():
+        table.setflags(write=False)
+    return tables
+
+def run_pipe_analysis(L,m_dot,p_inlet,p_outlet,depth, risers=1, data_location=DATA_LOCATION):
     '''
         This function calculates the cheapest grade, diameter, thickness, subject to ASME B31.12 and .8
+
+        All inputs but `data_location` may be arrays, which are broadcast against each other to size several pipes,
+        e.g. the sections of a pipeline network, in one call. Returns a DataFrame with one row per pipe.
     '''
+    tables = load_pipe_tables(data_location)
+    L, m_dot, p_inlet, p_outlet, depth, risers = np.broadcast_arrays(
+        *[np.atleast_1d(np.asarray(x, dtype=float)) for x in (L, m_dot, p_inlet, p_outlet, depth, risers)])
     p_inlet_MPa = p_inlet*bar2MPa
     F = 0.72 # Design option B class 1 - 2011 ASME B31.12 Table  PL-3.7.1.2
     E = 1.0 # Long. Weld Factor: Seamless (Table IX-3B)
@@ -24,57 +63,59 @@ def run_pipe_analysis(L,m_dot,p_inlet,p_outlet,depth, risers=1, data_location=os
     riser = True    #This is a flag for the ASMEB31.8 stress design, if not including risers, then this can be set to false
     total_L = L*(1+0.05) + risers*depth/1000 #km #Assuming 5% extra length and 1 riser. Will need two risers for turbine to central platform
 
-    #   Import mechanical props and pipe thicknesses (remove A,B ,and A25 since no costing data)
-    yield_strengths = pd.read_csv(os.path.join(data_location, 'steel_mechanical_props.csv'),index_col = None,header = 0)
-    yield_strengths = yield_strengths.loc[~yield_strengths['Grade'].isin(['A','B','A25'])].reset_index()
-    schedules_all = pd.read_csv(os.path.join(data_location, 'pipe_dimensions_metric.csv'),index_col = None,header = 0)
-    steel_costs_kg = pd.read_csv(os.path.join(data_location, 'steel_costs_per_kg.csv'),index_col = None,header = 0)
-
     #   First get the minimum diameter required to achieve the outlet pressure for given length and m_dot
     min_diam_mm = get_min_diameter_of_pipe(L,m_dot,p_inlet,p_outlet)
+
+    #   Screen all candidates at once, along axes of pipe, grade, diameter, and schedule
+    pipe = (slice(None), None, None, None)
+    grade = (None, slice(None), None, None)
+    SMYS = tables['SMYS'][grade]
+    SMTS = tables['SMTS'][grade]
+    diam = tables['outer_diameter'][None, None, :, None]
+    thickness = tables['thickness'][None, None, :, :]
+
     #   Filter for diameters larger than min diam required
-    schedules_spec = schedules_all.loc[schedules_all['DN']>=(min_diam_mm)]
-
-    #   Gather the grades, diameters, and schedules to loop thru
-    grades = yield_strengths['Grade'].values
-    diams = schedules_spec['Outer diameter [mm]'].values
-    schds = schedules_spec.loc[:,~schedules_spec.columns.isin(['DN','Outer diameter [mm]'])].columns
-    viable_types = []
- 
-    #   Loop thru grades
-    for grade in grades:
-        #   Get SMYS and SMTS for the specific grade
-        SMYS = yield_strengths.loc[yield_strengths['Grade']==grade,'SMYS [Mpa]'].iat[0]
-        SMTS = yield_strengths.loc[yield_strengths['Grade']==grade,'SMTS [Mpa]'].iat[0]
-        #   Loop thru diameters
-        for diam in diams:
-            diam_row = schedules_spec.loc[schedules_spec['Outer diameter [mm]']==diam]
-            #   Loop thru scheudles (which give the thickness)
-            for schd in schds:
-                thickness = diam_row[schd].iat[0]
-
-                #Check if thickness satisfies ASME B31.12
-                mat_perf_factor = get_mat_factor(SMYS,SMTS,p_inlet*bar2MPa)
-                t_ASME = p_inlet_MPa*diam/(2*SMYS*F*E*mat_perf_factor)
-                if thickness<t_ASME:
-                    continue
-
-                #Check if satifies ASME B31.8
-                if not checkASMEB318(SMYS,diam,thickness,riser,depth,p_inlet,T_derating):
-                    continue
-
-                #Add qualified pipes to saved answers:
-                inner_diam = diam-2*thickness
-                viable_types.append([grade,diam,inner_diam,schd,thickness])
-            
-    viable_types_df = pd.DataFrame(viable_types,columns=['Grade','Outer diameter (mm)','Inner Diameter (mm)','Schedule','Thickness (mm)']).dropna()
-
-    #   Calculate material, labor, row, and misc costs
-    viable_types_df = get_mat_costs(viable_types_df,total_L,steel_costs_kg)
-    viable_types_df = get_anl_costs(viable_types_df,total_L)
-    min_row = viable_types_df.sort_values(by='total capital cost [$]').iloc[:1].reset_index()
-    return min_row
- 
+    viable = tables['DN'][None, None, :, None] >= min_diam_mm[pipe]
+    viable = np.broadcast_to(viable, (len(L), len(tables['grades'])) + thickness.shape[2:]).copy()
+
+    #   Check if thickness satisfies ASME B31.12
+    mat_perf_factor = np.stack([get_mat_factor(SMYS_g,SMTS_g,p_inlet*bar2MPa) * np.ones_like(p_inlet)
+                                for SMYS_g, SMTS_g in zip(tables['SMYS'], tables['SMTS'])], axis=1)[..., None, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t_ASME = p_inlet_MPa[pipe]*diam/(2*SMYS*F*E*mat_perf_factor)
+        viable &= ~(thickness < t_ASME)
+
+        #   Check if satisfies ASME B31.8
+        viable &= checkASMEB318(SMYS,diam,thickness,riser,depth[pipe],p_inlet[pipe],T_derating) | np.isnan(thickness)
+
+    #   Schedules that don't exist for a diameter pass the checks, then are dropped
+    listed = viable
+    viable = listed & ~np.isnan(thickness)
+
+    #   Calculate material, labor, row, and misc costs of every candidate, then keep the cheapest
+    price = tables['price'][grade]
+    costs = get_pipe_costs(diam, thickness, price, total_L[pipe])
+    total_cost = np.where(viable, costs['total capital cost [$]'], np.inf).reshape(len(L), -1)
+    best = np.argmin(total_cost, axis=1)
+    if np.isinf(total_cost[np.arange(len(L)), best]).any():
+        raise ValueError("No pipe satisfies ASME B31.12 and B31.8 for some of the inputs")
+
+    shape = viable.shape[1:]
+    i_grade, i_diam, i_schd = np.unravel_index(best, shape)
+    i_pipe = np.arange(len(L))
+    min_rows = pd.DataFrame({
+        # position of the pipe among all candidates passing the checks
+        'index': np.cumsum(listed.reshape(len(L), -1), axis=1)[i_pipe, best] - 1,
+        'Grade': tables['grades'][i_grade],
+        'Outer diameter (mm)': tables['outer_diameter'][i_diam],
+        'Inner Diameter (mm)': tables['outer_diameter'][i_diam] - 2*tables['thickness'][i_diam, i_schd],
+        'Schedule': tables['schedules'][i_schd],
+        'Thickness (mm)': tables['thickness'][i_diam, i_schd],
+    })
+    for name, cost in costs.items():
+        min_rows[name] = np.broadcast_to(cost, (len(L),) + shape).reshape(len(L), -1)[i_pipe, best]
+    return min_rows
+
 def get_mat_factor(SMYS,SMTS,design_pressure):
     '''
         Determine the material performance factor ASMEB31.12. 
@@ -97,7 +138,8 @@ def get_mat_factor(SMYS,SMTS,design_pressure):
 
 def checkASMEB318(SMYS,diam,thickness,riser,depth,p_inlet,T_derating):
     '''
-        Determine if pipe parameters satisfy hoop and longitudinal stress requirements
+        Determine if pipe parameters satisfy hoop and longitudinal stress requirements.
+        Works elementwise on arrays of parameters.
     '''
     
     # Hoop Stress - 2020 ASME B31.8 Table A842.2.2-1
@@ -113,22 +155,27 @@ def checkASMEB318(SMYS,diam,thickness,riser,depth,p_inlet,T_derating):
     rho_water = 1000 #kg/m3
     p_hydrostatic = rho_water*9.81*depth*Pa2bar # bar
     dP = (p_inlet-p_hydrostatic)*bar2MPa    # MPa
-    S_h = dP*(diam-(thickness if diam/thickness>=30 else 0))/(2000*thickness)
-    if S_h>=S_h_check:
-        return False
+    S_h = dP*(diam-np.where(diam/thickness>=30, thickness, 0))/(2000*thickness)
 
     #   Longitudinal stress (MPa)
     S_L_check = 0.8*SMYS #2020 ASME B31.8 Table A842.2.2-1. Same for riser and pipe
     S_L = p_inlet*bar2MPa*(diam-2*thickness)/(4*thickness)
-    if S_L>S_L_check:
-        return False
 
     S_combined_check = 0.9*SMYS #2020 ASME B31.8 Table A842.2.2-1. Same for riser and pipe
     #   Torsional stress?? Under what applied torque? Not sure what to do for this.
 
-    return True
+    return (S_h<S_h_check) & (S_L<=S_L_check)
+
+def get_pipe_costs(diam,thickness,price,total_L):
+    '''
+        Calculates the material, labor, row, and misc costs of pipes, elementwise on arrays of
+        outer diameter [mm], thickness [mm], steel price [$/kg] and total length [km]
+    '''
+    rho_steel = 7840 #kg/m3
+    mm2m = 0.001
+    km2m = 1000
+    L_m = total_L*km2m
 
-def get_anl_costs(costs,total_L):
     labor_coef = [95295,0.53848,0.03070]
     misc_coef = [19211,0.14178,0.04697]
     row_coef = [72634,1.07566,0.05284]
@@ -136,12 +183,32 @@ def get_anl_costs(costs,total_L):
 
     L_mi = total_L*0.621371
 
-    # costs['mat cost anl [$]'] = costs.apply(lambda x: (mat_coef[0]*((x['Outer diameter (mm)']*mm2in)**mat_coef[1])/L_mi**mat_coef[2])*(x['Outer diameter (mm)']*mm2in*L_mi),axis=1)
-    costs['labor cost [$]'] = costs.apply(lambda x: (labor_coef[0]/((x['Outer diameter (mm)']*mm2in)**labor_coef[1])*L_mi**labor_coef[2])*(x['Outer diameter (mm)']*mm2in*L_mi),axis=1)
-    costs['misc cost [$]'] = costs.apply(lambda x: (misc_coef[0]/((x['Outer diameter (mm)']*mm2in)**misc_coef[1])/L_mi**misc_coef[2])*(x['Outer diameter (mm)']*mm2in*L_mi),axis=1)
-    costs['ROW cost [$]'] = costs.apply(lambda x: (row_coef[0]/((x['Outer diameter (mm)']*mm2in)**row_coef[1])*L_mi**row_coef[2])*(x['Outer diameter (mm)']*mm2in*L_mi),axis=1)
+    costs = {}
+    costs['volume [m3]'] = np.pi*(np.power(diam,2)-np.power(diam-thickness*2,2))*mm2m**2/4*L_m
+    costs['weight [kg]'] = costs['volume [m3]']*rho_steel
+    costs['mat cost [$]'] = costs['weight [kg]']*price
+
+    # costs['mat cost anl [$]'] = (mat_coef[0]*((diam*mm2in)**mat_coef[1])/L_mi**mat_coef[2])*(diam*mm2in*L_mi)
+    costs['labor cost [$]'] = (labor_coef[0]/np.power(diam*mm2in,labor_coef[1])*np.power(L_mi,labor_coef[2]))*(diam*mm2in*L_mi)
+    costs['misc cost [$]'] = (misc_coef[0]/np.power(diam*mm2in,misc_coef[1])/np.power(L_mi,misc_coef[2]))*(diam*mm2in*L_mi)
+    costs['ROW cost [$]'] = (row_coef[0]/np.power(diam*mm2in,row_coef[1])*np.power(L_mi,row_coef[2]))*(diam*mm2in*L_mi)
+
+    costs['total capital cost [$]'] = costs['mat cost [$]']+costs['labor cost [$]']+costs['misc cost [$]']+costs['ROW cost [$]']
+
+    costs['annual operating cost [$]'] = 0.0117*costs['total capital cost [$]'] # https://doi.org/10.1016/j.esr.2021.100658
+
+    return costs
+
+def get_anl_costs(costs,total_L):
+    '''
+        Adds the labor, row, and misc costs and the totals to a DataFrame of pipes with material costs
+    '''
+    anl_costs = get_pipe_costs(costs['Outer diameter (mm)'].values,0,0,total_L)
+    costs['labor cost [$]'] = anl_costs['labor cost [$]']
+    costs['misc cost [$]'] = anl_costs['misc cost [$]']
+    costs['ROW cost [$]'] = anl_costs['ROW cost [$]']
 
-    costs['total capital cost [$]'] = costs[['mat cost [$]','labor cost [$]','misc cost [$]','ROW cost [$]']].sum(axis=1)
+    costs['total capital cost [$]'] = costs['mat cost [$]']+costs['labor cost [$]']+costs['misc cost [$]']+costs['ROW cost [$]']
 
     costs['annual operating cost [$]'] = 0.0117*costs['total capital cost [$]'] # https://doi.org/10.1016/j.esr.2021.100658
 
@@ -151,13 +218,11 @@ def get_mat_costs(schedules_spec,total_L,steel_costs_kg):
     '''
         Calculates the material cost based on $/kg from Savoy for each grade
     '''
-    rho_steel = 7840 #kg/m3
-    mm2m = 0.001
-    km2m = 1000
-    L_m = total_L*km2m
-    schedules_spec['volume [m3]'] = schedules_spec.apply(lambda x: np.pi*(x['Outer diameter (mm)']**2-(x['Outer diameter (mm)']-x['Thickness (mm)']*2)**2)*mm2m**2/4*L_m,axis=1)
-    schedules_spec['weight [kg]'] = schedules_spec['volume [m3]']*rho_steel
-    schedules_spec['mat cost [$]'] = schedules_spec.apply(lambda x:x['weight [kg]']*steel_costs_kg.loc[steel_costs_kg['Grade']==x['Grade'],'Price [$/kg]'].iat[0],axis=1)
+    price = schedules_spec['Grade'].map(steel_costs_kg.drop_duplicates('Grade').set_index('Grade')['Price [$/kg]'])
+    mat_costs = get_pipe_costs(schedules_spec['Outer diameter (mm)'].values,schedules_spec['Thickness (mm)'].values,price.values,total_L)
+    schedules_spec['volume [m3]'] = mat_costs['volume [m3]']
+    schedules_spec['weight [kg]'] = mat_costs['weight [kg]']
+    schedules_spec['mat cost [$]'] = mat_costs['mat cost [$]']
 
     return schedules_spec
 
@@ -165,7 +230,13 @@ def get_min_diameter_of_pipe(L:float,m_dot:float,p_inlet:float,p_outlet:float):
     '''
     Overview:
     ---------
-        This function returns the diameter of a pipe for a given length,flow rate, and pressure boundaries
+        This function returns the diameter of a pipe for a given length,flow rate, and pressure boundaries.
+        Inputs may be arrays, which are broadcast against each other.
+
+        The isothermal momentum balance -dp/dz = f/(2D)*rho*v**2 + rho*v*dv/dz, with rho*v = m_dot/A and
+        rho = p/ZRT, integrates along the pipe to
+            (p_inlet**2 - p_outlet**2)/(2*ZRT) = (m_dot/A)**2 * (f*L/(2*D) + ln(p_inlet/p_outlet))
+        whose right-hand side decreases with D, so it is solved for D with Newton's method on ln(D).
 
     Parameters:
     -----------
@@ -179,75 +250,35 @@ def get_min_diameter_of_pipe(L:float,m_dot:float,p_inlet:float,p_outlet:float):
         diameter_mm : float - Diameter of pipe [mm]
 
     '''
-
-    def momentum_bal(x,*params):
-        '''
-        Overview:
-        ---------
-            Residual equation for momentum balance
-
-        Parameters:
-        -----------
-            x : list[float] - Guess values. Index 0 is the diameter. The remaining are the pressures
-            params : tuple(float) - Parameters in the order m_dot,p_inlet,p_outlet,L_km,ZRT,f,nodes
-
-        Returns:
-        --------
-            residual : list[float] - Residual values of momentum equation
-        '''
-        
-        #   Useful conversions
-        bar2Pa = 100000     #   Convert bar to Pa 
-        km2m = 1000         #   Convert km to m
-
-        # Unload params into local varibles
-        m_dot,p_inlet,p_outlet,L_km,ZRT,f,nodes = params 
-
-        #   Extract guess values
-        D = x[0]                                                    #   Diameter of pipe [m]
-        p_bar = x[1:]                                               #   Pressure inside the pipe [bar]
-
-        #   Geometric parameters
-        A = np.pi/4*D**2                                            #   Calculate area of pipe [m2]
-        L = L_km * km2m                                             #   Length of pipe [m]
-        dz = L/nodes                                                #   Uniform spacing of nodes [m]
-
-        #   Pressure, density, and velocity for each node
-        p = np.concatenate(([p_inlet],p_bar,[p_outlet]))*bar2Pa     #   Pressure array with boundary conditions [Pa]
-        rho = p/ZRT                                                 #   Density of gas [kg/m3]
-        rho_avg = np.mean([rho[0:-1],rho[1:]],axis=0)               #   Average density in each node [kg/m3]
-        v = m_dot/rho/A                                             #   Velocity of gas [m/s]
-        v_avg = np.mean([v[0:-1],v[1:]],axis=0)                     #   Average density in each node [m/s]
-
-        #   Momentum balance terms
-        dpdz = (p[1:]-p[0:-1])/dz                                   #   Pressure drop [Pa/m]
-        tau = 0.5*f*rho_avg*v_avg**2                                #   Viscous drag [Pa]
-        pududz = rho_avg*v_avg * (v[1:]-v[0:-1])/dz                 #   Velocity change effect [Pa/m]
-
-        #   Momentum balance
-        residual = -dpdz - tau/D - pududz 
-
-        return residual
-
     #   Conversions
     m2mm = 1000
+    bar2Pa = 100000     #   Convert bar to Pa
+    km2m = 1000         #   Convert km to m
 
     #   Various inputs
     f = 0.01                # Friction factor
     Z = 0.9                 # Compressibility
     R = 8.314/(2.016/1000)  # J/kg-K For hydrogen
     T = 15+273              # Temperature [K]
-    nodes = 50              # Number of nodes to discretize with
-    params = (m_dot,p_inlet,p_outlet,L,Z*R*T,f,nodes)
-
-    #   Generate guess values
-    d_init = 0.01           # Diameter [m]
-    p_init = np.linspace(p_inlet,p_outlet,nodes-1) #[bar]
-    x_init = np.concatenate(([d_init],p_init))
 
-    #   Solve for the diameter
-    diameter_m = fsolve(momentum_bal,x_init,args = params)[0]
-    diameter_mm = diameter_m * m2mm
+    p_in = np.asarray(p_inlet, dtype=float)*bar2Pa
+    p_out = np.asarray(p_outlet, dtype=float)*bar2Pa
+    drag = f*np.asarray(L, dtype=float)*km2m/2         #   Friction term times D [m]
+    expansion = np.log(p_in/p_out)                      #   Acceleration term
+    # ln((p_inlet**2 - p_outlet**2)/(2*ZRT)) - ln((4*m_dot/pi)**2)
+    rhs = np.log((p_in**2-p_out**2)/(2*Z*R*T)) - 2*np.log(4*np.asarray(m_dot, dtype=float)/np.pi)
+
+    #   Start from the friction-only solution, which is exact without the acceleration term
+    log_D = (np.log(drag) - rhs)/5
+    for _ in range(50):
+        friction = drag*np.exp(-log_D)
+        residual = np.log(friction + expansion) - 4*log_D - rhs
+        step = residual/(4 + friction/(friction + expansion))
+        log_D = log_D + step
+        if np.all(np.abs(step) < 1e-12):
+            break
+
+    diameter_mm = np.exp(log_D) * m2mm
 
     return diameter_mm
 
@@ -14,8 +14,10 @@ Returns:
 """
 def run_pipe_array(sections_distance, depth, p_inlet, p_outlet, mass_flow_rate):
     
-    capex = 0
-    opex = 0
+    section_lengths = []
+    flow_rates_sections = []
+    p_outlet_sections = []
+    risers_sections = []
 
     # loop over each string
     for i, pipe_string in enumerate(sections_distance):
@@ -42,12 +44,20 @@ def run_pipe_array(sections_distance, depth, p_inlet, p_outlet, mass_flow_rate):
                 risers = 2
             else:
                 risers = 1
-                
-            # get specs and costs for each section
-            section_outputs = run_pipe_analysis(section_length, m_dot, p_inlet, p_outlet_section, depth, risers=risers)
 
-            capex += section_outputs["total capital cost [$]"][0]
-            opex += section_outputs["annual operating cost [$]"][0]
+            section_lengths.append(section_length)
+            flow_rates_sections.append(m_dot)
+            p_outlet_sections.append(p_outlet_section)
+            risers_sections.append(risers)
+
+    if not section_lengths:
+        return 0, 0
+
+    # get specs and costs for all sections at once
+    section_outputs = run_pipe_analysis(section_lengths, flow_rates_sections, p_inlet, p_outlet_sections, depth, risers=risers_sections)
+
+    capex = section_outputs["total capital cost [$]"].sum()
+    opex = section_outputs["annual operating cost [$]"].sum()
 
     return capex, opex
 
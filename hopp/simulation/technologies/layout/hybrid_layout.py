@@ -6,7 +6,6 @@ import os
 from hopp.simulation.technologies.layout.wind_layout import WindLayout, WindBoundaryGridParameters
 from hopp.simulation.technologies.layout.pv_layout import PVLayout, PVGridParameters
 from hopp.simulation.technologies.layout.pv_layout_tools import get_flicker_loss_multiplier
-from hopp.simulation.technologies.layout.flicker_mismatch import FlickerMismatch
 from hopp.simulation.technologies.sites.site_info import SiteInfo
 
 class HybridLayout:
@@ -52,6 +51,9 @@ class HybridLayout:
                      x_coordinates of grid,
                      y_coordinates of grid)
         """
+        # the flicker model and its dependencies are only loaded for hybrids of wind and pv
+        from hopp.simulation.technologies.layout.flicker_mismatch import FlickerMismatch
+
         if flicker_load_nearest:
             # pre-processed detailed flicker heat map
             existing_locations = [[33.209, -108.283],
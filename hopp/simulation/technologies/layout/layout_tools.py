@@ -1,3 +1,4 @@
+from functools import lru_cache
 from math import fabs
 from typing import (
     Callable,
@@ -5,7 +6,9 @@ from typing import (
     )
 
 import numpy as np
-from shapely.geometry import Polygon
+from shapely import wkb
+from shapely.geometry import Polygon, MultiPolygon
+from shapely.geometry.base import BaseGeometry
 
 
 def binary_search_float(objective: Callable[[float], any],
@@ -91,3 +94,95 @@ def clamp(value,
         delta = minimum - value
         value = minimum
     return value, error + delta ** 2
+
+
+class PolygonScanlines:
+    """
+    Scanline decomposition of a (multi)polygon into vertical slabs.
+
+    The polygon's vertex x-coordinates split the plane into slabs within which the set of boundary edges crossed by
+    a vertical (N-S) line, and their vertical order, does not change. Storing the ordered edges per slab lets the
+    chords of any vertical line through the polygon be evaluated with array operations instead of shapely
+    intersections.
+    """
+
+    def __init__(self, site_shape: BaseGeometry):
+        if isinstance(site_shape, Polygon):
+            polygons = [site_shape]
+        elif isinstance(site_shape, MultiPolygon):
+            polygons = list(site_shape.geoms)
+        else:
+            polygons = [g for g in getattr(site_shape, 'geoms', []) if isinstance(g, Polygon)]
+
+        edges = []
+        for polygon in polygons:
+            if polygon.is_empty:
+                continue
+            for ring in [polygon.exterior, *polygon.interiors]:
+                coords = np.asarray(ring.coords)[:, :2]
+                edges.append(np.hstack((coords[:-1], coords[1:])))
+        edges = np.vstack(edges) if len(edges) else np.zeros((0, 4))
+        # vertical edges never cross a vertical line's interior
+        edges = edges[edges[:, 0] != edges[:, 2]]
+
+        self.x0, self.y0 = edges[:, 0], edges[:, 1]
+        self.slope = (edges[:, 3] - edges[:, 1]) / (edges[:, 2] - edges[:, 0])
+        edge_x_min = np.minimum(edges[:, 0], edges[:, 2])
+        edge_x_max = np.maximum(edges[:, 0], edges[:, 2])
+
+        self.slab_x = np.unique(np.concatenate((edge_x_min, edge_x_max)))
+        n_slabs = max(len(self.slab_x) - 1, 0)
+        slab_mid = .5 * (self.slab_x[:-1] + self.slab_x[1:])
+        crosses = (edge_x_min[:, None] < slab_mid[None, :]) & (slab_mid[None, :] < edge_x_max[:, None])
+        n_crossings = crosses.sum(axis=0)
+        max_crossings = int(n_crossings.max()) if n_slabs else 0
+
+        # edges crossing each slab ordered from north to south, padded with -1
+        y_mid = np.where(crosses, self.y0[:, None] + (slab_mid[None, :] - self.x0[:, None]) * self.slope[:, None],
+                         -np.inf)
+        order = np.argsort(-y_mid, axis=0, kind='stable')[:max_crossings].T
+        valid = np.arange(max_crossings)[None, :] < n_crossings[:, None]
+        self.slab_edges = np.where(valid, order, -1)
+
+    def chords(self,
+               x: np.ndarray,
+               y_min: float = -np.inf,
+               y_max: float = np.inf
+               ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Chords of the polygon along vertical lines, clipped to [y_min, y_max]
+        :param x: x-coordinates of the vertical lines
+        :param y_min: south limit of the lines
+        :param y_max: north limit of the lines
+        :return: (top, bottom) y-coordinates of shape (len(x), max chords per line), ordered from north to south.
+                 Missing chords have zero length (top == bottom).
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        if self.slab_edges.shape[1] == 0:
+            empty = np.zeros((len(x), 0))
+            return empty, empty
+        slab = np.searchsorted(self.slab_x, x, side='right') - 1
+        inside = (slab >= 0) & (slab < len(self.slab_x) - 1)
+        edges = self.slab_edges[np.clip(slab, 0, len(self.slab_x) - 2)]
+        edges = np.where(inside[:, None], edges, -1)
+        edge_index = np.maximum(edges, 0)
+        y = self.y0[edge_index] + (x[:, None] - self.x0[edge_index]) * self.slope[edge_index]
+        y = np.where(edges >= 0, y, np.nan)
+
+        top = np.clip(y[:, 0::2], y_min, y_max)
+        bottom = np.clip(y[:, 1::2], y_min, y_max)
+        missing = np.isnan(top) | np.isnan(bottom)
+        top[missing] = bottom[missing] = 0.0
+        return top, bottom
+
+
+@lru_cache(maxsize=32)
+def _scanlines_from_wkb(shape_wkb: bytes) -> PolygonScanlines:
+    return PolygonScanlines(wkb.loads(shape_wkb))
+
+
+def get_polygon_scanlines(site_shape: BaseGeometry) -> PolygonScanlines:
+    """
+    Returns the scanline decomposition of `site_shape`, reusing the one built for an identical shape
+    """
+    return _scanlines_from_wkb(site_shape.wkb)
@@ -29,27 +29,28 @@ def find_best_gcr(
     Finds the least dense (lowest gcr) layout that fits max_num_modules. If that isn't possible, it finds the densest,
     highest gcr that fits as many modules as possible.
     """
-    best: Tuple[float, int, List[(int, float, Polygon)]] = (0.0, 0, [])
-    prepared_site = prep(site_shape)
+    best: Tuple[float, int] = (0.0, 0)
+    scanlines = get_polygon_scanlines(site_shape)
+    bounds = site_shape.bounds
+    center = np.array([center.x, center.y])
     
     def objective(gcr: float) -> float:
         nonlocal best
-        num_modules, strands = \
-            place_solar_strands(
-                max_num_modules,
-                min_strand_length,
-                site_shape,
-                center,
-                phase,
-                gcr,
-                module_width,
-                module_height,
-                prepared_site=prepared_site
-                )
+        num_modules = count_solar_strand_modules(
+            scanlines,
+            max_num_modules,
+            min_strand_length,
+            center,
+            phase,
+            gcr,
+            module_width,
+            module_height,
+            bounds
+            )[0]
         
         delta_modules = num_modules - best[1]
         if delta_modules > 0 or (delta_modules == 0 and best[0] > gcr):
-            best = gcr, num_modules, strands
+            best = gcr, num_modules
         
         if num_modules < max_num_modules:
             # if the number of modules is less than the max, search denser, larger gcrs
@@ -63,7 +64,20 @@ def find_best_gcr(
         max_iters=32,
         threshold=1e-4)
     
-    return best
+    if best[1] == 0:
+        return best[0], 0, []
+    num_modules, strands = place_solar_strands_on_scanlines(
+        scanlines,
+        max_num_modules,
+        min_strand_length,
+        center,
+        phase,
+        best[0],
+        module_width,
+        module_height,
+        bounds
+        )
+    return best[0], num_modules, strands
 
 
 def find_best_solar_size(
@@ -81,35 +95,35 @@ def find_best_solar_size(
         ) -> Tuple[float, int, List[Tuple[int, float, Polygon]], np.ndarray]:
     """
     Finds the smallest size that fits max_num_modules. If that isn't possible, it fits as many modules as it can.
+
+    Each trial size is evaluated from the cached scanline decomposition of the site, so the shapely geometry of the
+    strands and solar region is only built for the chosen size.
     """
-    best: Tuple[float, int, List[(int, float, Polygon)], np.ndarray] = (0.0, 0, [], Point(0, 0).buffer(.01), np.zeros(2))
-    prepared_site = prep(site_shape)
+    best: Tuple[float, int] = (0.0, 0)
+    scanlines = get_polygon_scanlines(site_shape)
+    
+    def get_solar_bounds(x_length: float) -> Tuple[np.ndarray, np.ndarray]:
+        size = np.array([x_length, aspect * x_length])
+        return center - size / 2, center + size / 2
     
     def objective(x_length: float) -> float:
         nonlocal best
-        size = np.array([x_length, aspect * x_length])
-        sw_bound = center - size / 2
-        ne_bound = center + size / 2
-        solar_bounds = (sw_bound, ne_bound)
-        bounds_shape = make_polygon_from_bounds(sw_bound, ne_bound)
-        valid_region = bounds_shape.intersection(site_shape)
-        
-        num_modules, strands = \
-            place_solar_strands(
-                max_num_modules,
-                min_strand_length,
-                valid_region,
-                Point(center),
-                phase,
-                gcr,
-                module_width,
-                module_height,
-                prepared_site=prepared_site
-                )
+        sw_bound, ne_bound = get_solar_bounds(x_length)
+        num_modules = count_solar_strand_modules(
+            scanlines,
+            max_num_modules,
+            min_strand_length,
+            center,
+            phase,
+            gcr,
+            module_width,
+            module_height,
+            (*sw_bound, *ne_bound)
+            )[0]
         
         delta_modules = num_modules - best[1]
         if delta_modules > 0 or (delta_modules == 0 and best[0] > x_length):
-            best = x_length, num_modules, strands, valid_region, solar_bounds
+            best = x_length, num_modules
         
         if num_modules < max_num_modules:
             # if the number of modules is less than the max, search larger sizes
@@ -124,7 +138,94 @@ def find_best_solar_size(
         max_iters=32,
         threshold=1e-1)
     
-    return best
+    if best[1] == 0:
+        return 0.0, 0, [], Point(0, 0).buffer(.01), np.zeros(2)
+    
+    x_length = best[0]
+    solar_bounds = get_solar_bounds(x_length)
+    valid_region = make_polygon_from_bounds(*solar_bounds).intersection(site_shape)
+    num_modules, strands = place_solar_strands_on_scanlines(
+        scanlines,
+        max_num_modules,
+        min_strand_length,
+        center,
+        phase,
+        gcr,
+        module_width,
+        module_height,
+        (*solar_bounds[0], *solar_bounds[1])
+        )
+    return x_length, num_modules, strands, valid_region, solar_bounds
+
+
+def count_solar_strand_modules(
+        scanlines: PolygonScanlines,
+        max_num_modules: int,
+        min_strand_length: int,
+        center: np.ndarray,
+        phase_offset: float,
+        gcr: float,
+        module_width: float,
+        module_height: float,
+        bounds: Tuple[float, float, float, float],
+        ) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Analytic equivalent of `place_solar_strands` for the part of a site within a rectangle.
+
+    N-S rows are spaced by gcr as in `place_solar_strands`, and the strand on each chord of a row is filled west to
+    east, north to south until max_num_modules are placed.
+    :param scanlines: scanline decomposition of the site
+    :param center: (x, y) where the rows are centered
+    :param bounds: (min x, min y, max x, max y) of the rectangle
+    :return: (number of modules placed, x of each row, chord top y, chord bottom y, modules per chord)
+    """
+    interrow_spacing = module_width / np.sqrt(gcr)
+    grid_x = center[0] + phase_offset * interrow_spacing
+    first_row = np.ceil((bounds[0] - grid_x) / interrow_spacing)
+    last_row = np.floor((bounds[2] - grid_x) / interrow_spacing)
+    rows_x = grid_x + np.arange(first_row, last_row + 1) * interrow_spacing
+
+    top, bottom = scanlines.chords(rows_x, bounds[1], bounds[3])
+    chord_modules = np.floor((top - bottom) / module_height)
+    chord_modules = np.where(chord_modules >= min_strand_length, chord_modules, 0).ravel()
+
+    # strands are filled in order until the remaining modules can't make a strand of min_strand_length
+    placed_before = np.cumsum(chord_modules) - chord_modules
+    strand_modules = np.clip(max_num_modules - placed_before, 0, chord_modules)
+    strand_modules = np.where(strand_modules >= min_strand_length, strand_modules, 0).astype(int)
+    return int(strand_modules.sum()), rows_x, top, bottom, strand_modules.reshape(top.shape)
+
+
+def place_solar_strands_on_scanlines(
+        scanlines: PolygonScanlines,
+        max_num_modules: int,
+        min_strand_length: int,
+        center: np.ndarray,
+        phase_offset: float,
+        gcr: float,
+        module_width: float,
+        module_height: float,
+        bounds: Tuple[float, float, float, float],
+        ) -> Tuple[int, List[Tuple[int, float, LineString]]]:
+    """
+    Places rows of solar strands as in `place_solar_strands` using `count_solar_strand_modules`
+    """
+    num_modules, rows_x, top, bottom, strand_modules = count_solar_strand_modules(
+        scanlines,
+        max_num_modules,
+        min_strand_length,
+        center,
+        phase_offset,
+        gcr,
+        module_width,
+        module_height,
+        bounds
+        )
+    strands: List[Tuple[int, float, LineString]] = []
+    for row, chord in zip(*np.nonzero(strand_modules)):
+        x, y_top, y_bottom = rows_x[row], top[row, chord], bottom[row, chord]
+        strands.append((int(strand_modules[row, chord]), y_top - y_bottom, LineString([(x, y_top), (x, y_bottom)])))
+    return num_modules, strands
 
 
 def place_solar_strands(max_num_modules: int,
@@ -1,15 +1,17 @@
 from __future__ import annotations
 from typing import Union, NamedTuple
 import numpy as np
-import matplotlib.pyplot as plt
 from shapely.geometry import Polygon, Point, MultiPolygon
 from shapely.affinity import scale
+from shapely.prepared import prep
+from shapely import vectorized
 import PySAM.Windpower as windpower
 
 from hopp.utilities.log import hybrid_logger as logger
 from hopp.simulation.technologies.layout.wind_layout_tools import (
     get_best_grid,
     get_evenly_spaced_points_along_border,
+    get_points_along_line,
     subtract_turbine_exclusion_zone
     )
 from hopp.simulation.technologies.sites.site_info import SiteInfo
@@ -156,27 +158,27 @@ class WindLayout:
             spacing = np.sqrt(
                 self.site.polygon.area / n_turbines) * self.site.polygon.envelope.area / self.site.polygon.area
             spacing = max(spacing, self._system_model.value("wind_turbine_rotor_diameter") * 3)
-            coords = []
+            # the buffered site is built once and tested against all candidates on an envelope ring at a time
+            prepared_site = prep(self.site.polygon.buffer(1e3))
+            coords = np.zeros((0, 2))
             while len(coords) < n_turbines:
-
                 envelope = Polygon(self.site.polygon.envelope)
                 while len(coords) < n_turbines and envelope.area > spacing * spacing:
-                    d = 0
                     sub_boundary = envelope.boundary
-                    while d <= sub_boundary.length and len(coords) < n_turbines:
-                        coord = sub_boundary.interpolate(d)
-                        if self.site.polygon.buffer(1e3).contains(coord):
-                            coords.append(coord)
-                        d += spacing
+                    steps = np.full(int(np.floor(sub_boundary.length / spacing)) + 2, spacing)
+                    steps[0] = 0
+                    distances = np.cumsum(steps)
+                    ring_x, ring_y = get_points_along_line(sub_boundary, distances[distances <= sub_boundary.length])
+                    inside = vectorized.contains(prepared_site, ring_x, ring_y)
+                    ring_coords = np.column_stack((ring_x[inside], ring_y[inside]))
+                    coords = np.vstack((coords, ring_coords[:n_turbines - len(coords)]))
                     if len(coords) < n_turbines:
                         envelope = scale(envelope, (envelope.bounds[2] - spacing) / envelope.bounds[2],
                                          (envelope.bounds[3] - spacing) / envelope.bounds[3])
                 if len(coords) < n_turbines:
                     spacing *= .95
-                    coords = []
-            for _, p in enumerate(coords):
-                xcoords.append(p.x)
-                ycoords.append(p.y)
+                    coords = np.zeros((0, 2))
+            xcoords, ycoords = coords[:, 0].tolist(), coords[:, 1].tolist()
 
         self.turb_pos_x, self.turb_pos_y = xcoords, ycoords
         self._set_system_layout()
@@ -215,6 +217,8 @@ class WindLayout:
              site_alpha=0.95,
              linewidth=4.0
              ):
+        import matplotlib.pyplot as plt
+
         if not figure and not axes:
             figure, axes = self.site.plot(figure, axes, site_border_color, site_alpha, linewidth)
 
@@ -4,8 +4,9 @@ from typing import Optional
 from shapely.affinity import rotate, translate
 from shapely.geometry import Point, LineString, Polygon
 from shapely.geometry.base import BaseGeometry
-from shapely.prepared import prep
+from shapely.prepared import prep, PreparedGeometry
 from shapely.ops import unary_union
+from shapely import vectorized
 
 from hopp.simulation.technologies.layout.layout_tools import binary_search_float
 
@@ -35,21 +36,17 @@ def get_evenly_spaced_points_along_border(boundary: BaseGeometry,
     return result
 
 
-def make_grid_lines(site_shape: BaseGeometry,
-                    center: Point,
-                    grid_angle: float,
-                    interrow_spacing: float
-                    ) -> list:
+def make_grid_line_coords(site_shape: BaseGeometry,
+                          center: Point,
+                          grid_angle: float,
+                          interrow_spacing: float
+                          ) -> np.ndarray:
     """
-    Place parallel lines inside a site
-    :param site_shape: Polygon
-    :param center: where to center the grid
-    :param grid_angle: in degrees where 0 is east
-    :param interrow_spacing: distance between lines
-    :return: list of lines
+    Endpoints of parallel lines inside a site, see `make_grid_lines`
+    :return: array of shape (number of lines, 2, 2) of each line's start and end coordinates
     """
     if site_shape.is_empty:
-        return []
+        return np.zeros((0, 2, 2))
     
     grid_angle = (grid_angle + np.pi) % (2 * np.pi) - np.pi  # reset grid_angle to (-pi, pi)
     bounds = site_shape.bounds
@@ -65,13 +62,52 @@ def make_grid_lines(site_shape: BaseGeometry,
         interrow_spacing * np.cos(-grid_angle + np.pi / 2),
         interrow_spacing * np.sin(-grid_angle + np.pi / 2))
     
-    grid_lines: list[LineString] = []
     num_rows_per_side: int = int(np.ceil((line_length / 2) / interrow_spacing) + 1)
-    for row_number in range(-num_rows_per_side, num_rows_per_side + 1):
-        line = translate(base_line, row_number * row_offset.x, row_number * row_offset.y)
-        grid_lines.append(line)
-    
-    return grid_lines
+    row_numbers = np.arange(-num_rows_per_side, num_rows_per_side + 1)[:, None, None]
+    return np.asarray(base_line.coords)[None, :, :] + row_numbers * np.array([row_offset.x, row_offset.y])
+
+
+def make_grid_lines(site_shape: BaseGeometry,
+                    center: Point,
+                    grid_angle: float,
+                    interrow_spacing: float
+                    ) -> list:
+    """
+    Place parallel lines inside a site
+    :param site_shape: Polygon
+    :param center: where to center the grid
+    :param grid_angle: in degrees where 0 is east
+    :param interrow_spacing: distance between lines
+    :return: list of lines
+    """
+    return [LineString(coords) for coords in make_grid_line_coords(site_shape, center, grid_angle, interrow_spacing)]
+
+
+def get_points_along_line(line: LineString,
+                          distances: np.ndarray
+                          ) -> tuple:
+    """
+    Vectorized equivalent of `line.interpolate(d)` for each distance in `distances`
+    :param line: a line or ring
+    :param distances: distances along the line, clamped to [0, line.length]
+    :return: x and y coordinate arrays
+    """
+    coords = np.asarray(line.coords)
+    delta = np.diff(coords, axis=0)
+    segment_lengths = np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+    segment_ends = np.cumsum(segment_lengths)
+    segment_starts = np.concatenate(([0.], segment_ends[:-1]))
+
+    # as in GEOS, a point lies on the first segment that ends beyond it
+    distances = np.maximum(np.asarray(distances, dtype=float), 0.)
+    segment = np.minimum(np.searchsorted(segment_ends, distances, side='right'), len(segment_lengths) - 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = (distances - segment_starts[segment]) / segment_lengths[segment]
+    x = np.where(fraction >= 1, coords[segment + 1, 0], delta[segment, 0] * fraction + coords[segment, 0])
+    y = np.where(fraction >= 1, coords[segment + 1, 1], delta[segment, 1] * fraction + coords[segment, 1])
+    x = np.where(fraction <= 0, coords[segment, 0], x)
+    y = np.where(fraction <= 0, coords[segment, 1], y)
+    return x, y
 
 
 def create_grid(site_shape: BaseGeometry,
@@ -81,6 +117,7 @@ def create_grid(site_shape: BaseGeometry,
                 interrow_spacing: float,
                 row_phase_offset: float,
                 max_sites: int = None,
+                prepared_site: Optional[PreparedGeometry] = None,
                 ) -> list:
     """
     Get a list of coordinates placed along a grid inside a site boundary
@@ -91,34 +128,39 @@ def create_grid(site_shape: BaseGeometry,
     :param interrow_spacing: distance between rows
     :param row_phase_offset: offset of turbines along row from one row to the next
     :param max_sites: max number of turbines
+    :param prepared_site: prepared `site_shape`, to reuse across calls
     :return: list of coordinates
     """
-    grid_lines: list[LineString] = make_grid_lines(
+    line_coords = make_grid_line_coords(
         site_shape,
         center,
         grid_angle,
         interrow_spacing
         )
+    if not len(line_coords):
+        return []
     phase_offset: float = row_phase_offset * intrarow_spacing
     
-    prepared_site = prep(site_shape)
-    grid_positions: list[Point] = []
-    for row_number, grid_line in enumerate(grid_lines):
-        length = grid_line.length
-        
-        # generate points along that line with the right phase offset
-        x: float = (phase_offset * row_number) % intrarow_spacing
-        while x <= length:
-            position = grid_line.interpolate(x)
-            if prepared_site.contains(position):
-                if max_sites and len(grid_positions) >= max_sites:
-                    break
-                grid_positions.append(position)
-            x += intrarow_spacing
-        if max_sites and len(grid_positions) >= max_sites:
-            break
+    start, delta = line_coords[:, 0], line_coords[:, 1] - line_coords[:, 0]
+    length = np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])[:, None]
+    
+    # generate points along each line with the right phase offset, accumulated as in a running sum
+    num_rows = len(line_coords)
+    num_per_row = int(np.floor(length.max() / intrarow_spacing)) + 2
+    steps = np.full((num_rows, num_per_row), intrarow_spacing)
+    steps[:, 0] = [(phase_offset * row_number) % intrarow_spacing for row_number in range(num_rows)]
+    x = np.cumsum(steps, axis=1)
+    valid = x <= length
+    
+    fraction = np.clip(x / length, 0., 1.)
+    points_x = (delta[:, 0:1] * fraction + start[:, 0:1])[valid]
+    points_y = (delta[:, 1:2] * fraction + start[:, 1:2])[valid]
+    
+    prepared_site = prep(site_shape) if prepared_site is None else prepared_site
+    inside = vectorized.contains(prepared_site, points_x, points_y)
+    points_x, points_y = points_x[inside][:max_sites or None], points_y[inside][:max_sites or None]
     
-    return grid_positions
+    return [Point(x, y) for x, y in zip(points_x, points_y)]
 
 
 def get_best_grid(site_shape: BaseGeometry,
@@ -161,7 +203,8 @@ def get_best_grid(site_shape: BaseGeometry,
                 intrarow_spacing,
                 interrow_spacing,
                 row_phase_offset,
-                max_sites)
+                max_sites,
+                prepared_site)
             num_sites = len(grid_sites)
             
             delta_sites = num_sites - best[0]
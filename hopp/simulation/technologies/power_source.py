@@ -1,20 +1,24 @@
+import hashlib
 from typing import Iterable, Sequence, Union
 
 import numpy as np
-import pandas as pd
 import PySAM.Singleowner as Singleowner
 
 from hopp.simulation.technologies.sites.site_info import SiteInfo
 from hopp.utilities.log import hybrid_logger as logger
-from hopp.simulation.technologies.dispatch.power_sources.power_source_dispatch import PowerSourceDispatch
 from hopp.tools.utils import array_not_scalar, equal
 from hopp.utilities.log import hybrid_logger as logger
+from hopp.utilities.utilities import RepeatedYearArray, update_digest
 from hopp.simulation.base import BaseClass
 
 
 class PowerSource(BaseClass):
     """
     Abstract class for a renewable energy power plant simulation.
+
+    The system model is only executed when its inputs changed since its last execution, so that re-simulating a
+    hybrid after changing some of its technologies does not re-run the others. Subclasses whose system model is
+    quicker to execute than to compare set `cache_simulations` to False.
     
     Attributes
     ----------
@@ -23,6 +27,7 @@ class PowerSource(BaseClass):
     site : :class:`hybrid.sites.SiteInfo`
         Power source site information
     """
+    cache_simulations = True
 
     def __init__(self, name, site: SiteInfo, system_model, financial_model):
         """
@@ -44,7 +49,12 @@ class PowerSource(BaseClass):
         self._system_model = system_model
         self._financial_model = financial_model
         self._layout = None
-        self._dispatch = PowerSourceDispatch
+        self._dispatch = None               # dispatch model, created by HybridDispatchBuilderSolver
+        self.n_simulations_skipped = 0
+        self._simulated_digest = None       # digest of the system model inputs of its last execution
+        self._linked_outputs = None         # system model outputs of its last execution that are financial inputs
+        self._linked_output_names = None
+        self._input_groups = None
 
         if isinstance(self._financial_model, Singleowner.Singleowner):
             self.initialize_financial_values()
@@ -212,14 +222,15 @@ class PowerSource(BaseClass):
         :return: capacity value [%]
         """
         if self.capacity_factor_mode == "cap_hours":
-            TIMESTEPS_YEAR = 8760
-
             t_step = self.site.interval / 60  # [hr]
-            if t_step != 1 or len(self.site.capacity_hours) != TIMESTEPS_YEAR or len(self.gen_max_feasible) != TIMESTEPS_YEAR:
+            n_timesteps = self.site.n_timesteps
+            if len(self.site.capacity_hours) != n_timesteps or len(self.gen_max_feasible) != n_timesteps:
                 print("WARNING: Capacity credit could not be calculated. Therefore, it was set to zero for "
                     + type(self).__name__)
                 return 0
             else:
+                import pandas as pd
+
                 df = pd.DataFrame()
                 df['cap_hours'] = self.site.capacity_hours
                 df['E_net_max_feasible'] = self.gen_max_feasible  # [kWh]
@@ -266,9 +277,70 @@ class PowerSource(BaseClass):
             self._system_model.Lifetime.system_use_lifetime_output = 1 if lifetime_sim else 0
             self._system_model.Lifetime.analysis_period = project_life if lifetime_sim else 1
 
-        self._system_model.execute(0)
+        self.execute_system_model()
         logger.info(f"{self.name} simulation executed with AEP {self.annual_energy_kwh}")
-        
+
+    def get_system_model_digest(self) -> str:
+        """
+        Digest of the system model inputs, which identifies its outputs
+        """
+        if self._input_groups is None:
+            self._input_groups = [group for group in self._system_model.export() if group != 'Outputs']
+        # exported by group, to not copy out the outputs
+        inputs = {group: getattr(self._system_model, group).export() for group in self._input_groups}
+        digest = hashlib.sha1()
+        update_digest(digest, inputs)
+        return digest.hexdigest()
+
+    def execute_system_model(self):
+        """
+        Executes the system model, unless `cache_simulations` is set and its inputs are unchanged since its last
+        execution, in which case its outputs are those of that execution. Only PySAM system models, which export
+        their inputs, are cached.
+        """
+        if not self.cache_simulations or not hasattr(self._system_model, "export"):
+            self._execute_system_model()
+            return
+
+        digest = self.get_system_model_digest()
+        if digest == self._simulated_digest:
+            # linked financial models share the system model's data, so that setting their inputs, such as the
+            # lifetime `gen`, overwrites the outputs of the same name
+            for name, value in self._linked_outputs.items():
+                self._financial_model.value(name, value)
+            self.n_simulations_skipped += 1
+            logger.info(f"{self.name} inputs unchanged, skipping simulation")
+            return
+
+        self._simulated_digest = None
+        self._execute_system_model()
+        # executing assigns the defaults of unassigned inputs
+        self._simulated_digest = self.get_system_model_digest()
+        if self._linked_output_names is None:
+            self._linked_output_names = []
+            if isinstance(self._financial_model, Singleowner.Singleowner):
+                financial_inputs = self._financial_model.export()
+                financial_inputs.pop('Outputs', None)
+                input_names = {name for group in financial_inputs.values() for name in group}
+                # only financial models made with `from_existing` share the outputs
+                self._linked_output_names = [name for name in self._system_model.Outputs.export()
+                                             if name in input_names
+                                             and self._financial_model.value(name) == self._system_model.value(name)]
+        self._linked_outputs = {name: self._system_model.value(name) for name in self._linked_output_names}
+
+    def _execute_system_model(self):
+        """
+        Executes the system model, for technologies that run it differently to override
+        """
+        self._system_model.execute(0)
+
+    def clear_simulation_cache(self):
+        """
+        Forces the next simulation to execute the system model
+        """
+        self._simulated_digest = None
+        self._linked_outputs = None
+
     def simulate_financials(self, interconnect_kw: float, project_life: int):
         """
         Runs the finanical model for individual sub-systems
@@ -292,22 +364,29 @@ class PowerSource(BaseClass):
         self._financial_model.value('analysis_period', project_life)
         self._financial_model.value('system_use_lifetime_output', 1 if project_life > 1 else 0)
 
+        # TODO: Should we use the nominal capacity function here?
+        # calculated before the generation is extended to the project life, to only read the first year
+        self.gen_max_feasible = self.calc_gen_max_feasible_kwh(interconnect_kw)
+        self.capacity_credit_percent = self.calc_capacity_credit_percent(interconnect_kw)
+
+        # the generation is read once, as each read copies it out of the financial model
+        gen = self._financial_model.value('gen')
         # try to copy over system_model's generation_profile to the financial_model
-        if len(self._financial_model.value('gen')) == 1:
-            if len(self.generation_profile) == self.site.n_timesteps or \
-              len(self.generation_profile) == self.site.n_timesteps * project_life:
-                self._financial_model.value('gen', self.generation_profile)
+        if len(gen) == 1:
+            generation_profile = self.generation_profile
+            if len(generation_profile) == self.site.n_timesteps or \
+              len(generation_profile) == self.site.n_timesteps * project_life:
+                self._financial_model.value('gen', generation_profile)
+                gen = generation_profile
             else:
                 raise RuntimeError(f"simulate_financials error: generation profile of len {self.site.n_timesteps} required")
 
-        if len(self._financial_model.value('gen')) == self.site.n_timesteps:
+        if len(gen) == self.site.n_timesteps:
             #TODO is this correct? It seems like gen should not be multiplied by project life
-            self._financial_model.value('gen', self._financial_model.value('gen') * project_life)
-        self._financial_model.value('system_pre_curtailment_kwac', self._financial_model.value('gen'))
+            gen = RepeatedYearArray(gen, project_life)
+            self._financial_model.value('gen', gen)
+        self._financial_model.value('system_pre_curtailment_kwac', gen)
         self._financial_model.value('annual_energy_pre_curtailment_ac', self.value("annual_energy_kwh"))
-        # TODO: Should we use the nominal capacity function here?
-        self.gen_max_feasible = self.calc_gen_max_feasible_kwh(interconnect_kw)
-        self.capacity_credit_percent = self.calc_capacity_credit_percent(interconnect_kw)
 
         self._financial_model.execute(0)
 
@@ -1,2 +1,10 @@
-from .pv_plant import PVPlant, PVConfig
-from .detailed_pv_plant import DetailedPVPlant, DetailedPVConfig
\ No newline at end of file
+from hopp.utilities.utilities import lazy_exports
+
+_exports = {
+    "PVPlant": ".pv_plant",
+    "PVConfig": ".pv_plant",
+    "DetailedPVPlant": ".detailed_pv_plant",
+    "DetailedPVConfig": ".detailed_pv_plant",
+}
+__all__ = list(_exports)
+__getattr__ = lazy_exports(__name__, _exports)
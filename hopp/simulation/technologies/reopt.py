@@ -1,5 +1,9 @@
+import copy
+import hashlib
 import os
+import tempfile
 import time
+from pathlib import Path
 
 import PySAM.Singleowner as Singleowner
 import PySAM.Pvsamv1 as Pvsam
@@ -7,7 +11,7 @@ import json
 import requests
 import pandas as pd
 
-from typing import Sequence
+from typing import Callable, Optional, Sequence, Union
 
 from hopp.simulation.technologies.pv.pv_plant import PVPlant
 from hopp.simulation.technologies.wind.wind_plant import WindPlant
@@ -15,6 +19,7 @@ from hopp.simulation.technologies.battery import Battery
 from hopp.utilities.log import hybrid_logger as logger
 from hopp.utilities.keys import get_developer_nrel_gov_key
 from hopp.simulation.technologies.utility_rate import UtilityRate
+from hopp.utilities.utilities import update_digest
 
 import urllib3
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -22,6 +27,145 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 # enable to record responses for testing/debugging
 # from responses import _recorder
 
+
+class REoptProvider:
+    """
+    Source of REopt results
+    """
+    def get_results(self, post: dict) -> Optional[dict]:
+        """
+        Results of the REopt `post`, or None if they could not be obtained
+        """
+        raise NotImplementedError
+
+
+class REoptAPIProvider(REoptProvider):
+    """
+    Results from the REopt API, posting the job then polling its results until the optimization is done
+
+    :param api_url: REopt job endpoint
+    :param api_key: NREL developer API key
+    :param poll_interval: seconds between requests of the results
+    """
+    def __init__(self, api_url: str, api_key: str, poll_interval: float = 5):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.poll_interval = poll_interval
+
+    def get_results(self, post: dict) -> Optional[dict]:
+        run_id = REopt.get_run_uuid(post, API_KEY=self.api_key, api_url=self.api_url)
+        if run_id is None:
+            logger.error("Unable to get results: no run_uuid from POST.")
+            return None
+        results_url = self.api_url + '<run_uuid>/results/?api_key=' + self.api_key
+        return REopt.poller(results_url.replace('<run_uuid>', run_id), self.poll_interval)
+
+
+class REoptResultStore(REoptProvider):
+    """
+    Results of REopt posts, deduplicated by the digest of their payload.
+
+    Results are kept in memory, and also as one JSON file per digest if `results_dir` is given, so the store can be
+    shared by any process using the same directory. Only posts missing from the store are sent to `provider`, so a
+    store shared by many runs never requests the results of the same post twice.
+
+    :param provider: source of the results missing from the store, or None to only use stored results
+    :param results_dir: directory of the stored results, or None to only keep them in memory
+    """
+    def __init__(self,
+                 provider: Optional[REoptProvider] = None,
+                 results_dir: Optional[Union[str, Path]] = None):
+        self.provider = provider
+        self.results_dir = Path(results_dir) if results_dir is not None else None
+        self.n_hits = 0
+        self.n_misses = 0
+        self._results = {}
+
+    @staticmethod
+    def get_key(post: dict) -> str:
+        """
+        Digest of a REopt post
+
+        :param post: REopt post, see `REopt.create_post`
+        :return: hex digest
+        """
+        digest = hashlib.sha1()
+        update_digest(digest, post)
+        return digest.hexdigest()
+
+    def load(self, key: str) -> Optional[dict]:
+        """
+        Stored results, or None if there are none for `key`
+
+        :param key: digest of the post, see `get_key`
+        """
+        if key in self._results:
+            return self._results[key]
+        if self.results_dir is None:
+            return None
+        try:
+            with open(self.results_dir / f"{key}.json", 'r') as fp:
+                results = json.load(fp)
+        except (FileNotFoundError, ValueError):
+            return None
+        self._results[key] = results
+        return results
+
+    def save(self, key: str, results: dict):
+        """
+        Stores the results of a post
+
+        :param key: digest of the post, see `get_key`
+        :param results: REopt results
+        """
+        self._results[key] = results
+        if self.results_dir is None:
+            return
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first so other processes never read partial results
+        fd, tmp_path = tempfile.mkstemp(dir=self.results_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as fp:
+            json.dump(obj=results, fp=fp)
+        os.replace(tmp_path, self.results_dir / f"{key}.json")
+
+    def get_results(self, post: dict) -> Optional[dict]:
+        key = self.get_key(post)
+        results = self.load(key)
+        if results is not None:
+            self.n_hits += 1
+            logger.info(f"REoptResultStore loaded results {key} ({self.n_hits} hits, {self.n_misses} misses)")
+            # a copy, so that callers editing the results do not change them for later posts
+            return copy.deepcopy(results)
+        self.n_misses += 1
+        if self.provider is None:
+            return None
+        results = self.provider.get_results(post)
+        if results is not None:
+            self.save(key, results)
+            results = copy.deepcopy(results)
+        return results
+
+
+class LocalREoptService(REoptProvider):
+    """
+    Local stand-in for the REopt API, for tests and offline studies.
+
+    Every post is recorded in `posts` and answered without any request, with a copy of `results` or with the results
+    returned by `results(post)`.
+
+    :param results: REopt results, or function of the post returning them
+    """
+    def __init__(self, results: Union[dict, Callable[[dict], Optional[dict]]]):
+        self.results = results
+        self.posts = []
+
+    def get_results(self, post: dict) -> Optional[dict]:
+        self.posts.append(post)
+        if callable(self.results):
+            return self.results(post)
+        return copy.deepcopy(self.results)
+
+
 class REopt:
     """
     Class to interact with REopt API
@@ -40,7 +184,8 @@ class REopt:
                  storage_model: Battery = None,
                  fin_model: Singleowner.Singleowner = None,
                  off_grid=False,
-                 fileout=None):
+                 fileout=None,
+                 provider: Optional[REoptProvider] = None):
         """
         Initialize REopt API call
 
@@ -62,6 +207,8 @@ class REopt:
             Models initialized with correct parameters
         fileout: string
             Filename where REopt results should be written
+        provider: REoptProvider
+            Source of the results, e.g. a `REoptResultStore` shared by many runs, by default the REopt API
         """
 
         self.latitude = lat
@@ -89,6 +236,7 @@ class REopt:
         else:
             self.reopt_api_url = 'https://developer.nrel.gov/api/reopt/v1/job/'
 
+        self.provider = provider
         self.post = self.create_post(solar_model, wind_model, storage_model, fin_model)
         logger.info("Created REopt post")
 
@@ -252,29 +400,27 @@ class REopt:
 
     def get_reopt_results(self, results_file=None, poll_interval=5):
         """
-        Function for posting job and polling results end-point
-        :param post:
-        :param results_file:
-        :param API_KEY:
-        :param api_url:
+        Function for getting the results of the post from the provider, by default posting the job to the REopt API
+        and polling its results end-point
+        :param results_file: file where the results are written, by default `fileout`
+        :param poll_interval: seconds between polls of the REopt API, if no provider is set
         :return: results dictionary / API response
         """
         if not results_file:
             results_file = self.fileout
 
-        run_id = self.get_run_uuid(self.post, API_KEY=self.api_key, api_url=self.reopt_api_url)
-
-        if run_id is not None:
-            results_url = self.reopt_api_url + '<run_uuid>/results/?api_key=' + self.api_key
-            results = self.poller(results_url.replace('<run_uuid>', run_id), poll_interval)
+        provider = self.provider
+        if provider is None:
+            provider = REoptAPIProvider(self.reopt_api_url, self.api_key, poll_interval)
+        results = provider.get_results(self.post)
 
+        if results is not None:
             with open(results_file, 'w') as fp:
                 json.dump(obj=results, fp=fp)
 
             logger.info("Saved results to {}".format(results_file))
         else:
-            results = None
-            logger.error("Unable to get results: no run_uuid from POST.")
+            logger.error("Unable to get REopt results.")
 
         return results
 
@@ -1,5 +1,11 @@
-from hopp.simulation.technologies.resource.solar_resource import SolarResource
-from hopp.simulation.technologies.resource.wind_resource import WindResource
-from hopp.simulation.technologies.resource.wave_resource import WaveResource
-from hopp.simulation.technologies.resource.elec_prices import ElectricityPrices
-from hopp.simulation.technologies.resource.resource import Resource
+from hopp.utilities.utilities import lazy_exports
+
+_exports = {
+    "SolarResource": ".solar_resource",
+    "WindResource": ".wind_resource",
+    "WaveResource": ".wave_resource",
+    "ElectricityPrices": ".elec_prices",
+    "Resource": ".resource",
+}
+__all__ = list(_exports)
+__getattr__ = lazy_exports(__name__, _exports)
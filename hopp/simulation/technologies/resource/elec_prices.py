@@ -54,6 +54,16 @@ class ElectricityPrices(Resource):
         except ValueError:
             self._data = np.loadtxt(self.filename, skiprows=1)
 
+    def resample(self, n_timesteps: int):
+        """
+        Repeats hourly prices to the simulation's time resolution if it is sub-hourly
+
+        :param n_timesteps: number of timesteps in a year of simulation
+        """
+        n_prices = len(self._data)
+        if n_prices and n_timesteps > n_prices and n_timesteps % n_prices == 0:
+            self._data = np.repeat(self._data, n_timesteps // n_prices)
+
     def data(self):
         if not os.path.isfile(self.filename):
             raise NotImplementedError("File not available as downloading not implemented yet")
@@ -2,4 +2,9 @@ from hopp.simulation.technologies.sites.circular_site import make_circular_site
 from hopp.simulation.technologies.sites.flatirons_site import flatirons_site
 from hopp.simulation.technologies.sites.irregular_site import make_irregular_site
 from hopp.simulation.technologies.sites.locations import locations
-from hopp.simulation.technologies.sites.site_info import SiteInfo
+from hopp.utilities.utilities import lazy_exports
+
+_exports = {
+    "SiteInfo": ".site_info",
+}
+__getattr__ = lazy_exports(__name__, _exports)
@@ -1,17 +1,13 @@
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 from pathlib import Path
 
 from attrs import define, field
-import matplotlib.pyplot as plt
 import numpy as np
 from numpy.typing import NDArray
 from shapely.geometry import Polygon, MultiPolygon, Point 
 from shapely.geometry.base import BaseGeometry
 from shapely.ops import transform
 from shapely.validation import make_valid
-from fastkml import kml, KML
-import pyproj
-import utm
 
 from hopp.simulation.technologies.resource import (
     SolarResource,
@@ -29,7 +25,26 @@ from hopp.type_dec import (
 from hopp.simulation.base import BaseClass
 from hopp.utilities.validators import contains
 
+if TYPE_CHECKING:
+    from fastkml import KML
+
+HOURS_PER_YEAR = 8760
+
+
+def get_leap_day_mask(month: NDArray, day: NDArray) -> NDArray:
+    """
+    Mask of the records that are not on February 29th. SAM models simulate 365-day years, so leap days are dropped.
+
+    :param month: month of each record
+    :param day: day of month of each record
+    :return: boolean array, False for records on a leap day
+    """
+    return (np.asarray(month) != 2) | (np.asarray(day) != 29)
+
+
 def plot_site(verts, plt_style, labels):
+    import matplotlib.pyplot as plt
+
     for i in range(len(verts)):
         if i == 0:
             plt.plot([verts[0][0], verts[len(verts) - 1][0]], [verts[0][1], verts[len(verts) - 1][1]],
@@ -56,6 +71,12 @@ class SiteInfo(BaseClass):
         wind: Whether to set wind data for this site. Defaults to True.
         wave: Whether to set wave data for this site. Defaults to True.
         wind_resource_origin: Which wind resource API to use, defaults to WIND Toolkit
+
+    Resource data may be sub-hourly and may span several years. Leap days are dropped so that each year has
+    8760 hours, and `n_timesteps` is the number of timesteps in one year. For multi-year resources, the first
+    year is loaded into the resource data and the others are kept as float32 arrays, see `set_resource_year`.
+    Technology models are created from the selected year and simulate one year at a time; the CSP models and
+    dispatch clustering only support a single year of hourly resource data.
     """
     # User provided
     data: dict
@@ -73,6 +94,8 @@ class SiteInfo(BaseClass):
 
     # Set in post init hook
     n_timesteps: int = field(init=False, default=None)
+    steps_per_hour: int = field(init=False, default=None)
+    n_years: int = field(init=False, default=1)
     lat: hopp_float_type = field(init=False)
     lon: hopp_float_type = field(init=False)
     year: int = field(init=False, default=2012)
@@ -86,7 +109,8 @@ class SiteInfo(BaseClass):
     follow_desired_schedule: bool = field(init=False)
     polygon: Union[Polygon, BaseGeometry] = field(init=False)
     vertices: NDArrayFloat = field(init=False)
-    kml_data: Optional[KML] = field(init=False, default=None)
+    kml_data: Optional["KML"] = field(init=False, default=None)
+    _resource_years: dict = field(init=False, factory=dict)
 
     # .. TODO: Can we get rid of verts_simple and simplify site_boundaries
 
@@ -103,7 +127,9 @@ class SiteInfo(BaseClass):
             wind_resource (:obj:`hopp.simulation.technologies.resource.WindResource`): Class containing wind resource data.
             wave_resoure (:obj:`hopp.simulation.technologies.resource.WaveResource`): Class containing wave resource data.
             elec_prices (:obj:`hopp.simulation.technologies.resource.ElectricityPrices`): Class containing electricity prices.
-            n_timesteps (int): Number of timesteps in resource data.
+            n_timesteps (int): Number of timesteps in one year of resource data.
+            steps_per_hour (int): Number of timesteps per hour.
+            n_years (int): Number of years of resource data.
             n_periods_per_day (int): Number of time periods per day.
             interval (int): Number of minutes per time interval.
             urdb_label (str): Link to `Utility Rate DataBase <https://openei.org/wiki/Utility_Rate_Database>`_ label for REopt runs.
@@ -130,26 +156,25 @@ class SiteInfo(BaseClass):
         if 'tz' in data:
             self.tz = data['tz']
         
+        solar_leap_day_mask = None
         if self.solar:
             self.solar_resource = SolarResource(data['lat'], data['lon'], data['year'], filepath=self.solar_resource_file)
-            self.n_timesteps = len(self.solar_resource.data['gh']) // 8760 * 8760
+            solar_leap_day_mask = self._format_solar_resource()
         if self.wave:
             self.wave_resource = WaveResource(data['lat'], data['lon'], data['year'], filepath = self.wave_resource_file)
-            self.n_timesteps = 8760
+            self.n_timesteps = HOURS_PER_YEAR
+            self.steps_per_hour = 1
 
         if self.wind:
             # TODO: allow hub height to be used as an optimization variable
             self.wind_resource = WindResource(data['lat'], data['lon'], data['year'], wind_turbine_hub_ht=self.hub_height,
                                             filepath=self.wind_resource_file, source=self.wind_resource_origin)
-            n_timesteps = len(self.wind_resource.data['data']) // 8760 * 8760
-            if self.n_timesteps is None:
-                self.n_timesteps = n_timesteps
-            elif self.n_timesteps != n_timesteps:
-                raise ValueError(f"Wind resource timesteps of {n_timesteps} different than other resource timesteps of {self.n_timesteps}")
+            self._format_wind_resource(solar_leap_day_mask)
 
         self.elec_prices = ElectricityPrices(data['lat'], data['lon'], data['year'], filepath=self.grid_resource_file)
-        self.n_periods_per_day = self.n_timesteps // 365  # TODO: Does not handle leap years well
-        self.interval = int((60*24)/self.n_periods_per_day)
+        self.elec_prices.resample(self.n_timesteps)
+        self.n_periods_per_day = 24 * self.steps_per_hour
+        self.interval = 60 // self.steps_per_hour
         self.urdb_label = data['urdb_label'] if 'urdb_label' in data.keys() else None
 
         if len(self.capacity_hours) != self.n_timesteps:
@@ -168,6 +193,85 @@ class SiteInfo(BaseClass):
         if self.wave:
             logger.info("Set up SiteInfo with wave resource files: {}".format(self.wave_resource.filename))
 
+    def _format_solar_resource(self) -> NDArray:
+        """
+        Sets the time resolution and number of years of the solar resource, dropping leap days and keeping only
+        whole years
+
+        :return: mask of the original solar resource records that are kept
+        """
+        data = self.solar_resource.data
+        year, month, day = (np.asarray(data[k]) for k in ('year', 'month', 'day'))
+        keep = get_leap_day_mask(month, day)
+        first_day = (year == year[0]) & (month == month[0]) & (day == day[0])
+        self.steps_per_hour = max(int(first_day.sum()) // 24, 1)
+        self.n_timesteps = HOURS_PER_YEAR * self.steps_per_hour
+        self.n_years = max(int(keep.sum()) // self.n_timesteps, 1)
+        keep[np.cumsum(keep) > self.n_years * self.n_timesteps] = False
+
+        n_records = len(keep)
+        series = [k for k, v in data.items() if isinstance(v, (list, np.ndarray)) and len(v) == n_records]
+        if self.n_years > 1:
+            self._resource_years['solar'] = {
+                k: np.asarray(data[k], dtype=np.float32)[keep].reshape(self.n_years, self.n_timesteps)
+                for k in series}
+            self.set_resource_year(0)
+        elif not keep.all():
+            for k in series:
+                data[k] = np.asarray(data[k])[keep].tolist()
+        return keep
+
+    def _format_wind_resource(self, solar_leap_day_mask: Optional[NDArray] = None):
+        """
+        Sets the time resolution and number of years of the wind resource, dropping leap days and keeping only
+        whole years. Wind resource files have no timestamps, so without a solar resource to align with, the wind
+        resource is taken to be a single year, which includes a leap day if its length is a whole number of 366 days
+
+        :param solar_leap_day_mask: mask of the solar resource records that are kept
+        """
+        records = self.wind_resource.data['data']
+        n_records = len(records)
+        if solar_leap_day_mask is not None and len(solar_leap_day_mask) == n_records:
+            keep = solar_leap_day_mask
+        elif self.steps_per_hour is not None:
+            keep = np.arange(n_records) < self.n_years * self.n_timesteps
+        else:
+            keep = np.ones(n_records, dtype=bool)
+            if n_records % HOURS_PER_YEAR and n_records % (HOURS_PER_YEAR + 24) == 0:
+                steps_per_day = n_records // 366
+                keep[59 * steps_per_day:60 * steps_per_day] = False
+            self.steps_per_hour = max(int(keep.sum()) // HOURS_PER_YEAR, 1)
+            self.n_timesteps = HOURS_PER_YEAR * self.steps_per_hour
+            keep[np.cumsum(keep) > self.n_timesteps] = False
+
+        n_timesteps = min(int(keep.sum()), self.n_years * self.n_timesteps)
+        if n_timesteps != self.n_years * self.n_timesteps:
+            raise ValueError(f"Wind resource timesteps of {n_timesteps} different than other resource timesteps of "
+                             f"{self.n_years * self.n_timesteps}")
+
+        if self.n_years > 1:
+            self._resource_years['wind'] = np.asarray(records, dtype=np.float32)[keep].reshape(
+                self.n_years, self.n_timesteps, -1)
+            self.set_resource_year(0)
+        elif not keep.all():
+            self.wind_resource.data['data'] = [r for r, k in zip(records, keep) if k]
+
+    def set_resource_year(self, year: int):
+        """
+        Loads one year of a multi-year resource into the solar and wind resource data. Technology models copy
+        the resource data when created, so simulating another year requires creating the hybrid plant again after
+        selecting it.
+
+        :param year: index of the year in the resource data, from 0 to `n_years` - 1
+        """
+        if not 0 <= year < self.n_years:
+            raise ValueError(f"Resource year {year} is not within the {self.n_years} years of resource data")
+        if 'solar' in self._resource_years:
+            for k, v in self._resource_years['solar'].items():
+                self.solar_resource.data[k] = v[year].tolist()
+        if 'wind' in self._resource_years:
+            self.wind_resource.data['data'] = self._resource_years['wind'][year].tolist()
+
     # TODO: determine if the below functions are obsolete
 
     @property
@@ -192,6 +296,8 @@ class SiteInfo(BaseClass):
              alpha=0.95,
              linewidth=1.0
              ):
+        import matplotlib.pyplot as plt
+
         bounds = self.polygon.bounds
         site_sw_bound = np.array([bounds[0], bounds[1]])
         site_ne_bound = np.array([bounds[2], bounds[3]])
@@ -243,6 +349,10 @@ class SiteInfo(BaseClass):
 
     @staticmethod
     def kml_read(filepath):
+        from fastkml import kml
+        import pyproj
+        import utm
+
         k = kml.KML()
         with open(filepath) as kml_file:
             k.from_string(kml_file.read().encode("utf-8"))
@@ -275,6 +385,8 @@ class SiteInfo(BaseClass):
 
     @staticmethod
     def append_kml_data(kml_data, polygon, name):
+        from fastkml import kml
+
         folder = kml_data._features[0]._features[0]
         new_pm = kml.Placemark(name=name)
         new_pm.geometry = polygon
@@ -1,44 +1,241 @@
+import copy
+import hashlib
 import json
 import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
 import requests
 
 from hopp.utilities.keys import get_developer_nrel_gov_key
+from hopp.utilities.log import hybrid_logger as logger
+from hopp.utilities.utilities import update_digest
 
 URDB_BASE_URL = "https://api.openei.org/utility_rates"
 
+
+def parse_urdb_response(response) -> Optional[dict]:
+    """
+    Tariff of a URDB response, which may be the raw response text, the full response or a single tariff
+
+    :param response: URDB response
+    :return: dictionary of the tariff, or None if the response has no tariff
+    """
+    if isinstance(response, (str, bytes)):
+        response = json.loads(response, strict=False)
+    if isinstance(response, dict) and 'items' in response:
+        items = response['items']
+        response = items[0] if len(items) else None
+    return response
+
+
+def compile_hourly_energy_rates(tariff: dict, year: int = 2017) -> np.ndarray:
+    """
+    Hourly energy rates of a URDB tariff, from its weekday and weekend schedules of rate periods.
+
+    The rate of a period is the rate plus adjustment of its first tier, as tiers depend on the consumption. The year
+    sets the days of the week, and has 365 days as leap days are dropped from HOPP's 8760 hourly timesteps.
+
+    :param tariff: URDB tariff, see `parse_urdb_response`
+    :param year: year of the schedule
+    :return: energy rate of each hour of the year [$/kWh]
+    """
+    period_rates = np.array([period[0].get('rate', 0.0) + period[0].get('adj', 0.0)
+                             for period in tariff['energyratestructure']])
+    days = np.datetime64(f"{year}-01-01", 'D') + np.arange(365)
+    months = days.astype('datetime64[M]').astype(int) % 12
+    is_weekend = (days.astype(int) + 3) % 7 >= 5        # 1970-01-01 was a Thursday
+    weekday_periods = np.asarray(tariff['energyweekdayschedule'], dtype=int)[months]
+    weekend_periods = np.asarray(tariff['energyweekendschedule'], dtype=int)[months]
+    periods = np.where(is_weekend[:, None], weekend_periods, weekday_periods)
+    return period_rates[periods.ravel()]
+
+
+class UtilityRateProvider:
+    """
+    Source of URDB tariffs
+    """
+    def get_tariff(self, urdb_label: str) -> Optional[dict]:
+        """
+        Tariff of `urdb_label`, or None if it is not available
+        """
+        raise NotImplementedError
+
+
+class URDBProvider(UtilityRateProvider):
+    """
+    Tariffs downloaded from the Utility Rate Database (URDB) API
+
+    :param api_key: NREL developer API key
+    """
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key if api_key is not None else get_developer_nrel_gov_key()
+
+    def url(self, urdb_label: str) -> str:
+        return f"{URDB_BASE_URL}?version=7&format=json&detail=full&getpage={urdb_label}&api_key={self.api_key}"
+
+    def get_tariff(self, urdb_label: str) -> Optional[dict]:
+        # since NREL can't figure out its certificate
+        resp = requests.get(self.url(urdb_label), verify=False)
+        if not resp.ok:
+            logger.error(f"URDBProvider status code {resp.status_code} for {urdb_label}")
+            return None
+        return parse_urdb_response(resp.text)
+
+
+class URDBTariffStore(UtilityRateProvider):
+    """
+    Local store of URDB tariffs, as one `<urdb_label>.json` file per tariff.
+
+    Each file is parsed once for as long as it is unchanged on disk, and the hourly energy rates are compiled once
+    per tariff content and year, so tariffs with identical contents share them. Use `get_tariff_store` to share a
+    store between all users of a directory.
+
+    :param rates_dir: directory of the tariff files, created when a tariff is first saved
+    """
+    def __init__(self, rates_dir: Union[str, Path]):
+        self.rates_dir = Path(rates_dir)
+        self.n_hits = 0
+        self.n_misses = 0
+        self._tariffs = {}              # label -> (file stat, tariff, digest of the tariff)
+        self._hourly_rates = {}         # (digest of the tariff, year) -> hourly energy rates
+
+    def filepath(self, urdb_label: str) -> Path:
+        return self.rates_dir / f"{urdb_label}.json"
+
+    def _load(self, urdb_label: str) -> Optional[tuple]:
+        filepath = self.filepath(urdb_label)
+        try:
+            stat = os.stat(filepath)
+        except FileNotFoundError:
+            self._tariffs.pop(urdb_label, None)
+            self.n_misses += 1
+            return None
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        entry = self._tariffs.get(urdb_label)
+        if entry is None or entry[0] != stat_key:
+            with open(filepath, 'r') as fp:
+                tariff = parse_urdb_response(json.load(fp=fp))
+            digest = hashlib.sha1()
+            update_digest(digest, tariff)
+            entry = (stat_key, tariff, digest.hexdigest())
+            self._tariffs[urdb_label] = entry
+        self.n_hits += 1
+        return entry
+
+    def get_tariff(self, urdb_label: str) -> Optional[dict]:
+        entry = self._load(urdb_label)
+        # a copy, so that callers editing the tariff do not change it for later lookups
+        return copy.deepcopy(entry[1]) if entry is not None else None
+
+    def save(self, urdb_label: str, tariff: dict):
+        """
+        Stores the tariff of `urdb_label`
+
+        :param urdb_label: URDB label
+        :param tariff: URDB tariff
+        """
+        self.rates_dir.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first so other processes never read a partial tariff
+        fd, tmp_path = tempfile.mkstemp(dir=self.rates_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as fp:
+            json.dump(obj=tariff, fp=fp)
+        os.replace(tmp_path, self.filepath(urdb_label))
+
+    def hourly_energy_rates(self, urdb_label: str, year: int = 2017) -> Optional[np.ndarray]:
+        """
+        Hourly energy rates of a stored tariff, see `compile_hourly_energy_rates`
+
+        :param urdb_label: URDB label
+        :param year: year of the schedule
+        :return: read-only array of the energy rate of each hour [$/kWh], or None if the tariff is not stored
+        """
+        entry = self._load(urdb_label)
+        if entry is None:
+            return None
+        _, tariff, digest = entry
+        key = (digest, year)
+        if key not in self._hourly_rates:
+            rates = compile_hourly_energy_rates(tariff, year)
+            rates.flags.writeable = False
+            self._hourly_rates[key] = rates
+        return self._hourly_rates[key]
+
+
+@lru_cache(maxsize=None)
+def _tariff_store_from_dir(rates_dir: Path) -> URDBTariffStore:
+    return URDBTariffStore(rates_dir)
+
+
+def get_tariff_store(rates_dir: Union[str, Path]) -> URDBTariffStore:
+    """
+    Returns the tariff store of `rates_dir`, shared by all utility rates of this process using the same directory
+    """
+    return _tariff_store_from_dir(Path(rates_dir).resolve())
+
+
 class UtilityRate:
     """
     Class to define a utility rate and interact with the Utility Rate Database (URDB)
     https://api.openei.org/utility_rates?version=7&format=json&detail=full&getpage={urdb_label}&api_key={api_key}'
+
+    Tariffs are looked up in the local store of `path_rates` first, and only requested from `provider` if missing, in
+    which case they are saved to the store.
+
+    :param path_rates: directory of the local tariff store, or None to not store tariffs
+    :param urdb_label: URDB label of the tariff
+    :param provider: source of tariffs missing from the store, by default the URDB API
+    :param offline: if True, tariffs are only read from the local store
     """
-    def __init__(self, path_rates, urdb_label):
+    def __init__(self, path_rates, urdb_label,
+                 provider: Optional[UtilityRateProvider] = None,
+                 offline: bool = False):
         self.path_rates = path_rates
         self.urdb_label = urdb_label
         self.api_key = get_developer_nrel_gov_key()
+        if offline:
+            provider = None
+        elif provider is None:
+            provider = URDBProvider(self.api_key)
+        self.provider = provider
 
     @property
     def urdb_url(self):
         return f"{URDB_BASE_URL}?version=7&format=json&detail=full&getpage={self.urdb_label}&api_key={self.api_key}"
 
+    @property
+    def store(self) -> Optional[URDBTariffStore]:
+        return get_tariff_store(self.path_rates) if self.path_rates else None
+
     def get_urdb_response(self):
-        file_exists = False
-        if self.path_rates:
-            file_urdb_json = os.path.join(self.path_rates, str(self.urdb_label) + '.json')
-            file_exists = os.path.exists(file_urdb_json)
+        store = self.store
         results = None
-        if not file_exists and self.urdb_label is not None:
-            # since NREL can't figure out its certificate
-            resp = requests.get(self.urdb_url, verify=False)
-
-            if resp.ok:
-                results = json.loads(resp.text, strict=False)
-                results = results['items'][0]
-                if self.path_rates:
-                    with open(file_urdb_json, 'w') as fp:
-                        json.dump(obj=results, fp=fp)
+        if store is not None and self.urdb_label is not None:
+            results = store.get_tariff(self.urdb_label)
+        if results is None and self.urdb_label is not None and self.provider is not None:
+            results = self.provider.get_tariff(self.urdb_label)
+            if results is not None:
+                if store is not None:
+                    store.save(self.urdb_label, results)
                 self.urdb_response = results
-        elif file_exists:
-            with open(file_urdb_json, 'r') as fp:
-                results = json.load(fp=fp)
         self.results = results
         return results
+
+    def hourly_energy_rates(self, year: int = 2017) -> Optional[np.ndarray]:
+        """
+        Hourly energy rates of the tariff [$/kWh], see `compile_hourly_energy_rates`
+
+        :param year: year of the schedule
+        """
+        tariff = self.get_urdb_response()
+        if tariff is None:
+            return None
+        store = self.store
+        if store is not None:
+            rates = store.hourly_energy_rates(self.urdb_label, year)
+            if rates is not None:
+                return rates
+        return compile_hourly_energy_rates(tariff, year)
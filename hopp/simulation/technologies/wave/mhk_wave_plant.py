@@ -1,4 +1,5 @@
 from typing import Optional, List, Union
+import numpy as np
 import PySAM.MhkWave as MhkWave
 
 from attrs import define, field
@@ -7,6 +8,7 @@ from hopp.simulation.base import BaseClass
 from hopp.simulation.technologies.power_source import PowerSource, SiteInfo, Sequence, logger
 from hopp.simulation.technologies.financial.custom_financial_model import CustomFinancialModel
 from hopp.simulation.technologies.financial.mhk_cost_model import MHKCosts, MHKCostModelInputs
+from hopp.simulation.technologies.wave.wave_power_matrix import WavePowerMatrix
 from hopp.utilities.validators import gt_zero, range_val
 #TODO: Add dispatch for Wave
 # hopp.dispatch.power_sources.wave_dispatch import WaveDispatch
@@ -87,24 +89,23 @@ class MHKWavePlant(PowerSource):
 
         # Copy values from self.site.wave_resource.data to system_model.MHKWave
         attributes_to_copy = ['significant_wave_height', 'energy_period', 'year', 'month', 'day', 'hour', 'minute']
-        for attribute in attributes_to_copy:
-            setattr(system_model.MHKWave, attribute, self.site.wave_resource.data[attribute])
+        system_model.MHKWave.assign({attribute: list(self.site.wave_resource.data[attribute])
+                                     for attribute in attributes_to_copy})
 
         # System parameter inputs
-        self._system_model.value("device_rated_power", self.config.device_rating_kw)
-        self._system_model.value("number_devices",  self.config.num_devices)
-        self._system_model.value("wave_power_matrix", self.config.wave_power_matrix)
+        system_model.MHKWave.assign({
+            'device_rated_power': self.config.device_rating_kw,
+            'number_devices': self.config.num_devices,
+            'wave_power_matrix': self.config.wave_power_matrix
+        })
 
         # Losses
         loss_attributes = ['loss_array_spacing', 'loss_downtime', 'loss_resource_overprediction', 'loss_transmission', 'loss_additional']
+        system_model.MHKWave.assign({attribute: getattr(self.config, attribute, 0) for attribute in loss_attributes})
+
+        # power of a single device over the wave resource, evaluated on first use
+        self._device_power = None
 
-        for attribute in loss_attributes:
-            if attribute in self.config.as_dict().keys():
-                attr = getattr(self.config, attribute)
-                setattr(self._system_model.MHKWave, attribute, attr)
-            else:
-                setattr(self._system_model.MHKWave, attribute, 0)
-        
     def create_mhk_cost_calculator(self, cost_model_inputs: Union[dict, MHKCostModelInputs]):
         """
         Instantiates MHKCosts, cost calculator for MHKWavePlant.
@@ -119,13 +120,11 @@ class MHKWavePlant(PowerSource):
 
         self.mhk_costs = MHKCosts(self.config, cost_model)
     
-    def calculate_total_installed_cost(self) -> float:
-        if self.mhk_costs is None:
-            raise AttributeError("mhk_costs must be set before calling this method.")
-
-        self.mhk_costs.simulate_costs()
-        cost_dict = self.mhk_costs.cost_outputs
-
+    @staticmethod
+    def total_installed_cost_from_costs(cost_dict: dict):
+        """
+        Total installed cost from the outputs of the MHK cost model, scalars or arrays of them
+        """
         capex = cost_dict['structural_assembly_cost_modeled']+\
             cost_dict['power_takeoff_system_cost_modeled']+\
             cost_dict['mooring_found_substruc_cost_modeled']
@@ -144,10 +143,72 @@ class MHKWavePlant(PowerSource):
             cost_dict['insurance_during_construction']+\
             cost_dict['reserve_accounts']
 
-        total_installed_cost = capex+bos+elec_infrastruc_costs+financial
+        return capex+bos+elec_infrastruc_costs+financial
+
+    def calculate_total_installed_cost(self) -> float:
+        if self.mhk_costs is None:
+            raise AttributeError("mhk_costs must be set before calling this method.")
+
+        self.mhk_costs.simulate_costs()
+        total_installed_cost = self.total_installed_cost_from_costs(self.mhk_costs.cost_outputs)
         
         return self._financial_model.value("total_installed_cost", total_installed_cost)
 
+    @property
+    def power_matrix(self) -> WavePowerMatrix:
+        """Vectorized evaluator of the wave power matrix"""
+        return WavePowerMatrix(self.wave_power_matrix)
+
+    @property
+    def device_power(self) -> np.ndarray:
+        """Power of a single device over the wave resource, before losses [kW]"""
+        if self._device_power is None:
+            data = self.site.wave_resource.data
+            self._device_power = self.power_matrix.device_power(data['significant_wave_height'], data['energy_period'])
+        return self._device_power
+
+    @property
+    def total_loss(self) -> float:
+        """Sum of the losses [%]"""
+        mhk = self._system_model.MHKWave
+        return mhk.loss_array_spacing + mhk.loss_downtime + mhk.loss_resource_overprediction + \
+            mhk.loss_transmission + mhk.loss_additional
+
+    def evaluate_number_devices(self, number_devices: Sequence[int]) -> dict:
+        """
+        Performance, and costs if a cost model is set, for each number of devices, from the wave power matrix and the
+        cost curve of the cost model rather than by running the PySAM models for each size.
+
+        The generation matches the `gen` output of PySAM's MhkWave model, which is scaled by 1/3 in
+        `annual_energy_kwh` and `capacity_factor` for hourly resources.
+
+        Args:
+            number_devices: numbers of devices
+
+        Returns:
+            dictionary of arrays, with one value per number of devices, of the system capacity [kW], annual energy
+            [kWh], capacity factor [%] and, if a cost model is set, total installed cost [$]
+        """
+        number_devices = np.asarray(number_devices)
+        system_capacity_kw = number_devices * self.device_rated_power
+        # the array power is linear in the device power, so is its annual energy
+        annual_energy_kwh = WavePowerMatrix.array_power(self.device_power.sum(), number_devices, self.total_loss)
+        n_timesteps = len(self.device_power)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            capacity_factor = np.where(system_capacity_kw > 0,
+                                       annual_energy_kwh / (system_capacity_kw * n_timesteps) * 100, 0)
+        results = {
+            'number_devices': number_devices,
+            'system_capacity_kw': system_capacity_kw,
+            'annual_energy_kwh': annual_energy_kwh,
+            'capacity_factor': capacity_factor,
+        }
+        if self.mhk_costs is not None:
+            results['total_installed_cost'] = self.total_installed_cost_from_costs(
+                self.mhk_costs.cost_curve(number_devices.ravel())
+            ).reshape(number_devices.shape)
+        return results
+
     def system_capacity_by_num_devices(self, wave_size_kw: float):
         """
         Sets the system capacity by adjusting the number of devices
@@ -203,6 +264,7 @@ class MHKWavePlant(PowerSource):
             raise Exception("Wave power matrix must be dimensions 21 by 22")
         else:    
             self._system_model.MHKWave.wave_power_matrix = wave_power_matrix
+            self._device_power = None
 
     @property
     def system_capacity_kw(self) -> float:
@@ -0,0 +1,71 @@
+from typing import List, Tuple, Union
+
+import numpy as np
+from attrs import define, field
+
+from hopp.simulation.base import BaseClass
+
+
+@define
+class WavePowerMatrix(BaseClass):
+    """
+    Vectorized evaluation of a wave power matrix, matching PySAM's MhkWave model with time series resources.
+
+    Each time step takes the device power of the bins nearest to its significant wave height and energy period,
+    ties going to the upper bin, and conditions beyond the matrix take the power of its edge bins. As the device
+    power does not depend on the array, the power of any number of arrays is evaluated from a single lookup.
+
+    Args:
+        wave_power_matrix: device power [kW], with the energy periods [s] of the bins in the first row and their
+            significant wave heights [m] in the first column
+    """
+    wave_power_matrix: np.ndarray = field(converter=lambda m: np.asarray(m, dtype=float))
+
+    wave_heights: np.ndarray = field(init=False)
+    energy_periods: np.ndarray = field(init=False)
+    device_power_matrix: np.ndarray = field(init=False)
+
+    def __attrs_post_init__(self):
+        self.wave_heights = self.wave_power_matrix[1:, 0]
+        self.energy_periods = self.wave_power_matrix[0, 1:]
+        self.device_power_matrix = self.wave_power_matrix[1:, 1:]
+
+    @staticmethod
+    def _nearest_bins(bins: np.ndarray, values: np.ndarray) -> np.ndarray:
+        return np.searchsorted((bins[1:] + bins[:-1]) / 2, values, side='right')
+
+    def bin_indices(self, significant_wave_height, energy_period) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Indices of the wave height and energy period bins of each time step
+
+        :param significant_wave_height: significant wave height time series [m]
+        :param energy_period: energy period time series [s]
+        :return: indices of the rows and columns of `device_power_matrix`
+        """
+        return (self._nearest_bins(self.wave_heights, np.asarray(significant_wave_height, dtype=float)),
+                self._nearest_bins(self.energy_periods, np.asarray(energy_period, dtype=float)))
+
+    def device_power(self, significant_wave_height, energy_period) -> np.ndarray:
+        """
+        Power of a single device for each time step, before losses
+
+        :param significant_wave_height: significant wave height time series [m]
+        :param energy_period: energy period time series [s]
+        :return: device power [kW]
+        """
+        return self.device_power_matrix[self.bin_indices(significant_wave_height, energy_period)]
+
+    @staticmethod
+    def array_power(device_power: np.ndarray,
+                    number_devices: Union[int, List[int], np.ndarray],
+                    total_loss: Union[float, List[float], np.ndarray] = 0.) -> np.ndarray:
+        """
+        Power of arrays of devices for each time step, as PySAM's MhkWave `gen`
+
+        :param device_power: device power time series [kW], see `device_power`
+        :param number_devices: number of devices of each array
+        :param total_loss: sum of the array's losses [%], broadcast with `number_devices`
+        :return: array power [kW], of shape of the broadcast `number_devices` and `total_loss` plus the time steps
+        """
+        scale = np.asarray(number_devices, dtype=float) * (1 - np.asarray(total_loss, dtype=float) / 100)
+        return np.multiply.outer(scale, np.asarray(device_power, dtype=float))
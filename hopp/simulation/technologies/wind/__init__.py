@@ -1,2 +1,9 @@
-from .floris import Floris
-from .wind_plant import WindPlant, WindConfig
+from hopp.utilities.utilities import lazy_exports
+
+_exports = {
+    "Floris": ".floris",
+    "WindPlant": ".wind_plant",
+    "WindConfig": ".wind_plant",
+}
+__all__ = list(_exports)
+__getattr__ = lazy_exports(__name__, _exports)
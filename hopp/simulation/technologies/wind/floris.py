@@ -39,14 +39,18 @@ class Floris(BaseClass):
 
         self.wind_resource_data = self.site.wind_resource.data
         self.speeds, self.wind_dirs = self.parse_resource_data()
+        self.n_timesteps = len(self.speeds)
 
-        save_data = np.zeros((len(self.speeds),2))
-        save_data[:,0] = self.speeds
-        save_data[:,1] = self.wind_dirs
+        if self.config.floris_wind_rose:
+            self.wind_rose_bins, self.wind_rose_freq, self.wind_rose_index = self.bin_resource_data()
+        else:
+            save_data = np.zeros((len(self.speeds),2))
+            save_data[:,0] = self.speeds
+            save_data[:,1] = self.wind_dirs
 
-        with open('speed_dir_data.csv', 'w', newline='') as fo:
-            writer = csv.writer(fo)
-            writer.writerows(save_data)
+            with open('speed_dir_data.csv', 'w', newline='') as fo:
+                writer = csv.writer(fo)
+                writer.writerows(save_data)
 
         self.wind_farm_xCoordinates = self.fi.layout_x
         self.wind_farm_yCoordinates = self.fi.layout_y
@@ -64,7 +68,7 @@ class Floris(BaseClass):
             self.end_idx = self.config.timestep[1]
         else:
             self.start_idx = 0
-            self.end_idx = 8759
+            self.end_idx = self.n_timesteps
 
         # results
         self.gen = []
@@ -91,45 +95,72 @@ class Floris(BaseClass):
             return self.__getattribute__(name)
 
     def parse_resource_data(self):
-
-        # extract data for simulation
-        speeds = np.zeros(len(self.wind_resource_data['data']))
-        wind_dirs = np.zeros(len(self.site.wind_resource.data['data']))
+        """
+        Extracts wind speeds and directions from the resource data, averaged over the resource heights
+        """
+        data = np.array(self.wind_resource_data['data'], dtype=float)
         data_rows_total = 4
-        if np.shape(self.site.wind_resource.data['data'])[1] > data_rows_total:
-            height_entries = int(np.round(np.shape(self.site.wind_resource.data['data'])[1]/data_rows_total))
-            data_entries = np.empty((height_entries))
-            for j in range(height_entries):
-                data_entries[j] = int(j*data_rows_total)
-            data_entries = data_entries.astype(int)
-            for i in range((len(self.site.wind_resource.data['data']))):
-                data_array = np.array(self.site.wind_resource.data['data'][i])
-                speeds[i] = np.mean(data_array[2+data_entries])
-                wind_dirs[i] = np.mean(data_array[3+data_entries])
+        if data.shape[1] > data_rows_total:
+            height_entries = int(np.round(data.shape[1] / data_rows_total))
+            data_entries = np.arange(height_entries) * data_rows_total
+            speeds = data[:, 2 + data_entries].mean(axis=1)
+            wind_dirs = data[:, 3 + data_entries].mean(axis=1)
         else:
-            for i in range((len(self.site.wind_resource.data['data']))):
-                speeds[i] = self.site.wind_resource.data['data'][i][2]
-                wind_dirs[i] = self.site.wind_resource.data['data'][i][3]
+            speeds = data[:, 2].copy()
+            wind_dirs = data[:, 3].copy()
 
         return speeds, wind_dirs
 
+    def bin_resource_data(self):
+        """
+        Bins the wind resource into a wind rose of direction and speed bins, with bin centers at multiples of the
+        `floris_wind_rose_bin_widths` of the wind config
+
+        :returns: (wind direction, wind speed) of each occupied bin, frequency of each bin, and
+            the bin index of each timestep
+        """
+        direction_width, speed_width = self.config.floris_wind_rose_bin_widths
+        directions = (np.round(self.wind_dirs / direction_width) * direction_width) % 360.
+        speeds = np.round(self.speeds / speed_width) * speed_width
+        bins, index, counts = np.unique(np.column_stack((directions, speeds)), axis=0,
+                                        return_inverse=True, return_counts=True)
+        return bins, counts / len(index), index.ravel()
+
     def execute(self, project_life):
 
         print('Simulating wind farm output in FLORIS...')
 
         # find generation of wind farm
-        power_turbines = np.zeros((self.nTurbs, 8760))
-        power_farm = np.zeros(8760)
-
-        self.fi.reinitialize(wind_speeds=self.speeds[self.start_idx:self.end_idx], wind_directions=self.wind_dirs[self.start_idx:self.end_idx], time_series=True)
-        self.fi.calculate_wake()
+        power_turbines = np.zeros((self.nTurbs, self.n_timesteps))
+        power_farm = np.zeros(self.n_timesteps)
+
+        if self.config.floris_wind_rose:
+            # run each occupied wind rose bin once and map the results back to the time series,
+            # calm bins produce no power and are not passed to floris
+            sim_index = self.wind_rose_index[self.start_idx:self.end_idx]
+            sim_bins = np.unique(sim_index)
+            bin_position = np.searchsorted(sim_bins, sim_index)
+            run_bins = self.wind_rose_bins[sim_bins, 1] > 0
+            bin_power_turbines = np.zeros((len(sim_bins), self.nTurbs))
+            if run_bins.any():
+                self.fi.reinitialize(wind_directions=self.wind_rose_bins[sim_bins[run_bins], 0],
+                                     wind_speeds=self.wind_rose_bins[sim_bins[run_bins], 1],
+                                     time_series=True)
+                self.fi.calculate_wake()
+                bin_power_turbines[run_bins] = self.fi.get_turbine_powers().reshape((run_bins.sum(), self.nTurbs))
+
+            power_turbines[:, self.start_idx:self.end_idx] = bin_power_turbines[bin_position].T
+            power_farm[self.start_idx:self.end_idx] = bin_power_turbines.sum(axis=1)[bin_position]
+        else:
+            self.fi.reinitialize(wind_speeds=self.speeds[self.start_idx:self.end_idx], wind_directions=self.wind_dirs[self.start_idx:self.end_idx], time_series=True)
+            self.fi.calculate_wake()
 
-        power_turbines[:, self.start_idx:self.end_idx] = self.fi.get_turbine_powers().reshape((self.nTurbs, self.end_idx - self.start_idx))
-        power_farm[self.start_idx:self.end_idx] = self.fi.get_farm_power().reshape((self.end_idx - self.start_idx))
+            power_turbines[:, self.start_idx:self.end_idx] = self.fi.get_turbine_powers().reshape((self.nTurbs, self.end_idx - self.start_idx))
+            power_farm[self.start_idx:self.end_idx] = self.fi.get_farm_power().reshape((self.end_idx - self.start_idx))
 
         # Adding losses from PySAM defaults (excluding turbine and wake losses)
         self.gen = power_farm *((100 - 12.83)/100) / 1000
         # self.gen = power_farm  / 1000
         self.annual_energy = np.sum(self.gen)
         print('Wind annual energy: ', self.annual_energy)
-        self.capacity_factor = np.sum(self.gen) / (8760 * self.system_capacity) * 100
+        self.capacity_factor = np.sum(self.gen) / (self.n_timesteps * self.system_capacity) * 100
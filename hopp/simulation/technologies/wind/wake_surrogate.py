@@ -0,0 +1,187 @@
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+from attrs import define, field
+import numpy as np
+import PySAM.Windpower as Windpower
+
+from hopp.simulation.base import BaseClass
+from hopp.utilities.log import hybrid_logger as logger
+from hopp.utilities.utilities import update_digest
+
+# PySAM Windpower wake model which applies `wake_int_loss` as a constant percent
+CONSTANT_WAKE_MODEL = 3
+
+# inputs that define the layout rather than the turbine, resource and losses of the farm
+LAYOUT_INPUTS = ('wind_farm_xCoordinates', 'wind_farm_yCoordinates', 'system_capacity')
+
+
+def get_layout_features(xcoords: np.ndarray,
+                        ycoords: np.ndarray,
+                        rotor_diameter: float
+                        ) -> np.ndarray:
+    """
+    Normalized features of a turbine layout
+
+    :param xcoords: turbine x coordinates [m]
+    :param ycoords: turbine y coordinates [m]
+    :param rotor_diameter: turbine rotor diameter [m]
+    :return: number of turbines, mean nearest-neighbor spacing [rotor diameters] and grid angle [deg, 0-180)
+    """
+    n_turbines = len(xcoords)
+    if n_turbines < 2:
+        return np.array([n_turbines, 0., 0.])
+    dx = xcoords[None, :] - xcoords[:, None]
+    dy = ycoords[None, :] - ycoords[:, None]
+    distance = np.hypot(dx, dy)
+    np.fill_diagonal(distance, np.inf)
+    nearest = np.argmin(distance, axis=1)
+    rows = np.arange(n_turbines)
+    spacing = distance[rows, nearest].mean() / rotor_diameter
+
+    # orientation of the nearest-neighbor vectors, averaged on the doubled angle so opposite vectors agree
+    doubled_angle = 2 * np.arctan2(dy[rows, nearest], dx[rows, nearest])
+    angle = np.degrees(np.arctan2(np.sin(doubled_angle).mean(), np.cos(doubled_angle).mean()) / 2) % 180
+    return np.array([n_turbines, spacing, angle])
+
+
+@define
+class WakeLossSurrogate(BaseClass):
+    """
+    Cache and interpolating model of the internal wake loss of PySAM Windpower layouts.
+
+    Results are grouped by a digest of all Windpower inputs except the turbine coordinates, so layouts are only
+    compared against others with the same resource, turbine and losses. A layout seen before reuses its wake loss.
+    Otherwise, if at least `min_samples` cached layouts lie within the trust region around its features, the wake
+    loss is interpolated from them with a distance-weighted local linear fit. Anything else is simulated with the
+    full wake model and added to the cache.
+
+    The cached or interpolated loss is applied by running Windpower with the constant wake loss model, which
+    reproduces the annual energy of the full wake model but not its hourly variation in wake losses.
+
+    Args:
+        trust_turbines: relative difference in number of turbines spanning the trust region
+        trust_spacing: difference in mean nearest-neighbor spacing, in rotor diameters, spanning the trust region
+        trust_angle: difference in grid angle, in degrees, spanning the trust region
+        min_samples: number of cached layouts needed within the trust region to interpolate
+    """
+    trust_turbines: float = field(default=0.1)
+    trust_spacing: float = field(default=0.5)
+    trust_angle: float = field(default=10.)
+    min_samples: int = field(default=2)
+
+    n_cache_hits: int = field(init=False, default=0)
+    n_interpolated: int = field(init=False, default=0)
+    n_simulated: int = field(init=False, default=0)
+    _wake_losses: Dict[Tuple[str, bytes], float] = field(init=False, factory=dict)
+    _samples: Dict[str, List[Tuple[np.ndarray, float]]] = field(init=False, factory=dict)
+    _no_wake_energy: Dict[Tuple[str, int], float] = field(init=False, factory=dict)
+
+    @staticmethod
+    def get_model_digest(system_model: Windpower.Windpower) -> str:
+        """
+        Digest of the Windpower inputs other than the layout
+        """
+        inputs = system_model.export()
+        inputs.pop('Outputs', None)
+        for name in LAYOUT_INPUTS:
+            inputs['Farm'].pop(name, None)
+        digest = hashlib.sha1()
+        update_digest(digest, inputs)
+        return digest.hexdigest()
+
+    @staticmethod
+    def get_layout_key(xcoords: np.ndarray,
+                       ycoords: np.ndarray,
+                       rotor_diameter: float
+                       ) -> bytes:
+        """
+        Translation- and ordering-independent key of a layout, in rotor diameters
+        """
+        coords = np.column_stack((xcoords - np.mean(xcoords), ycoords - np.mean(ycoords))) / rotor_diameter
+        coords = np.round(coords, 3) + 0.
+        return coords[np.lexsort((coords[:, 1], coords[:, 0]))].tobytes()
+
+    def predict(self,
+                model_digest: str,
+                features: np.ndarray
+                ) -> Optional[float]:
+        """
+        Interpolated wake loss for a layout, or None if it is outside the trust region of the cached layouts
+
+        :param model_digest: digest of the Windpower inputs, see `get_model_digest`
+        :param features: layout features, see `get_layout_features`
+        :return: wake loss [%]
+        """
+        samples = self._samples.get(model_digest, [])
+        if len(samples) < self.min_samples:
+            return None
+        sample_features = np.array([s[0] for s in samples])
+        sample_losses = np.array([s[1] for s in samples])
+
+        angle_diff = np.abs(sample_features[:, 2] - features[2]) % 180
+        scaled_diff = np.column_stack((
+            (sample_features[:, 0] - features[0]) / max(self.trust_turbines * features[0], 1.),
+            (sample_features[:, 1] - features[1]) / self.trust_spacing,
+            np.minimum(angle_diff, 180 - angle_diff) / self.trust_angle))
+        distance = np.sqrt(np.sum(scaled_diff ** 2, axis=1))
+        in_region = distance <= 1
+        if in_region.sum() < self.min_samples:
+            return None
+
+        # distance-weighted local linear fit, with the minimum-norm slope along features the samples don't span
+        weights = np.sqrt(1 / np.maximum(distance[in_region], 1e-3))
+        design = np.column_stack((np.ones(in_region.sum()), scaled_diff[in_region]))
+        coeffs = np.linalg.lstsq(design * weights[:, None], sample_losses[in_region] * weights, rcond=1e-6)[0]
+        return float(coeffs[0])
+
+    def execute(self, system_model: Windpower.Windpower):
+        """
+        Runs the Windpower model with a cached or interpolated wake loss if one is available, and otherwise with its
+        wake model, recording the resulting wake loss
+
+        :param system_model: Windpower model with wake model other than the constant wake loss
+        """
+        xcoords = np.array(system_model.value("wind_farm_xCoordinates"), dtype=float)
+        ycoords = np.array(system_model.value("wind_farm_yCoordinates"), dtype=float)
+        rotor_diameter = system_model.value("wind_turbine_rotor_diameter")
+        model_digest = self.get_model_digest(system_model)
+        layout_key = (model_digest, self.get_layout_key(xcoords, ycoords, rotor_diameter))
+        features = get_layout_features(xcoords, ycoords, rotor_diameter)
+
+        wake_loss = self._wake_losses.get(layout_key)
+        if wake_loss is not None:
+            self.n_cache_hits += 1
+        else:
+            wake_loss = self.predict(model_digest, features)
+            if wake_loss is not None:
+                self.n_interpolated += 1
+
+        if wake_loss is not None:
+            self._run_constant_wake_loss(system_model, wake_loss)
+            logger.info(f"WakeLossSurrogate applied wake loss of {wake_loss:.3f}% to {len(xcoords)} turbines")
+            return
+
+        no_wake_key = (model_digest, len(xcoords))
+        if no_wake_key not in self._no_wake_energy:
+            self._run_constant_wake_loss(system_model, 0)
+            self._no_wake_energy[no_wake_key] = system_model.value("annual_energy")
+        system_model.execute(0)
+        self.n_simulated += 1
+
+        no_wake_energy = self._no_wake_energy[no_wake_key]
+        wake_loss = (1 - system_model.value("annual_energy") / no_wake_energy) * 100 if no_wake_energy > 0 else 0.
+        self._wake_losses[layout_key] = wake_loss
+        self._samples.setdefault(model_digest, []).append((features, wake_loss))
+
+    @staticmethod
+    def _run_constant_wake_loss(system_model: Windpower.Windpower, wake_loss: float):
+        wake_model = system_model.value("wind_farm_wake_model")
+        wake_int_loss = system_model.value("wake_int_loss")
+        system_model.value("wind_farm_wake_model", CONSTANT_WAKE_MODEL)
+        system_model.value("wake_int_loss", wake_loss)
+        try:
+            system_model.execute(0)
+        finally:
+            system_model.value("wind_farm_wake_model", wake_model)
+            system_model.value("wake_int_loss", wake_int_loss)
@@ -9,7 +9,7 @@ from hopp.simulation.base import BaseClass
 from hopp.type_dec import resource_file_converter
 from hopp.utilities import load_yaml
 from hopp.utilities.validators import gt_zero, contains
-from hopp.simulation.technologies.wind.floris import Floris
+from hopp.simulation.technologies.wind.wake_surrogate import WakeLossSurrogate
 from hopp.simulation.technologies.power_source import PowerSource
 from hopp.simulation.technologies.sites import SiteInfo
 from hopp.simulation.technologies.layout.wind_layout import WindLayout, WindBoundaryGridParameters
@@ -36,6 +36,11 @@ class WindConfig(BaseClass):
         rating_range_kw: allowable kw range of turbines, default is 1000 - 3000 kW
         floris_config: Floris configuration, only used if `model_name` == 'floris'
         timestep: Timestep (required for floris runs, otherwise optional)
+        floris_wind_rose: if True, floris is run once per occupied bin of a wind rose of the resource instead of
+            once per timestep, and the resource isn't written to `speed_dir_data.csv`
+        floris_wind_rose_bin_widths: wind rose (direction [deg], speed [m/s]) bin widths
+        wake_surrogate: if True, PySAM wake losses are cached per layout and interpolated between similar layouts
+            by a `WakeLossSurrogate`, falling back to the full wake model outside its trust region
         fin_model: Optional financial model. Can be any of the following:
 
             - a string representing an argument to `Singleowner.default`
@@ -56,6 +61,9 @@ class WindConfig(BaseClass):
     rating_range_kw: Tuple[int, int] = field(default=(1000, 3000))
     floris_config: Optional[Union[dict, str, Path]] = field(default=None)
     timestep: Optional[Tuple[int, int]] = field(default=None)
+    floris_wind_rose: bool = field(default=False)
+    floris_wind_rose_bin_widths: Tuple[float, float] = field(default=(5., 1.))
+    wake_surrogate: bool = field(default=False)
     fin_model: Optional[Union[dict, FinancialModelType]] = field(default=None)
 
     def __attrs_post_init__(self):
@@ -85,6 +93,8 @@ class WindPlant(PowerSource):
         self._rating_range_kw = self.config.rating_range_kw
 
         if self.config.model_name == 'floris':
+            from hopp.simulation.technologies.wind.floris import Floris
+
             print('FLORIS is the system model...')
             system_model = Floris(self.site, self.config)
             financial_model = Singleowner.default(self.config_name)
@@ -127,6 +137,11 @@ class WindPlant(PowerSource):
 
         self._dispatch = None
 
+        # may be replaced by a surrogate shared with other wind plants of the same turbine and resource
+        self.wake_surrogate = None
+        if self.config.wake_surrogate and self.config.model_name == 'pysam':
+            self.wake_surrogate = WakeLossSurrogate()
+
         self.turb_rating = self.config.turbine_rating_kw
         self.num_turbines = self.config.num_turbines
 
@@ -252,6 +267,15 @@ class WindPlant(PowerSource):
     def system_capacity_kw(self):
         return self._system_model.value("system_capacity")
 
+    def _execute_system_model(self):
+        """
+        Executes the wind model, through the wake loss surrogate if one is set
+        """
+        if self.wake_surrogate is None:
+            super()._execute_system_model()
+        else:
+            self.wake_surrogate.execute(self._system_model)
+
     def system_capacity_by_rating(self, wind_size_kw: float):
         """
         Sets the system capacity by adjusting the rating of the turbines within the provided boundaries
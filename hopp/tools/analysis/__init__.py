@@ -1,2 +1,9 @@
-from .bos.cost_calculator import CostCalculator, create_cost_calculator
-from .bos.bos_lookup import BOSLookup
+from hopp.utilities.utilities import lazy_exports
+
+_exports = {
+    "CostCalculator": ".bos.cost_calculator",
+    "create_cost_calculator": ".bos.cost_calculator",
+    "BOSLookup": ".bos.bos_lookup",
+}
+__all__ = list(_exports)
+__getattr__ = lazy_exports(__name__, _exports)
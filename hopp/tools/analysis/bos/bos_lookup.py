@@ -1,4 +1,6 @@
+from functools import lru_cache
 from scipy.interpolate import LinearNDInterpolator as interp
+from scipy.spatial import cKDTree
 from pathlib import Path
 import pandas as pd
 import numpy as np
@@ -9,6 +11,21 @@ from hopp.utilities.log import bos_logger as logger
 file_path = Path(__file__).parent
 
 
+@lru_cache(maxsize=None)
+def _load_lookup_index(input_parameters: tuple, output_parameters: tuple):
+    """
+    Loads the lookup table and indexes its inputs once per process: a KD-tree for nearest-neighbor searches and a
+    single Delaunay triangulation interpolating all outputs. The table's points are not on a regular grid, since it
+    covers wind and solar splits of each interconnection capacity.
+    """
+    file = file_path / "BOSLookup.csv"
+    with open(file, "r") as f:
+        data = pd.read_csv(f)
+    contents = data[list(input_parameters)].values
+    outputs = data[[p for p in output_parameters if p in data.columns]].values
+    return data, contents, cKDTree(contents), interp(contents, outputs)
+
+
 class BOSLookup(BOSCalculator):
     def __init__(self):
         super().__init__()
@@ -23,51 +40,57 @@ class BOSLookup(BOSCalculator):
                                           "Solar BOS Cost"]
 
         # Loads the json data containing all the BOS cost information from the excel model
-        self.data, self.contents = self._load_lookup()
-        self.interpolating_fxns = self._load_interp()
+        self.data, self.contents, self.tree, self.interpolating_fxn = _load_lookup_index(
+            tuple(self.input_parameters), tuple(self.desired_output_parameters))
 
         for p in self.desired_output_parameters:
             if p not in self.data.columns:
                 raise KeyError(p + " column missing")
+        self.output_values = self.data[self.desired_output_parameters].values
 
-    def _load_lookup(self):
-        file = file_path / "BOSLookup.csv"
-        with open(file, "r") as f:
-            data = pd.read_csv(f)
-        contents = data[self.input_parameters].values
-        return data, contents
+    def lookup_costs(self, wind_mw, solar_mw, interconnection_mw):
+        """
+        Interpolated BOS costs of many plants at once. Plants outside of the lookup's range take the costs of the
+        nearest entry if it is within 5% of their sizes.
 
-    def _load_interp(self):
-        fxns = []
-        for p in self.desired_output_parameters:
-            f = interp(self.contents, self.data[p].values)
-            fxns.append(f)
-        return fxns
+        :param wind_mw: Installed Capacity (MW) of wind component, scalar or array
+        :param solar_mw: Installed Capacity (MW) of solar component, scalar or array
+        :param interconnection_mw: Interconnection Capacity (MW), scalar or array
+        :return: arrays of wind, solar and total bos cost, and distance to the nearest lookup entry
+        """
+        wind_mw, solar_mw, interconnection_mw = np.broadcast_arrays(
+            *[np.atleast_1d(np.asarray(x, dtype=float)) for x in (wind_mw, solar_mw, interconnection_mw)])
+        search_inputs = np.column_stack((interconnection_mw.ravel(), wind_mw.ravel(), solar_mw.ravel()))
+        costs = np.zeros((len(search_inputs), len(self.desired_output_parameters)))
+        min_distance = np.zeros(len(search_inputs))
+
+        sized = wind_mw.ravel() + solar_mw.ravel() != 0
+        min_distance[sized], min_index = self.tree.query(search_inputs[sized])
+        # each simplex search starts from the last one found, so neighboring plants are interpolated in turn
+        order = np.argsort(min_index, kind='stable')
+        sized_costs = np.empty((len(min_index), len(self.desired_output_parameters)))
+        sized_costs[order] = self.interpolating_fxn(search_inputs[sized][order])
+        costs[sized] = sized_costs
+
+        outside = np.isnan(costs).any(axis=1)
+        if outside.any():
+            relative_distance = min_distance[outside] / np.linalg.norm(search_inputs[outside], axis=1)
+            if (relative_distance >= .05).any():
+                i = np.flatnonzero(outside)[np.argmax(relative_distance >= .05)]
+                raise ValueError("Inputs (Wind Size: {}MW and Solar Size: {}MW) to BOSLookup outside of range and cannot be extrapolated".format(search_inputs[i, 1], search_inputs[i, 2]))
+            costs[outside] = self.output_values[min_index[outside[sized]]]
+
+        wind_bos_cost = costs[:, self.desired_output_parameters.index("Wind BOS Cost")].reshape(wind_mw.shape)
+        solar_bos_cost = costs[:, self.desired_output_parameters.index("Solar BOS Cost")].reshape(wind_mw.shape)
+        total_bos_cost = wind_bos_cost + solar_bos_cost
+        return wind_bos_cost, solar_bos_cost, total_bos_cost, min_distance.reshape(wind_mw.shape)
 
     def _lookup_costs(self, wind_mw, solar_mw, interconnection_mw):
         if wind_mw + solar_mw == 0:
             return 0, 0, 0
 
-        search_inputs = np.array([interconnection_mw, wind_mw, solar_mw])
-        distance_norm = np.linalg.norm(self.contents - search_inputs, axis=1)
-        min_index = np.argmin(distance_norm)
-        min_distance = distance_norm[min_index]
-
-        vals = []
-        for i in range(len(self.desired_output_parameters)):
-            vals.append(self.interpolating_fxns[i](search_inputs)[0])
-
-        if np.isnan(vals).any():
-            if min_distance / np.linalg.norm(search_inputs) < .05:
-                wind_bos_cost = self.data.iloc[min_index:min_index+1]["Wind BOS Cost"].values
-                solar_bos_cost = self.data.iloc[min_index:min_index+1]["Solar BOS Cost"].values
-            else:
-                raise ValueError("Inputs (Wind Size: {}MW and Solar Size: {}MW) to BOSLookup outside of range and cannot be extrapolated".format(wind_mw, solar_mw))
-        else:
-            wind_bos_cost = vals[self.desired_output_parameters.index("Wind BOS Cost")]
-            solar_bos_cost = vals[self.desired_output_parameters.index("Solar BOS Cost")]
-
-        total_bos_cost = wind_bos_cost + solar_bos_cost
+        wind_bos_cost, solar_bos_cost, total_bos_cost, min_distance = [
+            float(x[0]) for x in self.lookup_costs(wind_mw, solar_mw, interconnection_mw)]
         logger.info("Total BOS Cost: {} Wind BOS Cost: {} Solar BOS Cost {}".
                     format(total_bos_cost, wind_bos_cost, solar_bos_cost))
 
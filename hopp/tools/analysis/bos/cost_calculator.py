@@ -1,5 +1,4 @@
 from .bos_model import BOSCostPerMW, BOSCalculator
-from .bos_lookup import BOSLookup
 # from .hybrid_bosse import HybridBOSSE
 from hopp.utilities.log import bos_logger as logger
 import numpy as np
@@ -54,6 +53,7 @@ class CostCalculator():
         self.model = BOSCalculator()
 
         if bos_cost_source.lower() == "boslookup":
+            from .bos_lookup import BOSLookup
             self.model = BOSLookup()
         elif bos_cost_source.lower() == "costpermw":
             self.model = BOSCostPerMW()
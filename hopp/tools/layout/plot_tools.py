@@ -1,4 +1,3 @@
-import matplotlib.pyplot as plt
 from shapely.geometry import (
     LineString,
     MultiPolygon,
@@ -10,6 +9,8 @@ def plot_turbines(turb_pos_x: list,
                   color='g',
                   alpha=.5
                   ) -> None:
+    import matplotlib.pyplot as plt
+
     for n in range(len(turb_pos_y)):
         plt.plot(turb_pos_x[n], turb_pos_y[n], 'o', color=color, alpha=alpha)
 
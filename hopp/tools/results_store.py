@@ -0,0 +1,169 @@
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+# column of the index of each simulation in the dataset
+RUN_COLUMN = "run"
+PARTITION_PATTERN = "part-*.npz"
+
+
+def _partition_index(filepath: Path) -> int:
+    return int(filepath.stem.split("-")[1])
+
+
+class ResultsWriter:
+    """
+    Appends simulation results to a columnar dataset, as written by `HybridSimulation.simulation_results`.
+
+    Results are dictionaries of column name to scalar or array, each simulation being a row. Rows are buffered in one
+    preallocated array per column and written as a partition, a `part-<index>.npz` file holding one array per column,
+    once `partition_size` rows are buffered. Only one partition is held in memory, and appending to an existing
+    dataset adds partitions after its last one. Columns missing from a row are NaN, and a column changing shape, for
+    instance with a different project life, starts a new partition.
+
+    :param path: directory of the dataset, created if missing
+    :param partition_size: number of simulations per partition
+    """
+    def __init__(self, path: Union[str, Path], partition_size: int = 100):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.partition_size = int(partition_size)
+
+        partitions = sorted(self.path.glob(PARTITION_PATTERN), key=_partition_index)
+        self._next_partition = _partition_index(partitions[-1]) + 1 if partitions else 0
+        self.n_runs = len(ResultsDataset(self.path)) if partitions else 0
+        self._columns: Dict[str, np.ndarray] = {}
+        self._n_rows = 0
+
+    def write(self, results: Dict[str, Union[float, np.ndarray]]) -> int:
+        """
+        Appends the results of a simulation
+
+        :param results: value of each column, of the same shape for every simulation
+        :return: index of the simulation in the dataset
+        """
+        # convert all values before writing any, so a failing conversion leaves no partially written row
+        values = {}
+        for name, value in results.items():
+            value = np.asarray(value)
+            values[name] = value if value.dtype.kind in "fc" else value.astype(np.float64)
+
+        columns = self._columns
+        if any(name in columns and value.shape != columns[name].shape[1:] for name, value in values.items()):
+            self.flush()
+            self._columns = columns = {}
+
+        row = self._n_rows
+        for name, value in values.items():
+            column = columns.get(name)
+            if column is None:
+                column = np.full((self.partition_size, *value.shape), np.nan, dtype=value.dtype)
+                columns[name] = column
+            column[row] = value
+        self._n_rows += 1
+
+        run = self.n_runs
+        self.n_runs += 1
+        if self._n_rows == self.partition_size:
+            self.flush()
+        return run
+
+    def flush(self):
+        """
+        Writes the buffered results as a partition
+        """
+        if not self._n_rows:
+            return
+        n_rows = self._n_rows
+        columns = {name: column[:n_rows] for name, column in self._columns.items()}
+        columns[RUN_COLUMN] = np.arange(self.n_runs - n_rows, self.n_runs, dtype=np.int64)
+
+        # write to a temporary file first so readers never open a partial partition
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fp:
+            np.savez(fp, **columns)
+        os.replace(tmp_path, self.path / f"part-{self._next_partition:05d}.npz")
+
+        self._next_partition += 1
+        self._columns = {}
+        self._n_rows = 0
+
+    def close(self):
+        """
+        Writes any buffered results. May be called more than once.
+        """
+        self.flush()
+
+    def __enter__(self) -> "ResultsWriter":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ResultsDataset:
+    """
+    Reads a dataset of simulation results written by `ResultsWriter`.
+
+    Each partition stores its columns as separate, uncompressed members, so reading a column only reads that column
+    from each partition.
+
+    :param path: directory of the dataset
+    """
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+
+    @property
+    def partitions(self) -> List[Path]:
+        """Partition files, in the order they were written"""
+        return sorted(self.path.glob(PARTITION_PATTERN), key=_partition_index)
+
+    @staticmethod
+    def _partition_columns(filepath: Path) -> List[str]:
+        with zipfile.ZipFile(filepath) as zf:
+            return [name[:-len(".npy")] for name in zf.namelist()]
+
+    @property
+    def columns(self) -> List[str]:
+        """Names of the columns of all partitions, from the partitions' file listings"""
+        columns = {}
+        for filepath in self.partitions:
+            columns.update(dict.fromkeys(self._partition_columns(filepath)))
+        return list(columns)
+
+    def __len__(self) -> int:
+        return sum(len(runs) for runs, _ in self.iter_column(RUN_COLUMN))
+
+    def iter_column(self, name: str) -> Iterator[Tuple[np.ndarray, Optional[np.ndarray]]]:
+        """
+        Values of a column by partition
+
+        :param name: column name
+        :return: iterator of the simulation indices of each partition and the column's values, None if the partition
+            does not have the column
+        """
+        for filepath in self.partitions:
+            with np.load(filepath) as partition:
+                runs = partition[RUN_COLUMN]
+                yield runs, partition[name] if name in partition.files else None
+
+    def read(self, name: str) -> np.ndarray:
+        """
+        Values of a column for all simulations, NaN for simulations without the column
+
+        :param name: column name
+        :return: array of the values, of shape (number of simulations, *shape of the column)
+        """
+        partitions = list(self.iter_column(name))
+        shapes = {values.shape[1:] for _, values in partitions if values is not None}
+        if not shapes:
+            raise KeyError(f"Column {name} is not in the results dataset {self.path}")
+        if len(shapes) > 1:
+            raise ValueError(f"Column {name} has shapes {shapes} in different partitions, use `iter_column`")
+        shape = shapes.pop()
+        return np.concatenate([values if values is not None else np.full((len(runs), *shape), np.nan)
+                               for runs, values in partitions])
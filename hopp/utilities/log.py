@@ -1,6 +1,9 @@
 import sys
 import os
+import glob
+import itertools
 import logging
+from logging.handlers import RotatingFileHandler
 from datetime import datetime
 from pathlib import Path
 
@@ -58,3 +61,48 @@ opt_logger.addHandler(console)
 logging.getLogger('').propagate = False
 logging.getLogger('HybridSim').propagate = False
 logging.getLogger('Optimization').propagate = False
+
+# parent of the loggers of the dispatch solver output, see `get_solver_logger`, which records nothing itself
+solver_logger = logging.getLogger('DispatchSolver')
+solver_logger.setLevel(logging.WARNING)
+solver_logger.propagate = False
+
+_solver_file_loggers = {}
+_solver_file_logger_ids = itertools.count()
+
+
+def get_solver_logger(log_name: str, max_bytes: int = 10 * 1024 ** 2, backup_count: int = 3) -> logging.Logger:
+    """
+    Logger writing the output of the dispatch solvers to `log_name`, rotating it to `log_name.1`, ... once it reaches
+    `max_bytes`. The logger is shared by all users of the same log file, and the log file and its backups from
+    previous runs are deleted when it is first opened. An empty `log_name` returns `solver_logger`, which records
+    nothing.
+    """
+    if log_name == "":
+        return solver_logger
+    log_path = Path(log_name).resolve()
+    file_logger = _solver_file_loggers.get(log_path)
+    if file_logger is None:
+        for filepath in [log_path, *log_path.parent.glob(glob.escape(log_path.name) + ".*")]:
+            if filepath == log_path or filepath.suffix[1:].isdigit():
+                filepath.unlink(missing_ok=True)
+        file_handler = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backup_count)
+        file_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)-8s %(message)s'))
+        file_logger = solver_logger.getChild(str(next(_solver_file_logger_ids)))
+        file_logger.addHandler(file_handler)
+        file_logger.setLevel(logging.INFO)
+        file_logger.propagate = False
+        _solver_file_loggers[log_path] = file_logger
+    return file_logger
+
+
+def close_solver_log(log_name: str):
+    """
+    Closes the log file of `get_solver_logger`, so that its next use starts a new log
+    """
+    file_logger = _solver_file_loggers.pop(Path(log_name).resolve(), None)
+    if file_logger is None:
+        return
+    for file_handler in list(file_logger.handlers):
+        file_logger.removeHandler(file_handler)
+        file_handler.close()
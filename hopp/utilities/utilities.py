@@ -1,5 +1,13 @@
+import importlib
+import importlib.util
+import itertools
 import os
+import sys
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional
+
 import yaml
+import numpy as np
 
 
 class Loader(yaml.SafeLoader):
@@ -25,3 +33,155 @@ def load_yaml(filename, loader=Loader) -> dict:
         return filename  # filename already yaml dict
     with open(filename) as fid:
         return yaml.load(fid, loader)
+
+
+def _update_digest_bytes(digest, tag: bytes, data: bytes):
+    digest.update(tag + len(data).to_bytes(8, 'little') + data)
+
+
+def _numeric_sequence_dtype(value) -> Optional[type]:
+    """dtype of a list or tuple of numbers of the same kind, or None"""
+    types = set(map(type, value))
+    if not types:
+        return None
+    if all(issubclass(t, (bool, np.bool_)) for t in types):
+        return np.bool_
+    if all(issubclass(t, (int, np.integer)) and not issubclass(t, bool) for t in types):
+        return np.int64
+    if all(issubclass(t, (float, np.floating)) for t in types):
+        return np.float64
+    return None
+
+
+def update_digest(digest, value):
+    """
+    Updates a hashlib digest with a (nested) dict or sequence of numbers, arrays and strings, independent of the dict
+    ordering.
+
+    Each value is tagged with its type, and arrays with their dtype and shape, so that values that only compare equal
+    as floats, such as `"1"`, `1` and `True`, or `None` and NaN, have different digests. Lists and tuples are the same
+    sequence.
+
+    :param digest: hashlib hash object
+    :param value: value to add to the digest
+    """
+    if isinstance(value, dict):
+        _update_digest_bytes(digest, b'd', str(len(value)).encode())
+        for k, v in sorted(value.items(), key=lambda item: repr(item[0])):
+            update_digest(digest, k)
+            update_digest(digest, v)
+    elif isinstance(value, (list, tuple)):
+        dtype = _numeric_sequence_dtype(value)
+        if dtype is not None:
+            try:
+                array = np.asarray(value, dtype=dtype)
+            except OverflowError:
+                dtype = None
+        if dtype is not None:
+            _update_digest_bytes(digest, b'l' + array.dtype.str.encode(), array.tobytes())
+        else:
+            _update_digest_bytes(digest, b'L', str(len(value)).encode())
+            for v in value:
+                update_digest(digest, v)
+    elif isinstance(value, np.ndarray):
+        header = f"{value.dtype.str}{value.shape}".encode()
+        if value.dtype.hasobject:
+            _update_digest_bytes(digest, b'A', header)
+            for v in value.ravel().tolist():
+                update_digest(digest, v)
+        else:
+            _update_digest_bytes(digest, b'a', header)
+            _update_digest_bytes(digest, b'', np.ascontiguousarray(value).tobytes())
+    elif value is None:
+        _update_digest_bytes(digest, b'n', b'')
+    elif isinstance(value, (bool, np.bool_)):
+        _update_digest_bytes(digest, b'b', bytes([bool(value)]))
+    elif isinstance(value, (int, np.integer)):
+        _update_digest_bytes(digest, b'i', str(int(value)).encode())
+    elif isinstance(value, (float, np.floating)):
+        _update_digest_bytes(digest, b'f', np.float64(value).tobytes())
+    elif isinstance(value, str):
+        _update_digest_bytes(digest, b's', value.encode())
+    elif isinstance(value, bytes):
+        _update_digest_bytes(digest, b'y', value)
+    else:
+        _update_digest_bytes(digest, b'r', type(value).__qualname__.encode())
+        _update_digest_bytes(digest, b'', repr(value).encode())
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Callable[[str], Any]:
+    """
+    Module `__getattr__` of a package whose public names are imported from their modules on first access, so that
+    importing the package does not import every module and their dependencies
+
+    :param package: name of the package, i.e. `__name__` of its `__init__`
+    :param exports: module of each exported name, relative to the package
+    :return: `__getattr__` of the package
+    """
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(exports[name], package), name)
+        setattr(importlib.import_module(package), name, value)
+        return value
+
+    return __getattr__
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Imports a module whose code only runs on first access of one of its attributes, for heavy dependencies that are
+    only used by some features. Parent packages are imported right away, so they should be light.
+
+    :param name: absolute name of the module
+    :return: module
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class RepeatedYearArray:
+    """
+    Time series over several years that repeat the same year, storing that year only.
+
+    The full series is only expanded when converted with `np.asarray`. Iterating, as when setting PySAM inputs, and
+    `tolist` share the elements of the repeated years, taking a fraction of the memory of an expanded list or array.
+    Indexing and slicing only read the year.
+
+    :param year: time series of a single year
+    :param n_years: number of years
+    """
+    def __init__(self, year, n_years: int):
+        self.year = np.asarray(year, dtype=float)
+        self.n_years = int(n_years)
+
+    def __len__(self) -> int:
+        return len(self.year) * self.n_years
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(itertools.repeat(self.year.tolist(), self.n_years))
+
+    def __getitem__(self, key):
+        # indices of the full series, mapped onto the year
+        indices = range(len(self))[key]
+        if isinstance(indices, range):
+            return self.year[np.arange(indices.start, indices.stop, indices.step) % len(self.year)]
+        return self.year[indices % len(self.year)]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return np.tile(self.year, self.n_years).astype(dtype or float, copy=False)
+
+    def tolist(self) -> list:
+        """
+        Full series as a list, whose years share the same elements
+        """
+        return self.year.tolist() * self.n_years
@@ -48,5 +48,6 @@ setup(
     package_data=package_data,
     include_package_data=True,
     install_requires=(base_path.parent / "requirements.txt").read_text().splitlines(),
+    extras_require={"highs": ["highspy"]},
     tests_require=['pytest', 'pytest-subtests', 'responses']
 )
@@ -3,6 +3,8 @@ Pytest configuration file.
 """
 import os
 
+import pytest
+
 from hopp import TEST_ENV_VAR
 from hopp.utilities.keys import set_nrel_key_dot_env
 
@@ -13,3 +15,20 @@ def pytest_sessionstart(session):
     os.environ["NREL_API_KEY"] = "a" * 40
     set_nrel_key_dot_env()
 
+
+def pytest_addoption(parser):
+    parser.addoption("--benchmark", action="store_true", default=False,
+                     help="run the performance benchmarks marked with `benchmark`")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: performance benchmark, only run with --benchmark")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmark, run with --benchmark")
+    for item in items:
+        if item.get_closest_marker("benchmark"):
+            item.add_marker(skip_benchmark)
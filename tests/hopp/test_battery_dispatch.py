@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 
 import pytest
@@ -10,6 +11,11 @@ from pyomo.util.check_units import assert_units_consistent
 from hopp.simulation.technologies.sites import SiteInfo, flatirons_site
 from hopp.simulation.technologies.battery import Battery, BatteryConfig, BatteryStateless, BatteryStatelessConfig
 from hopp.simulation.technologies.dispatch import SimpleBatteryDispatch
+from hopp.simulation.technologies.dispatch.power_storage import (
+    BatteryHeuristicParameters,
+    one_cycle_heuristic_dispatch,
+    simple_heuristic_dispatch,
+)
 from hopp.simulation.technologies.dispatch.hybrid_dispatch_builder_solver import HybridDispatchBuilderSolver, HybridDispatchOptions
 from hopp.simulation.technologies.financial.custom_financial_model import CustomFinancialModel
 
@@ -213,3 +219,79 @@ def test_batterystateless_cycle_limits():
 
     assert battery_sl.outputs.lifecycles_per_day[0:2] == pytest.approx([0.75048, 1], rel=1e-3)
 
+
+
+@pytest.mark.parametrize("battery_dispatch", ['heuristic', 'one_cycle_heuristic'])
+def test_battery_dispatch_heuristic_without_model(battery_dispatch):
+    # inputs and outputs of the per-timestep heuristics before they were vectorized, run day by day
+    reference = json.loads((Path(__file__).parent / "inputs" / "battery_heuristic_dispatch_reference.json").read_text())
+    gen, grid_limit, prices, user_fixed_dispatch = (np.array(reference[key]) for key in
+                                                    ('gen', 'grid_limit', 'prices', 'user_fixed_dispatch'))
+    expected = reference[battery_dispatch]
+    n_days = len(gen) // 24
+
+    model = pyomo.ConcreteModel(name='battery_heuristic')
+    model.forecast_horizon = pyomo.Set(initialize=range(24))
+    options = HybridDispatchOptions({'battery_dispatch': battery_dispatch})
+    config = BatteryConfig.from_dict(technologies_input['battery'])
+    battery = Battery(site, config=config)
+    dispatch = options.battery_dispatch_class(model,
+                                              model.forecast_horizon,
+                                              battery._system_model,
+                                              battery._financial_model,
+                                              dispatch_options=options)
+    dispatch.initialize_parameters()
+    dispatch.update_time_series_parameters(0)
+    dispatch.update_dispatch_initial_soc(dispatch.minimum_soc)
+    battery_parameters = BatteryHeuristicParameters.from_dispatch(dispatch)
+    initial_soc = model.initial_soc.value
+    assert initial_soc == expected['initial_soc']
+
+    # whole period at once, without the Pyomo model
+    if battery_dispatch == 'heuristic':
+        fixed_dispatch, soc = simple_heuristic_dispatch(user_fixed_dispatch, gen, grid_limit, initial_soc,
+                                                        battery_parameters)
+    else:
+        fixed_dispatch, soc = one_cycle_heuristic_dispatch(prices, gen, grid_limit, initial_soc,
+                                                           battery_parameters)
+    assert fixed_dispatch == pytest.approx(expected['fixed_dispatch'], abs=1e-9)
+    assert soc * 100. == pytest.approx(expected['soc'], abs=1e-9)
+
+    # day by day, fixing the model variables
+    for day in range(n_days):
+        period = slice(24 * day, 24 * (day + 1))
+        if battery_dispatch == 'heuristic':
+            dispatch.user_fixed_dispatch = user_fixed_dispatch[period].tolist()
+        else:
+            dispatch.prices = prices[period].tolist()
+        model.initial_soc = initial_soc
+        dispatch.set_fixed_dispatch(gen[period].tolist(), grid_limit[period].tolist())
+        assert dispatch.fixed_dispatch == pytest.approx(expected['fixed_dispatch'][period], abs=1e-9)
+        assert dispatch.soc == pytest.approx(expected['soc'][period], abs=1e-9)
+        assert dispatch.discharge_power == pytest.approx(np.maximum(fixed_dispatch[period], 0) * dispatch.maximum_power)
+        assert dispatch.charge_power == pytest.approx(np.maximum(-fixed_dispatch[period], 0) * dispatch.maximum_power)
+        initial_soc = dispatch.soc[-1] / 100.
+
+
+def test_battery_dispatch_heuristic_annual():
+    rng = np.random.default_rng(0)
+    n_hours = 8760
+    hours = np.arange(n_hours) % 24
+    gen = np.clip(60 * np.sin((hours - 6) / 12 * np.pi), 0, None) * rng.uniform(0.5, 1., n_hours)
+    grid_limit = np.full(n_hours, 50.)
+    day_prices = 30 + 20 * np.sin((hours - 10) / 12 * np.pi) + rng.normal(0, 3, n_hours)
+    battery_parameters = BatteryHeuristicParameters(maximum_power=50., capacity=200., minimum_soc=10.,
+                                                    maximum_soc=90., charge_efficiency=93.8, discharge_efficiency=93.8)
+
+    fixed_dispatch, soc = simple_heuristic_dispatch(rng.uniform(-1, 1, n_hours), gen, grid_limit, 0.5,
+                                                    battery_parameters)
+    assert np.all((soc >= 0) & (soc <= 1))
+
+    fixed_dispatch, soc = one_cycle_heuristic_dispatch(day_prices, gen, grid_limit, 0.1, battery_parameters)
+    assert np.all(np.round(soc, 6) * 100 >= battery_parameters.minimum_soc)
+    assert np.all(np.round(soc, 6) * 100 <= battery_parameters.maximum_soc)
+    # one cycle per day, at most
+    daily_discharge = np.maximum(fixed_dispatch, 0).reshape(-1, 24).sum(axis=1) * battery_parameters.maximum_power
+    usable_energy = (battery_parameters.maximum_soc - battery_parameters.minimum_soc) / 100 * battery_parameters.capacity
+    assert np.all(daily_discharge <= usable_energy * battery_parameters.discharge_efficiency / 100 + 1e-6)
+    assert daily_discharge.sum() > 0
@@ -1,12 +1,16 @@
 from unittest.mock import MagicMock
 from copy import deepcopy
 
+import numpy as np
+import pyomo.environ as pyomo
 import pytest
 from pytest import fixture
 
 from hopp.simulation.technologies.battery import (
     BatteryStateless, BatteryStatelessConfig
 )
+from hopp.simulation.technologies.dispatch import SimpleBatteryDispatch
+from hopp.simulation.technologies.dispatch.hybrid_dispatch_options import HybridDispatchOptions
 from tests.hopp.utils import create_default_site_info
 
 
@@ -73,4 +77,60 @@ def test_battery_initialization(site):
     assert battery.financial_model == fin_model
     assert battery.outputs is not None
     assert battery.system_capacity_kw == config.system_capacity_kw
-    assert battery.system_capacity_kwh == config.system_capacity_kwh
\ No newline at end of file
+    assert battery.system_capacity_kwh == config.system_capacity_kwh
+
+
+def test_battery_simulate_with_dispatch(site):
+    """Outputs and financial inputs match those of the list-based implementation"""
+    rng = np.random.default_rng(0)
+    n_look_ahead = 48
+    n_horizon = 24
+    battery = BatteryStateless(site, config=BatteryStatelessConfig.from_dict(config_data))
+    model = pyomo.ConcreteModel()
+    model.forecast_horizon = pyomo.Set(initialize=range(n_look_ahead))
+    battery._dispatch = SimpleBatteryDispatch(model,
+                                              model.forecast_horizon,
+                                              battery._system_model,
+                                              battery._financial_model,
+                                              'battery',
+                                              HybridDispatchOptions())
+    dispatch = battery.dispatch
+
+    n_timesteps = site.n_timesteps
+    expected_SOC = [0.0] * n_timesteps
+    expected_P = [0.0] * n_timesteps
+    expected_lifecycles = [None] * (n_timesteps // site.n_periods_per_day)
+    for start in range(0, n_timesteps, n_horizon):
+        # stand-in for a dispatch solution
+        for t in dispatch.blocks.index_set():
+            dispatch.blocks[t].charge_power.set_value(rng.uniform(0, 5))
+            dispatch.blocks[t].discharge_power.set_value(rng.uniform(0, 5))
+            dispatch.blocks[t].soc.set_value(rng.uniform(0.1, 0.9))
+        for d in model.days:
+            model.lifecycles[d].set_value(rng.uniform(0, 2))
+        battery.simulate_with_dispatch(n_horizon, start)
+
+        time_slice = slice(start, start + n_horizon)
+        expected_SOC[time_slice] = [i for i in dispatch.soc[0:n_horizon]]
+        expected_P[time_slice] = [i * 1e3 for i in dispatch.power[0:n_horizon]]
+        for d in range(n_horizon // site.n_periods_per_day):
+            expected_lifecycles[start // site.n_periods_per_day + d] = dispatch.lifecycles[d]
+
+    assert list(battery.outputs.SOC) == expected_SOC
+    assert list(battery.outputs.P) == expected_P
+    assert list(battery.outputs.I) == [0.0] * n_timesteps
+    assert battery.lifecycles == expected_lifecycles
+    assert battery.annual_energy_kwh == pytest.approx(sum(expected_P))
+
+    for project_life in (1, 25):
+        fin_model.reset_mock()
+        battery.simulate_financials(interconnect_kw=batt_kw, project_life=project_life)
+        values = {call.args[0]: call.args[1] for call in fin_model.value.call_args_list if len(call.args) == 2}
+
+        assert list(values['gen']) == expected_P * project_life
+        assert values['system_pre_curtailment_kwac'] is values['gen']
+        assert values['annual_energy_pre_curtailment_ac'] == pytest.approx(sum(expected_P))
+        assert values['batt_annual_discharge_energy'] == \
+            pytest.approx([sum(i for i in expected_P if i > 0)] * project_life)
+        assert values['batt_annual_charge_energy'] == \
+            pytest.approx([sum(i for i in expected_P if i < 0)] * project_life)
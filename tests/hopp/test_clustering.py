@@ -416,3 +416,30 @@ def test_cluster_avgs_from_timeseries():
     assert max(list_lengths) == min(list_lengths)
     assert sum(cluster_averages[0]) == approx(495893, 1e-3)
     assert sum(cluster_averages[-1]) == approx(2734562, 1e-3)
+
+
+def test_cluster_arrays_multiple_signals():
+    clusterer = clustering.Clustering(
+        power_sources=['tower'],
+        solar_resource_file=f"{ROOT_DIR.parent}/resource_files/solar/34.865371_-116.783023_psmv3_60_tmy.csv")
+    clusterer.ndays = 2
+    clusterer.run_clustering()
+
+    # two signals at 15 minute resolution
+    rng = np.random.default_rng(0)
+    signals = rng.random((8760 * 4, 2))
+
+    annual = clusterer.compute_annual_array_from_cluster_exemplar_data(signals, periods_per_day=96)
+    assert annual.shape == signals.shape
+    for i in range(signals.shape[1]):
+        assert np.array_equal(annual[:, i], clusterer.compute_annual_array_from_cluster_exemplar_data(signals[:, i], periods_per_day=96))
+
+    # each day of an exemplar group is reconstructed from the exemplar itself
+    for d in clusterer.sim_start_days:
+        exemplar = slice(d * 96, (d + clusterer.ndays) * 96)
+        assert np.array_equal(annual[exemplar], signals[exemplar])
+
+    averages = clusterer.compute_cluster_avg_from_timeseries(signals, periods_per_day=96)
+    assert averages.shape == (len(clusterer.clusters['count']), (1 + clusterer.ndays + 1) * 96, 2)
+    for i in range(signals.shape[1]):
+        assert averages[..., i] == approx(clusterer.compute_cluster_avg_from_timeseries(signals[:, i], periods_per_day=96))
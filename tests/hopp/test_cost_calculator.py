@@ -1,4 +1,8 @@
 import pytest
+import numpy as np
+from timeit import default_timer
+from scipy.interpolate import LinearNDInterpolator
+
 from hopp.tools.analysis import CostCalculator, BOSLookup, create_cost_calculator
 
 
@@ -117,4 +121,56 @@ class TestCostCalculator:
         except ValueError:
             assert True
 
-
+    def test_bos_lookup_costs_batch(self):
+        bos_calc = BOSLookup()
+        rng = np.random.default_rng(0)
+        # plants within the lookup's hybrid sizes of 1-2x the interconnection, and entries of the lookup itself
+        interconnection_mw = rng.uniform(10, 500, 300)
+        hybrid_mw = interconnection_mw * rng.uniform(1.05, 1.95, 300)
+        solar_mw = hybrid_mw * rng.uniform(.05, .95, 300)
+        entries = bos_calc.data[bos_calc.input_parameters].values[rng.choice(len(bos_calc.data), 100)]
+        interconnection_mw = np.concatenate((interconnection_mw, entries[:, 0], [100]))
+        wind_mw = np.concatenate((hybrid_mw - solar_mw, entries[:, 1], [0]))
+        solar_mw = np.concatenate((solar_mw, entries[:, 2], [0]))
+
+        wind_bos, solar_bos, total_bos, min_dist = bos_calc.lookup_costs(wind_mw, solar_mw, interconnection_mw)
+
+        # linear search and interpolation of one plant at a time
+        data = bos_calc.data
+        contents = data[bos_calc.input_parameters].values
+        wind_interp = LinearNDInterpolator(contents, data["Wind BOS Cost"].values)
+        solar_interp = LinearNDInterpolator(contents, data["Solar BOS Cost"].values)
+        for i in range(len(wind_mw)):
+            search_inputs = np.array([interconnection_mw[i], wind_mw[i], solar_mw[i]])
+            if wind_mw[i] + solar_mw[i] == 0:
+                assert total_bos[i] == 0
+                continue
+            distance_norm = np.linalg.norm(contents - search_inputs, axis=1)
+            assert min_dist[i] == pytest.approx(distance_norm.min())
+            assert wind_bos[i] == pytest.approx(wind_interp(search_inputs)[0], abs=1e-3)
+            assert solar_bos[i] == pytest.approx(solar_interp(search_inputs)[0], abs=1e-3)
+            assert total_bos[i] == pytest.approx(wind_bos[i] + solar_bos[i], abs=1e-3)
+
+            wind_bos_scalar, solar_bos_scalar, total_bos_scalar, min_dist_scalar = bos_calc.calculate_bos_costs(
+                wind_mw[i], solar_mw[i], interconnection_mw[i])
+            assert (wind_bos_scalar, solar_bos_scalar, total_bos_scalar, min_dist_scalar) == \
+                pytest.approx((wind_bos[i], solar_bos[i], total_bos[i], min_dist[i]), abs=1e-3)
+
+        with pytest.raises(ValueError):
+            bos_calc.lookup_costs([100, 295], [100, 295], [100, 550])
+
+    @pytest.mark.benchmark
+    def test_bos_lookup_costs_batch_benchmark(self):
+        bos_calc = BOSLookup()
+        rng = np.random.default_rng(1)
+        n_queries = 100000
+        interconnection_mw = rng.uniform(10, 500, n_queries)
+        hybrid_mw = interconnection_mw * rng.uniform(1.05, 1.95, n_queries)
+        solar_mw = hybrid_mw * rng.uniform(.05, .95, n_queries)
+
+        start = default_timer()
+        _, _, total_bos, _ = bos_calc.lookup_costs(hybrid_mw - solar_mw, solar_mw, interconnection_mw)
+        elapsed = default_timer() - start
+
+        assert np.all(total_bos > 0)
+        assert elapsed < 1
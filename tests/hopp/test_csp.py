@@ -1,11 +1,15 @@
 import pytest
 import datetime
+import numpy as np
 
 
 from hopp.simulation import HoppInterface
 from hopp.simulation.technologies.dispatch.power_sources.csp_dispatch import CspDispatch
 from hopp.simulation.technologies.csp.tower_plant import TowerPlant, TowerConfig
 from hopp.simulation.technologies.csp.trough_plant import TroughPlant, TroughConfig
+from hopp.simulation.technologies.csp.csp_plant import CspPlant
+from hopp.simulation.technologies.csp.forecast_cache import CspForecastCache
+from hopp.simulation.technologies.csp.pySSC_daotk.ssc_wrap import PysscWrap, ssc_wrap
 from tests.hopp.utils import create_default_site_info
 
 
@@ -144,6 +148,65 @@ def test_pySSC_trough_increment_simulation(site):
     assert increments_annual_energy == pytest.approx(wo_increments_annual_energy, 1e-5)
 
 
+@pytest.mark.parametrize("plant_class, config_class, csp_config", [
+    (TowerPlant, TowerConfig, {'cycle_capacity_kw': 100 * 1000, 'solar_multiple': 2.0, 'tes_hours': 6.0}),
+    (TroughPlant, TroughConfig, {'cycle_capacity_kw': 100 * 1000, 'solar_multiple': 1.5, 'tes_hours': 5.0}),
+])
+def test_pySSC_persistent_data_container(site, plant_class, config_class, csp_config):
+    """Testing simulations reusing the ssc data container match those in a new container"""
+    config = config_class.from_dict(csp_config)
+    csp = plant_class(site, config=config)
+    assert csp.ssc.persistent
+    if isinstance(csp, TowerPlant):
+        csp.generate_field()
+
+    def assert_matches_new_container(tech_outputs):
+        new_container = ssc_wrap('pyssc', config.tech_name, None)
+        new_container.set(csp.ssc.export_params())
+        expected_outputs = new_container.execute()
+
+        assert tech_outputs['annual_energy'] == pytest.approx(expected_outputs['annual_energy'])
+        np.testing.assert_allclose(tech_outputs['gen'], expected_outputs['gen'])
+        np.testing.assert_allclose(tech_outputs['e_ch_tes'], expected_outputs['e_ch_tes'])
+
+    # a whole year, then the same year with more storage
+    csp.ssc.set({'time_start': 0, 'time_stop': 8760 * 3600})
+    annual_outputs = csp.ssc.execute()
+    assert annual_outputs['annual_energy'] > 0
+    assert_matches_new_container(annual_outputs)
+
+    csp.ssc.set({'tshours': csp_config['tes_hours'] + 2})
+    assert_matches_new_container(csp.ssc.execute())
+    csp.ssc.set({'tshours': csp_config['tes_hours']})
+
+    # consecutive days carrying the plant state
+    for start_hour in [293*24, 294*24]:
+        start_datetime, end_datetime = CspDispatch.get_start_end_datetime(start_hour, 24)
+        csp.ssc.set({'time_start': CspDispatch.seconds_since_newyear(start_datetime)})
+        csp.ssc.set({'time_stop': CspDispatch.seconds_since_newyear(end_datetime)})
+        tech_outputs = csp.ssc.execute()
+        assert_matches_new_container(tech_outputs)
+
+        csp.set_plant_state_from_ssc_outputs(tech_outputs, 24 * 3600)
+        csp.update_ssc_inputs_from_plant_state()
+
+
+def test_pySSC_lk_inputs_file_numpy_values(tmp_path):
+    """Testing numpy arrays and scalars set by a persistent container are written to the LK inputs file"""
+    # only the parameters are needed to write the file, not the ssc library
+    wrap = PysscWrap.__new__(PysscWrap)
+    wrap.params = {'tech_model': 'trough_physical', 'financial_model': None,
+                   'array': np.arange(3.), 'matrix': np.ones((2, 2)), 'scalar': np.float64(2.5), 'flag': np.bool_(True)}
+    filename = tmp_path / "inputs.lk"
+    wrap.create_lk_inputs_file(str(filename), "weather.csv")
+
+    lines = filename.read_text()
+    assert "var( 'array', [ 0.0, 1.0, 2.0 ] );" in lines
+    assert "var( 'matrix', \n[ [ 1.0, 1.0 ],\n[ 1.0, 1.0 ] ] );" in lines
+    assert "var( 'scalar', 2.5 );" in lines
+    assert "var( 'flag', 1 );" in lines
+
+
 def test_value_csp_call(site):
     """Testing csp override of PowerSource value()"""
     trough_config = {'cycle_capacity_kw': 100 * 1000,
@@ -167,6 +230,122 @@ def test_value_csp_call(site):
     assert csp.tes_hours == 6.0
 
 
+def test_csp_forecast_cache(tmp_path):
+    """Testing forecast cache keys and persistence across cache instances"""
+    params = {'tshours': 6.0, 'P_ref': 100.0, 'solar_resource_data': {'dn': [0., 500., 800.], 'tz': -7}}
+    key = CspForecastCache.get_key(params)
+
+    assert CspForecastCache.get_key({**params, 'tshours': 10.0}) == key
+    assert CspForecastCache.get_key({**params, 'P_ref': 120.0}) != key
+    assert CspForecastCache.get_key({**params, 'solar_resource_data': {'dn': [0., 500., 801.], 'tz': -7}}) != key
+
+    cache = CspForecastCache(tmp_path / "forecasts")
+    assert cache.load(key) is None
+    cache.save(key, {'qsf_expected': [0., 1.5, 2.5], 'pc_config': 0, 'annual_energy': 1.})
+
+    shared_cache = CspForecastCache(tmp_path / "forecasts")
+    assert shared_cache.load(key) == {'qsf_expected': [0., 1.5, 2.5], 'pc_config': 0}
+    assert (cache.n_hits, cache.n_misses) == (0, 1)
+    assert (shared_cache.n_hits, shared_cache.n_misses) == (1, 0)
+
+
+class StubSsc:
+    """SSC inputs and a forecast, without the ssc library"""
+    def __init__(self, params):
+        self.params = dict(params)
+        self.n_executions = 0
+
+    def set(self, params):
+        self.params.update(params)
+
+    def get(self, name):
+        return self.params[name]
+
+    def export_params(self):
+        return dict(self.params)
+
+    def execute(self):
+        self.n_executions += 1
+        return {'qsf_expected': [0., 1.5, 2.5], 'pc_config': 1, 'ud_ind_od': [[1., 2.]]}
+
+
+class StubCspPlant:
+    """CSP plant forecast set up, with a stub SSC"""
+    setup_performance_model = CspPlant.setup_performance_model
+    run_year_for_max_thermal_gen = CspPlant.run_year_for_max_thermal_gen
+    set_forecast_simulation_times = CspPlant.set_forecast_simulation_times
+    set_cycle_efficiency_tables = CspPlant.set_cycle_efficiency_tables
+
+    def __init__(self, forecast_cache, tshours):
+        self.forecast_cache = forecast_cache
+        self.ssc = StubSsc({'tshours': tshours, 'rec_su_delay': 0.2, 'rec_qf_delay': 0.25, 'P_ref': 100.,
+                            'is_dispatch_targets': 1, 'time_start': 3600., 'time_stop': 7200.})
+
+    def value(self, name, value):
+        self.ssc.set({name: value})
+
+    def set_solar_thermal_resource(self, ssc_outputs):
+        self.solar_thermal_resource = ssc_outputs['qsf_expected']
+
+
+def test_csp_forecast_cache_hit_inputs(tmp_path):
+    """Testing a reused forecast sets the SSC inputs of a simulated one"""
+    cache = CspForecastCache(tmp_path / "forecasts")
+    simulated = StubCspPlant(cache, tshours=6.)
+    simulated.setup_performance_model()
+    assert simulated.ssc.n_executions == 1
+
+    reused = StubCspPlant(cache, tshours=10.)
+    reused.setup_performance_model()
+    assert reused.ssc.n_executions == 0
+    assert (cache.n_hits, cache.n_misses) == (1, 1)
+
+    assert reused.ssc.params == {**simulated.ssc.params, 'tshours': 10.}
+    assert reused.ssc.params['is_dispatch_targets'] == 0
+    assert (reused.ssc.params['time_start'], reused.ssc.params['time_stop']) == (0, 8760 * 60 * 60)
+    assert reused.solar_thermal_resource == simulated.solar_thermal_resource
+    assert reused.cycle_efficiency_tables == simulated.cycle_efficiency_tables
+
+
+def test_trough_forecast_cache(site, tmp_path):
+    """Testing dispatch inputs from a cached forecast match those of a simulated one"""
+    trough_config = {'cycle_capacity_kw': 100 * 1000,
+                     'solar_multiple': 1.5,
+                     'tes_hours': 5.0}
+
+    csp = TroughPlant(site, config=TroughConfig.from_dict(trough_config))
+    csp.setup_performance_model()
+
+    cache_dir = str(tmp_path / "forecasts")
+    cached_csp = TroughPlant(site, config=TroughConfig.from_dict({**trough_config, 'forecast_cache_dir': cache_dir}))
+    cached_csp.setup_performance_model()
+    assert cached_csp.forecast_cache.n_misses == 1
+
+    # different storage hours reuse the forecast
+    trough_config['tes_hours'] = 8.0
+    cached_csp = TroughPlant(site, config=TroughConfig.from_dict({**trough_config, 'forecast_cache_dir': cache_dir}))
+    cached_csp.setup_performance_model()
+    assert cached_csp.forecast_cache.n_hits == 1
+
+    assert cached_csp.solar_thermal_resource == pytest.approx(csp.solar_thermal_resource)
+    assert cached_csp.cycle_efficiency_tables.keys() == csp.cycle_efficiency_tables.keys()
+    for table in csp.cycle_efficiency_tables.keys():
+        np.testing.assert_allclose(cached_csp.cycle_efficiency_tables[table], csp.cycle_efficiency_tables[table])
+
+    # a reused forecast leaves the SSC inputs and the plant state of a simulated one
+    trough_config['tes_hours'] = 5.0
+    cached_csp = TroughPlant(site, config=TroughConfig.from_dict({**trough_config, 'forecast_cache_dir': cache_dir}))
+    cached_csp.setup_performance_model()
+    assert cached_csp.forecast_cache.n_hits == 2
+
+    ssc_inputs = csp.ssc.export_params()
+    cached_ssc_inputs = cached_csp.ssc.export_params()
+    assert cached_ssc_inputs.keys() == ssc_inputs.keys()
+    for name in ssc_inputs.keys():
+        np.testing.assert_equal(cached_ssc_inputs[name], ssc_inputs[name])
+    assert cached_csp.plant_state == csp.plant_state
+
+
 def test_tower_with_dispatch_model(site):
     """Testing pySSC tower model using HOPP built-in dispatch model"""
     expected_energy = 3842225.688
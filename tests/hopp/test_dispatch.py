@@ -1,8 +1,15 @@
 from pathlib import Path
+import timeit
+import tracemalloc
+
+import numpy as np
+import pandas as pd
 import pytest
 import pyomo.environ as pyomo
 from pyomo.environ import units as u
+from pyomo.network import Arc
 from pyomo.opt import TerminationCondition
+from pyomo.core.expr.visitor import identify_variables
 from pyomo.util.check_units import assert_units_consistent
 
 from hopp.simulation import HoppInterface
@@ -28,6 +35,7 @@ from hopp.simulation.technologies.dispatch.power_sources.wind_dispatch import Wi
 
 from tests.hopp.utils import create_default_site_info
 from hopp.utilities import load_yaml
+from hopp.utilities.log import close_solver_log, get_solver_logger, solver_logger
 
 
 @pytest.fixture
@@ -35,6 +43,9 @@ def site():
     return create_default_site_info()
 
 
+highs_available = pyomo.SolverFactory('appsi_highs').available(exception_flag=False)
+
+
 interconnect_mw = 50
 technologies = {
     'pv': {
@@ -210,6 +221,149 @@ def test_csp_dispatch_model(site):
     assert pyomo.value(model.test_objective) == pytest.approx(expected_objective, 1e-5)
 
 
+def test_csp_dispatch_time_series_parameters():
+    """Tests horizon parameters set in bulk and the vectorized ambient temperature corrections"""
+    model = pyomo.ConcreteModel(name='csp')
+    model.forecast_horizon = pyomo.Set(initialize=range(4))
+    csp_dispatch = CspDispatch(model, model.forecast_horizon, None, None)
+
+    csp_dispatch.available_thermal_generation = [0.0, 10.12345, 20.0, 30.0]
+    assert csp_dispatch.available_thermal_generation == [0.0, 10.1234, 20.0, 30.0]
+    csp_dispatch.available_thermal_generation = [5.0, 0.0, 1.00006, 2.0]
+    assert csp_dispatch.available_thermal_generation == [5.0, 0.0, 1.0001, 2.0]
+    assert model.csp[2].available_thermal_generation.value == 1.0001
+
+    csp_dispatch.receiver_startup_fraction = [1.0] * 4
+    with pytest.raises(ValueError):
+        csp_dispatch.receiver_startup_fraction = [0.5, 1.5, 0.5, 0.5]
+    with pytest.raises(ValueError):
+        csp_dispatch.available_thermal_generation = [0.0] * 3
+
+    Tpts = [0.0, 10.0, 20.0]
+    efficiency, condenser_losses = CspDispatch.get_cycle_ambient_corrections([-5.0, 5.0, 15.0, 25.0], Tpts,
+                                                                             [1.0, 0.9, 0.8], [0.0, 0.02, 0.04])
+    assert efficiency == pytest.approx([1.05, 0.95, 0.85, 0.75])
+    assert condenser_losses == pytest.approx([-0.01, 0.01, 0.03, 0.05])
+
+
+class StubCspPlant:
+    """Annual forecast and cycle tables of a CSP plant, without ssc"""
+    def __init__(self):
+        rng = np.random.default_rng(0)
+        hours = np.arange(8760)
+        daylight = np.clip(np.sin((hours % 24 - 6) / 12 * np.pi), 0, None)
+        self.solar_thermal_resource = (500 * daylight * rng.random(8760)).tolist()
+        self.year_weather_df = pd.DataFrame({'Temperature': 15 + 10 * np.sin(hours / 24 * np.pi) + rng.random(8760)})
+        self.cycle_nominal_efficiency = 0.4
+        Tpts = np.arange(-10., 50., 5.)
+        self.cycle_efficiency_tables = {'cycle_eff_Tdb_table': [[T, 1.05 - 0.005 * T] for T in Tpts],
+                                        'cycle_wcond_Tdb_table': [[T, 0.01 + 0.001 * T] for T in Tpts]}
+
+    def value(self, name):
+        return {'rec_su_delay': 0.2}[name]
+
+
+def update_time_series_parameters_loop(dispatch, start_time):
+    """Per-element update of the horizon parameters, as before they were sliced from annual arrays"""
+    plant = dispatch._system_model
+    n_horizon = len(dispatch.blocks.index_set())
+    time_duration = [1.0] * n_horizon
+    for t, delta in zip(dispatch.blocks, time_duration):
+        dispatch.blocks[t].time_duration = round(delta, dispatch.round_digits)
+
+    thermal_resource = plant.solar_thermal_resource
+    temperature = list(plant.year_weather_df.Temperature.values)
+    if start_time + n_horizon > len(thermal_resource):
+        field_gen = list(thermal_resource[start_time:])
+        field_gen.extend(list(thermal_resource[0:n_horizon - len(field_gen)]))
+        dry_bulb_temperature = list(temperature[start_time:])
+        dry_bulb_temperature.extend(list(temperature[0:n_horizon - len(dry_bulb_temperature)]))
+    else:
+        field_gen = thermal_resource[start_time:start_time + n_horizon]
+        dry_bulb_temperature = temperature[start_time:start_time + n_horizon]
+
+    tables = plant.cycle_efficiency_tables
+    Tpts = [T for T, _ in tables['cycle_eff_Tdb_table']]
+    etapts = [eta * plant.cycle_nominal_efficiency for _, eta in tables['cycle_eff_Tdb_table']]
+    wcondfpts = [wcond for _, wcond in tables['cycle_wcond_Tdb_table']]
+    Tstep = Tpts[1] - Tpts[0]
+    efficiency_correction = [1.0] * n_horizon
+    condenser_losses = [0.0] * n_horizon
+    for j in range(n_horizon):
+        i = max(0, min(int((dry_bulb_temperature[j] - Tpts[0]) / Tstep), len(Tpts) - 2))
+        r = (dry_bulb_temperature[j] - Tpts[i]) / Tstep
+        efficiency_correction[j] = etapts[i] + (etapts[i + 1] - etapts[i]) * r
+        condenser_losses[j] = wcondfpts[i] + (wcondfpts[i + 1] - wcondfpts[i]) * r
+
+    su_fraction = [min(1.0, max(dispatch.min_receiver_start_time / time_duration[i],
+                                dispatch.receiver_required_startup_energy / max(1e-6, field_gen[i] * time_duration[i])))
+                   for i in range(n_horizon)]
+
+    for name, values in (('available_thermal_generation', field_gen),
+                         ('cycle_ambient_efficiency_correction', efficiency_correction),
+                         ('condenser_losses', condenser_losses),
+                         ('receiver_startup_fraction', su_fraction)):
+        for t, value in zip(dispatch.blocks, values):
+            setattr(dispatch.blocks[t], name, round(value, dispatch.round_digits))
+
+
+def make_stub_csp_dispatch(n_horizon=48):
+    model = pyomo.ConcreteModel(name='csp')
+    model.forecast_horizon = pyomo.Set(initialize=range(n_horizon))
+    dispatch = CspDispatch(model, model.forecast_horizon, StubCspPlant(), None)
+    dispatch.receiver_required_startup_energy = 30.0
+    dispatch.min_receiver_start_time = 0.2
+    # the plant state is not part of the time series parameters
+    dispatch.update_initial_conditions = lambda: None
+    return dispatch
+
+
+def test_csp_dispatch_update_time_series_parameters():
+    """Tests the horizon parameters sliced from annual arrays match the per-element update"""
+    dispatch = make_stub_csp_dispatch()
+    expected = make_stub_csp_dispatch()
+    names = ('time_duration', 'available_thermal_generation', 'cycle_ambient_efficiency_correction',
+             'condenser_losses', 'receiver_startup_fraction')
+    # including horizons wrapping around the end of the year
+    for start_time in list(range(0, 8760, 24 * 7)) + [8760 - 24]:
+        dispatch.update_time_series_parameters(start_time)
+        update_time_series_parameters_loop(expected, start_time)
+        for name in names:
+            assert getattr(dispatch, name) == pytest.approx(getattr(expected, name), abs=1e-4)
+
+
+def test_csp_dispatch_horizon_values_domain():
+    """Tests horizon values outside of the parameter domain are rejected"""
+    dispatch = make_stub_csp_dispatch()
+    dispatch.update_time_series_parameters(0)
+    fractions = dispatch.receiver_startup_fraction
+    with pytest.raises(ValueError):
+        dispatch.receiver_startup_fraction = [1.5] * len(fractions)
+    with pytest.raises(ValueError):
+        dispatch.available_thermal_generation = [-1.0] * len(fractions)
+    assert dispatch.receiver_startup_fraction == fractions
+
+
+@pytest.mark.benchmark
+def test_csp_dispatch_update_time_series_parameters_benchmark():
+    dispatch = make_stub_csp_dispatch()
+    reference = make_stub_csp_dispatch()
+    start_times = range(0, 8760, 24)
+
+    dispatch.update_time_series_parameters(0)
+    start = timeit.default_timer()
+    for start_time in start_times:
+        dispatch.update_time_series_parameters(start_time)
+    elapsed = timeit.default_timer() - start
+
+    start = timeit.default_timer()
+    for start_time in start_times:
+        update_time_series_parameters_loop(reference, start_time)
+    reference_elapsed = timeit.default_timer() - start
+
+    assert reference_elapsed / elapsed > 10
+
+
 def test_tower_dispatch(site):
     """Tests setting up tower dispatch using system model and running simulation with dispatch"""
     expected_objective = 99485.378
@@ -783,7 +937,10 @@ def test_hybrid_dispatch_one_cycle_heuristic(site):
     assert sum(hybrid_plant.battery.outputs.P) < 0.0
     
 
-def test_hybrid_solar_battery_dispatch(site):
+@pytest.mark.parametrize("solver", ['glpk',
+                                    pytest.param('highs', marks=pytest.mark.skipif(not highs_available,
+                                                                                   reason="requires highspy"))])
+def test_hybrid_solar_battery_dispatch(site, solver):
     expected_objective = 23474
 
     solar_battery_technologies = {k: technologies[k] for k in ('pv', 'battery', 'grid')}
@@ -791,7 +948,7 @@ def test_hybrid_solar_battery_dispatch(site):
         "site": site,
         "technologies": solar_battery_technologies,
         "config": {
-            "dispatch_options": {'grid_charging': False}
+            "dispatch_options": {'grid_charging': False, 'solver': solver}
         }
     }
     hi = HoppInterface(hopp_config)
@@ -818,7 +975,7 @@ def test_hybrid_solar_battery_dispatch(site):
     hybrid_plant.grid.dispatch.electricity_sell_price = prices
     hybrid_plant.grid.dispatch.electricity_purchase_price = prices
 
-    results = HybridDispatchBuilderSolver.glpk_solve_call(hybrid_plant.dispatch_builder.pyomo_model)
+    results = hybrid_plant.dispatch_builder.solvers[solver]()
 
     assert results.solver.termination_condition == TerminationCondition.optimal
 
@@ -843,6 +1000,197 @@ def test_hybrid_solar_battery_dispatch(site):
         assert system_generation[t] * 1e3 >= 0.0
 
 
+def test_hybrid_dispatch_model_reused(site):
+    solar_battery_technologies = {k: technologies[k] for k in ('pv', 'battery', 'grid')}
+    hopp_config = {
+        "site": site,
+        "technologies": solar_battery_technologies,
+        "config": {
+            "dispatch_options": {'grid_charging': False, 'include_lifecycle_count': False}
+        }
+    }
+    hi = HoppInterface(hopp_config)
+    hybrid_plant = hi.system
+    dispatch = hybrid_plant.dispatch_builder.dispatch
+    model = hybrid_plant.dispatch_builder.pyomo_model
+    n_horizon = len(model.forecast_horizon)
+
+    # ports are linked by constraints rather than expanded arcs
+    assert not list(model.component_objects(Arc))
+    assert len(model.pv_port_balance) == n_horizon
+    assert len(model.battery_port_balance) == 2 * n_horizon
+    assert len(model.grid_port_balance) == 4 * n_horizon
+
+    # objectives are built once and swapped in place
+    objective = model.objective
+    gross_profit = model.gross_profit
+    assert objective.expr is gross_profit and objective.sense == pyomo.maximize
+    dispatch.create_min_operating_cost_objective()
+    assert model.objective is objective
+    assert objective.expr is model.operating_cost and objective.sense == pyomo.minimize
+    dispatch.create_max_gross_profit_objective()
+    assert model.gross_profit is gross_profit
+    assert objective.expr is gross_profit and objective.sense == pyomo.maximize
+
+    # time-varying coefficients are mutable parameters of the objective
+    hybrid_plant.pv.simulate(1)
+    dispatch.initialize_parameters()
+    dispatch.update_time_series_parameters(0)
+    for var in model.component_data_objects(pyomo.Var):
+        var.set_value(0, skip_validation=True)
+    for t in model.forecast_horizon:
+        dispatch.blocks[t].electricity_sold.set_value(1.)
+    for price in (30., 110.):
+        hybrid_plant.grid.dispatch.electricity_sell_price = [price] * n_horizon
+        expected = sum(price * weight for weight in dispatch.time_weighting_factor_list)
+        assert dispatch.objective_value == pytest.approx(expected)
+
+
+def test_hybrid_dispatch_lifecycle_objective(site):
+    solar_battery_technologies = {k: technologies[k] for k in ('pv', 'battery', 'grid')}
+    hopp_config = {
+        "site": site,
+        "technologies": solar_battery_technologies,
+        "config": {
+            "dispatch_options": {'include_lifecycle_count': True}
+        }
+    }
+    hi = HoppInterface(hopp_config)
+    dispatch = hi.system.dispatch_builder.dispatch
+    model = hi.system.dispatch_builder.pyomo_model
+    dispatch.create_min_operating_cost_objective()
+
+    # both objectives account for the battery lifecycles of every day of the horizon
+    lifecycles = {id(var) for var in hi.system.battery.dispatch.model.lifecycles.values()}
+    assert len(lifecycles) > 1
+    for objective in (model.gross_profit, model.operating_cost):
+        assert lifecycles <= {id(var) for var in identify_variables(objective.expr)}
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("n_look_ahead_periods", [48, 168])
+def test_hybrid_dispatch_model_construction_benchmark(site, n_look_ahead_periods):
+    # the tower is left out, as its dispatch model needs the ssc library
+    hopp_config = {
+        "site": site,
+        "technologies": {k: technologies[k] for k in ('pv', 'wind', 'battery', 'grid')},
+        "config": {
+            "dispatch_options": {'n_look_ahead_periods': n_look_ahead_periods}
+        }
+    }
+    hi = HoppInterface(hopp_config)
+    builder = hi.system.dispatch_builder
+
+    tracemalloc.start()
+    start = timeit.default_timer()
+    model = builder._create_dispatch_optimization_model()
+    builder.dispatch.create_max_gross_profit_objective()
+    builder.dispatch.create_port_balance_constraints()
+    construction_time = timeit.default_timer() - start
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = timeit.default_timer()
+    for _ in range(5):
+        builder.dispatch.create_min_operating_cost_objective()
+        builder.dispatch.create_max_gross_profit_objective()
+    swap_time = timeit.default_timer() - start
+
+    # the model size scales with the horizon, and swapping objectives does not rebuild them
+    n_constraints = sum(1 for _ in model.component_data_objects(pyomo.Constraint))
+    assert peak_memory / n_constraints < 10e3
+    assert swap_time < construction_time / 10
+
+
+def test_highs_solver_fallback(site):
+    solar_battery_technologies = {k: technologies[k] for k in ('pv', 'battery', 'grid')}
+    hopp_config = {
+        "site": site,
+        "technologies": solar_battery_technologies,
+        "config": {
+            "dispatch_options": {'solver': 'highs'}
+        }
+    }
+    hi = HoppInterface(hopp_config)
+    assert hi.system.dispatch_builder.options.solver == ('highs' if highs_available else 'cbc')
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(not highs_available, reason="requires highspy")
+def test_highs_dispatch_annual_overhead_benchmark(site):
+    """Compares the time per dispatch window over a full year of the in-process HiGHS and file-based Cbc solvers"""
+    window_times = {}
+    annual_generation = {}
+    for solver in ('highs', 'cbc'):
+        hopp_config = {
+            "site": site,
+            "technologies": {k: technologies[k] for k in ('pv', 'battery', 'grid')},
+            "config": {
+                "dispatch_options": {'grid_charging': False, 'solver': solver}
+            }
+        }
+        hi = HoppInterface(hopp_config)
+        builder = hi.system.dispatch_builder
+        assert builder.options.solver == solver
+
+        times = window_times[solver] = []
+        solve_dispatch_model = builder.solve_dispatch_model
+
+        def timed_solve_dispatch_model(start_time, n_days):
+            start = timeit.default_timer()
+            solve_dispatch_model(start_time, n_days)
+            times.append(timeit.default_timer() - start)
+
+        builder.solve_dispatch_model = timed_solve_dispatch_model
+        hi.simulate(1)
+        annual_generation[solver] = sum(hi.system.grid.generation_profile)
+
+    # both solvers dispatch every window of the year, to solutions within the optimality gap
+    assert len(window_times['highs']) == len(window_times['cbc']) == 365
+    assert annual_generation['highs'] == pytest.approx(annual_generation['cbc'], rel=1e-2)
+
+    # the HiGHS model stays loaded between windows, instead of writing a problem file and running an executable
+    assert np.mean(window_times['highs']) < np.mean(window_times['cbc']) / 2
+
+
+def test_solver_log_rotation(tmp_path):
+    log_name = tmp_path / "dispatch_solver_annual.log"
+    # backups of a previous run are deleted
+    (tmp_path / "dispatch_solver_annual.log.2").write_text("previous run")
+    file_logger = get_solver_logger(str(log_name), max_bytes=200, backup_count=1)
+    assert not (tmp_path / "dispatch_solver_annual.log.2").exists()
+    try:
+        file_logger.info("a" * 150)
+        file_logger.info("b" * 150)
+        file_logger.info("c" * 150)
+    finally:
+        close_solver_log(str(log_name))
+    assert "c" * 150 in log_name.read_text()
+    assert "b" * 150 in (tmp_path / "dispatch_solver_annual.log.1").read_text()
+    assert not (tmp_path / "dispatch_solver_annual.log.2").exists()
+
+    file_logger.info("d" * 150)
+    assert "d" * 150 not in log_name.read_text()
+
+
+def test_solver_log_per_log_name(tmp_path):
+    first_log, second_log = tmp_path / "first.log", tmp_path / "second.log"
+    first_logger = get_solver_logger(str(first_log))
+    try:
+        # loggers are shared by log name, and opening another log leaves the others attached
+        assert get_solver_logger(str(first_log)) is first_logger
+        second_logger = get_solver_logger(str(second_log))
+        assert get_solver_logger("") is solver_logger
+        first_logger.info("first")
+        second_logger.info("second")
+        solver_logger.info("no log")
+    finally:
+        close_solver_log(str(first_log))
+        close_solver_log(str(second_log))
+    assert first_log.read_text().strip().endswith("first")
+    assert second_log.read_text().strip().endswith("second")
+
+
 def test_hybrid_dispatch_financials(site):
     wind_solar_battery = {key: technologies[key] for key in ('pv', 'wind', 'battery', 'grid')}
     hopp_config = {
@@ -1,3 +1,4 @@
+import tracemalloc
 from unittest.mock import patch, MagicMock
 
 import pytest
@@ -6,6 +7,7 @@ import numpy as np
 from numpy.testing import assert_array_equal, assert_approx_equal
 
 from hopp.simulation.technologies.grid import GridConfig, Grid
+from hopp.utilities.utilities import RepeatedYearArray
 from tests.hopp.utils import create_default_site_info
 
 
@@ -128,3 +130,31 @@ def test_simulate_grid_connection(mock_simulate_power, site, subtests):
 
         assert_array_equal(grid.schedule_curtailed, np.repeat([2000], timesteps)) 
         assert_approx_equal(grid.schedule_curtailed_percentage, 2/3)
+
+
+@pytest.mark.parametrize("desired_schedule", [[], np.repeat([3], 8760)])
+def test_simulate_grid_connection_repeated_year(desired_schedule):
+    project_life = 30
+    hybrid_size_kw = 10e3
+    site = create_default_site_info(desired_schedule=desired_schedule)
+    year = np.linspace(0, 5000, site.n_timesteps)
+    config = GridConfig.from_dict({"interconnect_kw": interconnect_kw})
+
+    expected = Grid(site, config=config)
+    expected.simulate_grid_connection(hybrid_size_kw, np.tile(year, project_life), project_life, False, year)
+
+    grid = Grid(site, config=config)
+    tracemalloc.start()
+    grid.simulate_grid_connection(hybrid_size_kw, RepeatedYearArray(year, project_life), project_life, False, year)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # the repeated years are not expanded on the way to the grid model
+    assert peak_memory < 2 * year.nbytes * project_life
+    assert_array_equal(grid.generation_profile, expected.generation_profile)
+    if site.follow_desired_schedule:
+        assert isinstance(grid.missed_load, RepeatedYearArray)
+        assert_array_equal(grid.missed_load, expected.missed_load)
+        assert_array_equal(grid.schedule_curtailed, expected.schedule_curtailed)
+        assert grid.missed_load_percentage == pytest.approx(expected.missed_load_percentage)
+        assert grid.schedule_curtailed_percentage == pytest.approx(expected.schedule_curtailed_percentage)
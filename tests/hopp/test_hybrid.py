@@ -1,11 +1,16 @@
 from pathlib import Path
 from copy import deepcopy
+import subprocess
+import sys
+from unittest.mock import PropertyMock, patch
 
 from pytest import approx, fixture, raises
 import numpy as np
 import json
 
 from hopp.simulation import HoppInterface
+from hopp.simulation.hybrid_simulation import _add_generation, _lifetime_generation
+from hopp.tools.results_store import ResultsDataset, ResultsWriter
 
 from hopp.simulation.technologies.sites import SiteInfo
 from hopp.simulation.technologies.pv.detailed_pv_plant import DetailedPVPlant, DetailedPVConfig
@@ -268,6 +273,187 @@ def test_hybrid_pv_only(hybrid_config):
     assert npvs.hybrid == approx(-5121293, 1e3)
 
 
+def test_hybrid_incremental_simulation(hybrid_config):
+    technologies = hybrid_config["technologies"]
+    solar_only = {key: technologies[key] for key in ('pv', 'grid')}
+    hybrid_config["technologies"] = solar_only
+    hi = HoppInterface(hybrid_config)
+
+    hybrid_plant = hi.system
+
+    def get_results():
+        return (hybrid_plant.annual_energies.hybrid, hybrid_plant.net_present_values.hybrid,
+                hybrid_plant.net_present_values.pv, hybrid_plant.pv.generation_profile,
+                hybrid_plant.grid.generation_profile)
+
+    hi.simulate()
+    assert hybrid_plant.pv.n_simulations_skipped == 0
+
+    # resizing the interconnection leaves the pv inputs unchanged
+    for interconnect_kw in (4000, 15000):
+        hybrid_plant.interconnect_kw = interconnect_kw
+        hi.simulate()
+        results = get_results()
+        hybrid_plant.clear_simulation_cache()
+        hi.simulate()
+        assert results == get_results()
+    assert hybrid_plant.pv.n_simulations_skipped == 2
+
+    # the pv outputs are those of a simulation, not the lifetime generation of the last financial simulation
+    hybrid_plant.simulate_power()
+    assert hybrid_plant.pv.n_simulations_skipped == 3
+    assert len(hybrid_plant.pv.generation_profile) == hybrid_plant.site.n_timesteps
+
+    hybrid_plant.pv.system_capacity_kw = 6000
+    hi.simulate()
+    assert hybrid_plant.pv.n_simulations_skipped == 3
+    results = get_results()
+    hybrid_plant.clear_simulation_cache()
+    hi.simulate()
+    assert results == get_results()
+
+
+class CountingModel:
+    """Forwards to a PySAM model, counting its executions"""
+    def __init__(self, model):
+        object.__setattr__(self, "model", model)
+        object.__setattr__(self, "n_executions", 0)
+
+    def execute(self, *args):
+        object.__setattr__(self, "n_executions", self.n_executions + 1)
+        return self.model.execute(*args)
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def __setattr__(self, name, value):
+        setattr(self.model, name, value)
+
+
+def test_hybrid_sweep_model_executions(hybrid_config):
+    technologies = hybrid_config["technologies"]
+    solar_only = {key: technologies[key] for key in ('pv', 'grid')}
+    hybrid_config["technologies"] = solar_only
+    hi = HoppInterface(hybrid_config)
+
+    hybrid_plant = hi.system
+    pv_model = CountingModel(hybrid_plant.pv._system_model)
+    hybrid_plant.pv._system_model = pv_model
+
+    # a sweep of the interconnection and the PPA price leaves the pv inputs unchanged
+    for interconnect_kw in (10000, 15000, 20000):
+        for ppa_price in (0.03, 0.05):
+            hybrid_plant.interconnect_kw = interconnect_kw
+            hybrid_plant.ppa_price = ppa_price
+            hi.simulate()
+    assert pv_model.n_executions == 1
+    assert hybrid_plant.pv.n_simulations_skipped == 5
+
+    # a pv sizing sweep executes the model once per change of size
+    for system_capacity_kw in (6000, 7000, 7000, 6000):
+        hybrid_plant.pv.system_capacity_kw = system_capacity_kw
+        hi.simulate()
+    assert pv_model.n_executions == 4
+    assert hybrid_plant.pv.n_simulations_skipped == 6
+
+
+def test_hybrid_lifetime_generation():
+    n_timesteps = 24
+    project_life = 6
+    rng = np.random.default_rng(0)
+    # profiles of one year, of the project life and of a cycle of years dividing it
+    profiles = [rng.random(n_timesteps), rng.random(n_timesteps * project_life), rng.random(n_timesteps),
+                rng.random(n_timesteps * 2)]
+
+    expected = np.zeros(n_timesteps * project_life)
+    total_gen = np.zeros((1, n_timesteps))
+    for i, gen in enumerate(profiles):
+        expected += np.tile(gen, project_life * n_timesteps // len(gen))
+        total_gen = _add_generation(total_gen, gen, project_life)
+        lifetime_gen = _lifetime_generation(total_gen, project_life)
+        assert len(lifetime_gen) == len(expected)
+        assert np.array_equal(np.asarray(lifetime_gen), expected)
+        assert lifetime_gen.tolist() == expected.tolist()
+        if i == 0:
+            # single year profiles are only repeated on conversion
+            assert lifetime_gen.year.shape == (n_timesteps,)
+
+
+def test_hybrid_pv_only_lifetime_sim(hybrid_config):
+    technologies = hybrid_config["technologies"]
+    solar_only = {key: technologies[key] for key in ('pv', 'grid')}
+    hybrid_config["technologies"] = solar_only
+    hi = HoppInterface(hybrid_config)
+
+    hybrid_plant = hi.system
+
+    hybrid_plant.simulate(project_life=25, lifetime_sim=True)
+    n_timesteps = hybrid_plant.site.n_timesteps
+    assert len(hybrid_plant.pv.generation_profile) == n_timesteps * 25
+    assert np.array_equal(hybrid_plant.grid.generation_profile, hybrid_plant.pv.generation_profile)
+    assert hybrid_plant.annual_energies.hybrid == approx(hybrid_plant.annual_energies.pv)
+
+
+def test_hybrid_simulation_results(hybrid_config, tmp_path):
+    technologies = hybrid_config["technologies"]
+    solar_only = {key: technologies[key] for key in ('pv', 'grid')}
+    hybrid_config["technologies"] = solar_only
+    hi = HoppInterface(hybrid_config)
+
+    hybrid_plant = hi.system
+    with ResultsWriter(tmp_path) as writer:
+        for system_capacity_kw in (5000, 6000):
+            hybrid_plant.pv.system_capacity_kw = system_capacity_kw
+            hi.simulate()
+            results = hybrid_plant.simulation_results()
+            writer.write(results)
+
+    assert results["pv.generation_profile"].shape == (hybrid_plant.site.n_timesteps,)
+    assert results["pv.total_revenue"].shape == (26,)       # 25 year analysis period and year 0
+
+    dataset = ResultsDataset(tmp_path)
+    assert len(dataset) == 2
+    assert dataset.read("pv.system_capacity_kw") == approx([5000, 6000], rel=1e-3)
+    assert dataset.read("hybrid.annual_energy_kwh")[-1] == approx(hybrid_plant.annual_energies.hybrid)
+    assert dataset.read("pv.net_present_value")[-1] == approx(hybrid_plant.net_present_values.pv)
+    assert np.array_equal(dataset.read("hybrid.generation_profile")[-1],
+                          hybrid_plant.grid.generation_profile[:hybrid_plant.site.n_timesteps])
+
+    # errors of the financial model are not taken for missing outputs
+    with patch.object(type(hybrid_plant.pv), "net_present_value", new_callable=PropertyMock,
+                      side_effect=RuntimeError("financial model failed")):
+        with raises(RuntimeError):
+            hybrid_plant.simulation_results()
+
+
+def test_hybrid_lazy_imports():
+    # each check runs in a new interpreter, as for the workers of a process pool
+    def loaded_modules(script, packages):
+        script += f"""
+import sys
+print("modules:", *sorted({{name for name in sys.modules if name.split('.')[0] in {packages!r}}}))
+"""
+        result = subprocess.run([sys.executable, "-c", script], cwd=ROOT_DIR.parent, capture_output=True, text=True,
+                                check=True)
+        return result.stdout.splitlines()[-1].split()[1:]
+
+    # importing hopp does not import the optimization, technology or wake models
+    assert loaded_modules("import hopp", ('pyomo', 'PySAM', 'floris')) == []
+
+    # dependencies of the technologies and features that are not configured are not imported
+    script = """
+from hopp.simulation import HoppInterface
+from hopp import ROOT_DIR
+from hopp.utilities import load_yaml
+config = load_yaml(ROOT_DIR.parent / "tests" / "hopp" / "inputs" / "hybrid_run.yaml")
+config["technologies"] = {key: config["technologies"][key] for key in ('pv', 'grid')}
+HoppInterface(config)
+"""
+    optional = ('floris', 'pvmismatch', 'matplotlib', 'fastkml', 'pyproj', 'CoolProp', 'scipy')
+    assert loaded_modules(script, optional) == []
+    assert 'pyomo.core' not in loaded_modules(script, ('pyomo',))
+
+
 def test_detailed_pv_system_capacity(hybrid_config, subtests):
     with subtests.test("Detailed PV model (pvsamv1) using defaults except the top level system_capacity_kw parameter"):
         annual_energy_expected = 11128604
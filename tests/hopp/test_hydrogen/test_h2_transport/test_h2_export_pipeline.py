@@ -1,5 +1,6 @@
 from hopp.simulation.technologies.hydrogen.h2_transport.h2_export_pipe import run_pipe_analysis
 from pytest import approx
+import numpy as np
 
 # test that we the results we got when the code was recieved
 class TestExportPipeline():
@@ -26,25 +27,25 @@ class TestExportPipeline():
         assert self.costs["Thickness (mm)"][0] == 2.77
     
     def test_volume(self):
-        assert self.costs["volume [m3]"][0] == 12.213769866246679
+        assert self.costs["volume [m3]"][0] == approx(12.213769866246679, rel=1e-12)
 
     def test_weight(self):
-        assert self.costs["weight [kg]"][0] == 95755.95575137396
+        assert self.costs["weight [kg]"][0] == approx(95755.95575137396, rel=1e-12)
 
     def test_material_cost(self):
-        assert self.costs["mat cost [$]"][0] == 210663.1026530227
+        assert self.costs["mat cost [$]"][0] == approx(210663.1026530227, rel=1e-12)
     
     def test_labor_cost(self):
-        assert self.costs["labor cost [$]"][0] == 1264661.6443493643
+        assert self.costs["labor cost [$]"][0] == approx(1264661.6443493643, rel=1e-12)
 
     def test_misc_cost(self):
-        assert self.costs["misc cost [$]"][0] == 474423.0486551614
+        assert self.costs["misc cost [$]"][0] == approx(474423.0486551614, rel=1e-12)
     
     def test_row_cost(self): #ROW = right of way
-        assert self.costs["ROW cost [$]"][0] == 362152.90987383656
+        assert self.costs["ROW cost [$]"][0] == approx(362152.90987383656, rel=1e-12)
 
     def test_total_cost_output(self):
-        assert self.costs["total capital cost [$]"][0] == 2311900.705531385
+        assert self.costs["total capital cost [$]"][0] == approx(2311900.705531385, rel=1e-12)
 
     def test_total_capital_cost_sum(self):
         total_capital_cost = self.costs["mat cost [$]"][0] \
@@ -52,10 +53,26 @@ class TestExportPipeline():
                     + self.costs["misc cost [$]"][0] \
                     + self.costs["ROW cost [$]"][0]
 
-        assert self.costs["total capital cost [$]"][0] == total_capital_cost
+        assert self.costs["total capital cost [$]"][0] == approx(total_capital_cost, rel=1e-12)
 
     def test_annual_opex(self):
-        assert self.costs["annual operating cost [$]"][0] == 0.0117*self.costs["total capital cost [$]"][0]
+        assert self.costs["annual operating cost [$]"][0] == approx(0.0117*self.costs["total capital cost [$]"][0], rel=1e-12)
+
+def test_array_inputs():
+    L = np.array([8, 2.016, 20, 50])
+    m_dot = np.array([1.5, 0.3, 5, 12])
+    p_outlet = np.array([10, 25, 20, 15])
+    risers = np.array([1, 1, 2, 1])
+    costs = run_pipe_analysis(L, m_dot, 30, p_outlet, 80, risers=risers)
+
+    assert len(costs) == len(L)
+    for i in range(len(L)):
+        single_costs = run_pipe_analysis(L[i], m_dot[i], 30, p_outlet[i], 80, risers=risers[i])
+        for col in single_costs.columns:
+            if single_costs[col].dtype == object:
+                assert costs[col][i] == single_costs[col][0]
+            else:
+                assert costs[col][i] == approx(single_costs[col][0], rel=1e-12)
 
 if __name__ == "__main__":
     test_set = TestExportPipeline()
@@ -11,10 +11,10 @@ class TestPipeArraySingleSection():
     capex, opex = run_pipe_array([[L]], depth, p_inlet, p_outlet, [[m_dot]])
         
     def test_capex(self):
-        assert self.capex == 2334049.398178592
+        assert self.capex == approx(2334049.398178592, rel=1e-12)
     
     def test_opex(self):
-        assert self.opex == 27308.377958689525
+        assert self.opex == approx(27308.377958689525, rel=1e-12)
 
 # TODO check the values in these test, they are gut checked for being slightly above what would be expected for a single distance, but not well determined
 
@@ -27,10 +27,10 @@ class TestPipeArrayMultiSection():
 
 
     def test_capex(self):
-        assert self.capex == 4990951.552596819
+        assert self.capex == approx(4990951.552596819, rel=1e-12)
     
     def test_opex(self):
-        assert self.opex == 58394.13316538278
+        assert self.opex == approx(58394.13316538278, rel=1e-12)
     
     capex, opex = run_pipe_array([[L, L]], depth, p_inlet, p_outlet, [[m_dot, m_dot]])
         
@@ -45,9 +45,9 @@ class TestPipeArrayMultiSectionConstDiameter():
     capex, opex = run_pipe_array_const_diam([[L, L], [L, L]], depth, p_inlet, p_outlet, [[m_dot, m_dot], [m_dot, m_dot]])
         
     def test_capex(self):
-        assert self.capex == 10765617.481094152
+        assert self.capex == approx(10765617.481094152, rel=1e-12)
     def test_opex(self):
-        assert self.opex == 125957.72452880158
+        assert self.opex == approx(125957.72452880158, rel=1e-12)
     
 if __name__ == "__main__":
     test_set = TestPipeArraySingleSection()
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from CoolProp.CoolProp import PropsSI
+
+from hopp.simulation.technologies.hydrogen.h2_storage.pressure_vessel.compressed_gas_storage_model_20221021.hydrogen_properties import (
+    PROPERTIES,
+    get_hydrogen_property_table,
+)
+
+
+def test_property_table_matches_coolprop():
+    table = get_hydrogen_property_table()
+    assert max(table.max_error.values()) < 1e-7
+
+    # states of the compressed gas storage model, including the near-vacuum ones
+    pressures = np.array([30., 35., 30e5, 350e5, 350e5])
+    temperatures = np.array([353., 353., 353., 293., 288.])
+    for output in PROPERTIES:
+        reference = PropsSI(output, 'P', pressures, 'T', temperatures, 'Hydrogen')
+        assert table.props(output, pressures, temperatures) == pytest.approx(reference, rel=1e-7)
+    assert isinstance(table.props('D', 350e5, 293.), float)
+
+
+def test_property_table_bounds():
+    table = get_hydrogen_property_table()
+    with pytest.raises(ValueError):
+        table.props('D', 2000e5, 293.)
+    with pytest.raises(ValueError):
+        table.props('H', 30e5, 100.)
@@ -0,0 +1,50 @@
+import pytest
+import numpy as np
+
+from hopp.simulation.technologies.hydrogen.electrolysis.run_PEM_master import run_PEM_clusters
+from hopp.simulation.technologies.hydrogen.electrolysis.optimization_utils_linear import PowerSplitOptimizer
+
+electrolyzer_model_parameters = {
+    "Modify BOL Eff": False,
+    "BOL Eff [kWh/kg-H2]": [],
+    "Modify EOL Degradation Value": True,
+    "EOL Rated Efficiency Drop": 13,
+}
+
+
+def make_pem(n_procs=1):
+    rng = np.random.default_rng(0)
+    power_kw = np.clip(rng.normal(0.5, 0.3, 24 * 14), 0, 1.2) * 4000
+    return run_PEM_clusters(power_kw, 4, 4, 600, 30, electrolyzer_model_parameters, True, 0.1, n_procs)
+
+
+def test_iv_curve_shared_by_clusters():
+    pem = make_pem()
+    clusters = pem.create_clusters()
+    for cluster in clusters[1:]:
+        assert np.array_equal(cluster.curve_coeff, clusters[0].curve_coeff)
+
+
+def test_parallel_clusters():
+    h2_ts, h2_tot = make_pem().run()
+    h2_ts_parallel, h2_tot_parallel = make_pem(n_procs=2).run()
+
+    assert list(h2_ts.columns) == ["Cluster #{}".format(i) for i in range(4)]
+    assert h2_tot_parallel.loc['Total H2 Production [kg]'].sum() == pytest.approx(h2_tot.loc['Total H2 Production [kg]'].sum())
+    for col in h2_ts.columns:
+        assert np.array_equal(h2_ts_parallel[col]['hydrogen_hourly_production'], h2_ts[col]['hydrogen_hourly_production'])
+
+
+def test_power_split_model_reused():
+    optimizer = PowerSplitOptimizer(n_stacks=3, c_sw=12, rated_power=500)
+    model = optimizer.get_model(96)
+    assert optimizer.get_model(96) is model
+    assert optimizer.get_model(24) is not model
+
+    assert len(model.p) == 96 * 3
+    assert len(model.pwr_constraints) == 96
+    assert len(model.switching_constraints) == 2 * 95 * 3
+
+    # the available power is a parameter of the power constraints, updated in place for each window
+    model.P_wind[5] = 750.
+    assert model.pwr_constraints[6].upper() == 750.
@@ -0,0 +1,117 @@
+import pytest
+from timeit import default_timer
+import numpy as np
+import rainflow
+
+from hopp.simulation.technologies.hydrogen.electrolysis.rainflow_counter import RainflowCounter, cumulative_rainflow_damage
+
+
+def rainflow_damage(signal, nbins=10):
+    return sum(rng * count for rng, count in rainflow.count_cycles(signal, nbins=nbins))
+
+
+def windowed_rainflow_damage(signal, window=168, nbins=10):
+    """Cumulative damage counting each window's nonzero samples separately, as the fatigue model used to"""
+    t_calc = np.arange(0, len(signal) + window, window)
+    rf_track = 0
+    damage = []
+    for i in range(len(t_calc) - 1):
+        samples = signal[t_calc[i]:t_calc[i + 1]]
+        samples = samples[np.nonzero(samples)]
+        if np.size(samples) > 0 and np.max(samples) != np.min(samples):
+            rf_track += rainflow_damage(samples, nbins)
+        damage.append(rf_track)
+    return np.array(damage)
+
+
+@pytest.fixture
+def voltage_signal():
+    # daily cycles of a stack that is off for 4 hours each night
+    rng = np.random.default_rng(0)
+    days = 60
+    hours = np.arange(days * 24)
+    signal = 1.8 + 0.1 * np.sin(2 * np.pi * hours / 24) + 0.02 * rng.random(len(hours))
+    signal[hours % 24 < 4] = 0
+    return signal
+
+
+def test_counter_matches_rainflow():
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        signal = np.round(rng.normal(size=rng.integers(3, 80)), rng.integers(0, 3))
+        if signal.max() == signal.min():
+            continue
+        counter = RainflowCounter((signal.max() - signal.min()) / 10, nbins=10)
+        for chunk in np.split(signal, np.sort(rng.integers(0, len(signal), 4))):
+            counter.update(chunk)
+        assert counter.total_damage == pytest.approx(rainflow_damage(signal), rel=1e-12, abs=1e-12)
+
+
+def test_cumulative_damage_matches_windowed():
+    # cycles closing within each week: carrying residuals across windows gives the windowed damage
+    hours = np.arange(10 * 168)
+    signal = 1.8 - 0.1 * np.cos(2 * np.pi * hours / 24)
+    signal[hours % 24 == 12] = 1.95
+    signal[hours % 168 == 100] = 0
+
+    cumulative = cumulative_rainflow_damage(signal, 168)
+    assert cumulative == pytest.approx(windowed_rainflow_damage(signal), rel=1e-9)
+
+
+def test_cumulative_damage(voltage_signal):
+    cumulative = cumulative_rainflow_damage(voltage_signal, 168)
+    assert len(cumulative) == int(np.ceil(len(voltage_signal) / 168))
+    assert np.all(np.diff(cumulative) > 0)
+
+    # the damage at the end of each window is that of the signal up to that point
+    for i, end in enumerate([168, 168 * 4, len(voltage_signal)]):
+        samples = voltage_signal[voltage_signal != 0]
+        counter = RainflowCounter((samples.max() - samples.min()) / 10, nbins=10)
+        counter.update(voltage_signal[:end][voltage_signal[:end] != 0])
+        assert cumulative[int(np.ceil(end / 168)) - 1] == pytest.approx(counter.total_damage)
+    assert cumulative[-1] == pytest.approx(rainflow_damage(voltage_signal[voltage_signal != 0]))
+
+    # cycles spanning windows are only counted once
+    windowed = windowed_rainflow_damage(voltage_signal)
+    assert cumulative[-1] == pytest.approx(windowed[-1], rel=0.05)
+
+
+def test_cumulative_damage_2d(voltage_signal):
+    signals = np.vstack((voltage_signal, np.roll(voltage_signal, 5), np.zeros(len(voltage_signal))))
+    cumulative = cumulative_rainflow_damage(signals, 168)
+    assert cumulative.shape == (3, int(np.ceil(len(voltage_signal) / 168)))
+    for signal, damage in zip(signals, cumulative):
+        assert np.array_equal(damage, cumulative_rainflow_damage(signal, 168))
+    assert np.all(cumulative[2] == 0)
+
+
+def make_long_signal():
+    # 30-year hourly signal
+    rng = np.random.default_rng(0)
+    signal = 1.8 + 0.1 * rng.random(30 * 8760)
+    signal[rng.random(len(signal)) < 0.1] = 0
+    return signal
+
+
+def test_cumulative_damage_long_signal():
+    signal = make_long_signal()
+    cumulative = cumulative_rainflow_damage(signal, 168)
+    windowed = windowed_rainflow_damage(signal)
+
+    assert cumulative[-1] == pytest.approx(rainflow_damage(signal[signal != 0]))
+    assert cumulative[-1] == pytest.approx(windowed[-1], rel=0.05)
+
+
+@pytest.mark.benchmark
+def test_cumulative_damage_benchmark():
+    signal = make_long_signal()
+
+    start = default_timer()
+    cumulative_rainflow_damage(signal, 168)
+    time_cumulative = default_timer() - start
+
+    start = default_timer()
+    windowed_rainflow_damage(signal)
+    time_windowed = default_timer() - start
+
+    assert time_cumulative < time_windowed
@@ -12,7 +12,9 @@ from shapely.geometry import Point, MultiLineString
 from hopp.simulation.technologies.wind.wind_plant import WindPlant, WindConfig
 from hopp.simulation.technologies.pv.pv_plant import PVPlant, PVConfig
 from hopp.simulation.technologies.layout.hybrid_layout import HybridLayout, WindBoundaryGridParameters, PVGridParameters, get_flicker_loss_multiplier
-from hopp.simulation.technologies.layout.wind_layout_tools import create_grid
+from hopp.simulation.technologies.layout.wind_layout_tools import create_grid, get_points_along_line
+from hopp.simulation.technologies.layout.layout_tools import get_polygon_scanlines
+from hopp.simulation.technologies.layout.pv_layout_tools import place_solar_strands, place_solar_strands_on_scanlines
 from hopp.simulation.technologies.layout.pv_design_utils import size_electrical_parameters, find_modules_per_string
 from hopp.simulation.technologies.pv.detailed_pv_plant import DetailedPVPlant, DetailedPVConfig
 
@@ -72,6 +74,23 @@ def test_create_grid(site):
         assert(t.y == pytest.approx(expected_positions[n][1], 1e-1))
 
 
+def test_points_along_line(site):
+    boundary = site.polygon.exterior
+    distances = np.linspace(0, boundary.length, 57)
+    xs, ys = get_points_along_line(boundary, distances)
+    for d, x, y in zip(distances, xs, ys):
+        point = boundary.interpolate(d)
+        assert (x, y) == (point.x, point.y)
+
+
+def test_create_grid_max_sites(site):
+    all_positions = create_grid(site.polygon, site.polygon.centroid, np.pi / 4, 200, 200, .5)
+    positions = create_grid(site.polygon, site.polygon.centroid, np.pi / 4, 200, 200, .5, max_sites=5)
+    assert len(positions) == 5
+    for t, t_all in zip(positions, all_positions):
+        assert (t.x, t.y) == (t_all.x, t_all.y)
+
+
 def test_wind_layout(site):
     config = WindConfig.from_dict(technology['wind'])
     wind_model = WindPlant(site, config=config)
@@ -101,6 +120,26 @@ def test_solar_layout(site):
         assert buffer_region[i] == pytest.approx(expected_buffer_region[i], 1e-3)
 
 
+def test_solar_strands_on_scanlines(site):
+    scanlines = get_polygon_scanlines(site.polygon)
+    assert get_polygon_scanlines(site.polygon) is scanlines
+
+    center = np.array(site.polygon.centroid.coords[0])
+    for gcr in (0.2, 0.45, 0.8):
+        for max_num_modules in (500, 5000, 50000):
+            num_modules, strands = place_solar_strands(max_num_modules, 12, site.polygon, Point(center), 0.3, gcr,
+                                                       1.0, 2.0)
+            num_modules_fast, strands_fast = place_solar_strands_on_scanlines(scanlines, max_num_modules, 12, center,
+                                                                              0.3, gcr, 1.0, 2.0, site.polygon.bounds)
+            assert num_modules_fast == num_modules
+            assert len(strands_fast) == len(strands)
+            for strand, strand_fast in zip(strands, strands_fast):
+                assert strand_fast[0] == strand[0]
+                assert strand_fast[1] == pytest.approx(strand[1], abs=1e-6)
+                assert strand_fast[2].coords[0] == pytest.approx(strand[2].coords[0], abs=1e-6)
+                assert strand_fast[2].coords[-1] == pytest.approx(strand[2].coords[-1], abs=1e-6)
+
+
 def test_hybrid_layout(site):
     pv_config = PVConfig.from_dict(technology['pv'])
     wind_config = WindConfig.from_dict(technology['wind'])
@@ -7,7 +7,7 @@ import responses
 
 from hopp.simulation.technologies.pv.pv_plant import PVPlant, PVConfig
 from hopp.simulation.technologies.wind.wind_plant import WindPlant, WindConfig
-from hopp.simulation.technologies.reopt import REopt
+from hopp.simulation.technologies.reopt import REopt, REoptResultStore, LocalREoptService
 
 from tests import TEST_ROOT_DIR
 from tests.hopp.utils import create_default_site_info
@@ -73,3 +73,50 @@ def test_ReOPT():
         assert (results["outputs"]["Scenario"]["Site"]["Wind"]["size_kw"] >= 0)
 
     os.remove(fileout)
+
+
+def test_reopt_result_store(tmp_path):
+    site = create_default_site_info()
+    solar_model = PVPlant(site, config=PVConfig.from_dict({'system_capacity_kw': 20000}))
+    wind_model = WindPlant(site, config=WindConfig.from_dict({'num_turbines': 10, "turbine_rating_kw": 2000}))
+    fin_model = so.default("GenericSystemSingleOwner")
+
+    # the local service stands in for the API, answering without any request
+    def results(post):
+        load = post['Scenario']['Site']['LoadProfile']['loads_kw'][0]
+        return {"outputs": {"Scenario": {"status": "optimal", "load": load}}}
+
+    service = LocalREoptService(results)
+    store = REoptResultStore(service, results_dir=tmp_path / "results")
+
+    def get_results(load, provider):
+        reopt = REopt(lat=lat,
+                      lon=lon,
+                      load_profile=[load] * 8760,
+                      urdb_label="5ca4d1175457a39b23b3d45e",
+                      solar_model=solar_model,
+                      wind_model=wind_model,
+                      fin_model=fin_model,
+                      interconnection_limit_kw=20000,
+                      fileout=str(tmp_path / "REoptResults.json"),
+                      provider=provider)
+        return reopt.get_reopt_results()
+
+    # identical posts are only sent once
+    for load in (1000., 2000., 1000., 2000., 1000.):
+        assert get_results(load, store)["outputs"]["Scenario"]["load"] == load
+    assert len(service.posts) == 2
+    assert (store.n_hits, store.n_misses) == (3, 2)
+
+    # editing the results does not change them for later posts
+    get_results(1000., store)["outputs"]["Scenario"]["load"] = 0.
+    assert get_results(1000., store)["outputs"]["Scenario"]["load"] == 1000.
+    post = {'Scenario': {'Site': {'LoadProfile': {'loads_kw': [4000.]}}}}
+    store.get_results(post)["outputs"]["Scenario"]["status"] = "edited"
+    assert store.get_results(post)["outputs"]["Scenario"]["status"] == "optimal"
+
+    # results stored on disk are shared with other stores, which don't need a provider
+    offline_store = REoptResultStore(results_dir=tmp_path / "results")
+    assert get_results(2000., offline_store)["outputs"]["Scenario"]["load"] == 2000.
+    assert get_results(3000., offline_store) is None
+    assert len(service.posts) == 3
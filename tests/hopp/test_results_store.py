@@ -0,0 +1,132 @@
+import numpy as np
+from pytest import raises
+
+from hopp.tools.results_store import RUN_COLUMN, ResultsDataset, ResultsWriter
+
+
+def make_results(rng, n_timesteps=24, project_life=25):
+    return {
+        "pv.annual_energy_kwh": rng.random(),
+        "pv.total_revenue": rng.random(project_life + 1),
+        "pv.generation_profile": rng.random(n_timesteps),
+        "hybrid.net_present_value": rng.random(),
+    }
+
+
+def test_results_store_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    results = [make_results(rng) for _ in range(25)]
+
+    with ResultsWriter(tmp_path, partition_size=10) as writer:
+        runs = [writer.write(r) for r in results]
+    assert runs == list(range(25))
+
+    dataset = ResultsDataset(tmp_path)
+    assert len(dataset.partitions) == 3
+    assert len(dataset) == 25
+    assert set(dataset.columns) == set(results[0]) | {RUN_COLUMN}
+    assert np.array_equal(dataset.read(RUN_COLUMN), np.arange(25))
+    for name in results[0]:
+        assert np.array_equal(dataset.read(name), np.array([r[name] for r in results]))
+
+    with raises(KeyError):
+        dataset.read("wind.annual_energy_kwh")
+
+
+def test_results_store_append(tmp_path):
+    rng = np.random.default_rng(0)
+    results = [make_results(rng) for _ in range(15)]
+
+    with ResultsWriter(tmp_path, partition_size=10) as writer:
+        for r in results[:5]:
+            writer.write(r)
+    # a new writer continues the dataset
+    with ResultsWriter(tmp_path, partition_size=10) as writer:
+        assert writer.n_runs == 5
+        assert [writer.write(r) for r in results[5:]] == list(range(5, 15))
+
+    dataset = ResultsDataset(tmp_path)
+    assert np.array_equal(dataset.read(RUN_COLUMN), np.arange(15))
+    assert np.array_equal(dataset.read("pv.total_revenue"), np.array([r["pv.total_revenue"] for r in results]))
+
+
+def test_results_store_missing_columns_and_shape_change(tmp_path):
+    rng = np.random.default_rng(0)
+    with ResultsWriter(tmp_path, partition_size=10) as writer:
+        writer.write(make_results(rng))
+        # a technology without some outputs
+        writer.write({"pv.annual_energy_kwh": 1.})
+        # a different project life starts a new partition
+        writer.write(make_results(rng, project_life=30))
+        # a column added after the first rows of a partition
+        writer.write({**make_results(rng, project_life=30), "wind.annual_energy_kwh": 2.})
+
+    dataset = ResultsDataset(tmp_path)
+    assert len(dataset.partitions) == 2
+    assert len(dataset) == 4
+
+    energy = dataset.read("pv.annual_energy_kwh")
+    assert energy[1] == 1.
+    assert not np.isnan(energy).any()
+
+    wind = dataset.read("wind.annual_energy_kwh")
+    assert np.isnan(wind[:3]).all()
+    assert wind[3] == 2.
+
+    npv = dataset.read("hybrid.net_present_value")
+    assert np.isnan(npv[1])
+    assert not np.isnan(npv[[0, 2, 3]]).any()
+
+    with raises(ValueError):
+        dataset.read("pv.total_revenue")
+    shapes = [values.shape for _, values in dataset.iter_column("pv.total_revenue")]
+    assert shapes == [(2, 26), (2, 31)]
+    assert np.isnan(next(dataset.iter_column("pv.total_revenue"))[1][1]).all()
+
+
+def test_results_store_invalid_values(tmp_path):
+    with ResultsWriter(tmp_path, partition_size=10) as writer:
+        # a non-numeric value fails before any column is written
+        with raises(ValueError):
+            writer.write({"pv.total_revenue": np.zeros(26), "pv.annual_energy_kwh": "not a number"})
+        assert writer._n_rows == 0 and writer.n_runs == 0
+        assert writer._columns == {}
+
+        assert writer.write({"pv.total_revenue": np.zeros(31), "pv.annual_energy_kwh": 1.}) == 0
+        # a shape change flushes the buffered row
+        assert writer.write({"pv.total_revenue": np.ones(26)}) == 1
+
+    dataset = ResultsDataset(tmp_path)
+    assert len(dataset) == 2
+    assert [values.shape for _, values in dataset.iter_column("pv.total_revenue")] == [(1, 31), (1, 26)]
+
+
+def test_results_store_many_runs(tmp_path):
+    n_runs = 250
+    rng = np.random.default_rng(0)
+    # about as many columns as the results of a hybrid with several technologies
+    scalars = {f"tech{i}.scalar{j}": rng.random() for i in range(4) for j in range(14)}
+    cash_flows = {f"tech{i}.cash_flow{j}": rng.random(26) for i in range(4) for j in range(11)}
+    results = {**scalars, **cash_flows, "hybrid.generation_profile": rng.random(168)}
+
+    with ResultsWriter(tmp_path) as writer:
+        for _ in range(n_runs):
+            writer.write(results)
+            # only the current partition is buffered
+            assert writer._n_rows < writer.partition_size
+            assert all(len(column) == writer.partition_size for column in writer._columns.values())
+
+    dataset = ResultsDataset(tmp_path)
+    assert len(dataset.partitions) == 3
+    assert len(dataset) == n_runs
+
+    energy = dataset.read("tech0.scalar0")
+    assert energy.shape == (n_runs,)
+    assert (energy == scalars["tech0.scalar0"]).all()
+
+    n_rows = []
+    for runs, profiles in dataset.iter_column("hybrid.generation_profile"):
+        assert profiles.shape == (len(runs), 168)
+        assert (profiles == results["hybrid.generation_profile"]).all()
+        n_rows.append(len(runs))
+    assert n_rows == [100, 100, 50]
@@ -10,6 +10,8 @@ from numpy.testing import assert_array_equal
 
 from hopp.simulation.technologies.sites import SiteInfo, flatirons_site
 from hopp import ROOT_DIR
+from hopp.simulation import HoppInterface
+from hopp.utilities import load_yaml
 
 solar_resource_file = os.path.join(
     ROOT_DIR.parent, "resource_files", "solar", 
@@ -156,4 +158,96 @@ def test_site_kml_file_append():
     assert filepath_new.exists()
     k, valid_region, lat, lon = SiteInfo.kml_read(kml_filepath)
     assert valid_region.area > 0
-    os.remove(filepath_new)
\ No newline at end of file
+    os.remove(filepath_new)
+
+def read_resource_rows(filepath, n_header_rows, transform):
+    """Reads the header and transformed data rows of a resource file"""
+    with open(filepath) as f:
+        lines = f.readlines()
+    header, rows = lines[:n_header_rows], [line.rstrip('\n').split(',') for line in lines[n_header_rows:]]
+    return header, transform(rows)
+
+
+def test_site_init_subhourly_leap_year(tmp_path):
+    """Leap days should be dropped and the time resolution taken from the resource."""
+    def add_leap_day(rows):
+        leap_day = [[row[0], '2', '29'] + row[3:] for row in rows[58 * 24:59 * 24]]
+        return rows[:59 * 24] + leap_day + rows[59 * 24:]
+
+    def to_5_minutes(rows):
+        return [row[:4] + [str(minute)] + row[5:] for row in rows for minute in range(0, 60, 5)]
+
+    header, rows = read_resource_rows(solar_resource_file, 3, add_leap_day)
+    solar_file = tmp_path / "solar_leap.csv"
+    solar_file.write_text("".join(header) + "".join(",".join(row) + "\n" for row in rows))
+    header, wind_rows = read_resource_rows(wind_resource_file, 5, add_leap_day)
+    wind_file = tmp_path / "wind_leap.srw"
+    wind_file.write_text("".join(header) + "".join(",".join(row) + "\n" for row in wind_rows))
+
+    site = SiteInfo(flatirons_site, solar_resource_file=str(solar_file), wind_resource_file=str(wind_file))
+    reference = SiteInfo(flatirons_site, solar_resource_file=solar_resource_file, wind_resource_file=wind_resource_file)
+    assert site.n_timesteps == 8760
+    assert site.steps_per_hour == 1
+    assert_array_equal(site.solar_resource.data['gh'], reference.solar_resource.data['gh'])
+    assert_array_equal(site.wind_resource.data['data'], reference.wind_resource.data['data'])
+
+    header, rows = read_resource_rows(solar_resource_file, 3, to_5_minutes)
+    solar_file = tmp_path / "solar_5min.csv"
+    solar_file.write_text("".join(header) + "".join(",".join(row) + "\n" for row in rows))
+
+    site = SiteInfo(flatirons_site, solar_resource_file=str(solar_file), grid_resource_file=grid_resource_file, wind=False)
+    assert site.n_timesteps == 8760 * 12
+    assert site.steps_per_hour == 12
+    assert site.n_periods_per_day == 288
+    assert site.interval == 5
+    assert len(site.elec_prices.data) == site.n_timesteps
+    assert len(site.capacity_hours) == site.n_timesteps
+
+
+def test_site_init_multi_year(tmp_path):
+    """Multi-year resources should be split into years of resource data."""
+    def add_year(rows):
+        return rows + [[str(int(row[0]) + 1)] + row[1:5] + [str(float(row[5]) * 2)] + row[6:] for row in rows]
+
+    header, rows = read_resource_rows(solar_resource_file, 3, add_year)
+    solar_file = tmp_path / "solar_2_years.csv"
+    solar_file.write_text("".join(header) + "".join(",".join(row) + "\n" for row in rows))
+
+    site = SiteInfo(flatirons_site, solar_resource_file=str(solar_file), wind=False)
+    assert site.n_years == 2
+    assert site.n_timesteps == 8760
+    gh = np.array(site.solar_resource.data['gh'])
+    assert len(gh) == 8760
+
+    site.set_resource_year(1)
+    assert_array_equal(site.solar_resource.data['gh'], gh * 2)
+    assert site.solar_resource.data['year'][0] == flatirons_site['year'] + 1
+    with pytest.raises(ValueError):
+        site.set_resource_year(2)
+
+
+def test_hybrid_multi_year_resource(tmp_path):
+    """Each year of a multi-year resource is simulated by a hybrid plant created after selecting it."""
+    def add_year(rows):
+        return rows + [[str(int(row[0]) + 1)] + row[1:5] + [str(float(row[5]) * 2)] + row[6:] for row in rows]
+
+    header, rows = read_resource_rows(solar_resource_file, 3, add_year)
+    solar_file = tmp_path / "solar_2_years.csv"
+    solar_file.write_text("".join(header) + "".join(",".join(row) + "\n" for row in rows))
+    site = SiteInfo(flatirons_site, solar_resource_file=str(solar_file), wind=False)
+
+    config = load_yaml(ROOT_DIR.parent / "tests" / "hopp" / "inputs" / "hybrid_run.yaml")
+    config["site"] = site
+    config["technologies"] = {key: config["technologies"][key] for key in ('pv', 'grid')}
+    annual_energy = []
+    for year in range(site.n_years):
+        site.set_resource_year(year)
+        hi = HoppInterface(config)
+        hi.simulate(1)
+        annual_energy.append(hi.system.annual_energies.pv)
+    assert annual_energy[1] > annual_energy[0]
+
+    # models reading the resource files only support one hourly year
+    config["technologies"]["tower"] = {"cycle_capacity_kw": 100 * 1000, "solar_multiple": 2.0, "tes_hours": 6.0}
+    with pytest.raises(ValueError, match="tower"):
+        HoppInterface(config)
@@ -0,0 +1,52 @@
+import hashlib
+
+import numpy as np
+from pytest import mark
+
+from hopp.utilities.utilities import RepeatedYearArray, update_digest
+
+
+def get_digest(value):
+    digest = hashlib.sha1()
+    update_digest(digest, value)
+    return digest.hexdigest()
+
+
+@mark.parametrize("a, b", [
+    ("1", 1),
+    (True, 1),
+    (1, 1.),
+    (None, np.nan),
+    (None, "None"),
+    ([1., 2.], [[1.], [2.]]),
+    ([1, True], [1, 1]),
+    (np.arange(6.).reshape(2, 3), np.arange(6.).reshape(3, 2)),
+    (np.arange(6.), np.arange(6)),
+    ([1., 2., 3.], np.array([1., 2., 3.])),
+    (np.arange(2000.), np.concatenate((np.arange(1999.), [0.]))),
+    ({"a": 1, "b": 2}, {"a": 2, "b": 1}),
+    ({"ab": "c"}, {"a": "bc"}),
+    (["ab", "c"], ["a", "bc"]),
+    ([{"a": 1, "b": [2, 3]}], [{"a": [1, 2], "b": 3}]),
+])
+def test_update_digest_collisions(a, b):
+    assert get_digest(a) != get_digest(b)
+
+
+def test_update_digest_equal_values():
+    assert get_digest({"a": 1, "b": [1., 2.]}) == get_digest({"b": (1., 2.), "a": 1})
+    # dicts are ordered by key inside sequences too
+    assert get_digest([{"a": 1, "b": 2}]) == get_digest([{"b": 2, "a": 1}])
+    assert get_digest(np.arange(6.).reshape(2, 3)) == get_digest(np.arange(6.).reshape(2, 3))
+    assert get_digest(np.float32(0.5)) == get_digest(0.5)
+
+
+def test_repeated_year_array():
+    year = np.arange(5.)
+    repeated = RepeatedYearArray(year, 3)
+    expected = np.tile(year, 3)
+    assert len(repeated) == len(expected)
+    assert np.array_equal(np.asarray(repeated), expected)
+    assert list(repeated) == repeated.tolist() == expected.tolist()
+    for key in (0, 7, -1, slice(3, 12), slice(None, None, -2), slice(-6, None)):
+        assert np.array_equal(repeated[key], expected[key])
@@ -1,12 +1,16 @@
 import os
 import shutil
 
+import numpy as np
+import pandas as pd
 import responses
 from pytest import fixture
 import json
 
 from hopp import ROOT_DIR
-from hopp.simulation.technologies.utility_rate import UtilityRate, URDB_BASE_URL
+from hopp.simulation.technologies.utility_rate import (
+    UtilityRate, URDB_BASE_URL, compile_hourly_energy_rates, get_tariff_store
+)
 from hopp.utilities.keys import get_developer_nrel_gov_key
 
 path = os.path.dirname(os.path.abspath(__file__))
@@ -54,4 +58,55 @@ def test_from_file():
     resp = ur.get_urdb_response()
 
     assert resp is not None
-    assert('label' in resp)
\ No newline at end of file
+    assert('label' in resp)
+
+@responses.activate
+def test_tariff_store(tmp_path):
+    # offline rates are only read from the store, any request would fail as none is registered
+    label = "utility_rate_response"
+    shutil.copy(path_rates / f"{label}.json", tmp_path / f"{label}.json")
+    rates = [UtilityRate(path_rates=tmp_path, urdb_label=label, offline=True) for _ in range(3)]
+
+    tariffs = [ur.get_urdb_response() for ur in rates]
+    assert all(tariff == tariffs[0] for tariff in tariffs)
+    assert tariffs[0]['label'] == "5ca4d1175457a39b23b3d45e"
+
+    # editing a tariff does not change it for later lookups
+    rate = tariffs[0]['energyratestructure'][0][0]['rate']
+    edited_tariff = rates[0].get_urdb_response()
+    edited_tariff['label'] = "edited"
+    edited_tariff['energyratestructure'][0][0]['rate'] += 1
+    tariff = get_tariff_store(tmp_path).get_tariff(label)
+    assert tariff['label'] == "5ca4d1175457a39b23b3d45e"
+    assert tariff['energyratestructure'][0][0]['rate'] == rate
+
+    hourly_rates = [ur.hourly_energy_rates(year=2017) for ur in rates]
+    assert all(r is hourly_rates[0] for r in hourly_rates)
+    assert not hourly_rates[0].flags.writeable
+    assert np.array_equal(hourly_rates[0], compile_hourly_energy_rates(tariffs[0], 2017))
+
+    # reference from the schedules, by month, day of the week and hour
+    tariff = tariffs[0]
+    period_rates = [p[0]['rate'] + p[0].get('adj', 0) for p in tariff['energyratestructure']]
+    times = pd.date_range("2017-01-01", periods=8760, freq='h')
+    expected = [
+        period_rates[tariff['energyweekendschedule' if t.dayofweek >= 5 else 'energyweekdayschedule'][t.month - 1][t.hour]]
+        for t in times
+    ]
+    assert np.array_equal(hourly_rates[0], expected)
+
+    assert UtilityRate(path_rates=tmp_path, urdb_label="missing", offline=True).get_urdb_response() is None
+    assert len(responses.calls) == 0
+
+
+@responses.activate
+def test_tariff_store_saves_downloads(tmp_path):
+    with open(path_rates / "utility_rate_response.json", 'r') as f:
+        body = json.load(f)
+    ur = UtilityRate(path_rates=tmp_path, urdb_label=urdb_label)
+    responses.add(responses.GET, ur.urdb_url, body=body)
+
+    for _ in range(3):
+        assert UtilityRate(path_rates=tmp_path, urdb_label=urdb_label).get_urdb_response()['label'] == urdb_label
+    assert len(responses.calls) == 1
+    assert get_tariff_store(tmp_path).get_tariff(urdb_label)['label'] == urdb_label
@@ -1,9 +1,12 @@
+import numpy as np
 import pytest
 from pytest import fixture
 from pathlib import Path
 
 from hopp.simulation.technologies.sites import SiteInfo
 from hopp.simulation.technologies.wave.mhk_wave_plant import MHKWavePlant, MHKConfig
+from hopp.simulation.technologies.wave.wave_power_matrix import WavePowerMatrix
+from hopp.simulation.technologies.financial import mhk_cost_model
 from hopp.simulation.technologies.financial.mhk_cost_model import MHKCostModelInputs
 from hopp.simulation.technologies.financial.custom_financial_model import CustomFinancialModel
 from hopp.utilities import load_yaml
@@ -199,4 +202,36 @@ def test_changing_ref_model(waveplant,subtests):
 
 	with subtests.test("ref model number wrong"):
 		with pytest.raises(Exception):
-			waveplant.mhk_costs.ref_model_num = 11
\ No newline at end of file
+			waveplant.mhk_costs.ref_model_num = 11
+
+def test_power_matrix_matches_pysam(waveplant):
+	system_model = waveplant._system_model
+	matrix = WavePowerMatrix(waveplant.wave_power_matrix)
+	device_power = matrix.device_power(system_model.MHKWave.significant_wave_height, system_model.MHKWave.energy_period)
+
+	configs = [(100, 0.), (50, 0.), (100, 12.5)]
+	gen = matrix.array_power(device_power, [n for n, _ in configs], [loss for _, loss in configs])
+	for (n, loss), config_gen in zip(configs, gen):
+		system_model.MHKWave.number_devices = n
+		system_model.MHKWave.loss_downtime = loss
+		system_model.execute(0)
+		assert config_gen == pytest.approx(system_model.Outputs.gen, rel=1e-6)
+
+
+def test_evaluate_number_devices(waveplant):
+	number_devices = [10, 50, 100, 200]
+	results = waveplant.evaluate_number_devices(number_devices)
+
+	for i, n in enumerate(number_devices):
+		waveplant.number_devices = n
+		waveplant.simulate(25)
+		assert results['system_capacity_kw'][i] == waveplant.system_capacity_kw
+		assert results['annual_energy_kwh'][i] == pytest.approx(waveplant.annual_energy_kwh, rel=1e-6)
+		assert results['capacity_factor'][i] == pytest.approx(waveplant.capacity_factor, rel=1e-6)
+		assert results['total_installed_cost'][i] == pytest.approx(waveplant.total_installed_cost, rel=1e-9)
+
+	# the cost curve is reused by later sweeps rather than re-run
+	n_cached = len(mhk_cost_model._cost_outputs_cache)
+	assert np.array_equal(waveplant.evaluate_number_devices(number_devices)['total_installed_cost'],
+						  results['total_installed_cost'])
+	assert len(mhk_cost_model._cost_outputs_cache) == n_cached
@@ -1,9 +1,11 @@
 import pytest
 from pytest import fixture
 import math
+import numpy as np
 
 import PySAM.Windpower as windpower
 
+from hopp import ROOT_DIR
 from hopp.simulation.technologies.wind.wind_plant import WindPlant, WindConfig
 from tests.hopp.utils import create_default_site_info
 
@@ -129,4 +131,94 @@ def test_changing_system_capacity(site):
         assert model.system_capacity_kw == pytest.approx(n)
 
 
-
+def test_wake_surrogate(site):
+    config = {'num_turbines': 20, "turbine_rating_kw": 2000}
+    model = WindPlant(site, config=WindConfig.from_dict(config))
+    config['wake_surrogate'] = True
+    surrogate_model = WindPlant(site, config=WindConfig.from_dict(config))
+    surrogate = surrogate_model.wake_surrogate
+    xcoords = np.array(model._system_model.value("wind_farm_xCoordinates"))
+    ycoords = np.array(model._system_model.value("wind_farm_yCoordinates"))
+
+    def simulate_scaled_layout(scale):
+        for m in (model, surrogate_model):
+            m.modify_coordinates(list(xcoords * scale), list(ycoords * scale))
+            m.simulate_power(1)
+
+    for scale in (0.95, 1.0, 1.05):
+        simulate_scaled_layout(scale)
+        assert surrogate_model.annual_energy_kwh == pytest.approx(model.annual_energy_kwh, rel=1e-6)
+    assert surrogate.n_simulated == 3
+
+    # repeated layouts reuse their wake loss, nearby layouts are interpolated
+    simulate_scaled_layout(1.0)
+    assert surrogate.n_cache_hits == 1
+    assert surrogate_model.annual_energy_kwh == pytest.approx(model.annual_energy_kwh, rel=1e-6)
+    assert surrogate_model._system_model.value("wind_farm_wake_model") == model._system_model.value("wind_farm_wake_model")
+
+    simulate_scaled_layout(1.02)
+    assert surrogate.n_interpolated == 1
+    assert surrogate_model.annual_energy_kwh == pytest.approx(model.annual_energy_kwh, rel=5e-3)
+
+    # a different resource is outside of the cache
+    hub_ht = surrogate_model._system_model.value("wind_turbine_hub_ht")
+    surrogate_model._system_model.value("wind_turbine_hub_ht", 120)
+    simulate_scaled_layout(1.02)
+    assert surrogate.n_simulated == 4
+
+    # surrogate runs go through the simulation cache like any other
+    n_runs = (surrogate.n_cache_hits, surrogate.n_interpolated, surrogate.n_simulated)
+    surrogate_model.simulate_power(1)
+    assert surrogate_model.n_simulations_skipped == 1
+    assert (surrogate.n_cache_hits, surrogate.n_interpolated, surrogate.n_simulated) == n_runs
+
+    surrogate_model._system_model.value("wind_turbine_hub_ht", hub_ht)
+    simulate_scaled_layout(1.02)
+    assert surrogate.n_interpolated == n_runs[1] + 1
+    assert surrogate.n_simulated == n_runs[2]
+    assert surrogate_model.annual_energy_kwh == pytest.approx(model.annual_energy_kwh, rel=5e-3)
+
+
+def test_floris_wind_rose(site, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = {
+        'num_turbines': 4,
+        'turbine_rating_kw': 5000,
+        'model_name': 'floris',
+        'timestep': (0, 8760),
+        'floris_config': ROOT_DIR.parent / "examples" / "inputs" / "floris" / "gch.yaml",
+    }
+    time_series_model = WindPlant(site, config=WindConfig.from_dict(config))
+    time_series_model._system_model.execute(0)
+    (tmp_path / "speed_dir_data.csv").unlink()
+
+    config['floris_wind_rose'] = True
+    wind_rose_model = WindPlant(site, config=WindConfig.from_dict(config))
+    floris = wind_rose_model._system_model
+    assert len(floris.wind_rose_bins) < floris.n_timesteps
+    assert sum(floris.wind_rose_freq) == pytest.approx(1)
+
+    floris.execute(0)
+    assert not (tmp_path / "speed_dir_data.csv").exists()
+    assert len(floris.gen) == 8760
+    assert floris.annual_energy == pytest.approx(time_series_model._system_model.annual_energy, rel=5e-3)
+
+
+def test_floris_simulate(site, tmp_path, monkeypatch):
+    """FLORIS models are not PySAM models, so they are simulated without the simulation cache"""
+    monkeypatch.chdir(tmp_path)
+    config = {
+        'num_turbines': 4,
+        'turbine_rating_kw': 5000,
+        'model_name': 'floris',
+        'timestep': (0, 8760),
+        'floris_config': ROOT_DIR.parent / "examples" / "inputs" / "floris" / "gch.yaml",
+    }
+    model = WindPlant(site, config=WindConfig.from_dict(config))
+    model.simulate(20000)
+    annual_energy_kwh = model.annual_energy_kwh
+    assert annual_energy_kwh > 0
+
+    model.simulate(20000)
+    assert model.annual_energy_kwh == pytest.approx(annual_energy_kwh)
+    assert model.n_simulations_skipped == 0